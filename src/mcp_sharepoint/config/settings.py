@@ -27,8 +27,50 @@ class Settings:
     shp_doc_library: str
     shp_max_depth: int
     shp_max_folders_per_level: int
-    shp_level_delay: float
+    shp_tree_workers: int
+    shp_tree_rate_limit: float
+    shp_tree_engine: str  # "crawl" | "delta"
+    shp_page_size: int
     shp_api_type: str  # "office365" | "graph"
+    shp_token_refresh_fraction: float
+    shp_async_http: bool
+    shp_async_pool_size: int
+    shp_http_pool_connections: int
+    shp_http_pool_maxsize: int
+    shp_http_connect_timeout: float
+    shp_http_read_timeout: float
+    shp_http_transfer_timeout: float
+    shp_throttle_max_wait: float
+    shp_ratelimit_reserve: float
+    shp_retry_attempts: int
+    shp_retry_deadline: float
+    shp_breaker_failures: int
+    shp_breaker_reset: float
+    shp_readiness_interval: float
+    shp_download_chunk_size: int
+    shp_download_verify: str  # "size" | "hash" | "none"
+    shp_upload_chunk_size: int
+    shp_upload_session_threshold: int
+    shp_blob_transfer: bool
+    shp_blob_ttl: float
+    shp_blob_max_bytes: int
+    shp_blob_max_pending: int
+    shp_blob_max_pending_bytes: int
+    shp_cache_dir: str
+    shp_site_cache_ttl: float
+    shp_site_cache_snapshot: bool
+    shp_index_enabled: bool
+    shp_index_max_staleness: float
+    shp_cache_enabled: bool
+    shp_cache_max_bytes: int
+    shp_cache_ttls: dict[str, float]
+    shp_content_cache_enabled: bool
+    shp_content_cache_max_bytes: int
+    shp_content_cache_disk_max_bytes: int
+    shp_parse_workers: int
+    shp_parse_max_tasks_per_child: int
+    shp_parse_memory_limit: int
+    shp_parse_timeout: float
 
     # --- Server / transport ---
     transport: str      # "stdio" | "http"
@@ -62,7 +104,18 @@ class Settings:
         self.shp_doc_library = os.getenv("SHP_DOC_LIBRARY", "").strip()
         self.shp_max_depth = int(os.getenv("SHP_MAX_DEPTH", "15"))
         self.shp_max_folders_per_level = int(os.getenv("SHP_MAX_FOLDERS_PER_LEVEL", "100"))
-        self.shp_level_delay = float(os.getenv("SHP_LEVEL_DELAY", "0.5"))
+        self.shp_tree_workers = int(os.getenv("SHP_TREE_WORKERS", "8"))
+        self.shp_tree_rate_limit = float(os.getenv("SHP_TREE_RATE_LIMIT", "20"))
+        self.shp_tree_engine = os.getenv("SHP_TREE_ENGINE", "crawl").lower()
+        if self.shp_tree_engine not in ("crawl", "delta"):
+            logger.warning(
+                f"Invalid SHP_TREE_ENGINE '{self.shp_tree_engine}', defaulting to 'crawl'"
+            )
+            self.shp_tree_engine = "crawl"
+
+        # Items requested per page ($top / page size) when listing folders
+        self.shp_page_size = min(max(int(os.getenv("SHP_PAGE_SIZE", "999")), 1), 5000)
+
         self.shp_api_type = os.getenv("SHP_API_TYPE", "office365").lower()
         
         # Validate API type
@@ -72,6 +125,113 @@ class Settings:
             )
             self.shp_api_type = "office365"
 
+        # Renew Graph tokens in the background after this fraction of their lifetime
+        self.shp_token_refresh_fraction = min(
+            max(float(os.getenv("SHP_TOKEN_REFRESH_FRACTION", "0.8")), 0.1), 0.95
+        )
+
+        # Serve Graph tool calls on the event loop (aiohttp) instead of worker threads
+        self.shp_async_http = os.getenv("SHP_ASYNC_HTTP", "true").lower() in ("1", "true", "yes")
+        self.shp_async_pool_size = int(os.getenv("SHP_ASYNC_POOL_SIZE", "100"))
+
+        # Keep-alive connection pool and timeouts shared by the sync Graph clients
+        self.shp_http_pool_connections = int(os.getenv("SHP_HTTP_POOL_CONNECTIONS", "10"))
+        self.shp_http_pool_maxsize = int(os.getenv("SHP_HTTP_POOL_MAXSIZE", "20"))
+        self.shp_http_connect_timeout = float(os.getenv("SHP_HTTP_CONNECT_TIMEOUT", "5"))
+        self.shp_http_read_timeout = float(os.getenv("SHP_HTTP_READ_TIMEOUT", "30"))
+        self.shp_http_transfer_timeout = float(os.getenv("SHP_HTTP_TRANSFER_TIMEOUT", "60"))
+
+        # Throttling: longest tenant-wide pause honoured for one Retry-After, and
+        # the share of the RateLimit budget below which requests are spread out
+        self.shp_throttle_max_wait = max(float(os.getenv("SHP_THROTTLE_MAX_WAIT", "300")), 0.0)
+        self.shp_ratelimit_reserve = min(
+            max(float(os.getenv("SHP_RATELIMIT_RESERVE", "0.1")), 0.0), 1.0
+        )
+
+        # Retries (utils/retry.py): attempts per call and the time budget they share
+        self.shp_retry_attempts = max(int(os.getenv("SHP_RETRY_ATTEMPTS", "3")), 1)
+        self.shp_retry_deadline = max(float(os.getenv("SHP_RETRY_DEADLINE", "30")), 0.0)
+
+        # Circuit breakers (core/breaker.py): consecutive failures that open an
+        # endpoint class's breaker (0 = never), and seconds before it probes again
+        self.shp_breaker_failures = max(int(os.getenv("SHP_BREAKER_FAILURES", "5")), 0)
+        self.shp_breaker_reset = max(float(os.getenv("SHP_BREAKER_RESET", "30")), 1.0)
+
+        # Seconds between background SharePoint checks behind /readyz and /health
+        self.shp_readiness_interval = max(float(os.getenv("SHP_READINESS_INTERVAL", "15")), 1.0)
+
+        # Streaming downloads: bytes per chunk and post-download verification
+        self.shp_download_chunk_size = int(os.getenv("SHP_DOWNLOAD_CHUNK_SIZE", str(1024 * 1024)))
+        self.shp_download_verify = os.getenv("SHP_DOWNLOAD_VERIFY", "size").lower()
+        if self.shp_download_verify not in ("size", "hash", "none"):
+            logger.warning(
+                f"Invalid SHP_DOWNLOAD_VERIFY '{self.shp_download_verify}', defaulting to 'size'"
+            )
+            self.shp_download_verify = "size"
+
+        # Uploads above the threshold go through resumable chunked upload sessions
+        self.shp_upload_chunk_size = int(os.getenv("SHP_UPLOAD_CHUNK_SIZE", str(10 * 1024 * 1024)))
+        self.shp_upload_session_threshold = int(
+            os.getenv("SHP_UPLOAD_SESSION_THRESHOLD", str(4 * 1024 * 1024))
+        )
+
+        # Raw-byte side channel (/blobs) for binary content on HTTP transports
+        self.shp_blob_transfer = os.getenv("SHP_BLOB_TRANSFER", "true").lower() in (
+            "1", "true", "yes"
+        )
+        self.shp_blob_ttl = float(os.getenv("SHP_BLOB_TTL", "300"))
+        self.shp_blob_max_bytes = int(os.getenv("SHP_BLOB_MAX_BYTES", str(256 * 1024 * 1024)))
+        # Budget for all unclaimed blobs; POST /blobs answers 507 beyond it
+        self.shp_blob_max_pending = int(os.getenv("SHP_BLOB_MAX_PENDING", "32"))
+        self.shp_blob_max_pending_bytes = int(
+            os.getenv("SHP_BLOB_MAX_PENDING_BYTES", str(1024 * 1024 * 1024))
+        )
+
+        # Local state (drive index, caches) lives here
+        self.shp_cache_dir = os.path.expanduser(
+            os.getenv("SHP_CACHE_DIR", "~/.cache/sharepoint-mcp")
+        )
+
+        # Site/drive ID resolutions: TTL and a snapshot file for warm restarts
+        self.shp_site_cache_ttl = float(os.getenv("SHP_SITE_CACHE_TTL", "86400"))
+        self.shp_site_cache_snapshot = os.getenv("SHP_SITE_CACHE_SNAPSHOT", "true").lower() in (
+            "1", "true", "yes"
+        )
+
+        # Answer listings/trees from a delta-synced SQLite index (Graph only)
+        self.shp_index_enabled = os.getenv("SHP_INDEX_ENABLED", "false").lower() in (
+            "1", "true", "yes"
+        )
+        self.shp_index_max_staleness = float(os.getenv("SHP_INDEX_MAX_STALENESS", "60"))
+
+        # In-process response cache for read-only tools
+        self.shp_cache_enabled = os.getenv("SHP_CACHE_ENABLED", "true").lower() in (
+            "1", "true", "yes"
+        )
+        self.shp_cache_max_bytes = int(os.getenv("SHP_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+        self.shp_cache_ttls = _parse_ttls(os.getenv("SHP_CACHE_TTLS", ""))
+
+        # Parsed document text keyed by item id + cTag (memory, then SHP_CACHE_DIR)
+        self.shp_content_cache_enabled = os.getenv(
+            "SHP_CONTENT_CACHE_ENABLED", "true"
+        ).lower() in ("1", "true", "yes")
+        self.shp_content_cache_max_bytes = int(
+            os.getenv("SHP_CONTENT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+        )
+        self.shp_content_cache_disk_max_bytes = int(
+            os.getenv("SHP_CONTENT_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024))
+        )
+
+        # Run document parsers in worker processes (0 = parse on the calling thread)
+        self.shp_parse_workers = int(
+            os.getenv("SHP_PARSE_WORKERS", str(min(4, os.cpu_count() or 1)))
+        )
+        self.shp_parse_max_tasks_per_child = int(os.getenv("SHP_PARSE_MAX_TASKS_PER_CHILD", "50"))
+        self.shp_parse_memory_limit = int(
+            os.getenv("SHP_PARSE_MEMORY_LIMIT", str(2 * 1024 * 1024 * 1024))
+        )
+        self.shp_parse_timeout = float(os.getenv("SHP_PARSE_TIMEOUT", "120"))
+
         self.transport = os.getenv("TRANSPORT", "stdio").lower()
         self.http_host = os.getenv("HTTP_HOST", "0.0.0.0")
         self.http_port = int(os.getenv("HTTP_PORT", "8000"))
@@ -89,6 +249,20 @@ class Settings:
         )
 
 
+def _parse_ttls(raw: str) -> dict[str, float]:
+    """Parse ``tool=seconds,...`` overrides on top of the default cache TTLs."""
+    from ..utils.cache import DEFAULT_TTLS  # noqa: PLC0415
+
+    ttls = dict(DEFAULT_TTLS)
+    for pair in filter(None, (p.strip() for p in raw.split(","))):
+        tool, _, seconds = pair.partition("=")
+        try:
+            ttls[tool.strip()] = float(seconds)
+        except ValueError:
+            logger.warning(f"Ignoring invalid SHP_CACHE_TTLS entry '{pair}'")
+    return ttls
+
+
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Return a cached, validated Settings instance."""
@@ -0,0 +1,189 @@
+"""JSON ``$batch`` coalescing for independent Graph GET requests.
+
+Microsoft Graph accepts up to 20 sub-requests per ``POST /$batch``. Callers
+that need several unrelated resources (the children of every folder on a tree
+level, an item plus its list item) hand the endpoints to :func:`batch_get`
+and get the decoded bodies back in the same order, one round trip per 20
+requests instead of one per request.
+
+Sub-requests answered with 429/503 are re-batched and retried after the
+largest ``Retry-After`` reported, which pauses every other worker too (see
+``core/throttle.py``). Callers with their own re-queue loop (the tree crawler)
+pass ``retry_throttled=False`` and get them back as ``SharePointThrottleError``
+results instead, so a throttle is retried by one layer only. Other failures
+are returned per request as ``SharePointConnectionError`` instances so one
+missing item does not fail its neighbours.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from ..exceptions import SharePointConnectionError, SharePointThrottleError
+from ..utils.retry import parse_retry_after
+from .throttle import get_throttle_governor
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_SIZE = 20  # Graph hard limit per $batch payload
+MAX_THROTTLE_RETRIES = 3
+_THROTTLED = (429, 503)
+
+BatchResult = dict[str, Any] | SharePointConnectionError
+
+
+def _chunks(indices: list[int]) -> list[list[int]]:
+    return [indices[i : i + MAX_BATCH_SIZE] for i in range(0, len(indices), MAX_BATCH_SIZE)]
+
+
+def _payload(endpoints: list[str], indices: list[int]) -> dict[str, Any]:
+    """Build a ``$batch`` body; sub-request ids are the caller's indices."""
+    return {
+        "requests": [
+            {"id": str(i), "method": "GET", "url": f"/{endpoints[i].lstrip('/')}"}
+            for i in indices
+        ]
+    }
+
+
+def _retry_after(response: dict[str, Any], attempt: int) -> float:
+    headers = {k.lower(): v for k, v in (response.get("headers") or {}).items()}
+    delay = parse_retry_after(headers.get("retry-after"))
+    return float(2**attempt) if delay is None else delay
+
+
+def _demultiplex(
+    batch_response: dict[str, Any],
+    endpoints: list[str],
+    results: list[BatchResult | None],
+    attempt: int,
+) -> tuple[list[int], float]:
+    """Store each sub-response in *results*; return throttled ids and the wait."""
+    throttled: list[int] = []
+    delay = 0.0
+    for response in batch_response.get("responses", []):
+        index = int(response["id"])
+        status = int(response.get("status", 500))
+        body = response.get("body") or {}
+        if status in _THROTTLED:
+            throttled.append(index)
+            delay = max(delay, _retry_after(response, attempt))
+        elif status >= 400:
+            error = body.get("error", {}) if isinstance(body, dict) else {}
+            results[index] = SharePointConnectionError(
+                f"Graph API GET failed: {status} {error.get('message', '')}".strip()
+                + f" ({endpoints[index]})",
+                status,
+            )
+        else:
+            results[index] = body if isinstance(body, dict) else {}
+    return throttled, delay
+
+
+def _finish(
+    endpoints: list[str], results: list[BatchResult | None], raise_errors: bool,
+) -> list[BatchResult]:
+    for index, result in enumerate(results):
+        if result is None:
+            results[index] = SharePointConnectionError(
+                f"Graph API GET failed: no batch response ({endpoints[index]})"
+            )
+    if raise_errors:
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+    return results  # type: ignore[return-value]
+
+
+def _give_up(
+    pending: list[int], delay: float, results: list[BatchResult | None],
+    retry_throttled: bool,
+) -> None:
+    """Raise for sub-requests still throttled, or hand them back to the caller."""
+    if retry_throttled:
+        raise SharePointThrottleError(
+            f"{len(pending)} batched request(s) still throttled", delay
+        )
+    for index in pending:
+        results[index] = SharePointThrottleError("Graph API GET throttled", delay)
+
+
+def batch_get(
+    client: Any, endpoints: list[str], raise_errors: bool = False,
+    retry_throttled: bool = True,
+) -> list[BatchResult]:
+    """GET *endpoints* through ``$batch`` on a sync Graph/GraphQL client.
+
+    Args:
+        client: Client exposing ``get`` and ``post``
+        endpoints: Endpoints relative to the v1.0 root, as passed to ``client.get``
+        raise_errors: Raise the first failed sub-request instead of returning it
+        retry_throttled: Re-batch 429/503 sub-requests up to MAX_THROTTLE_RETRIES
+            times; when False they are returned as ``SharePointThrottleError``
+
+    Returns:
+        One decoded JSON body or ``SharePointConnectionError`` per endpoint,
+        in input order.
+
+    Raises:
+        SharePointConnectionError: if a ``$batch`` POST itself fails.
+        SharePointThrottleError: if sub-requests stay throttled after retries
+            (only when *retry_throttled*).
+    """
+    if len(endpoints) == 1:
+        try:
+            return [client.get(endpoints[0])]
+        except SharePointConnectionError as exc:
+            if raise_errors:
+                raise
+            return [exc]
+
+    results: list[BatchResult | None] = [None] * len(endpoints)
+    attempts = MAX_THROTTLE_RETRIES + 1 if retry_throttled else 1
+    for chunk in _chunks(list(range(len(endpoints)))):
+        pending = chunk
+        for attempt in range(attempts):
+            batch_response = client.post("$batch", _payload(endpoints, pending))
+            pending, delay = _demultiplex(batch_response, endpoints, results, attempt)
+            if not pending:
+                break
+            delay = get_throttle_governor().pause(delay)
+            if attempt < attempts - 1:
+                logger.warning("%d batched request(s) throttled; retrying in %.1fs",
+                               len(pending), delay)
+                get_throttle_governor().wait()
+        if pending:
+            _give_up(pending, delay, results, retry_throttled)
+    return _finish(endpoints, results, raise_errors)
+
+
+async def batch_get_async(
+    client: Any, endpoints: list[str], raise_errors: bool = False,
+    retry_throttled: bool = True,
+) -> list[BatchResult]:
+    """Async counterpart of :func:`batch_get` for ``AsyncGraphClient``."""
+    if len(endpoints) == 1:
+        try:
+            return [await client.get(endpoints[0])]
+        except SharePointConnectionError as exc:
+            if raise_errors:
+                raise
+            return [exc]
+
+    results: list[BatchResult | None] = [None] * len(endpoints)
+    attempts = MAX_THROTTLE_RETRIES + 1 if retry_throttled else 1
+    for chunk in _chunks(list(range(len(endpoints)))):
+        pending = chunk
+        for attempt in range(attempts):
+            batch_response = await client.post("$batch", _payload(endpoints, pending))
+            pending, delay = _demultiplex(batch_response, endpoints, results, attempt)
+            if not pending:
+                break
+            delay = get_throttle_governor().pause(delay)
+            if attempt < attempts - 1:
+                logger.warning("%d batched request(s) throttled; retrying in %.1fs",
+                               len(pending), delay)
+                await get_throttle_governor().wait_async()
+        if pending:
+            _give_up(pending, delay, results, retry_throttled)
+    return _finish(endpoints, results, raise_errors)
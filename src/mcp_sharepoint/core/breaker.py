@@ -0,0 +1,211 @@
+"""Circuit breakers around the SharePoint / Graph / AAD endpoints.
+
+When a backend is degraded, every call would otherwise sit through its full
+timeouts and retries, piling up worker threads and MCP sessions. Requests
+are grouped into four endpoint classes, each with its own breaker:
+
+* ``token`` -- access-token acquisition (AAD / ACS)
+* ``site`` -- site and drive resolution
+* ``search`` -- search queries
+* ``items`` -- everything else (drive items, list items, ``$batch``)
+
+A breaker opens after ``SHP_BREAKER_FAILURES`` consecutive failures
+(transport errors and 500/502/504; throttling is left to the throttle
+governor). While open, requests of that class fail immediately with
+``SharePointCircuitOpenError``; callers with a cached answer (the response
+cache, the site resolver, a still valid token) serve it instead. After
+``SHP_BREAKER_RESET`` seconds one probe request is let through (half-open):
+success closes the breaker, failure opens it again.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from typing import Any
+from urllib.parse import unquote, urlparse
+
+from ..exceptions import SharePointCircuitOpenError
+from ..utils.retry import TRANSIENT_STATUSES
+
+logger = logging.getLogger(__name__)
+
+ENDPOINT_CLASSES = ("token", "site", "items", "search")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_TOKEN_HOSTS = ("login.microsoftonline.com", "accounts.accesscontrol.windows.net")
+# Graph: sites/{id}, sites/{host}:/{path}, sites/{id}/drive(s)
+_GRAPH_SITE = re.compile(r"^/v1\.0/sites/(?:[^/:]+|[^/:]+:/[^:]*)(?:/drives?)?/?$")
+# SharePoint REST: the web / site objects and the request digest
+_REST_SITE = re.compile(r"/_api/(?:web|site|site/id|contextinfo)/?$")
+
+
+def endpoint_class(url: str) -> str:
+    """Endpoint class (breaker) a request to *url* belongs to."""
+    parsed = urlparse(url)
+    path = unquote(parsed.path).lower()
+    if parsed.netloc.lower() in _TOKEN_HOSTS:
+        return "token"
+    if "/_api/search/" in path or "/search(" in path or path.endswith("/search/query"):
+        return "search"
+    if _GRAPH_SITE.match(path) or _REST_SITE.search(path):
+        return "site"
+    return "items"
+
+
+class CircuitBreaker:
+    """Closed / open / half-open state machine for one endpoint class.
+
+    Args:
+        name: Endpoint class the breaker guards
+        failures: Consecutive failures that open the breaker (0 = never open)
+        reset: Seconds the breaker stays open before a probe is let through
+    """
+
+    def __init__(self, name: str, failures: int = 5, reset: float = 30.0):
+        self.name = name
+        self.threshold = failures
+        self.reset = reset
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probe_at: float | None = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> None:
+        """Admit a request, or fail fast while the breaker is open.
+
+        Raises:
+            SharePointCircuitOpenError: While open, and while a half-open
+                probe is in flight
+        """
+        if self.state == CLOSED:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN and now - self._opened_at >= self.reset:
+                self.state = HALF_OPEN
+                logger.info("Circuit '%s' half-open; probing", self.name)
+            # A probe that never reported back (e.g. cancelled) frees its slot
+            if self.state == HALF_OPEN and (
+                self._probe_at is None or now - self._probe_at >= self.reset
+            ):
+                self._probe_at = now
+                return
+            if self.state == CLOSED:
+                return
+            self.rejected += 1
+            retry_in = max(0.0, self._opened_at + self.reset - now)
+        raise SharePointCircuitOpenError(self.name, retry_in)
+
+    def observe(self, status: int) -> None:
+        """Record a response: 500/502/504 count as failures, other answers as success.
+
+        A throttled (429/503) probe proves nothing either way; it only frees
+        the half-open slot so the next request can probe.
+        """
+        if status in TRANSIENT_STATUSES:
+            self.failure()
+        elif status not in (429, 503):
+            self.success()
+        elif self.state == HALF_OPEN:
+            with self._lock:
+                if self.state == HALF_OPEN:
+                    self._probe_at = None
+
+    def success(self) -> None:
+        if self.state == CLOSED and not self.failures:
+            return
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("Circuit '%s' closed", self.name)
+            self.state = CLOSED
+            self.failures = 0
+            self._probe_at = None
+
+    def failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.threshold and self.failures >= self.threshold
+            ):
+                self.state = OPEN
+                self.opened += 1
+                self._opened_at = time.monotonic()
+                self._probe_at = None
+                logger.warning(
+                    "Circuit '%s' open after %d failure(s); failing fast for %.0fs",
+                    self.name, self.failures, self.reset,
+                )
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            retry_in = (
+                max(0.0, self._opened_at + self.reset - time.monotonic())
+                if self.state == OPEN else 0.0
+            )
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+                "retry_in": round(retry_in, 1),
+            }
+
+
+class CircuitBreakers:
+    """One :class:`CircuitBreaker` per endpoint class.
+
+    Args:
+        failures: Consecutive failures that open a breaker (0 = never open)
+        reset: Seconds a breaker stays open before probing
+    """
+
+    def __init__(self, failures: int = 5, reset: float = 30.0):
+        self.breakers = {name: CircuitBreaker(name, failures, reset) for name in ENDPOINT_CLASSES}
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        return self.breakers[endpoint_class(url)]
+
+    def stats(self) -> dict[str, Any]:
+        return {name: breaker.stats() for name, breaker in self.breakers.items()}
+
+
+_breakers: CircuitBreakers | None = None
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breakers() -> CircuitBreakers:
+    """Return the process-wide breakers, creating them from settings on first use."""
+    global _breakers
+    if _breakers is None:
+        from ..config import get_settings  # noqa: PLC0415
+
+        with _breakers_lock:
+            if _breakers is None:
+                settings = get_settings()
+                _breakers = CircuitBreakers(
+                    settings.shp_breaker_failures, settings.shp_breaker_reset
+                )
+    return _breakers
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Breaker of endpoint class *name*."""
+    return get_circuit_breakers().breakers[name]
+
+
+def breaker_for(url: str) -> CircuitBreaker:
+    """Breaker guarding requests to *url*."""
+    return get_circuit_breakers().for_url(url)
+
+
+def breaker_stats() -> dict[str, Any] | None:
+    """Stats for /health, or None if no request went through a breaker yet."""
+    return _breakers.stats() if _breakers is not None else None
@@ -8,20 +8,36 @@ Provides a unified interface for SharePoint operations using:
 from __future__ import annotations
 
 import logging
-from functools import lru_cache
-from typing import Any, Protocol
+import threading
+from typing import Any, BinaryIO, Protocol
 from urllib.parse import urlparse
 
-import msal
 import requests
 from office365.runtime.auth.client_credential import ClientCredential
 from office365.sharepoint.client_context import ClientContext
 
 from ..config import get_settings
 from ..exceptions import SharePointConnectionError
+from .http import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_TIMEOUT,
+    DEFAULT_TRANSFER_TIMEOUT,
+    RANGE_CHUNK_SIZE,
+    RangeBuffer,
+    create_session,
+    get_session,
+    range_header,
+    timeouts,
+)
+from .site_resolver import get_site_resolver
+from .token_manager import get_token_manager
 
 logger = logging.getLogger(__name__)
 
+# Process-wide client shared by every service module (see get_sp_context)
+_shared_client: Office365Client | GraphClient | None = None
+_shared_client_lock = threading.Lock()
+
 
 class SharePointClient(Protocol):
     """Protocol defining the interface for SharePoint clients."""
@@ -52,17 +68,30 @@ class Office365Client:
 class GraphClient:
     """Microsoft Graph API client for SharePoint operations."""
 
-    def __init__(self, access_token: str, site_url: str):
+    def __init__(
+        self,
+        access_token: str,
+        site_url: str,
+        session: requests.Session | None = None,
+        timeout: tuple[float, float] = DEFAULT_TIMEOUT,
+        transfer_timeout: tuple[float, float] = DEFAULT_TRANSFER_TIMEOUT,
+    ):
         """Initialize Graph client with access token and site URL.
         
         Args:
             access_token: Microsoft Graph API access token
             site_url: SharePoint site URL
+            session: Pooled HTTP session (a private one is created if omitted)
+            timeout: (connect, read) timeout for API calls
+            transfer_timeout: (connect, read) timeout for downloads/uploads
         """
         self.access_token = access_token
         self.site_url = site_url
         self.base_url = "https://graph.microsoft.com/v1.0"
         self.api_type = "graph"
+        self.session = session or create_session()
+        self.timeout = timeout
+        self.transfer_timeout = transfer_timeout
         
         # Extract site components from URL
         parsed = urlparse(site_url)
@@ -76,35 +105,25 @@ class GraphClient:
             "Accept": "application/json",
         }
         
-        # Cache site ID
-        self._site_id_cache: str | None = None
+    def set_access_token(self, access_token: str) -> None:
+        """Swap the bearer token in place.
+
+        Site and drive IDs live in the shared resolver, so a token refresh
+        never triggers a new site lookup.
+
+        Args:
+            access_token: Freshly acquired Microsoft Graph API access token
+        """
+        self.access_token = access_token
+        self.headers["Authorization"] = f"Bearer {access_token}"
         
     def _get_site_id(self) -> str:
-        """Get the SharePoint site ID from the site URL (cached)."""
-        if self._site_id_cache:
-            return self._site_id_cache
-            
-        # Format: /sites/{hostname}:{site_path}
-        site_resource = f"{self.hostname}:{self.site_path}"
-        url = f"{self.base_url}/sites/{site_resource}"
-        
-        try:
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            self._site_id_cache = response.json().get("id", "")
-            return self._site_id_cache
-        except Exception as exc:
-            logger.error(f"Failed to get site ID: {exc}")
-            # Fallback: try root site
-            try:
-                url = f"{self.base_url}/sites/{self.hostname}:{self.site_path}"
-                response = requests.get(url, headers=self.headers, timeout=30)
-                response.raise_for_status()
-                self._site_id_cache = response.json().get("id", "")
-                return self._site_id_cache
-            except Exception as e:
-                logger.error(f"Fallback site ID lookup failed: {e}")
-                raise SharePointConnectionError(f"Cannot determine site ID: {exc}") from exc
+        """Get the SharePoint site ID from the site URL (memoized, see site_resolver)."""
+        return get_site_resolver().site_id(self.site_url, self.get)
+
+    def get_drive_id(self, library: str = "") -> str:
+        """Get the drive ID of *library* ("" = the default document library)."""
+        return get_site_resolver().drive_id(self.site_url, self.get, library)
     
     def get(self, endpoint: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
         """Make a GET request to Graph API.
@@ -118,7 +137,9 @@ class GraphClient:
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=30)
+            response = self.session.get(
+                url, headers=self.headers, params=params, timeout=self.timeout
+            )
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as exc:
@@ -139,7 +160,7 @@ class GraphClient:
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         try:
-            response = requests.post(url, headers=self.headers, json=data, timeout=30)
+            response = self.session.post(url, headers=self.headers, json=data, timeout=self.timeout)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as exc:
@@ -160,7 +181,7 @@ class GraphClient:
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         try:
-            response = requests.put(url, headers=self.headers, json=data, timeout=30)
+            response = self.session.put(url, headers=self.headers, json=data, timeout=self.timeout)
             response.raise_for_status()
             return response.json() if response.content else {}
         except requests.exceptions.RequestException as exc:
@@ -180,7 +201,7 @@ class GraphClient:
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         try:
-            response = requests.delete(url, headers=self.headers, timeout=30)
+            response = self.session.delete(url, headers=self.headers, timeout=self.timeout)
             response.raise_for_status()
             return True
         except requests.exceptions.RequestException as exc:
@@ -189,24 +210,76 @@ class GraphClient:
                 logger.error(f"Response: {exc.response.text}")
             raise SharePointConnectionError(f"Graph API DELETE failed: {exc}") from exc
     
-    def download(self, endpoint: str) -> bytes:
+    def download(
+        self, endpoint: str, byte_range: tuple[int, int | None] | None = None,
+    ) -> bytes:
         """Download binary content from Graph API.
         
         Args:
             endpoint: API endpoint (relative to base_url)
+            byte_range: Inclusive ``(start, end)`` bytes to fetch with a
+                ``Range`` request (end None = to EOF); None for the whole file
             
         Returns:
-            Binary content
+            Binary content (empty if the range starts past the end)
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         try:
-            response = requests.get(url, headers=self.headers, timeout=60)
-            response.raise_for_status()
-            return response.content
+            if byte_range is None:
+                response = self.session.get(
+                    url, headers=self.headers, timeout=self.transfer_timeout
+                )
+                response.raise_for_status()
+                return response.content
+            with self.session.get(
+                url,
+                headers={**self.headers, **range_header(byte_range)},
+                timeout=self.transfer_timeout,
+                stream=True,
+            ) as response:
+                if response.status_code == 416:  # range starts past the end
+                    return b""
+                response.raise_for_status()
+                buffer = RangeBuffer(byte_range, response.status_code)
+                for chunk in response.iter_content(chunk_size=RANGE_CHUNK_SIZE):
+                    if not buffer.feed(chunk):
+                        break
+                return buffer.getvalue()
         except requests.exceptions.RequestException as exc:
             logger.error(f"Download from {url} failed: {exc}")
             raise SharePointConnectionError(f"Graph API download failed: {exc}") from exc
     
+    def download_to(
+        self, endpoint: str, fh: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """Stream binary content into *fh* without holding it in memory.
+        
+        Args:
+            endpoint: API endpoint (relative to base_url)
+            fh: Writable binary file object
+            chunk_size: Bytes read from the socket per write
+            
+        Returns:
+            Number of bytes written
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        written = 0
+        try:
+            with self.session.get(
+                url,
+                headers=self.headers,
+                timeout=self.transfer_timeout,
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    fh.write(chunk)
+                    written += len(chunk)
+            return written
+        except requests.exceptions.RequestException as exc:
+            logger.error(f"Streaming download from {url} failed: {exc}")
+            raise SharePointConnectionError(f"Graph API download failed: {exc}") from exc
+    
     def upload(self, endpoint: str, content: bytes) -> dict[str, Any]:
         """Upload binary content to Graph API.
         
@@ -223,7 +296,9 @@ class GraphClient:
             "Content-Type": "application/octet-stream",
         }
         try:
-            response = requests.put(url, headers=headers, data=content, timeout=60)
+            response = self.session.put(
+                url, headers=headers, data=content, timeout=self.transfer_timeout
+            )
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as exc:
@@ -236,30 +311,71 @@ class GraphClient:
         return f"GraphClient(site={self.site_url})"
 
 
-@lru_cache(maxsize=1)
 def get_sp_context() -> Office365Client | GraphClient:
-    """Return a cached, authenticated SharePoint client.
+    """Return the shared, authenticated SharePoint client.
 
     The client type is determined by the SHP_API_TYPE environment variable:
     - "office365" (default): Uses Office365 REST API
     - "graph": Uses Microsoft Graph REST API
     - "graphql": Uses Microsoft Graph GraphQL API
 
+    One client is created per process. For Graph/GraphQL clients the bearer
+    token is swapped in place by the shared TokenManager (normally from its
+    background renewer), so the client keeps its cached site/drive IDs and is
+    never rebuilt.
+
     Raises:
         SharePointConnectionError: if the client cannot be established.
     """
-    settings = get_settings()
-    
+    client = _shared_client
+    if client is None:
+        with _shared_client_lock:
+            client = _shared_client or _create_shared_client(get_settings())
+
+    if client.api_type != "office365":
+        # No-op while the token is valid; otherwise a single-flight refresh
+        # whose listener updates this client's headers.
+        get_token_manager().ensure_fresh()
+    return client
+
+
+def shared_client_ready() -> bool:
+    """Whether :func:`get_sp_context` would return without blocking."""
+    client = _shared_client
+    if client is None:
+        return False
+    return client.api_type == "office365" or not get_token_manager().needs_refresh()
+
+
+def reset_sp_context() -> None:
+    """Drop the shared client so the next get_sp_context() call rebuilds it."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is not None and _shared_client.api_type != "office365":
+            get_token_manager().remove_listener(_shared_client.set_access_token)
+        _shared_client = None
+
+
+def _create_shared_client(settings) -> Office365Client | GraphClient:
+    """Build the shared client for the configured API type (lock must be held)."""
+    global _shared_client
+
     if settings.shp_api_type == "graphql":
         logger.info("Using Microsoft Graph GraphQL API client")
         from .client_graphql import create_graphql_client
-        return create_graphql_client(settings)
+        _shared_client = create_graphql_client(
+            settings, get_token_manager().ensure_fresh()
+        )
     elif settings.shp_api_type == "graph":
         logger.info("Using Microsoft Graph REST API client")
-        return _create_graph_client(settings)
+        _shared_client = _create_graph_client(settings)
     else:
         logger.info("Using Office365 REST API client")
-        return _create_office365_client(settings)
+        _shared_client = _create_office365_client(settings)
+        return _shared_client
+
+    get_token_manager().add_listener(_shared_client.set_access_token)
+    return _shared_client
 
 
 def _create_office365_client(settings) -> Office365Client:
@@ -267,6 +383,10 @@ def _create_office365_client(settings) -> Office365Client:
     try:
         credentials = ClientCredential(settings.shp_id_app, settings.shp_id_app_secret)
         ctx = ClientContext(settings.shp_site_url).with_credentials(credentials)
+        # Route REST calls through the shared, throttle-governed session
+        # (older office365-rest-python-client releases lack with_transport)
+        if hasattr(ctx, "with_transport"):
+            ctx.with_transport(session=get_session(settings))
         logger.info("Office365 client context initialized for %s", settings.shp_site_url)
         return Office365Client(ctx)
     except Exception as exc:
@@ -278,27 +398,19 @@ def _create_office365_client(settings) -> Office365Client:
 def _create_graph_client(settings) -> GraphClient:
     """Create a Microsoft Graph API client."""
     try:
-        # Create MSAL confidential client application
-        app = msal.ConfidentialClientApplication(
-            settings.shp_id_app,
-            authority=f"https://login.microsoftonline.com/{settings.shp_tenant_id}",
-            client_credential=settings.shp_id_app_secret,
+        timeout, transfer_timeout = timeouts(settings)
+        client = GraphClient(
+            get_token_manager().ensure_fresh(),
+            settings.shp_site_url,
+            session=get_session(settings),
+            timeout=timeout,
+            transfer_timeout=transfer_timeout,
         )
-        
-        # Acquire token for Microsoft Graph
-        scopes = ["https://graph.microsoft.com/.default"]
-        result = app.acquire_token_for_client(scopes=scopes)
-        
-        if "access_token" not in result:
-            error_desc = result.get("error_description", "Unknown error")
-            raise SharePointConnectionError(f"Failed to acquire access token: {error_desc}")
-        
-        access_token = result["access_token"]
-        client = GraphClient(access_token, settings.shp_site_url)
-        
         logger.info("Microsoft Graph API client initialized for %s", settings.shp_site_url)
         return client
-        
+
+    except SharePointConnectionError:
+        raise
     except Exception as exc:
         msg = f"Failed to create Graph API client: {exc}"
         logger.error(msg)
@@ -0,0 +1,310 @@
+"""Asyncio Microsoft Graph transport built on aiohttp.
+
+``AsyncGraphClient`` mirrors the request methods of the sync Graph clients but
+runs them on the event loop, so tool calls no longer need a worker thread
+each. It wraps the shared sync client rather than replacing it: the bearer
+token, the cached site ID and path normalisation all come from there, which
+keeps token renewal and site resolution in one place. Requests pass the same
+circuit breakers and throttle governor as the sync session.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, BinaryIO
+
+import aiohttp
+
+from ..config import get_settings
+from ..exceptions import SharePointConnectionError, SharePointThrottleError
+from ..utils.metrics import HTTP_REQUESTS
+from . import client as _client_mod
+from .breaker import breaker_for
+from .client import get_sp_context
+from .http import DEFAULT_CHUNK_SIZE, RANGE_CHUNK_SIZE, RangeBuffer, range_header
+from .site_resolver import get_site_resolver
+from .throttle import get_throttle_governor
+from .token_manager import get_token_manager
+
+logger = logging.getLogger(__name__)
+
+
+def _http_error(action: str, response: aiohttp.ClientResponse) -> SharePointConnectionError:
+    """Error for a failed response; throttling carries the pause the governor applied."""
+    message = f"Graph API {action} failed: {response.status} {response.reason}"
+    retry_after = get_throttle_governor().observe(response.status, response.headers)
+    if retry_after is not None:
+        return SharePointThrottleError(message, retry_after, response.status)
+    return SharePointConnectionError(message, response.status)
+
+
+class AsyncGraphClient:
+    """Async Microsoft Graph API client sharing state with a sync Graph client."""
+
+    def __init__(self, sync_client: Any, pool_size: int = 100):
+        """Initialize around an existing sync Graph/GraphQL client.
+
+        Args:
+            sync_client: Shared GraphClient or GraphQLClient instance
+            pool_size: Maximum simultaneous connections to graph.microsoft.com
+        """
+        self.sync_client = sync_client
+        self.api_type = sync_client.api_type
+        self.base_url = "https://graph.microsoft.com/v1.0"
+        self.pool_size = pool_size
+        self._session: aiohttp.ClientSession | None = None
+        self._session_loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def access_token(self) -> str:
+        """Current bearer token (always read from the shared sync client)."""
+        return self.sync_client.access_token
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled session for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            await self.close()
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=5, sock_read=30),
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def get_site_id(self) -> str:
+        """Return the site ID, resolving it off the event loop if not cached."""
+        cached = get_site_resolver().peek(self.sync_client.site_url)
+        if cached:
+            return cached
+        return await asyncio.to_thread(self.sync_client._get_site_id)
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        params: dict[str, Any] | None = None,
+        json_data: dict[str, Any] | None = None,
+        data: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        read_timeout: float = 30,
+        raw: bool = False,
+    ) -> Any:
+        """Send one request and decode the response.
+
+        Returns the parsed JSON body (``{}`` when empty), or the raw bytes
+        when *raw* is set.
+
+        Raises:
+            SharePointCircuitOpenError: while the endpoint's breaker is open.
+            SharePointThrottleError: on 429/503 (after pausing all requests).
+            SharePointConnectionError: on other HTTP errors and transport failures.
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        request_headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Accept": "application/json",
+        }
+        if headers:
+            request_headers.update(headers)
+        query = {k: str(v) for k, v in params.items()} if params else None
+
+        session = await self._get_session()
+        breaker = breaker_for(url)
+        breaker.allow()
+        await get_throttle_governor().wait_async()
+        try:
+            async with session.request(
+                method,
+                url,
+                params=query,
+                json=json_data,
+                data=data,
+                headers=request_headers,
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=5, sock_read=read_timeout),
+            ) as response:
+                body = await response.read()
+                breaker.observe(response.status)
+                HTTP_REQUESTS.inc(breaker.name, method, response.status)
+                if response.status >= 400:
+                    logger.error(f"{method} {url} failed: {response.status}")
+                    logger.error(f"Response: {body[:2000].decode('utf-8', 'replace')}")
+                    raise _http_error(method, response)
+                get_throttle_governor().observe(response.status, response.headers)
+                if raw:
+                    return body
+                return json.loads(body) if body else {}
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            breaker.failure()
+            HTTP_REQUESTS.inc(breaker.name, method, "error")
+            logger.error(f"{method} {url} failed: {exc}")
+            raise SharePointConnectionError(f"Graph API {method} failed: {exc}") from exc
+
+    async def get(self, endpoint: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Make a GET request to Graph API."""
+        return await self._request("GET", endpoint, params=params)
+
+    async def post(self, endpoint: str, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Make a POST request to Graph API."""
+        return await self._request("POST", endpoint, json_data=data)
+
+    async def put(self, endpoint: str, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Make a PUT request to Graph API."""
+        return await self._request("PUT", endpoint, json_data=data)
+
+    async def delete(self, endpoint: str) -> bool:
+        """Make a DELETE request to Graph API."""
+        await self._request("DELETE", endpoint)
+        return True
+
+    async def download(
+        self, endpoint: str, byte_range: tuple[int, int | None] | None = None,
+    ) -> bytes:
+        """Download binary content from Graph API.
+
+        *byte_range* (inclusive ``(start, end)``, end None = to EOF) fetches
+        part of the file with a ``Range`` request.
+        """
+        if byte_range is None:
+            return await self._request("GET", endpoint, read_timeout=60, raw=True)
+
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        headers = {"Authorization": f"Bearer {self.access_token}", **range_header(byte_range)}
+        session = await self._get_session()
+        breaker = breaker_for(url)
+        breaker.allow()
+        await get_throttle_governor().wait_async()
+        try:
+            async with session.get(
+                url,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=5, sock_read=60),
+            ) as response:
+                breaker.observe(response.status)
+                HTTP_REQUESTS.inc(breaker.name, "GET", response.status)
+                if response.status == 416:  # range starts past the end
+                    return b""
+                if response.status >= 400:
+                    logger.error(f"GET {url} failed: {response.status}")
+                    raise _http_error("download", response)
+                get_throttle_governor().observe(response.status, response.headers)
+                buffer = RangeBuffer(byte_range, response.status)
+                async for chunk in response.content.iter_chunked(RANGE_CHUNK_SIZE):
+                    if not buffer.feed(chunk):
+                        break
+                return buffer.getvalue()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            breaker.failure()
+            HTTP_REQUESTS.inc(breaker.name, "GET", "error")
+            logger.error(f"Ranged download from {url} failed: {exc}")
+            raise SharePointConnectionError(f"Graph API download failed: {exc}") from exc
+
+    async def download_to(
+        self, endpoint: str, fh: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """Stream binary content into *fh* without holding it in memory.
+
+        Writes run in a worker thread so disk I/O never blocks the event loop.
+
+        Returns:
+            Number of bytes written
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        session = await self._get_session()
+        written = 0
+        breaker = breaker_for(url)
+        breaker.allow()
+        await get_throttle_governor().wait_async()
+        try:
+            async with session.get(
+                url,
+                headers={"Authorization": f"Bearer {self.access_token}"},
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=5, sock_read=60),
+            ) as response:
+                breaker.observe(response.status)
+                HTTP_REQUESTS.inc(breaker.name, "GET", response.status)
+                if response.status >= 400:
+                    logger.error(f"GET {url} failed: {response.status}")
+                    raise _http_error("download", response)
+                get_throttle_governor().observe(response.status, response.headers)
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    await asyncio.to_thread(fh.write, chunk)
+                    written += len(chunk)
+            return written
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            breaker.failure()
+            HTTP_REQUESTS.inc(breaker.name, "GET", "error")
+            logger.error(f"Streaming download from {url} failed: {exc}")
+            raise SharePointConnectionError(f"Graph API download failed: {exc}") from exc
+
+    async def upload(self, endpoint: str, content: bytes) -> dict[str, Any]:
+        """Upload binary content to Graph API."""
+        return await self._request(
+            "PUT",
+            endpoint,
+            data=content,
+            headers={"Content-Type": "application/octet-stream"},
+            read_timeout=60,
+        )
+
+    async def close(self) -> None:
+        """Close the underlying aiohttp session.
+
+        A session created on another event loop cannot be awaited here; it
+        is closed on its own loop if that is still running. If that loop has
+        finished, its transports went with it and the session is detached.
+        """
+        session, loop = self._session, self._session_loop
+        self._session = self._session_loop = None
+        if session is None or session.closed:
+            return
+        if loop is asyncio.get_running_loop():
+            await session.close()
+        elif loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        else:
+            session.detach()
+
+    def __repr__(self) -> str:
+        return f"AsyncGraphClient(site={self.sync_client.site_url})"
+
+
+_async_client: AsyncGraphClient | None = None
+
+
+def async_graph_enabled() -> bool:
+    """Whether tool calls should use the asyncio Graph transport."""
+    settings = get_settings()
+    return settings.shp_async_http and settings.shp_api_type in ("graph", "graphql")
+
+
+async def get_async_sp_context() -> AsyncGraphClient:
+    """Return the shared async Graph client.
+
+    Client creation and inline token refreshes are blocking, so they are
+    pushed to a worker thread; the common path never leaves the event loop.
+    """
+    global _async_client
+
+    sync_client = _client_mod._shared_client
+    if sync_client is None or get_token_manager().needs_refresh():
+        sync_client = await asyncio.to_thread(get_sp_context)
+
+    if _async_client is None or _async_client.sync_client is not sync_client:
+        previous = _async_client
+        _async_client = AsyncGraphClient(
+            sync_client, pool_size=get_settings().shp_async_pool_size
+        )
+        if previous is not None:
+            await previous.close()
+    return _async_client
+
+
+async def close_async_sp_context() -> None:
+    """Close the shared async client's session (at shutdown)."""
+    global _async_client
+    client, _async_client = _async_client, None
+    if client is not None:
+        await client.close()
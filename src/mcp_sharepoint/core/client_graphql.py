@@ -5,13 +5,25 @@ Provides a true GraphQL client for SharePoint operations.
 from __future__ import annotations
 
 import logging
-from typing import Any
+from typing import Any, BinaryIO
 from urllib.parse import urlparse
 
 import msal
-from gql.transport.requests import RequestsHTTPTransport
+import requests
 
 from ..exceptions import SharePointConnectionError
+from .http import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_TIMEOUT,
+    DEFAULT_TRANSFER_TIMEOUT,
+    RANGE_CHUNK_SIZE,
+    RangeBuffer,
+    create_session,
+    get_session,
+    range_header,
+    timeouts,
+)
+from .site_resolver import get_site_resolver
 
 logger = logging.getLogger(__name__)
 
@@ -19,16 +31,29 @@ logger = logging.getLogger(__name__)
 class GraphQLClient:
     """Microsoft Graph GraphQL API client for SharePoint operations."""
 
-    def __init__(self, access_token: str, site_url: str):
+    def __init__(
+        self,
+        access_token: str,
+        site_url: str,
+        session: requests.Session | None = None,
+        timeout: tuple[float, float] = DEFAULT_TIMEOUT,
+        transfer_timeout: tuple[float, float] = DEFAULT_TRANSFER_TIMEOUT,
+    ):
         """Initialize GraphQL client with access token and site URL.
         
         Args:
             access_token: Microsoft Graph API access token
             site_url: SharePoint site URL
+            session: Pooled HTTP session (a private one is created if omitted)
+            timeout: (connect, read) timeout for API calls
+            transfer_timeout: (connect, read) timeout for downloads/uploads
         """
         self.access_token = access_token
         self.site_url = site_url
         self.api_type = "graphql"
+        self.session = session or create_session()
+        self.timeout = timeout
+        self.transfer_timeout = transfer_timeout
         
         # Microsoft Graph GraphQL endpoint (beta)
         # Note: GraphQL support is in beta, we'll use REST-style queries
@@ -39,115 +64,41 @@ class GraphQLClient:
         self.hostname = parsed.netloc
         self.site_path = parsed.path.rstrip('/')
         
-        # Setup GraphQL transport
-        self.transport = RequestsHTTPTransport(
-            url=f"{self.graphql_endpoint}/$batch",
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "Content-Type": "application/json",
-            },
-            verify=True,
-            retries=3,
-        )
-        
-        # Cache site ID and drive ID
-        self._site_id_cache: str | None = None
-        self._drive_id_cache: str | None = None
-        
         # Initialize site and drive information
         self._initialize_site_info()
+
+    def set_access_token(self, access_token: str) -> None:
+        """Swap the bearer token in place, keeping the resolved site/drive IDs.
+
+        Args:
+            access_token: Freshly acquired Microsoft Graph API access token
+        """
+        self.access_token = access_token
     
     def _initialize_site_info(self):
         """Initialize site and drive information on client creation.
         
-        This proactively fetches site ID and default drive ID to:
+        This proactively resolves the site ID and default drive ID to:
         1. Validate credentials and access early
         2. Enable more reliable API calls using drive IDs
         3. Detect configuration issues immediately
-        """
-        import requests
         
+        Both come from the shared site resolver, so only the first client
+        (or a cold start without a snapshot) pays for the lookups.
+        """
+        resolver = get_site_resolver()
         try:
-            # Step 1: Get site ID
-            site_resource = f"{self.hostname}:{self.site_path}"
-            site_url = f"{self.graphql_endpoint}/sites/{site_resource}"
-            
-            headers = {
-                "Authorization": f"Bearer {self.access_token}",
-                "Accept": "application/json",
-            }
-            
-            logger.info(f"Fetching site info for {site_resource}")
-            response = requests.get(site_url, headers=headers, timeout=30)
-            response.raise_for_status()
-            site_data = response.json()
-            self._site_id_cache = site_data.get("id")
-            
-            if not self._site_id_cache:
-                raise ValueError("Site ID not found in response")
-            
-            logger.info(f"✓ Site ID retrieved: {self._site_id_cache}")
-            
-            # Step 2: Get default drive ID
-            logger.info(f"Fetching default drive for site {self._site_id_cache[:20]}...")
-            drive_url = f"{self.graphql_endpoint}/sites/{self._site_id_cache}/drive"
-            
-            response = requests.get(drive_url, headers=headers, timeout=30)
-            logger.debug(f"Drive API response status: {response.status_code}")
-            
-            if response.status_code == 404:
-                logger.warning("No default drive found (404); listing all drives")
-
-                # Try to get list of all drives
-                drives_url = f"{self.graphql_endpoint}/sites/{self._site_id_cache}/drives"
-                drives_response = requests.get(drives_url, headers=headers, timeout=30)
-                drives_response.raise_for_status()
-                drives_data = drives_response.json()
-
-                drives = drives_data.get("value", [])
-                logger.info("Found %d drive(s) on this site:", len(drives))
-                for drive in drives:
-                    name = drive.get("name")
-                    d_type = drive.get("driveType")
-                    d_id = (drive.get("id") or "")[:20]
-                    logger.info("  - %s (Type: %s, ID: %s...)", name, d_type, d_id)
-
-                if drives:
-                    # Use first available drive
-                    drive0 = drives[0]
-                    self._drive_id_cache = drive0.get("id")
-                    drive_name = drive0.get("name")
-                    drive_id_snip = (self._drive_id_cache or "")[:20]
-                    logger.info("Using drive: %s (ID: %s...)", drive_name, drive_id_snip)
-                else:
-                    raise ValueError("No drives found on this SharePoint site")
-            else:
-                response.raise_for_status()
-                drive_data = response.json()
-                self._drive_id_cache = drive_data.get("id")
-                drive_name = drive_data.get("name", "Unknown")
-                drive_id_snip = (self._drive_id_cache or "")[:20]
-                logger.info("Default drive retrieved: %s (ID: %s...)", drive_name, drive_id_snip)
-            
-            if not self._drive_id_cache:
-                raise ValueError("Drive ID not found")
-            
-            logger.info("GraphQL client initialized successfully")
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"❌ HTTP error during site initialization: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response status: {e.response.status_code}")
-                logger.error(f"Response body: {e.response.text}")
+            site_id = resolver.site_id(self.site_url, self.get)
+            drive_id = resolver.drive_id(self.site_url, self.get)
+        except SharePointConnectionError as e:
+            logger.error(f"❌ Error during site initialization: {e}")
             raise SharePointConnectionError(
                 f"Failed to initialize SharePoint connection: {e}. "
                 f"Please check credentials and site URL."
             ) from e
-        except Exception as e:
-            logger.error(f"❌ Unexpected error during site initialization: {e}")
-            raise SharePointConnectionError(
-                f"Failed to initialize SharePoint connection: {e}"
-            ) from e
+        logger.info(
+            "GraphQL client initialized (site %s..., drive %s...)", site_id[:20], drive_id[:20],
+        )
     
     def normalize_path(self, path: str) -> str:
         """Normalize folder path for Microsoft Graph API.
@@ -190,30 +141,12 @@ class GraphQLClient:
         return path
         
     def _get_site_id(self) -> str:
-        """Get the SharePoint site ID."""
-        if self._site_id_cache:
-            return self._site_id_cache
-        
-        import requests
-        
-        # Use REST endpoint to get site ID (required for subsequent GraphQL queries)
-        site_resource = f"{self.hostname}:{self.site_path}"
-        url = f"{self.graphql_endpoint}/sites/{site_resource}"
-        
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Accept": "application/json",
-        }
-        
-        try:
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-            self._site_id_cache = response.json().get("id", "")
-            logger.info(f"Retrieved site ID: {self._site_id_cache}")
-            return self._site_id_cache
-        except Exception as exc:
-            logger.error(f"Failed to get site ID: {exc}")
-            raise SharePointConnectionError(f"Cannot determine site ID: {exc}") from exc
+        """Get the SharePoint site ID (memoized, see site_resolver)."""
+        return get_site_resolver().site_id(self.site_url, self.get)
+
+    def get_drive_id(self, library: str = "") -> str:
+        """Get the drive ID of *library* ("" = the default document library)."""
+        return get_site_resolver().drive_id(self.site_url, self.get, library)
     
     def execute_query(self, query: str, variables: dict[str, Any] | None = None) -> dict[str, Any]:
         """Execute a GraphQL query using batch requests.
@@ -225,8 +158,6 @@ class GraphQLClient:
         Returns:
             Query result
         """
-        import requests
-        
         headers = {
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json",
@@ -237,7 +168,9 @@ class GraphQLClient:
         if query.startswith("/"):
             url = f"{self.graphql_endpoint}{query}"
             try:
-                response = requests.get(url, headers=headers, params=variables, timeout=30)
+                response = self.session.get(
+                    url, headers=headers, params=variables, timeout=self.timeout
+                )
                 response.raise_for_status()
                 return response.json()
             except requests.exceptions.RequestException as exc:
@@ -251,7 +184,7 @@ class GraphQLClient:
         raise NotImplementedError("Pure GraphQL queries not yet supported by Microsoft Graph")
     
     def get(self, endpoint: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
-        """Execute a GET request with automatic retry for common path issues.
+        """Execute a GET request.
         
         Args:
             endpoint: API endpoint path
@@ -260,8 +193,6 @@ class GraphQLClient:
         Returns:
             Response data
         """
-        import requests
-        
         url = f"{self.graphql_endpoint}/{endpoint.lstrip('/')}"
         headers = {
             "Authorization": f"Bearer {self.access_token}",
@@ -269,44 +200,9 @@ class GraphQLClient:
         }
         
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = self.session.get(url, headers=headers, params=params, timeout=self.timeout)
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.HTTPError as exc:
-            # Handle 404 errors that might be due to "Shared Documents" path issues
-            if exc.response is not None and exc.response.status_code == 404:
-                logger.warning(f"GET {url} returned 404")
-                
-                # Check if this is a "Shared Documents" path issue
-                if "Shared%20Documents" in url or "Shared Documents" in endpoint:
-                    logger.info("Detected 'Shared Documents' path; retrying")
-
-                    # Try to fix the path by removing "Shared Documents"
-                    fixed_endpoint = endpoint.replace("/Shared Documents", "")
-                    fixed_endpoint = fixed_endpoint.replace("/Shared%20Documents", "")
-                    fixed_endpoint = fixed_endpoint.replace("Shared Documents/", "")
-                    fixed_endpoint = fixed_endpoint.replace("Shared%20Documents/", "")
-
-                    if fixed_endpoint != endpoint:
-                        logger.info("Retrying with fixed endpoint: %s", fixed_endpoint)
-                        fixed_url = f"{self.graphql_endpoint}/{fixed_endpoint.lstrip('/')}"
-                        try:
-                            response = requests.get(
-                                fixed_url,
-                                headers=headers,
-                                params=params,
-                                timeout=30,
-                            )
-                            response.raise_for_status()
-                            logger.info("Retry successful with normalized path")
-                            return response.json()
-                        except Exception as retry_exc:
-                            logger.error("Retry also failed: %s", retry_exc)
-                
-                # Log response details for debugging
-                logger.error(f"Response: {exc.response.text}")
-            
-            raise SharePointConnectionError(f"API request failed: {exc}") from exc
         except requests.exceptions.RequestException as exc:
             logger.error(f"GET {url} failed: {exc}")
             if hasattr(exc, 'response') and exc.response is not None:
@@ -323,8 +219,6 @@ class GraphQLClient:
         Returns:
             Response data
         """
-        import requests
-        
         url = f"{self.graphql_endpoint}/{endpoint.lstrip('/')}"
         headers = {
             "Authorization": f"Bearer {self.access_token}",
@@ -332,7 +226,7 @@ class GraphQLClient:
         }
         
         try:
-            response = requests.post(url, headers=headers, json=data, timeout=30)
+            response = self.session.post(url, headers=headers, json=data, timeout=self.timeout)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as exc:
@@ -351,8 +245,6 @@ class GraphQLClient:
         Returns:
             Response data
         """
-        import requests
-        
         url = f"{self.graphql_endpoint}/{endpoint.lstrip('/')}"
         headers = {
             "Authorization": f"Bearer {self.access_token}",
@@ -360,7 +252,7 @@ class GraphQLClient:
         }
         
         try:
-            response = requests.put(url, headers=headers, json=data, timeout=30)
+            response = self.session.put(url, headers=headers, json=data, timeout=self.timeout)
             response.raise_for_status()
             return response.json() if response.content else {}
         except requests.exceptions.RequestException as exc:
@@ -378,15 +270,13 @@ class GraphQLClient:
         Returns:
             True if successful
         """
-        import requests
-        
         url = f"{self.graphql_endpoint}/{endpoint.lstrip('/')}"
         headers = {
             "Authorization": f"Bearer {self.access_token}",
         }
         
         try:
-            response = requests.delete(url, headers=headers, timeout=30)
+            response = self.session.delete(url, headers=headers, timeout=self.timeout)
             response.raise_for_status()
             return True
         except requests.exceptions.RequestException as exc:
@@ -395,30 +285,78 @@ class GraphQLClient:
                 logger.error(f"Response: {exc.response.text}")
             raise SharePointConnectionError(f"API request failed: {exc}") from exc
     
-    def download(self, endpoint: str) -> bytes:
+    def download(
+        self, endpoint: str, byte_range: tuple[int, int | None] | None = None,
+    ) -> bytes:
         """Download binary content.
         
         Args:
             endpoint: API endpoint path
+            byte_range: Inclusive ``(start, end)`` bytes to fetch with a
+                ``Range`` request (end None = to EOF); None for the whole file
             
         Returns:
-            Binary content
+            Binary content (empty if the range starts past the end)
         """
-        import requests
-        
         url = f"{self.graphql_endpoint}/{endpoint.lstrip('/')}"
         headers = {
             "Authorization": f"Bearer {self.access_token}",
         }
         
         try:
-            response = requests.get(url, headers=headers, timeout=60)
-            response.raise_for_status()
-            return response.content
+            if byte_range is None:
+                response = self.session.get(url, headers=headers, timeout=self.transfer_timeout)
+                response.raise_for_status()
+                return response.content
+            with self.session.get(
+                url,
+                headers={**headers, **range_header(byte_range)},
+                timeout=self.transfer_timeout,
+                stream=True,
+            ) as response:
+                if response.status_code == 416:  # range starts past the end
+                    return b""
+                response.raise_for_status()
+                buffer = RangeBuffer(byte_range, response.status_code)
+                for chunk in response.iter_content(chunk_size=RANGE_CHUNK_SIZE):
+                    if not buffer.feed(chunk):
+                        break
+                return buffer.getvalue()
         except requests.exceptions.RequestException as exc:
             logger.error(f"Download failed: {exc}")
             raise SharePointConnectionError(f"Download failed: {exc}") from exc
     
+    def download_to(
+        self, endpoint: str, fh: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """Stream binary content into *fh* without holding it in memory.
+        
+        Args:
+            endpoint: API endpoint (relative to base_url)
+            fh: Writable binary file object
+            chunk_size: Bytes read from the socket per write
+            
+        Returns:
+            Number of bytes written
+        """
+        url = f"{self.graphql_endpoint}/{endpoint.lstrip('/')}"
+        written = 0
+        try:
+            with self.session.get(
+                url,
+                headers={"Authorization": f"Bearer {self.access_token}"},
+                timeout=self.transfer_timeout,
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    fh.write(chunk)
+                    written += len(chunk)
+            return written
+        except requests.exceptions.RequestException as exc:
+            logger.error(f"Streaming download from {url} failed: {exc}")
+            raise SharePointConnectionError(f"Download failed: {exc}") from exc
+    
     def upload(self, endpoint: str, content: bytes) -> dict[str, Any]:
         """Upload binary content.
         
@@ -429,8 +367,6 @@ class GraphQLClient:
         Returns:
             Response data
         """
-        import requests
-        
         url = f"{self.graphql_endpoint}/{endpoint.lstrip('/')}"
         headers = {
             "Authorization": f"Bearer {self.access_token}",
@@ -438,7 +374,9 @@ class GraphQLClient:
         }
         
         try:
-            response = requests.put(url, headers=headers, data=content, timeout=60)
+            response = self.session.put(
+                url, headers=headers, data=content, timeout=self.transfer_timeout
+            )
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as exc:
@@ -451,15 +389,28 @@ class GraphQLClient:
         return f"GraphQLClient(site={self.site_url})"
 
 
-def create_graphql_client(settings) -> GraphQLClient:
+def create_graphql_client(settings, access_token: str | None = None) -> GraphQLClient:
     """Create a Microsoft Graph GraphQL client.
     
     Args:
         settings: Application settings
+        access_token: Already acquired Graph token; a new one is requested
+            from MSAL when omitted
         
     Returns:
         Authenticated GraphQL client
     """
+    timeout, transfer_timeout = timeouts(settings)
+    pooled = {
+        "session": get_session(settings),
+        "timeout": timeout,
+        "transfer_timeout": transfer_timeout,
+    }
+    if access_token:
+        client = GraphQLClient(access_token, settings.shp_site_url, **pooled)
+        logger.info("Microsoft Graph GraphQL client initialized for %s", settings.shp_site_url)
+        return client
+
     try:
         # Create MSAL confidential client application
         app = msal.ConfidentialClientApplication(
@@ -477,7 +428,7 @@ def create_graphql_client(settings) -> GraphQLClient:
             raise SharePointConnectionError(f"Failed to acquire access token: {error_desc}")
         
         access_token = result["access_token"]
-        client = GraphQLClient(access_token, settings.shp_site_url)
+        client = GraphQLClient(access_token, settings.shp_site_url, **pooled)
         
         logger.info("Microsoft Graph GraphQL client initialized for %s", settings.shp_site_url)
         return client
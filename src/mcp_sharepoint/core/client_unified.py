@@ -17,11 +17,11 @@ import msal
 import requests
 from office365.runtime.auth.client_credential import ClientCredential
 from office365.sharepoint.client_context import ClientContext
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from ..config import get_settings
 from ..exceptions import SharePointConnectionError
+from .http import create_session
+from .site_resolver import get_site_resolver
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +37,9 @@ class TokenCache:
         """Initialize empty token cache with thread lock."""
         self.token: str | None = None
         self.expires_at: float = 0
-        self._lock = threading.Lock()
+        self.issued_at: float = 0
+        # Re-entrant: get_token() checks expiry while already holding the lock
+        self._lock = threading.RLock()
     
     def set_token(self, token: str, expires_in: int):
         """Set token with expiry time.
@@ -48,7 +50,8 @@ class TokenCache:
         """
         with self._lock:
             self.token = token
-            self.expires_at = time.time() + expires_in
+            self.issued_at = time.time()
+            self.expires_at = self.issued_at + expires_in
             logger.info(
                 f"Token cached. Expires in {expires_in}s (at {time.ctime(self.expires_at)})"
             )
@@ -129,25 +132,9 @@ class GraphClient:
         # Extract site path (e.g., /sites/sitename)
         self.site_path = parsed.path.rstrip('/')
         
-        # Create session with connection pooling and retry strategy
-        self.session = requests.Session()
-        
-        # Configure retry strategy for transient errors
-        retry_strategy = Retry(
-            total=3,
-            status_forcelist=[429, 500, 502, 503, 504],
-            backoff_factor=1,
-            allowed_methods=["HEAD", "GET", "POST", "PUT", "DELETE", "PATCH"]
-        )
-        
-        # Add adapter with connection pooling
-        adapter = HTTPAdapter(
-            max_retries=retry_strategy,
-            pool_connections=10,
-            pool_maxsize=20,
-            pool_block=False
-        )
-        self.session.mount("https://", adapter)
+        # Pooled, throttle-governed session; retries are left to sp_retry so a
+        # failing call is not retried at two layers
+        self.session = create_session()
         
         # Set default headers
         self.session.headers.update({
@@ -162,76 +149,36 @@ class GraphClient:
         # Configurable timeouts (connect, read)
         self.timeout = (5, 30)
         
-        # Cache site ID and drive ID
-        self._site_id_cache: str | None = None
-        self._drive_id_cache: str | None = None
-        
         # Initialize site and drive information
         self._initialize_site_info()
     
     def _initialize_site_info(self):
         """Initialize site and drive information on client creation.
         
-        This proactively fetches site ID and default drive ID to:
+        This proactively resolves site ID and default drive ID to:
         1. Validate credentials and access
         2. Enable more reliable API calls using drive IDs
         3. Detect configuration issues early
+        
+        Resolutions are shared through the site resolver, so constructing
+        another client for the same site makes no requests.
         """
+        resolver = get_site_resolver()
         try:
-            # Get site ID
-            site_resource = f"{self.hostname}:{self.site_path}"
-            site_url = f"{self.base_url}/sites/{site_resource}"
-            
-            response = self.session.get(site_url, timeout=self.timeout)
-            response.raise_for_status()
-            site_data = response.json()
-            self._site_id_cache = site_data.get("id")
-            
-            if self._site_id_cache:
-                # Get default drive (document library)
-                drive_url = f"{self.base_url}/sites/{self._site_id_cache}/drive"
-                response = self.session.get(drive_url, timeout=self.timeout)
-                response.raise_for_status()
-                drive_data = response.json()
-                self._drive_id_cache = drive_data.get("id")
-                
-                site_snip = (self._site_id_cache or "")[:20]
-                drive_snip = (self._drive_id_cache or "")[:20]
-                logger.info(
-                    "Initialized Graph client - site_id=%s..., drive_id=%s...",
-                    site_snip,
-                    drive_snip,
-                )
+            site_id = resolver.site_id(self.site_url, self.get)
+            drive_id = resolver.drive_id(self.site_url, self.get)
+            logger.info(
+                "Initialized Graph client - site_id=%s..., drive_id=%s...",
+                site_id[:20],
+                drive_id[:20],
+            )
         except Exception as exc:
             logger.warning(f"Could not initialize site/drive info: {exc}")
             logger.warning("Client will use fallback path-based URLs")
         
     def _get_site_id(self) -> str:
-        """Get the SharePoint site ID from the site URL (cached)."""
-        if self._site_id_cache:
-            return self._site_id_cache
-            
-        # Format: /sites/{hostname}:{site_path}
-        site_resource = f"{self.hostname}:{self.site_path}"
-        url = f"{self.base_url}/sites/{site_resource}"
-        
-        try:
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            self._site_id_cache = response.json().get("id", "")
-            return self._site_id_cache
-        except Exception as exc:
-            logger.error(f"Failed to get site ID: {exc}")
-            # Fallback: try root site
-            try:
-                url = f"{self.base_url}/sites/{self.hostname}:{self.site_path}"
-                response = requests.get(url, headers=self.headers, timeout=30)
-                response.raise_for_status()
-                self._site_id_cache = response.json().get("id", "")
-                return self._site_id_cache
-            except Exception as e:
-                logger.error(f"Fallback site ID lookup failed: {e}")
-                raise SharePointConnectionError(f"Cannot determine site ID: {exc}") from exc
+        """Get the SharePoint site ID from the site URL (memoized)."""
+        return get_site_resolver().site_id(self.site_url, self.get)
     
     def normalize_path(self, path: str) -> str:
         """Normalize folder path for Microsoft Graph API.
@@ -279,7 +226,7 @@ class GraphClient:
         return path
     
     def get(self, endpoint: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
-        """Make a GET request to Graph API with automatic retry for common path issues.
+        """Make a GET request to Graph API.
         
         Args:
             endpoint: API endpoint (relative to base_url)
@@ -293,40 +240,6 @@ class GraphClient:
             response = self.session.get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.HTTPError as exc:
-            # Handle 404 errors that might be due to "Shared Documents" path issues
-            if exc.response is not None and exc.response.status_code == 404:
-                logger.warning(f"GET {url} returned 404")
-                
-                # Check if this is a "Shared Documents" path issue
-                if "Shared%20Documents" in url or "Shared Documents" in endpoint:
-                    logger.info("Detected 'Shared Documents' path; retrying")
-
-                    # Try to fix the path by removing "Shared Documents"
-                    fixed_endpoint = endpoint.replace("/Shared Documents", "")
-                    fixed_endpoint = fixed_endpoint.replace("/Shared%20Documents", "")
-                    fixed_endpoint = fixed_endpoint.replace("Shared Documents/", "")
-                    fixed_endpoint = fixed_endpoint.replace("Shared%20Documents/", "")
-
-                    if fixed_endpoint != endpoint:
-                        logger.info("Retrying with fixed endpoint: %s", fixed_endpoint)
-                        fixed_url = f"{self.base_url}/{fixed_endpoint.lstrip('/')}"
-                        try:
-                            response = self.session.get(
-                                fixed_url,
-                                params=params,
-                                timeout=self.timeout,
-                            )
-                            response.raise_for_status()
-                            logger.info("Retry successful with normalized path")
-                            return response.json()
-                        except Exception as retry_exc:
-                            logger.error("Retry also failed: %s", retry_exc)
-                
-                # Log response details for debugging
-                logger.error(f"Response: {exc.response.text}")
-            
-            raise SharePointConnectionError(f"Graph API GET failed: {exc}") from exc
         except requests.exceptions.RequestException as exc:
             logger.error(f"GET {url} failed: {exc}")
             if hasattr(exc, 'response') and exc.response is not None:
@@ -488,8 +401,11 @@ def _get_msal_app(tenant_id: str, client_id: str, client_secret: str):
 
 
 def _acquire_graph_token(settings) -> str:
-    """Acquire a new Graph API token with retry logic.
-    
+    """Acquire a new Graph API token (one attempt).
+
+    Retrying is left to the callers: ``sp_retry`` around the request, the
+    token manager's background renewer and the ``token`` circuit breaker.
+
     Args:
         settings: Application settings containing credentials
         
@@ -497,59 +413,32 @@ def _acquire_graph_token(settings) -> str:
         Valid access token
         
     Raises:
-        SharePointConnectionError: If token acquisition fails after retries
+        SharePointConnectionError: If token acquisition fails
     """
-    max_retries = 3
-    retry_delay = 2  # seconds
-    
-    for attempt in range(max_retries):
-        try:
-            app = _get_msal_app(
-                settings.shp_tenant_id,
-                settings.shp_id_app,
-                settings.shp_id_app_secret
-            )
-            scopes = ["https://graph.microsoft.com/.default"]
-            
-            logger.info(
-                f"Acquiring Graph API token (attempt {attempt + 1}/{max_retries})..."
-            )
-            result = app.acquire_token_for_client(scopes=scopes)
-            
-            if "access_token" not in result:
-                error = result.get("error_description", result.get("error", "Unknown error"))
-                logger.error(f"Token acquisition failed: {error}")
-                
-                if attempt < max_retries - 1:
-                    logger.info(f"Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                    continue
-                else:
-                    raise SharePointConnectionError(
-                        f"Failed to acquire token after {max_retries} attempts: {error}"
-                    )
-            
-            # Successfully acquired token
-            expires_in = result.get("expires_in", 3600)  # Default 1 hour
-            _graph_token_cache.set_token(result["access_token"], expires_in)
-            
-            logger.info(f"✓ Token acquired successfully. Valid for {expires_in}s")
-            return result["access_token"]
-            
-        except SharePointConnectionError:
-            raise
-        except Exception as e:
-            logger.exception(f"Exception during token acquisition: {e}")
-            if attempt < max_retries - 1:
-                logger.info(f"Retrying in {retry_delay} seconds...")
-                time.sleep(retry_delay)
-            else:
-                raise SharePointConnectionError(
-                    f"Failed to acquire token: {e}"
-                ) from e
-    
-    # Should never reach here, but just in case
-    raise SharePointConnectionError("Token acquisition failed unexpectedly")
+    try:
+        app = _get_msal_app(
+            settings.shp_tenant_id,
+            settings.shp_id_app,
+            settings.shp_id_app_secret
+        )
+        scopes = ["https://graph.microsoft.com/.default"]
+
+        logger.info("Acquiring Graph API token...")
+        result = app.acquire_token_for_client(scopes=scopes)
+    except Exception as e:
+        logger.exception(f"Exception during token acquisition: {e}")
+        raise SharePointConnectionError(f"Failed to acquire token: {e}") from e
+
+    if "access_token" not in result:
+        error = result.get("error_description", result.get("error", "Unknown error"))
+        logger.error(f"Token acquisition failed: {error}")
+        raise SharePointConnectionError(f"Failed to acquire token: {error}")
+
+    expires_in = result.get("expires_in", 3600)  # Default 1 hour
+    _graph_token_cache.set_token(result["access_token"], expires_in)
+
+    logger.info(f"✓ Token acquired successfully. Valid for {expires_in}s")
+    return result["access_token"]
 
 
 def _create_office365_client(settings) -> Office365Client:
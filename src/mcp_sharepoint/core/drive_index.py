@@ -0,0 +1,338 @@
+"""Persistent SQLite index of drive items, kept fresh by Graph delta sync.
+
+When enabled (``SHP_INDEX_ENABLED``), folder listings, trees and existence
+checks on the Graph/GraphQL path are answered from a local SQLite database
+instead of live ``children`` requests. The index is:
+
+- filled by a full ``root/delta`` scan on first use, then updated
+  incrementally from the stored ``@odata.deltaLink``;
+- re-synced whenever it is older than ``SHP_INDEX_MAX_STALENESS`` seconds
+  (inline on read, and periodically in the background on long-running
+  servers);
+- written through by uploads, folder creation and deletes so the server's
+  own changes are visible immediately.
+
+Items are stored by id with their parent id; paths are resolved segment by
+segment (delta does not report ``parentReference.path``, and a folder rename
+would otherwise invalidate every descendant's stored path).
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from ..exceptions import SharePointConnectionError
+from ..utils.retry import http_status
+from .pagination import iter_pages, relative_link
+
+logger = logging.getLogger(__name__)
+
+DELTA_SELECT = (
+    "id,name,folder,file,size,webUrl,createdDateTime,lastModifiedDateTime,"
+    "parentReference,deleted,root,eTag,cTag"
+)
+_KEPT_FIELDS = (
+    "id", "name", "folder", "file", "size", "webUrl", "createdDateTime",
+    "lastModifiedDateTime", "eTag", "cTag",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id        TEXT PRIMARY KEY,
+    parent_id TEXT,
+    name      TEXT NOT NULL,
+    is_folder INTEGER NOT NULL,
+    data      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_by_parent ON items (parent_id, name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS state (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class DriveIndex:
+    """SQLite-backed id/path index of one SharePoint drive."""
+
+    def __init__(self, db_path: str, max_staleness: float = 60.0):
+        """Open (or create) the index database.
+
+        Args:
+            db_path: SQLite file location (``:memory:`` for tests)
+            max_staleness: Seconds after which reads trigger a delta sync
+        """
+        self.db_path = db_path
+        self.max_staleness = max_staleness
+        self.syncs = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._sync_lock = threading.RLock()
+        self._task: asyncio.Task | None = None
+
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    # -- state ---------------------------------------------------------------
+
+    def _get_state(self, key: str) -> str | None:
+        row = self._db.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key: str, value: str | None) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    def age(self) -> float | None:
+        """Seconds since the last completed sync (None if never synced)."""
+        with self._lock:
+            synced_at = self._get_state("synced_at")
+        return time.time() - float(synced_at) if synced_at else None
+
+    def is_stale(self) -> bool:
+        age = self.age()
+        return age is None or age > self.max_staleness
+
+    # -- writes --------------------------------------------------------------
+
+    def _upsert(self, item: dict[str, Any], parent_id: str | None) -> None:
+        kept = {k: item[k] for k in _KEPT_FIELDS if k in item}
+        self._db.execute(
+            "INSERT OR REPLACE INTO items (id, parent_id, name, is_folder, data) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (item["id"], parent_id, item.get("name") or "", int("folder" in item),
+             json.dumps(kept)),
+        )
+
+    def _remove(self, item_id: str) -> None:
+        self._db.execute(
+            "WITH RECURSIVE tree(id) AS ("
+            " SELECT ? UNION ALL"
+            " SELECT items.id FROM items JOIN tree ON items.parent_id = tree.id)"
+            " DELETE FROM items WHERE id IN tree",
+            (item_id,),
+        )
+
+    def upsert(self, item: dict[str, Any]) -> None:
+        """Write through a created/updated drive item returned by Graph."""
+        if not item.get("id"):
+            return
+        parent_id = (item.get("parentReference") or {}).get("id")
+        with self._lock:
+            self._upsert(item, parent_id)
+
+    def remove(self, item_id: str) -> None:
+        """Write through a deletion (descendants of a folder go too)."""
+        with self._lock:
+            self._remove(item_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM items")
+            self._db.execute("DELETE FROM state")
+
+    # -- sync ----------------------------------------------------------------
+
+    def sync(self, client: Any, site_id: str) -> None:
+        """Apply all changes since the stored delta link (full scan on first use)."""
+        with self._sync_lock:
+            with self._lock:
+                if self._get_state("site_id") not in (None, site_id):
+                    logger.info("Drive index belongs to another site; rebuilding")
+                    self._db.execute("DELETE FROM items")
+                    self._db.execute("DELETE FROM state")
+                delta_link = self._get_state("delta_link")
+
+            try:
+                self._apply_delta(client, site_id, delta_link)
+            except SharePointConnectionError as exc:
+                if delta_link is None or http_status(exc) != 410:
+                    raise
+                # 410 Gone: the delta token expired; start over
+                logger.warning("Delta token expired; rebuilding drive index")
+                self.clear()
+                self._apply_delta(client, site_id, None)
+
+    def _apply_delta(self, client: Any, site_id: str, delta_link: str | None) -> None:
+        if delta_link:
+            pages = iter_pages(client, relative_link(delta_link))
+        else:
+            pages = iter_pages(
+                client,
+                f"sites/{site_id}/drive/root/delta",
+                params={"$select": DELTA_SELECT},
+            )
+
+        changed = 0
+        for page in pages:
+            with self._lock:
+                self._db.execute("BEGIN")
+                try:
+                    self._apply_page(page, site_id)
+                except Exception:
+                    self._db.execute("ROLLBACK")
+                    raise
+                self._db.execute("COMMIT")
+            changed += len(page.get("value", []))
+
+        self.syncs += 1
+        logger.info("Drive index synced (%d change(s))", changed)
+
+    def _apply_page(self, page: dict[str, Any], site_id: str) -> None:
+        """Apply one delta page (caller holds the lock and a transaction)."""
+        for item in page.get("value", []):
+            if "deleted" in item:
+                self._remove(item["id"])
+            elif "root" in item:
+                self._set_state("root_id", item["id"])
+                self._upsert(item, None)
+            else:
+                self._upsert(item, (item.get("parentReference") or {}).get("id"))
+        if page.get("@odata.deltaLink"):
+            self._set_state("delta_link", page["@odata.deltaLink"])
+            self._set_state("site_id", site_id)
+            self._set_state("synced_at", str(time.time()))
+
+    def ensure_fresh(self, client: Any, site_id: str) -> None:
+        """Sync if the index is older than the staleness bound."""
+        if not self.is_stale():
+            return
+        with self._sync_lock:
+            # Callers that queued behind a running sync find the index fresh
+            if self.is_stale():
+                self.sync(client, site_id)
+
+    # -- reads ---------------------------------------------------------------
+
+    def _row_item(self, row: tuple[str]) -> dict[str, Any]:
+        return json.loads(row[0])
+
+    def item_at(self, path: str) -> dict[str, Any] | None:
+        """Return the drive item at drive-relative *path* ("" = root)."""
+        with self._lock:
+            item_id = self._get_state("root_id")
+            for segment in [s for s in path.split("/") if s]:
+                if item_id is None:
+                    break
+                row = self._db.execute(
+                    "SELECT id FROM items WHERE parent_id = ? AND name = ? COLLATE NOCASE",
+                    (item_id, segment),
+                ).fetchone()
+                item_id = row[0] if row else None
+            if item_id is None:
+                return None
+            row = self._db.execute("SELECT data FROM items WHERE id = ?", (item_id,)).fetchone()
+        return self._row_item(row) if row else None
+
+    def children(self, item_id: str) -> list[dict[str, Any]]:
+        """Direct children of *item_id*, ordered by name."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT data FROM items WHERE parent_id = ? ORDER BY name COLLATE NOCASE",
+                (item_id,),
+            ).fetchall()
+        return [self._row_item(row) for row in rows]
+
+    def listing(self, client: Any, site_id: str, path: str) -> list[dict[str, Any]] | None:
+        """Children of the folder at *path*, syncing first if stale.
+
+        Returns None when the folder is not in the index, so callers fall
+        back to a live request (and its usual not-found error).
+        """
+        self.ensure_fresh(client, site_id)
+        folder = self.item_at(path)
+        if folder is None or "folder" not in folder:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self.children(folder["id"])
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        age = self.age()
+        return {
+            "items": count,
+            "age_s": round(age, 1) if age is not None else None,
+            "syncs": self.syncs,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    # -- background sync -----------------------------------------------------
+
+    def start_background_sync(self, interval: float | None = None) -> asyncio.Task:
+        """Run a delta sync every *interval* seconds (default: the staleness bound)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(
+                self._sync_loop(interval or self.max_staleness)
+            )
+        return self._task
+
+    async def _sync_loop(self, interval: float) -> None:
+        from .client import get_sp_context  # noqa: PLC0415
+
+        def _sync_shared() -> None:
+            client = get_sp_context()
+            self.sync(client, client._get_site_id())
+
+        while True:
+            try:
+                await asyncio.to_thread(_sync_shared)
+            except Exception as exc:
+                logger.warning("Background drive index sync failed: %s", exc)
+            await asyncio.sleep(interval)
+
+
+_index: DriveIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_drive_index() -> DriveIndex | None:
+    """Return the shared index, or None when disabled / not on Graph."""
+    global _index
+    from ..config import get_settings  # noqa: PLC0415
+
+    settings = get_settings()
+    if not settings.shp_index_enabled or settings.shp_api_type not in ("graph", "graphql"):
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                site_key = hashlib.sha1(settings.shp_site_url.encode()).hexdigest()[:12]
+                _index = DriveIndex(
+                    os.path.join(settings.shp_cache_dir, f"drive-index-{site_key}.sqlite3"),
+                    max_staleness=settings.shp_index_max_staleness,
+                )
+    return _index
+
+
+def record_upsert(item: dict[str, Any]) -> None:
+    """Write a created/updated item through to the index, if enabled."""
+    index = get_drive_index()
+    if index is not None:
+        index.upsert(item)
+
+
+def record_removal(item_id: str | None) -> None:
+    """Write a deletion through to the index, if enabled."""
+    index = get_drive_index()
+    if index is not None and item_id:
+        index.remove(item_id)
+
+
+def index_stats() -> dict[str, Any] | None:
+    """Stats for /health, or None if the index was never opened."""
+    return _index.stats() if _index is not None else None
@@ -0,0 +1,177 @@
+"""Shared keep-alive HTTP session for the sync Graph clients.
+
+All Graph traffic from ``GraphClient`` and ``GraphQLClient`` goes through one
+``requests.Session`` so TCP/TLS connections to graph.microsoft.com are reused
+across tool calls. Authorization is sent per request (each client owns its
+headers), which keeps the session safe to share. Every request passes the
+throttle governor (``core/throttle.py``) on its way out and reports its
+response back, so a 429 seen by one worker pauses them all. Its endpoint's
+circuit breaker (``core/breaker.py``) is checked first and told the outcome.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..utils.metrics import HTTP_REQUESTS
+from .breaker import breaker_for
+from .throttle import get_throttle_governor
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeouts used when no settings are supplied
+DEFAULT_TIMEOUT = (5.0, 30.0)
+DEFAULT_TRANSFER_TIMEOUT = (5.0, 60.0)
+# Bytes read per chunk when streaming downloads
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+# Smaller reads for ranged downloads, which are usually a few KB
+RANGE_CHUNK_SIZE = 64 * 1024
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def range_header(byte_range: tuple[int, int | None]) -> dict[str, str]:
+    """``Range`` header for an inclusive ``(start, end)`` byte range (end None = to EOF)."""
+    start, end = byte_range
+    return {"Range": f"bytes={start}-{'' if end is None else end}"}
+
+
+class RangeBuffer:
+    """Collects the bytes of a requested range from a response body.
+
+    A ``206`` body already is the range. A ``200`` means the server ignored
+    ``Range`` and sent the whole file, so the range is cut out of the stream
+    here; :meth:`feed` reports when the caller can stop reading.
+
+    Args:
+        byte_range: The inclusive ``(start, end)`` range that was requested
+        status: HTTP status of the response
+    """
+
+    def __init__(self, byte_range: tuple[int, int | None], status: int):
+        start, end = byte_range
+        self._skip = start if status == 200 else 0
+        self._limit = None if end is None else end - start + 1
+        self._parts: list[bytes] = []
+        self.size = 0
+
+    def feed(self, chunk: bytes) -> bool:
+        """Add a body chunk; returns False once the range is complete."""
+        if self._skip:
+            cut = min(self._skip, len(chunk))
+            chunk = chunk[cut:]
+            self._skip -= cut
+        if self._limit is not None:
+            chunk = chunk[:self._limit - self.size]
+        if chunk:
+            self._parts.append(chunk)
+            self.size += len(chunk)
+        return self._limit is None or self.size < self._limit
+
+    def getvalue(self) -> bytes:
+        return b"".join(self._parts)
+
+
+class GovernedAdapter(HTTPAdapter):
+    """Keep-alive adapter passing each request through its breaker and the governor."""
+
+    def send(self, request: requests.PreparedRequest, *args: Any, **kwargs: Any) -> Any:
+        breaker = breaker_for(request.url or "")
+        breaker.allow()
+        governor = get_throttle_governor()
+        governor.wait()
+        try:
+            response = super().send(request, *args, **kwargs)
+        except requests.exceptions.RequestException:
+            breaker.failure()
+            HTTP_REQUESTS.inc(breaker.name, request.method, "error")
+            raise
+        breaker.observe(response.status_code)
+        HTTP_REQUESTS.inc(breaker.name, request.method, response.status_code)
+        governor.observe(response.status_code, response.headers)
+        return response
+
+
+def create_session(pool_connections: int = 10, pool_maxsize: int = 20) -> requests.Session:
+    """Create a session with a pooled, throttle-governed keep-alive adapter.
+
+    Args:
+        pool_connections: Number of per-host connection pools to keep
+        pool_maxsize: Connections kept alive per host
+    """
+    session = requests.Session()
+    adapter = GovernedAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=False,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(settings: Any) -> requests.Session:
+    """Return the process-wide session, creating it from *settings* on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session(
+                    settings.shp_http_pool_connections,
+                    settings.shp_http_pool_maxsize,
+                )
+                logger.info(
+                    "HTTP pool created (pools=%d, maxsize=%d)",
+                    settings.shp_http_pool_connections,
+                    settings.shp_http_pool_maxsize,
+                )
+    return _session
+
+
+def timeouts(settings: Any) -> tuple[tuple[float, float], tuple[float, float]]:
+    """Return the (API, transfer) ``(connect, read)`` timeouts from *settings*."""
+    return (
+        (settings.shp_http_connect_timeout, settings.shp_http_read_timeout),
+        (settings.shp_http_connect_timeout, settings.shp_http_transfer_timeout),
+    )
+
+
+def pool_stats(session: requests.Session | None = None) -> dict[str, Any] | None:
+    """Connection reuse counters for *session* (default: the shared session).
+
+    A "hit" is a request served on an already open keep-alive connection, a
+    "miss" one that had to open a new TCP/TLS connection. Counts come from
+    the live urllib3 pools, so pools evicted by the pool manager drop out.
+    """
+    session = session or _session
+    if session is None:
+        return None
+
+    requests_made = connections_opened = pools = 0
+    # One adapter may be mounted under several prefixes; count it once
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+    for adapter in adapters.values():
+        manager = getattr(adapter, "poolmanager", None)
+        if manager is None:
+            continue
+        for key in list(manager.pools.keys()):
+            pool = manager.pools.get(key)
+            if pool is None:
+                continue
+            pools += 1
+            requests_made += pool.num_requests
+            connections_opened += pool.num_connections
+
+    hits = max(0, requests_made - connections_opened)
+    return {
+        "pools": pools,
+        "requests": requests_made,
+        "hits": hits,
+        "misses": connections_opened,
+        "hit_ratio": round(hits / requests_made, 3) if requests_made else None,
+    }
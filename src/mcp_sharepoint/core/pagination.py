@@ -0,0 +1,220 @@
+"""``@odata.nextLink`` paging for Graph collection endpoints.
+
+Collections come back one page at a time (200 items by default, at most
+``SHP_PAGE_SIZE`` with ``$top``). :func:`iter_pages` / :func:`iter_pages_async`
+follow ``@odata.nextLink`` lazily, so a full listing never truncates and a
+partial one stops requesting pages once it has enough.
+
+Listing tools page with ``limit`` and an opaque ``cursor``. A cursor records
+the next link of the page being read plus how many of its items were
+already consumed; :func:`iter_entries` resumes from it and pairs every
+item with the cursor that continues *after* it, and :func:`take` collects
+one page of results.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from typing import Any
+from urllib.parse import quote
+
+GRAPH_ROOT = "https://graph.microsoft.com/v1.0/"
+
+# An item paired with the cursor resuming after it (None: nothing follows)
+Entry = tuple[str | None, Any]
+
+
+def relative_link(link: str) -> str:
+    """Strip the Graph v1.0 root so *link* can be passed to ``client.get``."""
+    return link[len(GRAPH_ROOT):] if link.startswith(GRAPH_ROOT) else link
+
+
+def page_top(page_size: int, limit: int | None) -> int:
+    """Items to request per page when at most *limit* are wanted."""
+    return min(page_size, limit) if limit else page_size
+
+
+def collection_params(page_size: int, limit: int | None, select: str) -> dict[str, Any]:
+    """``$top``/``$select`` for a collection read returning at most *limit* items."""
+    return {"$top": page_top(page_size, limit), "$select": select}
+
+
+def with_query(endpoint: str, params: dict[str, Any]) -> str:
+    """*endpoint* with *params* in its query string (for ``$batch`` requests)."""
+    query = "&".join(f"{key}={quote(str(value), safe=',')}" for key, value in params.items())
+    return f"{endpoint}?{query}"
+
+
+def encode_cursor(link: str | None, skip: int) -> str:
+    """Opaque cursor: the page's next link (None = first page) and items consumed."""
+    raw = json.dumps([link, skip], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str | None, int]:
+    """Inverse of :func:`encode_cursor`.
+
+    Raises:
+        ValueError: If *cursor* was not produced by :func:`encode_cursor`
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        link, skip = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not (link is None or isinstance(link, str)) or not isinstance(skip, int) or skip < 0:
+        raise ValueError("Invalid cursor")
+    if link is not None and "://" in link:
+        raise ValueError("Invalid cursor")
+    return link, skip
+
+
+def cursor_link(cursor: str | None) -> str | None:
+    """Next link recorded in *cursor* (None for offset cursors and no cursor)."""
+    return decode_cursor(cursor)[0] if cursor else None
+
+
+def check_limit(limit: int | None) -> None:
+    """Reject a page size below one."""
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be at least 1")
+
+
+def iter_pages(
+    client: Any, endpoint: str, params: dict[str, Any] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield every page of a Graph collection, following ``@odata.nextLink``.
+
+    The query parameters only apply to the first request; next links already
+    carry them (plus the skip token).
+    """
+    page = client.get(endpoint, params=params)
+    yield page
+    while page.get("@odata.nextLink"):
+        page = client.get(relative_link(page["@odata.nextLink"]))
+        yield page
+
+
+async def iter_pages_async(
+    client: Any, endpoint: str, params: dict[str, Any] | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Async variant of :func:`iter_pages` for the asyncio Graph client."""
+    page = await client.get(endpoint, params=params)
+    yield page
+    while page.get("@odata.nextLink"):
+        page = await client.get(relative_link(page["@odata.nextLink"]))
+        yield page
+
+
+class _EntryCursor:
+    """Turns a stream of pages into :data:`Entry` pairs, honouring a start offset."""
+
+    def __init__(self, link: str | None, skip: int):
+        self.link = link
+        self.skip = skip
+
+    def entries(self, page: dict[str, Any]) -> Iterator[Entry]:
+        values = page.get("value", [])
+        next_link = page.get("@odata.nextLink")
+        next_link = relative_link(next_link) if next_link else None
+        start, self.skip = min(self.skip, len(values)), max(0, self.skip - len(values))
+        for index in range(start, len(values)):
+            if index + 1 < len(values):
+                after = encode_cursor(self.link, index + 1)
+            else:
+                after = encode_cursor(next_link, 0) if next_link else None
+            yield after, values[index]
+        self.link = next_link
+
+
+def iter_entries(
+    client: Any,
+    endpoint: str,
+    params: dict[str, Any] | None = None,
+    cursor: str | None = None,
+) -> Iterator[Entry]:
+    """Yield the items of a Graph collection from *cursor* on, page by page."""
+    link, skip = decode_cursor(cursor) if cursor else (None, 0)
+    position = _EntryCursor(link, skip)
+    pages = iter_pages(client, link, None) if link else iter_pages(client, endpoint, params)
+    for page in pages:
+        yield from position.entries(page)
+
+
+async def iter_entries_async(
+    client: Any,
+    endpoint: str,
+    params: dict[str, Any] | None = None,
+    cursor: str | None = None,
+) -> AsyncIterator[Entry]:
+    """Async variant of :func:`iter_entries`."""
+    link, skip = decode_cursor(cursor) if cursor else (None, 0)
+    position = _EntryCursor(link, skip)
+    pages = (
+        iter_pages_async(client, link, None) if link
+        else iter_pages_async(client, endpoint, params)
+    )
+    async for page in pages:
+        for entry in position.entries(page):
+            yield entry
+
+
+def list_entries(items: list[Any], cursor: str | None = None) -> Iterator[Entry]:
+    """:data:`Entry` pairs for an in-memory listing (offset cursors only)."""
+    link, skip = decode_cursor(cursor) if cursor else (None, 0)
+    if link is not None:
+        raise ValueError("Invalid cursor")
+    yield from _EntryCursor(None, skip).entries({"value": items})
+
+
+def collection_entries(collection: Any, cursor: str | None = None) -> Iterator[Entry]:
+    """:data:`Entry` pairs for an Office365 ``ClientObjectCollection`` in paged mode.
+
+    Iterating the collection loads its further pages on demand; the cursor
+    is an offset into the whole collection.
+    """
+    link, skip = decode_cursor(cursor) if cursor else (None, 0)
+    if link is not None:
+        raise ValueError("Invalid cursor")
+    for index, item in enumerate(collection):
+        if index < skip:
+            continue
+        more = index + 1 < len(collection) or collection.has_next
+        yield (encode_cursor(None, index + 1) if more else None), item
+
+
+def page_result(items: list[Any], next_cursor: str | None) -> dict[str, Any]:
+    """Payload of a listing read with ``limit``/``cursor``."""
+    return {"items": items, "count": len(items), "next_cursor": next_cursor}
+
+
+def take(
+    entries: Iterable[Entry],
+    limit: int | None = None,
+    keep: Callable[[Any], bool] | None = None,
+) -> tuple[list[Any], str | None]:
+    """Collect up to *limit* kept items; returns them and the next cursor."""
+    items: list[Any] = []
+    for after, item in entries:
+        if keep is None or keep(item):
+            items.append(item)
+            if limit is not None and len(items) >= limit:
+                return items, after
+    return items, None
+
+
+async def take_async(
+    entries: AsyncIterator[Entry],
+    limit: int | None = None,
+    keep: Callable[[Any], bool] | None = None,
+) -> tuple[list[Any], str | None]:
+    """Async variant of :func:`take`."""
+    items: list[Any] = []
+    async for after, item in entries:
+        if keep is None or keep(item):
+            items.append(item)
+            if limit is not None and len(items) >= limit:
+                return items, after
+    return items, None
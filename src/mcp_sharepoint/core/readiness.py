@@ -0,0 +1,129 @@
+"""Cached SharePoint readiness for the ``/readyz`` and ``/health`` probes.
+
+Load balancers probe every few seconds from every node. Checking SharePoint
+on each probe costs a Graph call per hit and can hold the probe for a full
+HTTP timeout, so ``ReadinessProbe`` checks the backend on a background
+asyncio task every ``SHP_READINESS_INTERVAL`` seconds and the probe
+endpoints only read its last result. A result older than three intervals
+(the refresher has stalled) counts as not ready.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Intervals after which the last result is no longer trusted
+_STALE_AFTER = 3
+
+
+def check_sharepoint() -> None:
+    """Make one cheap SharePoint request; raises if the backend is unreachable."""
+    from . import get_sp_context  # noqa: PLC0415
+
+    client = get_sp_context()
+    if client.api_type in ("graph", "graphql"):
+        # The site ID is memoized, so ask for the site itself
+        client.get(f"sites/{client._get_site_id()}", params={"$select": "id"})
+    else:
+        client.ctx.load(client.ctx.web)
+        client.ctx.execute_query()
+
+
+class ReadinessProbe:
+    """Last known backend status, refreshed off the request path.
+
+    Args:
+        check: Blocking callable that raises when the backend is unavailable
+        interval: Seconds between background checks
+    """
+
+    def __init__(self, check: Callable[[], None], interval: float = 15.0):
+        self._check = check
+        self.interval = interval
+        self.checks = 0
+        self.failures = 0
+        self._ready: bool | None = None  # None: not checked yet
+        self._error: str | None = None
+        self._checked_at = 0.0
+        self._task: asyncio.Task | None = None
+        self._lock = threading.Lock()
+
+    async def refresh(self) -> bool:
+        """Run the check once (in a worker thread) and record the outcome."""
+        try:
+            await asyncio.to_thread(self._check)
+        except Exception as exc:
+            ready, error = False, str(exc)
+        else:
+            ready, error = True, None
+        with self._lock:
+            if ready and self._ready is False:
+                logger.info("SharePoint readiness check passing again")
+            elif not ready and self._ready is not False:
+                logger.warning("SharePoint readiness check failed: %s", error)
+            self.checks += 1
+            self.failures += not ready
+            self._ready, self._error = ready, error
+            self._checked_at = time.monotonic()
+        return ready
+
+    def start_background_refresh(self) -> asyncio.Task:
+        """Start (once) the refresh task on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(
+                self._refresh_loop(), name="readiness-refresher"
+            )
+        return self._task
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+    def status(self) -> dict[str, Any]:
+        """Last known status; never contacts SharePoint.
+
+        ``sharepoint`` is ``"connected"``, ``"disconnected"`` or ``"unknown"``
+        (no check finished yet, or the last one is stale).
+        """
+        with self._lock:
+            ready, error = self._ready, self._error
+            age = time.monotonic() - self._checked_at if ready is not None else None
+        if age is not None and age > self.interval * _STALE_AFTER:
+            ready, error = None, f"last check {age:.0f}s ago"
+        return {
+            "ready": bool(ready),
+            "sharepoint": {True: "connected", False: "disconnected"}.get(ready, "unknown"),
+            "error": error,
+            "checked_ago": round(age, 1) if age is not None else None,
+        }
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "checks": self.checks,
+            "failures": self.failures,
+            "interval": self.interval,
+            "background_refresh": self._task is not None and not self._task.done(),
+        }
+
+
+_probe: ReadinessProbe | None = None
+_probe_lock = threading.Lock()
+
+
+def get_readiness_probe() -> ReadinessProbe:
+    """Return the process-wide probe, creating it from settings on first use."""
+    global _probe
+    if _probe is None:
+        from ..config import get_settings  # noqa: PLC0415
+
+        with _probe_lock:
+            if _probe is None:
+                _probe = ReadinessProbe(check_sharepoint, get_settings().shp_readiness_interval)
+    return _probe
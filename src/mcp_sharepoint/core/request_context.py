@@ -0,0 +1,170 @@
+"""Per-tool-call SharePoint context shared by the service layer.
+
+Without it a single tool call looked the client up several times: the
+dispatcher in ``services/*_service.py`` fetched it just to read
+``api_type``, the backend module fetched it again, and every path
+normalization fetched it once more along with the settings.
+
+A dispatcher decorated with :func:`request_scoped` opens one
+:class:`RequestContext` for the call. Backend modules pick it up with
+:func:`request_context` (it travels in a ``ContextVar``, which
+``asyncio.to_thread`` copies), so the client, site ID, drive ID and
+normalized paths are each resolved at most once per call. Everything is
+resolved lazily: a call served from a cache only normalizes its path.
+Outside a scope, :func:`request_context` returns a fresh, unshared context.
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import posixpath
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+from . import client as _client_mod
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_current: ContextVar[RequestContext | None] = ContextVar("sharepoint_request", default=None)
+
+
+class RequestContext:
+    """Client, site/drive IDs and normalized paths for one tool call."""
+
+    def __init__(self) -> None:
+        self._client: Any = None
+        self._async_client: Any = None
+        self._site_id: str | None = None
+        self._drive_id: str | None = None
+        self._paths: dict[str | None, str] = {}
+
+    @property
+    def client(self) -> Any:
+        """The shared sync client (Office365 or Graph)."""
+        if self._client is None:
+            self._client = _client_mod.get_sp_context()
+        return self._client
+
+    @property
+    def async_client(self) -> Any:
+        """The asyncio Graph client bound by :func:`async_request_context`."""
+        if self._async_client is None:
+            raise RuntimeError("async_request_context() was not awaited for this call")
+        return self._async_client
+
+    @property
+    def is_graph(self) -> bool:
+        return self.client.api_type in ("graph", "graphql")
+
+    @property
+    def site_id(self) -> str:
+        """Graph site ID of the configured site."""
+        if self._site_id is None:
+            self._site_id = self.client._get_site_id()
+        return self._site_id
+
+    @property
+    def drive_id(self) -> str:
+        """Graph drive ID of the site's default document library."""
+        if self._drive_id is None:
+            self._drive_id = self.client.get_drive_id()
+        return self._drive_id
+
+    def path(self, sub_path: str | None = None) -> str:
+        """Build drive-relative path from configured scope + sub_path.
+
+        Returns empty string when both scope and sub_path are empty (= drive
+        root). Graph API's drive/root already IS the document library, so a
+        leading library name ("Shared Documents") is mapped away by clients
+        that support it.
+        """
+        normalized = self._paths.get(sub_path)
+        if normalized is None:
+            normalized = self._paths[sub_path] = self._normalize(sub_path)
+        return normalized
+
+    def file_path(self, folder_name: str | None, file_name: str) -> str:
+        """Drive-relative path of *file_name* inside *folder_name*."""
+        folder_path = self.path(folder_name)
+        return f"{folder_path}/{file_name}" if folder_path else file_name
+
+    def _normalize(self, sub_path: str | None) -> str:
+        from ..config import get_settings  # noqa: PLC0415
+
+        scope = get_settings().shp_doc_library
+        clean_path = posixpath.normpath(f"/{sub_path}").lstrip("/") if sub_path else ""
+        if clean_path.startswith(".."):
+            raise ValueError(f"Invalid path traversal attempt: {sub_path}")
+        combined_path = "/".join(p for p in [scope, clean_path] if p)
+
+        # Use client's normalize_path if available (GraphQL client)
+        normalize = getattr(self.client, "normalize_path", None)
+        if normalize is None:
+            return combined_path
+        normalized = normalize(combined_path)
+        logger.debug("Path normalization: '%s' → '%s'", combined_path, normalized)
+        return normalized
+
+
+def request_context() -> RequestContext:
+    """Return the current tool call's context (a fresh one outside a scope)."""
+    return _current.get() or RequestContext()
+
+
+async def async_request_context() -> RequestContext:
+    """Return the current context with its asyncio client and site ID bound.
+
+    Resolution that would block (client creation, a cold site lookup) runs
+    on a worker thread.
+    """
+    from .client_async import get_async_sp_context  # noqa: PLC0415
+
+    ctx = request_context()
+    if ctx._async_client is None:
+        ctx._async_client = await get_async_sp_context()
+        ctx._client = ctx._client or ctx._async_client.sync_client
+    if ctx._site_id is None:
+        ctx._site_id = await ctx._async_client.get_site_id()
+    return ctx
+
+
+@contextmanager
+def request_scope() -> Iterator[RequestContext]:
+    """Share one :class:`RequestContext` with everything called inside.
+
+    Nested scopes (an async dispatcher falling back to a sync one on a worker
+    thread) reuse the outer context.
+    """
+    ctx = _current.get()
+    if ctx is not None:
+        yield ctx
+        return
+    ctx = RequestContext()
+    token = _current.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _current.reset(token)
+
+
+def request_scoped(func: F) -> F:
+    """Run *func* (sync or async) inside a :func:`request_scope`."""
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with request_scope():
+                return await func(*args, **kwargs)
+
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with request_scope():
+            return func(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
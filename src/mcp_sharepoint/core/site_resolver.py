@@ -0,0 +1,237 @@
+"""Memoized site ID / drive ID resolution shared by every Graph client.
+
+Resolving the configured site URL to a Graph site ID (and a library to its
+drive ID) costs one to three requests. The answers practically never change,
+so ``SiteResolver`` keeps them for ``SHP_SITE_CACHE_TTL`` seconds, shared by
+the sync, GraphQL and asyncio clients and every service module. Concurrent
+cold lookups are coalesced into one request.
+
+With ``SHP_SITE_CACHE_SNAPSHOT`` enabled, resolutions are also written to
+``SHP_CACHE_DIR/sites.json`` so a restarted server (or another worker
+process) starts warm. Once an entry expires it is re-resolved; if that
+fails, the stale value is used and the failure logged.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+from urllib.parse import unquote, urlparse
+
+from ..exceptions import SharePointConnectionError
+
+logger = logging.getLogger(__name__)
+
+# Fetches a Graph endpoint (relative to /v1.0) and returns its JSON body
+Fetch = Callable[[str], dict[str, Any]]
+
+
+def site_key(site_url: str) -> str:
+    """Normalized ``host/path`` identifying a site URL."""
+    parsed = urlparse(site_url)
+    return f"{parsed.netloc.lower()}{parsed.path.rstrip('/').lower()}"
+
+
+class SiteResolver:
+    """Thread-safe TTL cache of site and drive IDs.
+
+    Args:
+        ttl: Seconds a resolution stays fresh
+        snapshot_path: JSON file persisting resolutions (None = memory only)
+    """
+
+    def __init__(self, ttl: float = 86400.0, snapshot_path: str | None = None):
+        self.ttl = ttl
+        self.snapshot_path = snapshot_path
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        # "<site key>|site" or "<site key>|drive:<library>" -> (id, resolved_at)
+        self._entries: dict[str, tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        # Re-entrant: resolving a drive first resolves the site
+        self._fetch_lock = threading.RLock()
+        if snapshot_path:
+            self._load()
+
+    def _fresh(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is not None and time.time() - entry[1] < self.ttl:
+            return entry[0]
+        return None
+
+    def peek(self, site_url: str, library: str | None = None) -> str | None:
+        """Fresh cached site ID (or drive ID of *library*) without any I/O."""
+        key = self._key(site_url, library)
+        with self._lock:
+            return self._fresh(key)
+
+    def prime(self, site_url: str, value: str, library: str | None = None) -> None:
+        """Record a site ID (or the drive ID of *library*) resolved elsewhere."""
+        self._store({self._key(site_url, library): value})
+
+    def site_id(self, site_url: str, fetch: Fetch) -> str:
+        """Return the Graph site ID for *site_url*, resolving it if needed."""
+        return self._resolve(site_url, None, fetch, self._fetch_site)
+
+    def drive_id(self, site_url: str, fetch: Fetch, library: str = "") -> str:
+        """Return the drive ID of *library* ("" = the site's default drive)."""
+        return self._resolve(site_url, library.strip().strip("/"), fetch, self._fetch_drives)
+
+    def invalidate(self, site_url: str | None = None) -> None:
+        """Forget resolutions for *site_url* (default: all sites)."""
+        prefix = f"{site_key(site_url)}|" if site_url else ""
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    @staticmethod
+    def _key(site_url: str, library: str | None) -> str:
+        if library is None:
+            return f"{site_key(site_url)}|site"
+        return f"{site_key(site_url)}|drive:{library.lower()}"
+
+    def _resolve(
+        self,
+        site_url: str,
+        library: str | None,
+        fetch: Fetch,
+        resolver: Callable[[str, Fetch], dict[str, str]],
+    ) -> str:
+        key = self._key(site_url, library)
+        with self._lock:
+            value = self._fresh(key)
+            if value is not None:
+                self.hits += 1
+                return value
+
+        # One resolution at a time; callers that waited find it cached
+        with self._fetch_lock:
+            with self._lock:
+                value = self._fresh(key)
+                if value is not None:
+                    self.hits += 1
+                    return value
+                self.misses += 1
+                stale = self._entries.get(key)
+            try:
+                self._store(resolver(site_url, fetch))
+            except SharePointConnectionError as exc:
+                if stale is None:
+                    raise
+                logger.warning("Re-resolving %s failed, using cached ID: %s", key, exc)
+                with self._lock:
+                    self.stale += 1
+                return stale[0]
+
+        with self._lock:
+            value = self._fresh(key)
+        if value is None:
+            raise SharePointConnectionError(f"No drive named '{library}' on {site_url}")
+        return value
+
+    def _fetch_site(self, site_url: str, fetch: Fetch) -> dict[str, str]:
+        parsed = urlparse(site_url)
+        site_id = fetch(f"sites/{parsed.netloc}:{parsed.path.rstrip('/')}").get("id")
+        if not site_id:
+            raise SharePointConnectionError(f"Cannot determine site ID for {site_url}")
+        logger.info("Resolved site ID for %s", site_url)
+        return {self._key(site_url, None): site_id}
+
+    def _fetch_drives(self, site_url: str, fetch: Fetch) -> dict[str, str]:
+        """Resolve the default drive and every library name in one pass."""
+        site_id = self.site_id(site_url, fetch)
+        drives = fetch(f"sites/{site_id}/drives?$select=id,name,webUrl").get("value", [])
+        resolved: dict[str, str] = {}
+        for drive in drives:
+            # Match both the display name ("Documents") and the URL segment
+            # ("Shared Documents")
+            names = {drive.get("name") or ""}
+            names.add(unquote(urlparse(drive.get("webUrl") or "").path.rstrip("/").split("/")[-1]))
+            for name in filter(None, names):
+                resolved[self._key(site_url, name)] = drive["id"]
+
+        try:
+            default = fetch(f"sites/{site_id}/drive?$select=id").get("id")
+        except SharePointConnectionError:
+            default = None
+        if not default and drives:
+            logger.warning("No default drive on %s; using '%s'", site_url, drives[0].get("name"))
+            default = drives[0]["id"]
+        if not default:
+            raise SharePointConnectionError(f"No drives found on {site_url}")
+        resolved[self._key(site_url, "")] = default
+        logger.info("Resolved %d drive(s) for %s", len(drives), site_url)
+        return resolved
+
+    def _store(self, values: dict[str, str]) -> None:
+        now = time.time()
+        with self._lock:
+            for key, value in values.items():
+                self._entries[key] = (value, now)
+            snapshot = dict(self._entries)
+        self._save(snapshot)
+
+    def _load(self) -> None:
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as fh:  # type: ignore[arg-type]
+                record = json.load(fh)
+            self._entries = {key: (value, float(at)) for key, (value, at) in record.items()}
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning("Ignoring unreadable site snapshot %s: %s", self.snapshot_path, exc)
+
+    def _save(self, entries: dict[str, tuple[str, float]]) -> None:
+        if not self.snapshot_path:
+            return
+        directory = os.path.dirname(self.snapshot_path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump({key: list(entry) for key, entry in entries.items()}, fh)
+            os.replace(tmp, self.snapshot_path)
+        except OSError as exc:
+            logger.warning("Could not write site snapshot %s: %s", self.snapshot_path, exc)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+            }
+
+
+_resolver: SiteResolver | None = None
+_resolver_lock = threading.Lock()
+
+
+def get_site_resolver() -> SiteResolver:
+    """Return the process-wide resolver, creating it from settings on first use."""
+    global _resolver
+    if _resolver is None:
+        from ..config import get_settings  # noqa: PLC0415
+
+        with _resolver_lock:
+            if _resolver is None:
+                settings = get_settings()
+                snapshot = (
+                    os.path.join(settings.shp_cache_dir, "sites.json")
+                    if settings.shp_site_cache_snapshot
+                    else None
+                )
+                _resolver = SiteResolver(settings.shp_site_cache_ttl, snapshot)
+    return _resolver
+
+
+def site_resolver_stats() -> dict[str, Any] | None:
+    """Stats for /health, or None if nothing was resolved yet."""
+    return _resolver.stats() if _resolver is not None else None
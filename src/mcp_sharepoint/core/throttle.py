@@ -0,0 +1,172 @@
+"""Tenant-wide throttling governor for SharePoint / Graph traffic.
+
+SharePoint throttles per app and tenant, not per connection: once it answers
+429 or 503, every worker that keeps sending only extends the ban. The
+``ThrottleGovernor`` sees every response (sync requests through the
+``GovernedAdapter`` of the shared session, asyncio requests through
+``AsyncGraphClient``, ``$batch`` sub-requests through ``core/batch.py``) and
+holds all workers back together:
+
+* A 429/503 pauses every request until its ``Retry-After`` has passed (an
+  exponential delay if the header is missing), capped at
+  ``SHP_THROTTLE_MAX_WAIT`` seconds.
+* ``RateLimit-Limit``/``-Remaining``/``-Reset``, which SharePoint sends once
+  most of the app's resource-unit budget is used, are tracked. Below
+  ``SHP_RATELIMIT_RESERVE`` of the budget, requests are spread evenly over
+  the rest of the window; with nothing left, all wait for the reset.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any
+
+from ..utils.retry import THROTTLED_STATUSES, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+# Exponent cap for the fallback delay when a throttle carries no Retry-After
+_MAX_BACKOFF_EXPONENT = 8
+
+
+class ThrottleGovernor:
+    """Process-wide pause and pacing shared by every SharePoint request.
+
+    Args:
+        max_wait: Longest single pause in seconds
+        reserve: Share of the RateLimit budget below which requests are paced
+    """
+
+    def __init__(self, max_wait: float = 300.0, reserve: float = 0.1):
+        self.max_wait = max_wait
+        self.reserve = reserve
+        self.throttles = 0
+        self.delayed = 0
+        self.delayed_seconds = 0.0
+        self._consecutive = 0
+        self._resume_at = 0.0
+        # Pacing while the budget is low: one request per interval until the window resets
+        self._interval = 0.0
+        self._next_slot = 0.0
+        self._window_ends = 0.0
+        self._budget: tuple[int, int] | None = None
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        """Seconds the caller must hold its next request (reserving a paced slot)."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._resume_at)
+            if self._interval and now < self._window_ends:
+                slot = max(slot, self._next_slot)
+                self._next_slot = slot + self._interval
+            wait = slot - now
+            if wait > 0:
+                self.delayed += 1
+                self.delayed_seconds += wait
+            return wait
+
+    def wait(self) -> None:
+        """Block until the caller may send its next request."""
+        wait = self.delay()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def wait_async(self) -> None:
+        """Async variant of :meth:`wait`."""
+        wait = self.delay()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def observe(self, status: int, headers: Mapping[str, Any]) -> float | None:
+        """Record a response; returns the pause imposed if it was throttled."""
+        self._track_budget(headers)
+        if status not in THROTTLED_STATUSES:
+            if status < 400 and self._consecutive:
+                with self._lock:
+                    self._consecutive = 0
+            return None
+
+        with self._lock:
+            self.throttles += 1
+            self._consecutive += 1
+            consecutive = self._consecutive
+        delay = parse_retry_after(headers.get("Retry-After"))
+        if delay is None:
+            delay = float(2 ** min(consecutive, _MAX_BACKOFF_EXPONENT))
+        delay = self.pause(delay)
+        logger.warning("SharePoint answered %d; pausing all requests for %.1fs", status, delay)
+        return delay
+
+    def pause(self, seconds: float) -> float:
+        """Hold every request for *seconds* (capped); returns the pause applied."""
+        seconds = min(max(seconds, 0.0), self.max_wait)
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+        return seconds
+
+    def _track_budget(self, headers: Mapping[str, Any]) -> None:
+        if headers.get("RateLimit-Remaining") is None:
+            return
+        try:
+            limit = int(headers.get("RateLimit-Limit"))
+            remaining = int(headers.get("RateLimit-Remaining"))
+            reset = float(headers.get("RateLimit-Reset") or 60)
+        except (TypeError, ValueError):
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            self._budget = (limit, remaining)
+            self._window_ends = now + reset
+            if remaining <= 0:
+                self._interval = 0.0
+                self._resume_at = max(self._resume_at, now + min(reset, self.max_wait))
+            elif remaining < limit * self.reserve:
+                self._interval = reset / remaining
+            else:
+                self._interval = 0.0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "throttles": self.throttles,
+                "delayed_requests": self.delayed,
+                "delayed_seconds": round(self.delayed_seconds, 3),
+                "paused_for": round(max(0.0, self._resume_at - now), 3),
+                "paced_interval": (
+                    round(self._interval, 3) if now < self._window_ends else 0.0
+                ),
+                "ratelimit": (
+                    {"limit": self._budget[0], "remaining": self._budget[1]}
+                    if self._budget and now < self._window_ends else None
+                ),
+            }
+
+
+_governor: ThrottleGovernor | None = None
+_governor_lock = threading.Lock()
+
+
+def get_throttle_governor() -> ThrottleGovernor:
+    """Return the process-wide governor, creating it from settings on first use."""
+    global _governor
+    if _governor is None:
+        from ..config import get_settings  # noqa: PLC0415
+
+        with _governor_lock:
+            if _governor is None:
+                settings = get_settings()
+                _governor = ThrottleGovernor(
+                    settings.shp_throttle_max_wait, settings.shp_ratelimit_reserve
+                )
+    return _governor
+
+
+def throttle_stats() -> dict[str, Any] | None:
+    """Stats for /health, or None if no request went through the governor yet."""
+    return _governor.stats() if _governor is not None else None
@@ -0,0 +1,219 @@
+"""Graph access-token lifecycle: single-flight acquisition and background renewal.
+
+Every Graph/GraphQL client shares one ``TokenManager``. Tool calls only read
+the cached token; renewal happens on a background asyncio task at a
+configurable fraction of the token lifetime, so no user request pays for an
+AAD round trip. When a refresh is needed inline (cold start, or the renewer
+has been failing), concurrent callers wait on the one in-flight acquisition
+instead of each hitting MSAL. Acquisitions go through the ``token`` circuit
+breaker; while it is open, callers keep the current token until it expires.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from ..config import get_settings
+from ..exceptions import SharePointCircuitOpenError, SharePointConnectionError
+from .breaker import get_breaker
+from .client_unified import TokenCache, _acquire_graph_token, _graph_token_cache
+
+logger = logging.getLogger(__name__)
+
+# Delay before the renewer retries after a failed acquisition
+_RENEW_RETRY_DELAY = 30.0
+
+
+class TokenManager:
+    """Owns the Graph token and pushes refreshed tokens to registered clients."""
+
+    def __init__(
+        self,
+        acquire: Callable[[], str],
+        cache: TokenCache,
+        refresh_fraction: float = 0.8,
+    ) -> None:
+        """Initialize the manager.
+
+        Args:
+            acquire: Callable that fetches a new token and stores it in *cache*
+            cache: Token cache holding the current token and its expiry
+            refresh_fraction: Fraction of the token lifetime after which the
+                background renewer replaces it
+        """
+        self._acquire = acquire
+        self._cache = cache
+        self.refresh_fraction = refresh_fraction
+        self._cond = threading.Condition()
+        self._inflight = False
+        self._flight_error: Exception | None = None
+        self._listeners: list[Callable[[str], None]] = []
+        self._task: asyncio.Task | None = None
+
+        self.renewals = 0
+        self.failures = 0
+        self.coalesced = 0
+
+    def add_listener(self, callback: Callable[[str], None]) -> None:
+        """Register *callback* to receive every newly acquired token."""
+        with self._cond:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str], None]) -> None:
+        """Unregister a callback previously passed to add_listener()."""
+        with self._cond:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def needs_refresh(self) -> bool:
+        """Whether the cached token is missing or inside its expiry buffer."""
+        return self._cache.is_expired()
+
+    def ensure_fresh(self) -> str:
+        """Return a valid token, refreshing inline only if it is near expiry."""
+        token = self._cache.get_token()
+        if token:
+            return token
+        return self.refresh(force=False)
+
+    def refresh(self, force: bool = True) -> str:
+        """Acquire a new token, coalescing concurrent callers onto one request.
+
+        Args:
+            force: Refresh even if the cached token is still valid. Callers
+                that merely need a valid token pass ``False``.
+
+        Raises:
+            SharePointCircuitOpenError: if the token breaker is open and no
+                unexpired token is cached (or *force* is set).
+            SharePointConnectionError: if the acquisition fails.
+        """
+        with self._cond:
+            if self._inflight:
+                self.coalesced += 1
+                self._cond.wait_for(lambda: not self._inflight)
+                if self._flight_error is not None:
+                    raise SharePointConnectionError(
+                        f"Token acquisition failed: {self._flight_error}"
+                    ) from self._flight_error
+                return self._cache.token or ""
+            if not force:
+                token = self._cache.get_token()
+                if token:
+                    return token
+            breaker = get_breaker("token")
+            try:
+                breaker.allow()
+            except SharePointCircuitOpenError:
+                # AAD is failing: the token is inside its refresh buffer but
+                # still accepted, so keep using it
+                if not force and self.seconds_to_expiry() > 0:
+                    logger.warning(
+                        "Token breaker open; keeping the current token (expires in %.0fs)",
+                        self.seconds_to_expiry(),
+                    )
+                    return self._cache.token or ""
+                raise
+            self._inflight = True
+            self._flight_error = None
+
+        try:
+            token = self._acquire()
+        except Exception as exc:
+            breaker.failure()
+            with self._cond:
+                self.failures += 1
+                self._flight_error = exc
+                self._inflight = False
+                self._cond.notify_all()
+            if isinstance(exc, SharePointConnectionError):
+                raise
+            raise SharePointConnectionError(f"Token acquisition failed: {exc}") from exc
+
+        breaker.success()
+        with self._cond:
+            self.renewals += 1
+            self._inflight = False
+            self._cond.notify_all()
+            listeners = list(self._listeners)
+
+        for callback in listeners:
+            callback(token)
+        return token
+
+    def seconds_to_expiry(self) -> float:
+        """Seconds until the current token expires (0 when there is none)."""
+        if not self._cache.token:
+            return 0.0
+        return max(0.0, self._cache.expires_at - time.time())
+
+    def next_renewal_in(self) -> float:
+        """Seconds until the background renewer should replace the token."""
+        if not self._cache.token:
+            return 0.0
+        lifetime = self._cache.expires_at - self._cache.issued_at
+        renew_at = self._cache.issued_at + lifetime * self.refresh_fraction
+        return max(0.0, renew_at - time.time())
+
+    def start_background_renewal(self) -> asyncio.Task:
+        """Start (once) the renewal task on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(
+                self._renew_loop(), name="graph-token-renewer"
+            )
+        return self._task
+
+    async def _renew_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.next_renewal_in())
+            try:
+                await asyncio.to_thread(self.refresh)
+                logger.info(
+                    "Graph token renewed in background; next renewal in %.0fs",
+                    self.next_renewal_in(),
+                )
+            except Exception as exc:
+                logger.warning(
+                    "Background token renewal failed (%s); retrying in %.0fs",
+                    exc,
+                    _RENEW_RETRY_DELAY,
+                )
+                await asyncio.sleep(_RENEW_RETRY_DELAY)
+
+    def stats(self) -> dict[str, Any]:
+        """Return renewal counters and the remaining token lifetime."""
+        return {
+            "renewals": self.renewals,
+            "failures": self.failures,
+            "coalesced": self.coalesced,
+            "seconds_to_expiry": round(self.seconds_to_expiry(), 1),
+            "background_renewal": self._task is not None and not self._task.done(),
+        }
+
+
+_manager: TokenManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_token_manager() -> TokenManager:
+    """Return the process-wide token manager, creating it on first use."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                settings = get_settings()
+                _manager = TokenManager(
+                    acquire=lambda: _acquire_graph_token(settings),
+                    cache=_graph_token_cache,
+                    refresh_fraction=settings.shp_token_refresh_fraction,
+                )
+    return _manager
+
+
+def token_stats() -> dict[str, Any] | None:
+    """Return token counters, or None if no Graph client has been created."""
+    return _manager.stats() if _manager is not None else None
@@ -0,0 +1,160 @@
+"""Resumable Graph upload sessions for large files.
+
+A single PUT to ``:/content`` is limited to 250 MB and has to start over
+from byte zero if the connection drops. Above ``SHP_UPLOAD_SESSION_THRESHOLD``
+uploads instead go through ``createUploadSession``: the file is sent as a
+sequence of ``Content-Range`` fragments (``SHP_UPLOAD_CHUNK_SIZE``, rounded
+to the 320 KiB multiple Graph requires) to the pre-authenticated upload URL.
+After a transient failure the session is queried for ``nextExpectedRanges``
+and the upload resumes from the first byte the service has not acknowledged.
+
+Graph requires a session's fragments to arrive in order, so fragments are
+sent sequentially. Content is pulled through a ``read_range(start, end)``
+callable so callers can serve it from an mmap of a local file rather than
+loading the file into memory.
+"""
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import requests
+
+from ..exceptions import SharePointConnectionError
+from ..utils.retry import http_status, retry_after_seconds
+
+logger = logging.getLogger(__name__)
+
+ReadRange = Callable[[int, int], bytes]
+
+CHUNK_ALIGNMENT = 320 * 1024
+DEFAULT_UPLOAD_CHUNK_SIZE = 32 * CHUNK_ALIGNMENT  # 10 MiB
+MAX_RESUMES = 5
+MAX_RESUME_DELAY = 30
+
+# Statuses after which the session is still usable and can be resumed
+_RESUMABLE = {408, 416, 429, 500, 502, 503, 504}
+
+
+def aligned_chunk_size(chunk_size: int) -> int:
+    """Round *chunk_size* down to a multiple of 320 KiB (at least one)."""
+    return max(CHUNK_ALIGNMENT, chunk_size - chunk_size % CHUNK_ALIGNMENT)
+
+
+def bytes_reader(data: bytes) -> ReadRange:
+    """Serve ranges of an in-memory byte string without copying it whole."""
+    view = memoryview(data)
+    return lambda start, end: view[start:end].tobytes()
+
+
+@contextmanager
+def file_reader(path: str) -> Iterator[tuple[ReadRange, int]]:
+    """Memory-map the file at *path*; yields ``(read_range, size)``."""
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size == 0:
+            yield (lambda start, end: b""), 0
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield (lambda start, end: mapped[start:end]), size
+
+
+def _next_offset(status: dict[str, Any], default: int) -> int:
+    """First missing byte according to an upload status's ``nextExpectedRanges``."""
+    ranges = status.get("nextExpectedRanges") or []
+    if not ranges:
+        return default
+    return int(str(ranges[0]).split("-")[0])
+
+
+def _resume_offset(
+    client: Any,
+    upload_url: str,
+    exc: requests.exceptions.RequestException,
+    offset: int,
+    attempt: int,
+    max_resumes: int,
+) -> int:
+    """Wait out a transient fragment failure and ask where to continue."""
+    status = http_status(exc)
+    if attempt > max_resumes or (status is not None and status not in _RESUMABLE):
+        raise SharePointConnectionError(f"Upload session failed: {exc}") from exc
+    delay = min(retry_after_seconds(exc) or 2 ** attempt, MAX_RESUME_DELAY)
+    logger.warning(
+        "Upload fragment at byte %d failed (%s); resuming in %.0fs", offset, exc, delay,
+    )
+    time.sleep(delay)
+    try:
+        response = client.session.get(upload_url, timeout=client.timeout)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as status_exc:
+        # Retry the same fragment; a 416 will tell us if it already landed
+        logger.warning("Upload status query failed: %s", status_exc)
+        return offset
+    return _next_offset(response.json(), offset)
+
+
+def upload_in_session(
+    client: Any,
+    session_endpoint: str,
+    read_range: ReadRange,
+    size: int,
+    chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+    max_resumes: int = MAX_RESUMES,
+) -> dict[str, Any]:
+    """Upload *size* bytes through a Graph upload session.
+
+    Args:
+        client: Sync Graph client (``GraphClient`` / ``GraphQLClient``)
+        session_endpoint: ``.../createUploadSession`` endpoint for the item
+        read_range: Returns bytes ``[start, end)`` of the content
+        size: Total content length
+        chunk_size: Fragment size (aligned to 320 KiB)
+        max_resumes: Transient failures tolerated before giving up
+
+    Returns:
+        The created/updated drive item
+
+    Raises:
+        SharePointConnectionError: If the session cannot be created or the
+            upload fails permanently (the session is then cancelled).
+    """
+    chunk_size = aligned_chunk_size(chunk_size)
+    session = client.post(
+        session_endpoint,
+        {"item": {"@microsoft.graph.conflictBehavior": "replace"}},
+    )
+    upload_url = session["uploadUrl"]
+    offset = _next_offset(session, 0)
+    resumes = 0
+    logger.info("Upload session started for %d byte(s) in %d-byte fragments", size, chunk_size)
+
+    try:
+        while True:
+            end = min(offset + chunk_size, size)
+            try:
+                # The upload URL is pre-authenticated: no Authorization header
+                response = client.session.put(
+                    upload_url,
+                    data=read_range(offset, end),
+                    headers={"Content-Range": f"bytes {offset}-{end - 1}/{size}"},
+                    timeout=client.transfer_timeout,
+                )
+                response.raise_for_status()
+                if response.status_code in (200, 201):
+                    return response.json()
+                offset = _next_offset(response.json(), end)
+            except requests.exceptions.RequestException as exc:
+                resumes += 1
+                offset = _resume_offset(client, upload_url, exc, offset, resumes, max_resumes)
+    except BaseException:
+        try:
+            client.session.delete(upload_url, timeout=client.timeout)
+        except requests.exceptions.RequestException as exc:
+            logger.debug("Could not cancel upload session: %s", exc)
+        raise
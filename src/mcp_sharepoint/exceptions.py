@@ -1,4 +1,5 @@
 """Custom exceptions for mcp-sharepoint."""
+from __future__ import annotations
 
 
 class SharePointError(Exception):
@@ -10,7 +11,15 @@ class SharePointConfigError(SharePointError):
 
 
 class SharePointConnectionError(SharePointError):
-    """Raised when the SharePoint client context cannot be established."""
+    """Raised when the SharePoint client context cannot be established.
+
+    Attributes:
+        status: HTTP status of the failed response, when there was one
+    """
+
+    def __init__(self, message: str = "", status: int | None = None) -> None:
+        self.status = status
+        super().__init__(message)
 
 
 class SharePointOperationError(SharePointError):
@@ -20,3 +29,34 @@ class SharePointOperationError(SharePointError):
         self.operation = operation
         self.detail = detail
         super().__init__(f"Operation '{operation}' failed: {detail}")
+
+
+class SharePointThrottleError(SharePointConnectionError):
+    """Raised when SharePoint answers 429 / 503 (throttled or busy).
+
+    Attributes:
+        retry_after: Seconds the server asked callers to wait, if it said
+    """
+
+    def __init__(
+        self, message: str, retry_after: float | None = None, status: int | None = None,
+    ) -> None:
+        self.retry_after = retry_after
+        super().__init__(message, status)
+
+
+class SharePointCircuitOpenError(SharePointConnectionError):
+    """Raised without contacting SharePoint while an endpoint's circuit breaker is open.
+
+    Attributes:
+        endpoint: Endpoint class whose breaker is open (token, site, items, search)
+        retry_in: Seconds until the breaker lets a probe request through
+    """
+
+    def __init__(self, endpoint: str, retry_in: float = 0.0) -> None:
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+        super().__init__(
+            f"SharePoint '{endpoint}' endpoints are failing; "
+            f"not retrying for another {retry_in:.0f}s (circuit open)"
+        )
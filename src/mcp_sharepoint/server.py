@@ -83,10 +83,11 @@ mcp = FastMCP(
 # ---------------------------------------------------------------------------
 @mcp.custom_route("/health", methods=["GET"])
 async def health_check(request: Any) -> Any:  # noqa: ARG001
-    """Return server health status as JSON, including live SharePoint access validation.
+    """Return server health status as JSON, including the last SharePoint check.
     
-    This endpoint validates live SharePoint connectivity and returns
-    operational metrics suitable for load balancer health checks.
+    SharePoint connectivity is not checked on this request: the result of
+    the background readiness check (``core/readiness.py``) is reported, so
+    the endpoint answers immediately and costs no Graph calls.
     
     Args:
         request: Starlette request object (unused, required by route signature)
@@ -99,36 +100,31 @@ async def health_check(request: Any) -> Any:  # noqa: ARG001
             - tools: Number of registered tools
             - sharepoint: "connected" | "disconnected" | "unknown"
             - sharepoint_error (optional): Error details if connection failed
+            - readiness: Background check counters and age of the last result
+            - token (optional): Graph token renewal counters and time-to-expiry
+            - site_resolver (optional): Memoized site/drive ID hit counts
+            - http_pool (optional): Keep-alive connection reuse (hits/misses)
+            - throttling (optional): 429/503 count, pauses and RateLimit budget
+            - retries (optional): Calls, retried calls and calls given up by sp_retry
+            - circuit_breakers (optional): State and failure counts per endpoint class
+            - drive_index (optional): Local index size, age and hit counts
+            - response_cache (optional): Read-only tool cache hit rate and size
+            - content_cache (optional): Parsed document text cache hit rate and size
+            - blobs (optional): Pending /blobs handles and transfer counters
+            - parse_pool (optional): Parse worker queue depth, timeouts and restarts
     
     Status Codes:
-        200: SharePoint connectivity verified
-        503: SharePoint connection failed (service degraded)
+        200: Last SharePoint check succeeded
+        503: Last SharePoint check failed, is stale, or has not run yet
     """
     from starlette.responses import JSONResponse
-    
-    sp_status = "unknown"
-    sp_error = None
-    
-    try:
-        def _verify_sp() -> None:
-            from .core import get_sp_context
-            client = get_sp_context()
-            
-            # Test connection based on API type
-            if client.api_type in ("graph", "graphql"):
-                # For Graph/GraphQL API, try to get site ID
-                client._get_site_id()
-            else:
-                # For Office365 API, use traditional load/execute
-                client.ctx.load(client.ctx.web)
-                client.ctx.execute_query()
-            
-        await asyncio.to_thread(_verify_sp)
-        sp_status = "connected"
-    except Exception as exc:
-        sp_status = "disconnected"
-        sp_error = str(exc)
-        logger.error("SharePoint connection failed during health check", error=sp_error)
+
+    from .core.readiness import get_readiness_probe  # noqa: PLC0415
+
+    probe = get_readiness_probe()
+    last_check = probe.status()
+    sp_status = last_check["sharepoint"]
+    sp_error = last_check["error"]
 
     payload = {
         "status": "ok" if sp_status == "connected" else "degraded",
@@ -139,6 +135,64 @@ async def health_check(request: Any) -> Any:  # noqa: ARG001
     }
     if sp_error:
         payload["sharepoint_error"] = sp_error
+    payload["readiness"] = {**probe.stats(), "checked_ago": last_check["checked_ago"]}
+
+    from .core.token_manager import token_stats  # noqa: PLC0415
+    token = token_stats()
+    if token is not None:
+        payload["token"] = token
+
+    from .core.site_resolver import site_resolver_stats  # noqa: PLC0415
+    site_resolver = site_resolver_stats()
+    if site_resolver is not None:
+        payload["site_resolver"] = site_resolver
+
+    from .core.http import pool_stats  # noqa: PLC0415
+    http_pool = pool_stats()
+    if http_pool is not None:
+        payload["http_pool"] = http_pool
+
+    from .core.throttle import throttle_stats  # noqa: PLC0415
+    throttling = throttle_stats()
+    if throttling is not None:
+        payload["throttling"] = throttling
+
+    from .utils.retry import retry_stats  # noqa: PLC0415
+    retries = retry_stats()
+    if retries is not None:
+        payload["retries"] = retries
+
+    from .core.breaker import OPEN, breaker_stats  # noqa: PLC0415
+    circuit_breakers = breaker_stats()
+    if circuit_breakers is not None:
+        payload["circuit_breakers"] = circuit_breakers
+        if any(breaker["state"] == OPEN for breaker in circuit_breakers.values()):
+            payload["status"] = "degraded"
+
+    from .core.drive_index import index_stats  # noqa: PLC0415
+    drive_index = index_stats()
+    if drive_index is not None:
+        payload["drive_index"] = drive_index
+
+    from .utils.cache import cache_stats  # noqa: PLC0415
+    response_cache = cache_stats()
+    if response_cache is not None:
+        payload["response_cache"] = response_cache
+
+    from .utils.content_cache import content_cache_stats  # noqa: PLC0415
+    content_cache = content_cache_stats()
+    if content_cache is not None:
+        payload["content_cache"] = content_cache
+
+    from .utils.blobs import blob_stats  # noqa: PLC0415
+    blobs = blob_stats()
+    if blobs is not None:
+        payload["blobs"] = blobs
+
+    from .utils.parse_pool import parse_pool_stats  # noqa: PLC0415
+    parse_pool = parse_pool_stats()
+    if parse_pool is not None:
+        payload["parse_pool"] = parse_pool
 
     return JSONResponse(
         payload, 
@@ -146,10 +200,219 @@ async def health_check(request: Any) -> Any:  # noqa: ARG001
     )
 
 
+def _component_metrics() -> list[str]:
+    """Metric families read from the components' own counters at scrape time."""
+    from .core.breaker import OPEN, breaker_stats  # noqa: PLC0415
+    from .core.drive_index import index_stats  # noqa: PLC0415
+    from .core.http import pool_stats  # noqa: PLC0415
+    from .core.readiness import get_readiness_probe  # noqa: PLC0415
+    from .core.site_resolver import site_resolver_stats  # noqa: PLC0415
+    from .core.throttle import throttle_stats  # noqa: PLC0415
+    from .core.token_manager import token_stats  # noqa: PLC0415
+    from .utils.cache import cache_stats  # noqa: PLC0415
+    from .utils.content_cache import content_cache_stats  # noqa: PLC0415
+    from .utils.metrics import family, thread_work_in_flight  # noqa: PLC0415
+    from .utils.parse_pool import parse_pool_stats  # noqa: PLC0415
+    from .utils.retry import retry_stats  # noqa: PLC0415
+
+    lines = family(
+        "sharepoint_mcp_ready", "gauge", "1 if the last background SharePoint check passed.",
+        [({}, int(get_readiness_probe().status()["ready"]))],
+    )
+
+    retries = retry_stats() or {}
+    lines += family(
+        "sharepoint_mcp_retries_total", "counter", "Retry attempts made by sp_retry.",
+        [({}, retries.get("retries", 0))],
+    )
+    lines += family(
+        "sharepoint_mcp_retry_gave_up_total", "counter",
+        "Calls that failed after exhausting their attempts or deadline.",
+        [({}, retries.get("gave_up", 0))],
+    )
+
+    throttling = throttle_stats() or {}
+    lines += family(
+        "sharepoint_mcp_throttles_total", "counter", "429/503 responses from SharePoint.",
+        [({}, throttling.get("throttles", 0))],
+    )
+    lines += family(
+        "sharepoint_mcp_throttle_delay_seconds_total", "counter",
+        "Time requests were held back by the throttle governor.",
+        [({}, throttling.get("delayed_seconds", 0.0))],
+    )
+
+    token = token_stats() or {}
+    lines += family(
+        "sharepoint_mcp_token_refreshes_total", "counter", "Graph token acquisitions by result.",
+        [({"result": "success"}, token.get("renewals", 0)),
+         ({"result": "failure"}, token.get("failures", 0))],
+    )
+
+    caches = {
+        "response": cache_stats(),
+        "content": content_cache_stats(),
+        "site_resolver": site_resolver_stats(),
+        "drive_index": index_stats(),
+        "http_pool": pool_stats(),
+    }
+    lookups = []
+    for name, stats in caches.items():
+        if stats is not None:
+            hits = stats.get("hits", 0) + stats.get("disk_hits", 0)
+            lookups.append((name, hits, stats.get("misses", 0)))
+    lines += family(
+        "sharepoint_mcp_cache_hits_total", "counter", "Cache hits by cache.",
+        [({"cache": name}, hits) for name, hits, _ in lookups],
+    )
+    lines += family(
+        "sharepoint_mcp_cache_misses_total", "counter", "Cache misses by cache.",
+        [({"cache": name}, misses) for name, _, misses in lookups],
+    )
+    lines += family(
+        "sharepoint_mcp_cache_hit_ratio", "gauge", "Share of lookups answered by each cache.",
+        [({"cache": name}, round(hits / (hits + misses), 3) if hits + misses else None)
+         for name, hits, misses in lookups],
+    )
+
+    breakers = breaker_stats() or {}
+    lines += family(
+        "sharepoint_mcp_circuit_open", "gauge", "1 while the endpoint class's breaker is open.",
+        [({"endpoint": name}, int(stats["state"] == OPEN)) for name, stats in breakers.items()],
+    )
+
+    parse_pool = parse_pool_stats() or {}
+    lines += family(
+        "sharepoint_mcp_pool_queue_depth", "gauge",
+        "Work waiting or running in the thread pool and the parse process pool.",
+        [({"pool": "threads"}, thread_work_in_flight()),
+         ({"pool": "parse"}, parse_pool.get("pending"))],
+    )
+    return lines
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Any) -> Any:  # noqa: ARG001
+    """Prometheus metrics in the text exposition format.
+
+    Hot-path instruments only update in-memory counters; everything else
+    is read from the components' stats here, at scrape time.
+
+    Returns:
+        Response with tool, HTTP, retry, throttle, token, cache, parse and
+        pool metrics
+    """
+    from starlette.responses import Response
+
+    from .utils.metrics import CONTENT_TYPE, render  # noqa: PLC0415
+
+    return Response(render(_component_metrics()), media_type=CONTENT_TYPE)
+
+
+@mcp.custom_route("/livez", methods=["GET"])
+async def liveness(request: Any) -> Any:  # noqa: ARG001
+    """Liveness probe: the process and its event loop are responsive.
+
+    Never touches SharePoint; a degraded backend does not make the server
+    unhealthy enough to restart.
+
+    Returns:
+        200 JSONResponse ``{status: "ok"}``
+    """
+    from starlette.responses import JSONResponse
+
+    return JSONResponse({"status": "ok"})
+
+
+@mcp.custom_route("/readyz", methods=["GET"])
+async def readiness(request: Any) -> Any:  # noqa: ARG001
+    """Readiness probe: whether the last background SharePoint check passed.
+
+    Answers from the cached result of the readiness refresher
+    (``SHP_READINESS_INTERVAL``); no SharePoint call is made here.
+
+    Returns:
+        JSONResponse ``{ready, sharepoint, error, checked_ago}``; 200 when
+        ready, 503 when the last check failed, is stale or has not run yet
+    """
+    from starlette.responses import JSONResponse
+
+    from .core.readiness import get_readiness_probe  # noqa: PLC0415
+
+    status = get_readiness_probe().status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+# ---------------------------------------------------------------------------
+# Raw-byte side channel — binary content without base64 (HTTP transports)
+# ---------------------------------------------------------------------------
+@mcp.custom_route("/blobs", methods=["POST"])
+async def create_blob(request: Any) -> Any:
+    """Stream a raw request body into a short-lived blob.
+
+    Pass the returned handle to ``Upload_Document`` as ``content_handle``.
+
+    Returns:
+        201 JSONResponse ``{handle, size, expires_in}``; 404 when the side
+        channel is disabled; 413 when the body exceeds ``SHP_BLOB_MAX_BYTES``;
+        507 when unclaimed blobs already use ``SHP_BLOB_MAX_PENDING`` /
+        ``SHP_BLOB_MAX_PENDING_BYTES``
+    """
+    from starlette.responses import JSONResponse
+
+    from .utils.blobs import (  # noqa: PLC0415
+        BlobStoreFullError,
+        BlobTooLargeError,
+        get_blob_store,
+    )
+
+    store = get_blob_store()
+    if store is None:
+        return JSONResponse({"error": "blob transfer is disabled"}, status_code=404)
+    try:
+        blob = await store.receive(request.stream())
+    except BlobTooLargeError as exc:
+        return JSONResponse({"error": str(exc)}, status_code=413)
+    except BlobStoreFullError as exc:
+        return JSONResponse({"error": str(exc)}, status_code=507)
+    return JSONResponse(
+        {"handle": blob.handle, "size": blob.size, "expires_in": int(store.ttl)},
+        status_code=201,
+    )
+
+
+@mcp.custom_route("/blobs/{handle}", methods=["GET"])
+async def read_blob(request: Any) -> Any:
+    """Stream a blob published by a tool result's ``content_url`` (single use).
+
+    Returns:
+        FileResponse with the raw bytes; 404 for unknown or expired handles
+    """
+    from starlette.background import BackgroundTask
+    from starlette.responses import FileResponse, JSONResponse
+
+    from .utils.blobs import get_blob_store  # noqa: PLC0415
+
+    store = get_blob_store()
+    blob = store.claim(request.path_params["handle"]) if store is not None else None
+    if blob is None:
+        return JSONResponse({"error": "unknown or expired handle"}, status_code=404)
+    return FileResponse(
+        blob.path,
+        media_type="application/octet-stream",
+        filename=blob.name,
+        background=BackgroundTask(blob.discard),
+    )
+
+
 async def main() -> None:
     """Validate config, register all tools, then run the MCP server."""
     logger.info("sharepoint-mcp starting", version="1.0.1", transport=_TRANSPORT)
 
+    # Count asyncio.to_thread work for /metrics
+    from .utils.metrics import count_thread_work  # noqa: PLC0415
+    count_thread_work(asyncio.get_running_loop())
+
     # Eagerly validate config — fail fast before any tool is called
     from .config import get_settings  # noqa: PLC0415
     settings = get_settings()
@@ -159,24 +422,45 @@ async def main() -> None:
     else:
         logger.info("config loaded — full library access", library_name=settings.shp_library_name)
 
+    # Keep the Graph token fresh off the request path
+    if settings.shp_api_type in ("graph", "graphql"):
+        from .core.token_manager import get_token_manager  # noqa: PLC0415
+        get_token_manager().start_background_renewal()
+
+        from .core.drive_index import get_drive_index  # noqa: PLC0415
+        index = get_drive_index()
+        if index is not None:
+            index.start_background_sync()
+
     # Register all tools (side-effect of importing the tool modules)
     from .tools import document_tools, folder_tools, metadata_tools  # noqa: F401, PLC0415
     logger.info("tools registered", count=13)
 
+    # Check SharePoint off the probe path (only HTTP transports serve probes)
+    if _TRANSPORT in ("sse", "http"):
+        from .core.readiness import get_readiness_probe  # noqa: PLC0415
+        get_readiness_probe().start_background_refresh()
+
     # --- Transport selection ---
-    if _TRANSPORT == "sse":
-        logger.info("starting SSE transport", host=_HTTP_HOST, port=_HTTP_PORT, mount=_MOUNT_PATH)
-        await mcp.run_sse_async(mount_path=_MOUNT_PATH)
+    try:
+        if _TRANSPORT == "sse":
+            logger.info(
+                "starting SSE transport", host=_HTTP_HOST, port=_HTTP_PORT, mount=_MOUNT_PATH
+            )
+            await mcp.run_sse_async(mount_path=_MOUNT_PATH)
 
-    elif _TRANSPORT == "http":
-        logger.info("starting streamable-http transport", host=_HTTP_HOST, port=_HTTP_PORT)
-        await mcp.run_streamable_http_async()
+        elif _TRANSPORT == "http":
+            logger.info("starting streamable-http transport", host=_HTTP_HOST, port=_HTTP_PORT)
+            await mcp.run_streamable_http_async()
 
-    else:
-        if _TRANSPORT != "stdio":
-            logger.warning("unknown transport, defaulting to stdio", transport=_TRANSPORT)
-        logger.info("starting stdio transport")
-        await mcp.run_stdio_async()
+        else:
+            if _TRANSPORT != "stdio":
+                logger.warning("unknown transport, defaulting to stdio", transport=_TRANSPORT)
+            logger.info("starting stdio transport")
+            await mcp.run_stdio_async()
+    finally:
+        from .core.client_async import close_async_sp_context  # noqa: PLC0415
+        await close_async_sp_context()
 
 
 if __name__ == "__main__":
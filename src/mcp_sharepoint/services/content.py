@@ -0,0 +1,250 @@
+"""Get_Document_Content payload building shared by every backend.
+
+The backends only differ in how they fetch bytes; turning those bytes into
+the tool result (parser selection, limits from :class:`ContentOptions`,
+fallback to a ``/blobs`` URL or base64) happens here.
+
+Text and unparsed binary files can be read partially: :func:`download_range`
+gives the ``Range`` the backends should request, so previewing the head of
+a 200 MB log fetches only the bytes shown.
+
+PDFs and workbooks are parsed from a file on disk so PyMuPDF and openpyxl
+read only the pages / rows they need (:func:`parses_from_disk`);
+:func:`temp_download_path` (:func:`async_temp_download_path` on the event
+loop) provides a scratch file for the download. The
+parsers themselves run in the process pool from ``utils/parse_pool.py``.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import codecs
+import logging
+import os
+import tempfile
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+from ..utils.blobs import publish_blob
+from ..utils.metrics import PARSE_SECONDS
+from ..utils.parse_pool import run_parse
+from ..utils.parsers import (
+    ContentOptions,
+    detect_file_type,
+    extract_pdf,
+    parse_excel,
+    parse_word,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def parses_from_disk(file_name: str) -> bool:
+    """Whether *file_name* should be downloaded to a file before parsing."""
+    return detect_file_type(file_name) in ("pdf", "excel")
+
+
+def download_range(
+    file_name: str, options: ContentOptions,
+) -> tuple[int, int | None] | None:
+    """Bytes to request for *file_name*, or None to fetch the whole file.
+
+    PDFs, workbooks and Word documents can only be parsed whole, so byte
+    limits apply to text and unparsed binary files.
+    """
+    if detect_file_type(file_name) in ("text", "binary"):
+        return options.byte_range
+    return None
+
+
+@contextmanager
+def temp_download_path(suffix: str = "") -> Iterator[str]:
+    """Yield a scratch file path that is removed afterwards."""
+    fd, path = tempfile.mkstemp(prefix="sharepoint-mcp-", suffix=suffix)
+    os.close(fd)
+    try:
+        yield path
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+@asynccontextmanager
+async def async_temp_download_path(suffix: str = "") -> AsyncIterator[str]:
+    """:func:`temp_download_path` with file creation and removal off the event loop."""
+    paths = temp_download_path(suffix)
+    path = await asyncio.to_thread(paths.__enter__)
+    try:
+        yield path
+    finally:
+        await asyncio.to_thread(paths.__exit__, None, None, None)
+
+
+def _budget(text: str, options: ContentOptions) -> dict[str, Any]:
+    """``content`` (cut to ``max_chars``) plus a ``truncated`` flag if cut."""
+    if options.max_chars is not None and len(text) > options.max_chars:
+        return {"content": text[:options.max_chars], "truncated": True}
+    return {"content": text}
+
+
+def _decode_partial(data: bytes) -> str:
+    """Decode part of a UTF-8 file, dropping characters cut at either end."""
+    start = 0
+    while start < min(len(data), 3) and 0x80 <= data[start] < 0xC0:
+        start += 1
+    # Without final=True a truncated trailing sequence is held back, not an error
+    return codecs.getincrementaldecoder("utf-8")().decode(data[start:])
+
+
+def _range_fields(
+    byte_range: tuple[int, int | None], fetched: int, size: int, truncated: bool,
+) -> dict[str, Any]:
+    """``byte_range`` actually returned and whether the file continues past it."""
+    start = byte_range[0]
+    return {
+        "byte_range": f"{start}-{start + fetched - 1}" if fetched else "",
+        "truncated": truncated or start + fetched < size,
+    }
+
+
+def _parse(file_type: str, parser: Callable[..., Any], *args: Any) -> Any:
+    """Run *parser* through the parse pool, timing it for ``/metrics``."""
+    started = time.perf_counter()
+    try:
+        return run_parse(parser, *args)
+    finally:
+        PARSE_SECONDS.observe(time.perf_counter() - started, file_type)
+
+
+def content_result(
+    file_name: str,
+    content: bytes | None = None,
+    *,
+    path: str | None = None,
+    options: ContentOptions | None = None,
+    size: int | None = None,
+) -> dict[str, Any]:
+    """Parse a downloaded file into a Get_Document_Content payload.
+
+    Args:
+        file_name: Used to pick the parser
+        content: The file's bytes, or the :func:`download_range` part of
+            them (omit when *path* is given)
+        path: Local copy of the file (preferred for PDFs and workbooks)
+        options: Page range / character budget / sheet and byte limits
+        size: Size of the whole file, when *content* is only part of it
+
+    Falls back to a blob URL or base64 when the type is unknown or parsing
+    fails.
+    """
+    options = options or ContentOptions()
+    file_type = detect_file_type(file_name)
+    byte_range = download_range(file_name, options)
+    if size is None:
+        size = os.path.getsize(path) if path is not None else len(content or b"")
+
+    if file_type == "pdf":
+        try:
+            text, pages, last_page, truncated = _parse(
+                "pdf", extract_pdf, path if path is not None else content, options,
+            )
+            result = {
+                "name": file_name,
+                "content_type": "text",
+                "content": text,
+                "original_type": "pdf",
+                "page_count": pages,
+                "size": size,
+            }
+            if options.is_partial:
+                result["pages"] = f"{options.start_page}-{last_page}"
+                result["truncated"] = truncated
+            return result
+        except Exception as exc:
+            logger.warning("PDF parse failed: %s", exc)
+
+    elif file_type == "excel":
+        try:
+            text, sheets = _parse(
+                "excel", parse_excel, path if path is not None else content, options,
+            )
+            return {
+                "name": file_name,
+                "content_type": "text",
+                **_budget(text, options),
+                "original_type": "excel",
+                "sheet_count": sheets,
+                "size": size,
+            }
+        except Exception as exc:
+            logger.error(
+                "Excel parse failed for '%s': %s (%s)",
+                file_name, exc, type(exc).__name__,
+            )
+            # Fallback to base64 for failed parse
+
+    if content is None:
+        with open(path, "rb") as fh:  # type: ignore[arg-type]
+            content = fh.read()
+
+    if file_type == "word":
+        try:
+            text, paragraphs = _parse("word", parse_word, content)
+            return {
+                "name": file_name,
+                "content_type": "text",
+                **_budget(text, options),
+                "original_type": "word",
+                "paragraph_count": paragraphs,
+                "size": size,
+            }
+        except Exception as exc:
+            logger.error(
+                "Word parse failed for '%s': %s (%s)",
+                file_name, exc, type(exc).__name__,
+            )
+            # Fallback to base64 for failed parse
+
+    elif file_type == "text":
+        try:
+            text = _decode_partial(content) if byte_range else content.decode("utf-8")
+            result = {
+                "name": file_name,
+                "content_type": "text",
+                **_budget(text, options),
+                "size": size,
+            }
+            if byte_range:
+                result.update(
+                    _range_fields(byte_range, len(content), size, result.get("truncated", False))
+                )
+            return result
+        except UnicodeDecodeError as exc:
+            logger.warning(
+                "Text decode failed for '%s', falling back to base64: %s",
+                file_name, exc,
+            )
+
+    # Fallback: a side-channel download URL (HTTP transports), else base64
+    blob = publish_blob(content, file_name)
+    if blob is not None:
+        result = {
+            "name": file_name,
+            "content_type": "binary",
+            **blob,
+            "size": size,
+        }
+    else:
+        result = {
+            "name": file_name,
+            "content_type": "binary",
+            "content_base64": base64.b64encode(content).decode(),
+            "size": size,
+        }
+    if byte_range:
+        result.update(_range_fields(byte_range, len(content), size, False))
+    return result
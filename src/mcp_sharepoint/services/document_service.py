@@ -1,31 +1,41 @@
-"""Unified document service supporting both Office365 and Graph APIs."""
+"""Unified document service supporting both Office365 and Graph APIs.
+
+The ``*_async`` variants are what tool handlers await: they run on the
+asyncio Graph transport when it is enabled and fall back to the sync
+implementation on a worker thread otherwise.
+"""
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
 from typing import Any
 
-from ..core import get_sp_context
+from ..core.client_async import async_graph_enabled
+from ..core.request_context import request_context, request_scoped
+from ..utils.cache import cached, invalidates, join_path
+from ..utils.parsers import ContentOptions
 
 logger = logging.getLogger(__name__)
 
 
-def list_documents(folder_name: str) -> list[dict[str, Any]]:
-    """List all files in *folder_name*."""
-    client = get_sp_context()
-    
-    if client.api_type in ("graph", "graphql"):
+@request_scoped
+def list_documents(
+    folder_name: str, limit: int | None = None, cursor: str | None = None,
+) -> list[dict[str, Any]] | dict[str, Any]:
+    """List files in *folder_name* (one page of them with *limit*/*cursor*)."""
+    if request_context().is_graph:
         from . import document_service_graph
-        return document_service_graph.list_documents(folder_name)
+        return document_service_graph.list_documents(folder_name, limit, cursor)
     else:
         from . import document_service_office365
-        return document_service_office365.list_documents(folder_name)
+        return document_service_office365.list_documents(folder_name, limit, cursor)
 
 
+@request_scoped
 def search_documents(query_text: str, row_limit: int = 20) -> list[dict[str, Any]]:
     """Search SharePoint documents using query text."""
-    client = get_sp_context()
-    
-    if client.api_type in ("graph", "graphql"):
+    if request_context().is_graph:
         from . import document_service_graph
         return document_service_graph.search_documents(query_text, row_limit)
     else:
@@ -33,18 +43,20 @@ def search_documents(query_text: str, row_limit: int = 20) -> list[dict[str, Any
         return document_service_office365.search_documents(query_text, row_limit)
 
 
-def get_document_content(folder_name: str, file_name: str) -> dict[str, Any]:
+@request_scoped
+def get_document_content(
+    folder_name: str, file_name: str, options: ContentOptions | None = None,
+) -> dict[str, Any]:
     """Download and decode a file, returning its content."""
-    client = get_sp_context()
-    
-    if client.api_type in ("graph", "graphql"):
+    if request_context().is_graph:
         from . import document_service_graph
-        return document_service_graph.get_document_content(folder_name, file_name)
+        return document_service_graph.get_document_content(folder_name, file_name, options)
     else:
         from . import document_service_office365
-        return document_service_office365.get_document_content(folder_name, file_name)
+        return document_service_office365.get_document_content(folder_name, file_name, options)
 
 
+@request_scoped
 def upload_document(
     folder_name: str,
     file_name: str,
@@ -52,9 +64,7 @@ def upload_document(
     is_base64: bool = False,
 ) -> dict[str, Any]:
     """Upload *file_name* with *content* to *folder_name*."""
-    client = get_sp_context()
-    
-    if client.api_type in ("graph", "graphql"):
+    if request_context().is_graph:
         from . import document_service_graph
         return document_service_graph.upload_document(
             folder_name,
@@ -72,15 +82,19 @@ def upload_document(
         )
 
 
+@invalidates(
+    lambda folder_name, file_path, new_name=None: [
+        join_path(folder_name, new_name or os.path.basename(file_path))
+    ]
+)
+@request_scoped
 def upload_from_path(
     folder_name: str,
     file_path: str,
     new_name: str | None = None,
 ) -> dict[str, Any]:
     """Upload a local file at *file_path* to *folder_name*."""
-    client = get_sp_context()
-    
-    if client.api_type in ("graph", "graphql"):
+    if request_context().is_graph:
         from . import document_service_graph
         return document_service_graph.upload_from_path(
             folder_name,
@@ -92,6 +106,7 @@ def upload_from_path(
         return document_service_office365.upload_from_path(folder_name, file_path, new_name)
 
 
+@request_scoped
 def update_document(
     folder_name: str,
     file_name: str,
@@ -99,9 +114,7 @@ def update_document(
     is_base64: bool = False,
 ) -> dict[str, Any]:
     """Overwrite *file_name* in *folder_name* with new *content*."""
-    client = get_sp_context()
-    
-    if client.api_type in ("graph", "graphql"):
+    if request_context().is_graph:
         from . import document_service_graph
         return document_service_graph.update_document(
             folder_name,
@@ -119,11 +132,26 @@ def update_document(
         )
 
 
+@invalidates(lambda folder_name, file_name, *_args: [join_path(folder_name, file_name)])
+@request_scoped
+def update_from_path(
+    folder_name: str,
+    file_name: str,
+    file_path: str,
+) -> dict[str, Any]:
+    """Overwrite *file_name* in *folder_name* with the local file at *file_path*."""
+    if request_context().is_graph:
+        from . import document_service_graph
+        return document_service_graph.update_from_path(folder_name, file_name, file_path)
+    else:
+        from . import document_service_office365
+        return document_service_office365.update_from_path(folder_name, file_name, file_path)
+
+
+@request_scoped
 def delete_document(folder_name: str, file_name: str) -> dict[str, Any]:
     """Delete *file_name* from *folder_name*."""
-    client = get_sp_context()
-    
-    if client.api_type in ("graph", "graphql"):
+    if request_context().is_graph:
         from . import document_service_graph
         return document_service_graph.delete_document(folder_name, file_name)
     else:
@@ -131,15 +159,14 @@ def delete_document(folder_name: str, file_name: str) -> dict[str, Any]:
         return document_service_office365.delete_document(folder_name, file_name)
 
 
+@request_scoped
 def download_document(
     folder_name: str,
     file_name: str,
     local_path: str,
 ) -> dict[str, Any]:
     """Download a SharePoint file to *local_path* (fallback: system temp)."""
-    client = get_sp_context()
-    
-    if client.api_type in ("graph", "graphql"):
+    if request_context().is_graph:
         from . import document_service_graph
         return document_service_graph.download_document(folder_name, file_name, local_path)
     else:
@@ -149,3 +176,85 @@ def download_document(
             file_name,
             local_path,
         )
+
+
+# ---------------------------------------------------------------------------
+# Async entry points
+# ---------------------------------------------------------------------------
+
+@cached("list_documents", lambda folder_name, *_args, **_kwargs: folder_name)
+@request_scoped
+async def list_documents_async(
+    folder_name: str, limit: int | None = None, cursor: str | None = None,
+) -> list[dict[str, Any]] | dict[str, Any]:
+    """Async variant of :func:`list_documents`."""
+    if async_graph_enabled():
+        from . import document_service_graph_async
+        return await document_service_graph_async.list_documents(folder_name, limit, cursor)
+    return await asyncio.to_thread(list_documents, folder_name, limit, cursor)
+
+
+@request_scoped
+async def search_documents_async(query_text: str, row_limit: int = 20) -> list[dict[str, Any]]:
+    """Async variant of :func:`search_documents`."""
+    if async_graph_enabled():
+        from . import document_service_graph_async
+        return await document_service_graph_async.search_documents(query_text, row_limit)
+    return await asyncio.to_thread(search_documents, query_text, row_limit)
+
+
+@request_scoped
+async def get_document_content_async(
+    folder_name: str, file_name: str, options: ContentOptions | None = None,
+) -> dict[str, Any]:
+    """Async variant of :func:`get_document_content`."""
+    if async_graph_enabled():
+        from . import document_service_graph_async
+        return await document_service_graph_async.get_document_content(
+            folder_name, file_name, options,
+        )
+    return await asyncio.to_thread(get_document_content, folder_name, file_name, options)
+
+
+@invalidates(lambda folder_name, file_name, *_args: [join_path(folder_name, file_name)])
+@request_scoped
+async def upload_document_async(
+    folder_name: str,
+    file_name: str,
+    content: str,
+    is_base64: bool = False,
+) -> dict[str, Any]:
+    """Async variant of :func:`upload_document`."""
+    if async_graph_enabled():
+        from . import document_service_graph_async
+        return await document_service_graph_async.upload_document(
+            folder_name, file_name, content, is_base64,
+        )
+    return await asyncio.to_thread(upload_document, folder_name, file_name, content, is_base64)
+
+
+@invalidates(lambda folder_name, file_name, *_args: [join_path(folder_name, file_name)])
+@request_scoped
+async def update_document_async(
+    folder_name: str,
+    file_name: str,
+    content: str,
+    is_base64: bool = False,
+) -> dict[str, Any]:
+    """Async variant of :func:`update_document`."""
+    if async_graph_enabled():
+        from . import document_service_graph_async
+        return await document_service_graph_async.update_document(
+            folder_name, file_name, content, is_base64,
+        )
+    return await asyncio.to_thread(update_document, folder_name, file_name, content, is_base64)
+
+
+@invalidates(lambda folder_name, file_name: [join_path(folder_name, file_name)])
+@request_scoped
+async def delete_document_async(folder_name: str, file_name: str) -> dict[str, Any]:
+    """Async variant of :func:`delete_document`."""
+    if async_graph_enabled():
+        from . import document_service_graph_async
+        return await document_service_graph_async.delete_document(folder_name, file_name)
+    return await asyncio.to_thread(delete_document, folder_name, file_name)
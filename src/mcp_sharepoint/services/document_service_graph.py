@@ -4,47 +4,30 @@ from __future__ import annotations
 import base64
 import logging
 import os
-import posixpath
-import tempfile
 from typing import Any
 from urllib.parse import quote
 
 from ..config import get_settings
-from ..core import get_sp_context
+from ..core.drive_index import record_removal, record_upsert
+from ..core.pagination import check_limit, page_result, take
+from ..core.request_context import request_context
+from ..core.upload_session import bytes_reader, file_reader, upload_in_session
 from ..exceptions import SharePointConnectionError
-from ..utils.parsers import detect_file_type, parse_excel, parse_pdf, parse_word
-from ..utils.retry import sp_retry
+from ..utils.content_cache import get_content_cache
+from ..utils.parsers import ContentOptions
+from ..utils.retry import http_status, sp_retry
+from ..utils.transfer import expected_hash, save_download
+from .content import (
+    content_result,
+    download_range,
+    parses_from_disk,
+    temp_download_path,
+)
+from .folder_service_graph import _children_entries
 
 logger = logging.getLogger(__name__)
 
-
-def _normalize_path(sub_path: str = "") -> str:
-    """Build drive-relative path from configured scope + sub_path.
-
-    Returns empty string when both scope and sub_path are empty (= drive root).
-    Graph API's drive/root already IS the document library, so NO library name
-    is prepended.
-    
-    This function now uses the GraphClient's normalize_path method to properly
-    handle SharePoint library names like "Shared Documents".
-    """
-    client = get_sp_context()
-    scope = get_settings().shp_doc_library
-    clean_path = posixpath.normpath(f"/{sub_path}").lstrip("/") if sub_path else ""
-    if clean_path.startswith(".."):
-        raise ValueError(f"Invalid path traversal attempt: {sub_path}")
-    
-    # Combine scope and path
-    parts = [p for p in [scope, clean_path] if p]
-    combined_path = "/".join(parts)
-    
-    # Use client's normalize_path if available (for Graph API)
-    if hasattr(client, 'normalize_path'):
-        normalized = client.normalize_path(combined_path)
-        logger.debug(f"Path normalization: '{combined_path}' → '{normalized}'")
-        return normalized
-    
-    return combined_path
+_FILE_SELECT = "id,name,webUrl,size,createdDateTime,lastModifiedDateTime,file"
 
 
 def _drive_item_url(site_id: str, path: str, suffix: str = "") -> str:
@@ -61,55 +44,91 @@ def _drive_item_url(site_id: str, path: str, suffix: str = "") -> str:
     return f"sites/{site_id}/drive/root{suffix.lstrip(':')}"
 
 
-def _get_drive_item_path(folder_name: str, file_name: str | None = None) -> str:
-    """Get the Graph API path for a drive item."""
-    client = get_sp_context()
-    site_id = client._get_site_id()
-    
-    base_path = _normalize_path(folder_name)
-    if file_name:
-        base_path = f"{base_path}/{file_name}" if base_path else file_name
-    
-    return _drive_item_url(site_id, base_path)
+def _file_entry(item: dict[str, Any]) -> dict[str, Any]:
+    """Shape a drive item as a List_SharePoint_Documents entry."""
+    return {
+        "name": item.get("name"),
+        "url": item.get("webUrl"),
+        "size": item.get("size"),
+        "created": item.get("createdDateTime"),
+        "modified": item.get("lastModifiedDateTime"),
+        "id": item.get("id"),
+    }
+
+
+def _search_entry(item: dict[str, Any]) -> dict[str, Any]:
+    """Shape a drive item returned by search() as a search result."""
+    name = item.get("name", "")
+    ext = name.split(".")[-1] if "." in name else ""
+    return {
+        "Title": name,
+        "Path": item.get("webUrl"),
+        "FileExtension": ext,
+        "ServerRelativeUrl": item.get("webUrl"),
+        "id": item.get("id"),
+    }
+
+
+def _item_result(message: str, item: dict[str, Any]) -> dict[str, Any]:
+    """Build the success payload for an upload/update returning *item*."""
+    return {
+        "success": True,
+        "message": message,
+        "file": {
+            "name": item.get("name"),
+            "url": item.get("webUrl"),
+            "id": item.get("id"),
+        },
+    }
+
+
+def _upload_bytes(
+    client: Any, content_endpoint: str, session_endpoint: str, file_bytes: bytes,
+) -> dict[str, Any]:
+    """PUT small content directly; send large content through an upload session."""
+    settings = get_settings()
+    if len(file_bytes) <= settings.shp_upload_session_threshold:
+        return client.upload(content_endpoint, file_bytes)
+    return upload_in_session(
+        client,
+        session_endpoint,
+        bytes_reader(file_bytes),
+        len(file_bytes),
+        settings.shp_upload_chunk_size,
+    )
 
 
 @sp_retry
-def list_documents(folder_name: str) -> list[dict[str, Any]]:
-    """List all files in *folder_name*."""
+def list_documents(
+    folder_name: str, limit: int | None = None, cursor: str | None = None,
+) -> list[dict[str, Any]] | dict[str, Any]:
+    """List files in *folder_name*.
+
+    Every page is read unless *limit* or *cursor* is given; then one page of
+    results is returned with the ``next_cursor`` to continue from.
+    """
     logger.info("Listing documents in '%s'", folder_name)
-    client = get_sp_context()
-    site_id = client._get_site_id()
-    
-    folder_path = _normalize_path(folder_name)
+    check_limit(limit)
+    ctx = request_context()
+    client, site_id = ctx.client, ctx.site_id
     
-    # Get folder children
-    endpoint = _drive_item_url(site_id, folder_path, ":/children")
-    response = client.get(endpoint)
-    
-    items = response.get("value", [])
+    folder_path = ctx.path(folder_name)
+    entries = _children_entries(client, site_id, folder_path, _FILE_SELECT, limit, cursor)
     
     # Filter only files (not folders)
-    files = [item for item in items if "file" in item]
-    
-    return [
-        {
-            "name": f.get("name"),
-            "url": f.get("webUrl"),
-            "size": f.get("size"),
-            "created": f.get("createdDateTime"),
-            "modified": f.get("lastModifiedDateTime"),
-            "id": f.get("id"),
-        }
-        for f in files
-    ]
+    items, next_cursor = take(entries, limit, keep=lambda item: "file" in item)
+    files = [_file_entry(item) for item in items]
+    if limit is None and cursor is None:
+        return files
+    return page_result(files, next_cursor)
 
 
 @sp_retry
 def search_documents(query_text: str, row_limit: int = 20) -> list[dict[str, Any]]:
     """Search SharePoint documents using query text."""
     logger.info("Searching SharePoint documents with query '%s'", query_text)
-    client = get_sp_context()
-    site_id = client._get_site_id()
+    ctx = request_context()
+    client, site_id = ctx.client, ctx.site_id
     
     # Use Graph API search
     endpoint = f"sites/{site_id}/drive/root/search(q='{query_text}')"
@@ -118,33 +137,21 @@ def search_documents(query_text: str, row_limit: int = 20) -> list[dict[str, Any
     
     items = response.get("value", [])
     
-    results = []
-    for item in items:
-        if "file" in item:  # Only files, not folders
-            name = item.get("name", "")
-            ext = name.split(".")[-1] if "." in name else ""
-            results.append({
-                "Title": name,
-                "Path": item.get("webUrl"),
-                "FileExtension": ext,
-                "ServerRelativeUrl": item.get("webUrl"),
-                "id": item.get("id"),
-            })
-    
-    return results
+    # Only files, not folders
+    return [_search_entry(item) for item in items if "file" in item]
 
 
 @sp_retry
 def get_document_content(
-    folder_name: str, file_name: str,
+    folder_name: str, file_name: str, options: ContentOptions | None = None,
 ) -> dict[str, Any]:
     """Download and decode a file, returning its content."""
-    client = get_sp_context()
-    site_id = client._get_site_id()
+    ctx = request_context()
+    client, site_id = ctx.client, ctx.site_id
+    options = options or ContentOptions()
     
     # Get file metadata first
-    folder_path = _normalize_path(folder_name)
-    file_path = f"{folder_path}/{file_name}" if folder_path else file_name
+    file_path = ctx.file_path(folder_name, file_name)
     
     # Get file metadata
     metadata_endpoint = _drive_item_url(site_id, file_path)
@@ -158,88 +165,31 @@ def get_document_content(
         file_name, file_size,
     )
 
-    # Download file content
+    # Unchanged content (same cTag) was already parsed
+    cache = get_content_cache()
+    tag = metadata.get("cTag")
+    if cache is not None and tag:
+        cached = cache.lookup(file_id, tag, file_name, options.key)
+        if cached is not None:
+            return cached
+
+    # Download file content; PDFs and workbooks go to disk and are read on demand
     content_endpoint = f"sites/{site_id}/drive/items/{file_id}/content"
-    content_bytes = client.download(content_endpoint)
-
-    file_type = detect_file_type(file_name)
-
-    if file_type == "pdf":
-        try:
-            text, pages = parse_pdf(content_bytes)
-            return {
-                "name": file_name,
-                "content_type": "text",
-                "content": text,
-                "original_type": "pdf",
-                "page_count": pages,
-                "size": len(content_bytes),
-            }
-        except Exception as exc:
-            logger.warning("PDF parse failed: %s", exc)
-
-    elif file_type == "excel":
-        try:
-            text, sheets = parse_excel(content_bytes)
-            return {
-                "name": file_name,
-                "content_type": "text",
-                "content": text,
-                "original_type": "excel",
-                "sheet_count": sheets,
-                "size": len(content_bytes),
-            }
-        except Exception as exc:
-            logger.error(
-                "Excel parse failed",
-                file_name=file_name,
-                error=str(exc),
-                error_type=type(exc).__name__
-            )
-            # Fallback to base64 for failed parse
-
-    elif file_type == "word":
-        try:
-            text, paragraphs = parse_word(content_bytes)
-            return {
-                "name": file_name,
-                "content_type": "text",
-                "content": text,
-                "original_type": "word",
-                "paragraph_count": paragraphs,
-                "size": len(content_bytes),
-            }
-        except Exception as exc:
-            logger.error(
-                "Word parse failed",
-                file_name=file_name,
-                error=str(exc),
-                error_type=type(exc).__name__
-            )
-            # Fallback to base64 for failed parse
-
-    elif file_type == "text":
-        try:
-            return {
-                "name": file_name,
-                "content_type": "text",
-                "content": content_bytes.decode("utf-8"),
-                "size": len(content_bytes),
-            }
-        except UnicodeDecodeError as exc:
-            logger.warning(
-                "Text decode failed, falling back to base64",
-                file_name=file_name,
-                error=str(exc)
-            )
+    byte_range = download_range(file_name, options)
+    if byte_range is not None:
+        content_bytes = client.download(content_endpoint, byte_range=byte_range)
+        result = content_result(file_name, content_bytes, options=options, size=file_size)
+    elif parses_from_disk(file_name):
+        with temp_download_path(os.path.splitext(file_name)[1]) as path:
+            with open(path, "wb") as fh:
+                client.download_to(content_endpoint, fh, get_settings().shp_download_chunk_size)
+            result = content_result(file_name, path=path, options=options)
+    else:
+        result = content_result(file_name, client.download(content_endpoint), options=options)
 
-    # Fallback: return as base64 binary
-    return {
-        "name": file_name,
-        "content_type": "binary",
-        "content_base64": base64.b64encode(content_bytes).decode(),
-        "size": len(content_bytes),
-    }
+    if cache is not None and tag:
+        cache.store(file_id, tag, file_name, result, options.key)
+    return result
 
 
 @sp_retry
@@ -250,8 +200,8 @@ def upload_document(
     is_base64: bool = False,
 ) -> dict[str, Any]:
     """Upload *file_name* with *content* to *folder_name*."""
-    client = get_sp_context()
-    site_id = client._get_site_id()
+    ctx = request_context()
+    client, site_id = ctx.client, ctx.site_id
     
     logger.info("Uploading '%s' to '%s'", file_name, folder_name)
     
@@ -260,22 +210,18 @@ def upload_document(
         else content.encode("utf-8")
     )
     
-    folder_path = _normalize_path(folder_name)
-    file_path = f"{folder_path}/{file_name}" if folder_path else file_name
+    file_path = ctx.file_path(folder_name, file_name)
     
     # Upload file
-    endpoint = _drive_item_url(site_id, file_path, ":/content")
-    uploaded = client.upload(endpoint, file_bytes)
+    uploaded = _upload_bytes(
+        client,
+        _drive_item_url(site_id, file_path, ":/content"),
+        _drive_item_url(site_id, file_path, ":/createUploadSession"),
+        file_bytes,
+    )
+    record_upsert(uploaded)
     
-    return {
-        "success": True,
-        "message": f"File '{file_name}' uploaded successfully",
-        "file": {
-            "name": uploaded.get("name"),
-            "url": uploaded.get("webUrl"),
-            "id": uploaded.get("id"),
-        },
-    }
+    return _item_result(f"File '{file_name}' uploaded successfully", uploaded)
 
 
 @sp_retry
@@ -290,28 +236,28 @@ def upload_from_path(
         "Uploading from path '%s' as '%s'", file_path, dest_name,
     )
     
-    with open(file_path, "rb") as fh:
-        file_bytes = fh.read()
-    
-    client = get_sp_context()
-    site_id = client._get_site_id()
-    
-    folder_path = _normalize_path(folder_name)
-    dest_path = f"{folder_path}/{dest_name}" if folder_path else dest_name
-    
-    # Upload file
-    endpoint = _drive_item_url(site_id, dest_path, ":/content")
-    uploaded = client.upload(endpoint, file_bytes)
+    ctx = request_context()
+    client, site_id = ctx.client, ctx.site_id
+    settings = get_settings()
+    
+    dest_path = ctx.file_path(folder_name, dest_name)
+    
+    # Upload file, paging large files in from an mmap fragment by fragment
+    with file_reader(file_path) as (read_range, size):
+        if size <= settings.shp_upload_session_threshold:
+            endpoint = _drive_item_url(site_id, dest_path, ":/content")
+            uploaded = client.upload(endpoint, read_range(0, size))
+        else:
+            uploaded = upload_in_session(
+                client,
+                _drive_item_url(site_id, dest_path, ":/createUploadSession"),
+                read_range,
+                size,
+                settings.shp_upload_chunk_size,
+            )
+    record_upsert(uploaded)
     
-    return {
-        "success": True,
-        "message": f"File '{dest_name}' uploaded successfully",
-        "file": {
-            "name": uploaded.get("name"),
-            "url": uploaded.get("webUrl"),
-            "id": uploaded.get("id"),
-        },
-    }
+    return _item_result(f"File '{dest_name}' uploaded successfully", uploaded)
 
 
 @sp_retry
@@ -322,11 +268,10 @@ def update_document(
     is_base64: bool = False,
 ) -> dict[str, Any]:
     """Overwrite *file_name* in *folder_name* with new *content*."""
-    client = get_sp_context()
-    site_id = client._get_site_id()
+    ctx = request_context()
+    client, site_id = ctx.client, ctx.site_id
     
-    folder_path = _normalize_path(folder_name)
-    file_path = f"{folder_path}/{file_name}" if folder_path else file_name
+    file_path = ctx.file_path(folder_name, file_name)
     
     # Check if file exists
     try:
@@ -334,11 +279,11 @@ def update_document(
         metadata = client.get(metadata_endpoint)
         file_id = metadata.get("id")
     except SharePointConnectionError as exc:
+        if http_status(exc) != 404:
+            raise
         logger.error(
-            "File not found for update",
-            folder=folder_name,
-            file=file_name,
-            error=str(exc)
+            "File not found for update (folder=%s, file=%s, error=%s)",
+            folder_name, file_name, exc,
         )
         return {
             "success": False,
@@ -354,18 +299,48 @@ def update_document(
     )
     
     # Update file content using file ID
-    endpoint = f"sites/{site_id}/drive/items/{file_id}/content"
-    updated = client.upload(endpoint, file_bytes)
+    updated = _upload_bytes(
+        client,
+        f"sites/{site_id}/drive/items/{file_id}/content",
+        f"sites/{site_id}/drive/items/{file_id}/createUploadSession",
+        file_bytes,
+    )
+    record_upsert(updated)
     
-    return {
-        "success": True,
-        "message": f"File '{file_name}' updated successfully",
-        "file": {
-            "name": updated.get("name"),
-            "url": updated.get("webUrl"),
-            "id": updated.get("id"),
-        },
-    }
+    return _item_result(f"File '{file_name}' updated successfully", updated)
+
+
+@sp_retry
+def update_from_path(
+    folder_name: str,
+    file_name: str,
+    file_path: str,
+) -> dict[str, Any]:
+    """Overwrite *file_name* in *folder_name* with the local file at *file_path*."""
+    ctx = request_context()
+    client, site_id = ctx.client, ctx.site_id
+
+    # Check if file exists
+    try:
+        client.get(_drive_item_url(site_id, ctx.file_path(folder_name, file_name)))
+    except SharePointConnectionError as exc:
+        if http_status(exc) != 404:
+            raise
+        logger.error(
+            "File not found for update (folder=%s, file=%s, error=%s)",
+            folder_name, file_name, exc,
+        )
+        return {
+            "success": False,
+            "message": (
+                f"File '{file_name}' does not exist "
+                f"in '{folder_name}'"
+            ),
+        }
+
+    result = upload_from_path(folder_name, file_path, file_name)
+    result["message"] = f"File '{file_name}' updated successfully"
+    return result
 
 
 @sp_retry
@@ -373,11 +348,10 @@ def delete_document(
     folder_name: str, file_name: str,
 ) -> dict[str, Any]:
     """Delete *file_name* from *folder_name*."""
-    client = get_sp_context()
-    site_id = client._get_site_id()
+    ctx = request_context()
+    client, site_id = ctx.client, ctx.site_id
     
-    folder_path = _normalize_path(folder_name)
-    file_path = f"{folder_path}/{file_name}" if folder_path else file_name
+    file_path = ctx.file_path(folder_name, file_name)
     
     # Get file metadata to get ID
     try:
@@ -385,11 +359,11 @@ def delete_document(
         metadata = client.get(metadata_endpoint)
         file_id = metadata.get("id")
     except SharePointConnectionError as exc:
+        if http_status(exc) != 404:
+            raise
         logger.error(
-            "File not found for deletion",
-            folder=folder_name,
-            file=file_name,
-            error=str(exc)
+            "File not found for deletion (folder=%s, file=%s, error=%s)",
+            folder_name, file_name, exc,
         )
         return {
             "success": False,
@@ -402,6 +376,7 @@ def delete_document(
     # Delete file
     endpoint = f"sites/{site_id}/drive/items/{file_id}"
     client.delete(endpoint)
+    record_removal(file_id)
     
     return {
         "success": True,
@@ -416,16 +391,15 @@ def download_document(
     local_path: str,
 ) -> dict[str, Any]:
     """Download a SharePoint file to *local_path* (fallback: system temp)."""
-    client = get_sp_context()
-    site_id = client._get_site_id()
+    ctx = request_context()
+    client, site_id = ctx.client, ctx.site_id
     
     logger.info(
         "Downloading '%s/%s' → '%s'",
         folder_name, file_name, local_path,
     )
 
-    folder_path = _normalize_path(folder_name)
-    file_path = f"{folder_path}/{file_name}" if folder_path else file_name
+    file_path = ctx.file_path(folder_name, file_name)
     
     # Get file metadata
     try:
@@ -433,62 +407,27 @@ def download_document(
         metadata = client.get(metadata_endpoint)
         file_id = metadata.get("id")
     except SharePointConnectionError as exc:
+        if http_status(exc) != 404:
+            raise
         logger.error(
-            "File not found for download",
-            folder=folder_name,
-            file=file_name,
-            error=str(exc)
+            "File not found for download (folder=%s, file=%s, error=%s)",
+            folder_name, file_name, exc,
         )
         return {
             "success": False,
             "error": f"File '{file_name}' not found in '{folder_name}'",
         }
 
-    # Download content
+    # Stream content straight to disk; nothing is buffered in memory
+    settings = get_settings()
     content_endpoint = f"sites/{site_id}/drive/items/{file_id}/content"
-    content_bytes = client.download(content_endpoint)
-
-    def _save(path: str) -> dict[str, Any]:
-        try:
-            directory = os.path.dirname(path)
-            if directory:
-                os.makedirs(directory, exist_ok=True)
-            with open(path, "wb") as fh:
-                fh.write(content_bytes)
-            if (
-                os.path.exists(path)
-                and os.path.getsize(path) == len(content_bytes)
-            ):
-                return {
-                    "success": True,
-                    "path": os.path.abspath(path),
-                    "size": len(content_bytes),
-                }
-            raise OSError("File verification failed after write")
-        except Exception as exc:
-            logger.error("Save failed for '%s': %s", path, exc)
-            return {"success": False, "error": str(exc)}
-
-    primary = _save(local_path)
-    if primary["success"]:
-        return {**primary, "method": "primary"}
-
-    logger.warning(
-        "Primary save failed (%s), trying fallback",
-        primary["error"],
+    verify = settings.shp_download_verify
+    return save_download(
+        lambda sink: client.download_to(
+            content_endpoint, sink, settings.shp_download_chunk_size,
+        ),
+        local_path,
+        file_name,
+        expected_size=metadata.get("size") if verify != "none" else None,
+        expected=expected_hash(metadata) if verify == "hash" else None,
     )
-    fallback_dir = tempfile.gettempdir()
-    fallback = _save(os.path.join(fallback_dir, file_name))
-    if fallback["success"]:
-        return {
-            **fallback,
-            "method": "fallback",
-            "primary_error": primary["error"],
-        }
-
-    return {
-        "success": False,
-        "error": "Both primary and fallback saves failed",
-        "primary_error": primary["error"],
-        "fallback_error": fallback["error"],
-    }
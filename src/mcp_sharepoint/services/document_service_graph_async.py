@@ -0,0 +1,220 @@
+"""Document operations using Microsoft Graph API on the asyncio transport.
+
+Async counterparts of ``document_service_graph``. Request building and
+response shaping are shared with the sync module; only the HTTP calls differ.
+CPU-bound parsing is still pushed to a worker thread.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import logging
+import os
+from typing import Any
+
+from ..config import get_settings
+from ..core.drive_index import record_removal, record_upsert
+from ..core.pagination import check_limit, page_result, take_async
+from ..core.request_context import async_request_context
+from ..exceptions import SharePointConnectionError
+from ..utils.content_cache import get_content_cache
+from ..utils.parsers import ContentOptions
+from ..utils.retry import http_status, sp_retry
+from .content import (
+    async_temp_download_path,
+    content_result,
+    download_range,
+    parses_from_disk,
+)
+from .document_service_graph import (
+    _FILE_SELECT,
+    _drive_item_url,
+    _file_entry,
+    _item_result,
+    _search_entry,
+    _upload_bytes,
+)
+from .folder_service_graph_async import _children_entries
+
+logger = logging.getLogger(__name__)
+
+
+async def _upload(
+    client: Any, content_endpoint: str, session_endpoint: str, file_bytes: bytes,
+) -> dict[str, Any]:
+    """Async PUT for small content; large content uses a (sync) upload session."""
+    if len(file_bytes) <= get_settings().shp_upload_session_threshold:
+        return await client.upload(content_endpoint, file_bytes)
+    return await asyncio.to_thread(
+        _upload_bytes, client.sync_client, content_endpoint, session_endpoint, file_bytes,
+    )
+
+
+@sp_retry
+async def list_documents(
+    folder_name: str, limit: int | None = None, cursor: str | None = None,
+) -> list[dict[str, Any]] | dict[str, Any]:
+    """List files in *folder_name*."""
+    logger.info("Listing documents in '%s'", folder_name)
+    check_limit(limit)
+    ctx = await async_request_context()
+    client, site_id = ctx.async_client, ctx.site_id
+
+    folder_path = ctx.path(folder_name)
+    items, next_cursor = await take_async(
+        _children_entries(client, site_id, folder_path, _FILE_SELECT, limit, cursor),
+        limit,
+        keep=lambda item: "file" in item,
+    )
+    files = [_file_entry(item) for item in items]
+    if limit is None and cursor is None:
+        return files
+    return page_result(files, next_cursor)
+
+
+@sp_retry
+async def search_documents(query_text: str, row_limit: int = 20) -> list[dict[str, Any]]:
+    """Search SharePoint documents using query text."""
+    logger.info("Searching SharePoint documents with query '%s'", query_text)
+    ctx = await async_request_context()
+    client, site_id = ctx.async_client, ctx.site_id
+
+    endpoint = f"sites/{site_id}/drive/root/search(q='{query_text}')"
+    response = await client.get(endpoint, params={"$top": row_limit})
+
+    return [_search_entry(item) for item in response.get("value", []) if "file" in item]
+
+
+@sp_retry
+async def get_document_content(
+    folder_name: str, file_name: str, options: ContentOptions | None = None,
+) -> dict[str, Any]:
+    """Download and decode a file, returning its content."""
+    ctx = await async_request_context()
+    client, site_id = ctx.async_client, ctx.site_id
+    options = options or ContentOptions()
+
+    metadata = await client.get(_drive_item_url(site_id, ctx.file_path(folder_name, file_name)))
+    logger.info("File '%s' exists=True size=%s", file_name, metadata.get("size", 0))
+
+    file_id = metadata.get("id")
+    cache = get_content_cache()
+    tag = metadata.get("cTag")
+    if cache is not None and tag:
+        cached = await asyncio.to_thread(cache.lookup, file_id, tag, file_name, options.key)
+        if cached is not None:
+            return cached
+
+    content_endpoint = f"sites/{site_id}/drive/items/{file_id}/content"
+    byte_range = download_range(file_name, options)
+    if byte_range is not None:
+        content_bytes = await client.download(content_endpoint, byte_range=byte_range)
+        result = await asyncio.to_thread(
+            content_result, file_name, content_bytes,
+            options=options, size=metadata.get("size", 0),
+        )
+    elif parses_from_disk(file_name):
+        # PDFs and workbooks go to disk and are read on demand
+        async with async_temp_download_path(os.path.splitext(file_name)[1]) as path:
+            fh = await asyncio.to_thread(open, path, "wb")
+            try:
+                await client.download_to(
+                    content_endpoint, fh, get_settings().shp_download_chunk_size,
+                )
+            finally:
+                await asyncio.to_thread(fh.close)
+            result = await asyncio.to_thread(
+                content_result, file_name, path=path, options=options,
+            )
+    else:
+        content_bytes = await client.download(content_endpoint)
+        result = await asyncio.to_thread(
+            content_result, file_name, content_bytes, options=options,
+        )
+    if cache is not None and tag:
+        await asyncio.to_thread(cache.store, file_id, tag, file_name, result, options.key)
+    return result
+
+
+@sp_retry
+async def upload_document(
+    folder_name: str,
+    file_name: str,
+    content: str,
+    is_base64: bool = False,
+) -> dict[str, Any]:
+    """Upload *file_name* with *content* to *folder_name*."""
+    ctx = await async_request_context()
+    client, site_id = ctx.async_client, ctx.site_id
+    logger.info("Uploading '%s' to '%s'", file_name, folder_name)
+
+    file_bytes = base64.b64decode(content) if is_base64 else content.encode("utf-8")
+    file_path = ctx.file_path(folder_name, file_name)
+    uploaded = await _upload(
+        client,
+        _drive_item_url(site_id, file_path, ":/content"),
+        _drive_item_url(site_id, file_path, ":/createUploadSession"),
+        file_bytes,
+    )
+    await asyncio.to_thread(record_upsert, uploaded)
+
+    return _item_result(f"File '{file_name}' uploaded successfully", uploaded)
+
+
+@sp_retry
+async def update_document(
+    folder_name: str,
+    file_name: str,
+    content: str,
+    is_base64: bool = False,
+) -> dict[str, Any]:
+    """Overwrite *file_name* in *folder_name* with new *content*."""
+    ctx = await async_request_context()
+    client, site_id = ctx.async_client, ctx.site_id
+
+    try:
+        metadata = await client.get(_drive_item_url(site_id, ctx.file_path(folder_name, file_name)))
+    except SharePointConnectionError as exc:
+        if http_status(exc) != 404:
+            raise
+        logger.error("File not found for update (folder=%s, file=%s, error=%s)",
+                     folder_name, file_name, exc)
+        return {
+            "success": False,
+            "message": f"File '{file_name}' does not exist in '{folder_name}'",
+        }
+
+    file_bytes = base64.b64decode(content) if is_base64 else content.encode("utf-8")
+    item = f"sites/{site_id}/drive/items/{metadata.get('id')}"
+    updated = await _upload(
+        client, f"{item}/content", f"{item}/createUploadSession", file_bytes,
+    )
+    await asyncio.to_thread(record_upsert, updated)
+
+    return _item_result(f"File '{file_name}' updated successfully", updated)
+
+
+@sp_retry
+async def delete_document(folder_name: str, file_name: str) -> dict[str, Any]:
+    """Delete *file_name* from *folder_name*."""
+    ctx = await async_request_context()
+    client, site_id = ctx.async_client, ctx.site_id
+
+    try:
+        metadata = await client.get(_drive_item_url(site_id, ctx.file_path(folder_name, file_name)))
+    except SharePointConnectionError as exc:
+        if http_status(exc) != 404:
+            raise
+        logger.error("File not found for deletion (folder=%s, file=%s, error=%s)",
+                     folder_name, file_name, exc)
+        return {
+            "success": False,
+            "message": f"File '{file_name}' does not exist in '{folder_name}'",
+        }
+
+    await client.delete(f"sites/{site_id}/drive/items/{metadata.get('id')}")
+    await asyncio.to_thread(record_removal, metadata.get("id"))
+    return {
+        "success": True,
+        "message": f"File '{file_name}' deleted successfully",
+    }
@@ -6,13 +6,22 @@ import io
 import logging
 import os
 import posixpath
-import tempfile
 from typing import Any
 
 from ..config import get_settings
-from ..core import get_sp_context
-from ..utils.parsers import detect_file_type, parse_excel, parse_pdf, parse_word
+from ..core.http import RangeBuffer, range_header
+from ..core.pagination import check_limit, collection_entries, page_result, page_top, take
+from ..core.request_context import request_context
+from ..utils.content_cache import get_content_cache
+from ..utils.parsers import ContentOptions
 from ..utils.retry import sp_retry
+from ..utils.transfer import save_download
+from .content import (
+    content_result,
+    download_range,
+    parses_from_disk,
+    temp_download_path,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -56,18 +65,26 @@ def _sp_path(sub_path: str = "") -> str:
 
 
 @sp_retry
-def list_documents(folder_name: str) -> list[dict[str, Any]]:
-    """List all files in *folder_name*."""
+def list_documents(
+    folder_name: str, limit: int | None = None, cursor: str | None = None,
+) -> list[dict[str, Any]] | dict[str, Any]:
+    """List files in *folder_name*.
+
+    Further pages are loaded while iterating; with *limit*/*cursor* one page
+    of results is returned with the ``next_cursor`` to continue from.
+    """
     logger.info("Listing documents in '%s'", folder_name)
-    ctx = get_sp_context()
+    check_limit(limit)
+    ctx = request_context().client
     folder = ctx.web.get_folder_by_server_relative_url(_sp_path(folder_name))
-    files = folder.files.top(500)
+    files = folder.files.paged(page_top(get_settings().shp_page_size, limit))
     ctx.load(
         files,
         ["ServerRelativeUrl", "Name", "Length", "TimeCreated", "TimeLastModified"],
     )
     ctx.execute_query()
-    return [
+    items, next_cursor = take(collection_entries(files, cursor), limit)
+    entries = [
         {
             "name": f.name,
             "url": f.properties.get("ServerRelativeUrl"),
@@ -83,8 +100,11 @@ def list_documents(folder_name: str) -> list[dict[str, Any]]:
                 else None
             ),
         }
-        for f in files
+        for f in items
     ]
+    if limit is None and cursor is None:
+        return entries
+    return page_result(entries, next_cursor)
 
 
 @sp_retry
@@ -92,7 +112,7 @@ def search_documents(query_text: str, row_limit: int = 20) -> list[dict[str, Any
     """Search SharePoint documents using KQL *query_text*."""
     from office365.sharepoint.search.query.request import SearchRequest
     logger.info("Searching SharePoint documents with query '%s'", query_text)
-    ctx = get_sp_context()
+    ctx = request_context().client
     
     # We scope the search to the site or specific document library using path
     # exclusion/inclusion if needed. For a general search within the site:
@@ -128,102 +148,59 @@ def search_documents(query_text: str, row_limit: int = 20) -> list[dict[str, Any
 
 @sp_retry
 def get_document_content(
-    folder_name: str, file_name: str,
+    folder_name: str, file_name: str, options: ContentOptions | None = None,
 ) -> dict[str, Any]:
     """Download and decode a file, returning its content."""
-    ctx = get_sp_context()
+    ctx = request_context().client
+    options = options or ContentOptions()
     file_path = _sp_path(f"{folder_name}/{file_name}")
     file = ctx.web.get_file_by_server_relative_url(file_path)
-    ctx.load(file, ["Exists", "Length", "Name"])
+    ctx.load(file, ["Exists", "Length", "Name", "UniqueId", "ContentTag"])
     ctx.execute_query()
     logger.info(
         "File '%s' exists=%s size=%s",
         file_name, file.exists, file.length,
     )
 
-    buf = io.BytesIO()
-    file.download(buf)
-    ctx.execute_query()
-    content_bytes = buf.getvalue()
-
-    file_type = detect_file_type(file_name)
-
-    if file_type == "pdf":
-        try:
-            text, pages = parse_pdf(content_bytes)
-            return {
-                "name": file_name,
-                "content_type": "text",
-                "content": text,
-                "original_type": "pdf",
-                "page_count": pages,
-                "size": len(content_bytes),
-            }
-        except Exception as exc:
-            logger.warning("PDF parse failed: %s", exc)
-
-    elif file_type == "excel":
-        try:
-            text, sheets = parse_excel(content_bytes)
-            return {
-                "name": file_name,
-                "content_type": "text",
-                "content": text,
-                "original_type": "excel",
-                "sheet_count": sheets,
-                "size": len(content_bytes),
-            }
-        except Exception as exc:
-            logger.error(
-                "Excel parse failed",
-                file_name=file_name,
-                error=str(exc),
-                error_type=type(exc).__name__
-            )
-            # Fallback to base64 for failed parse
-
-    elif file_type == "word":
-        try:
-            text, paragraphs = parse_word(content_bytes)
-            return {
-                "name": file_name,
-                "content_type": "text",
-                "content": text,
-                "original_type": "word",
-                "paragraph_count": paragraphs,
-                "size": len(content_bytes),
-            }
-        except Exception as exc:
-            logger.error(
-                "Word parse failed",
-                file_name=file_name,
-                error=str(exc),
-                error_type=type(exc).__name__
-            )
-            # Fallback to base64 for failed parse
-
-    elif file_type == "text":
-        try:
-            return {
-                "name": file_name,
-                "content_type": "text",
-                "content": content_bytes.decode("utf-8"),
-                "size": len(content_bytes),
-            }
-        except UnicodeDecodeError as exc:
-            logger.warning(
-                "Text decode failed, falling back to base64",
-                file_name=file_name,
-                error=str(exc)
-            )
+    # Unchanged content (same content tag) was already parsed
+    cache = get_content_cache()
+    item_id, tag = file.unique_id, file.content_tag
+    if cache is not None and item_id and tag:
+        cached = cache.lookup(item_id, tag, file_name, options.key)
+        if cached is not None:
+            return cached
+
+    byte_range = download_range(file_name, options)
+    if byte_range is not None:
+        buffer = RangeBuffer(byte_range, 206)
+        if byte_range[0] < file.length:
+            value = range_header(byte_range)["Range"]
+            content = file.get_content()
+            ctx.before_execute(lambda request: request.set_header("Range", value))
+            ctx.execute_query()
+            # A body as long as the whole file means the Range was ignored
+            if len(content.value) == file.length:
+                buffer = RangeBuffer(byte_range, 200)
+            buffer.feed(content.value)
+        result = content_result(
+            file_name, buffer.getvalue(), options=options, size=file.length,
+        )
+    elif parses_from_disk(file_name):
+        # PDFs and workbooks go to disk and are read on demand
+        with temp_download_path(os.path.splitext(file_name)[1]) as path:
+            with open(path, "wb") as fh:
+                file.download_session(fh, chunk_size=get_settings().shp_download_chunk_size)
+                ctx.execute_query()
+            result = content_result(file_name, path=path, options=options)
+    else:
+        buf = io.BytesIO()
+        file.download(buf)
+        ctx.execute_query()
+        result = content_result(file_name, buf.getvalue(), options=options)
 
-    # Fallback: return as base64 binary
-    return {
-        "name": file_name,
-        "content_type": "binary",
-        "content_base64": base64.b64encode(content_bytes).decode(),
-        "size": len(content_bytes),
-    }
+    if cache is not None and item_id and tag:
+        cache.store(item_id, tag, file_name, result, options.key)
+    return result
 
 
 @sp_retry
@@ -234,7 +211,7 @@ def upload_document(
     is_base64: bool = False,
 ) -> dict[str, Any]:
     """Upload *file_name* with *content* to *folder_name*."""
-    ctx = get_sp_context()
+    ctx = request_context().client
     logger.info("Uploading '%s' to '%s'", file_name, folder_name)
     file_bytes = (
         base64.b64decode(content) if is_base64
@@ -262,18 +239,24 @@ def upload_from_path(
     new_name: str | None = None,
 ) -> dict[str, Any]:
     """Upload a local file at *file_path* to *folder_name*."""
-    ctx = get_sp_context()
+    ctx = request_context().client
     dest_name = new_name or os.path.basename(file_path)
     logger.info(
         "Uploading from path '%s' as '%s'", file_path, dest_name,
     )
-    with open(file_path, "rb") as fh:
-        file_bytes = fh.read()
+    settings = get_settings()
     folder = ctx.web.get_folder_by_server_relative_url(
         _sp_path(folder_name),
     )
-    uploaded = folder.upload_file(dest_name, file_bytes)
-    ctx.execute_query()
+    with open(file_path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size <= settings.shp_upload_session_threshold:
+            uploaded = folder.upload_file(dest_name, fh.read())
+        else:
+            # StartUpload/ContinueUpload/FinishUpload, reading one chunk at a time
+            uploaded = folder.files.create_upload_session(
+                fh, settings.shp_upload_chunk_size, file_name=dest_name,
+            )
+        ctx.execute_query()
     return {
         "success": True,
         "message": f"File '{dest_name}' uploaded successfully",
@@ -292,7 +275,7 @@ def update_document(
     is_base64: bool = False,
 ) -> dict[str, Any]:
     """Overwrite *file_name* in *folder_name* with new *content*."""
-    ctx = get_sp_context()
+    ctx = request_context().client
     file_path = _sp_path(f"{folder_name}/{file_name}")
     file = ctx.web.get_file_by_server_relative_url(file_path)
     ctx.load(file, ["Exists", "Name", "ServerRelativeUrl"])
@@ -326,12 +309,38 @@ def update_document(
     }
 
 
+@sp_retry
+def update_from_path(
+    folder_name: str,
+    file_name: str,
+    file_path: str,
+) -> dict[str, Any]:
+    """Overwrite *file_name* in *folder_name* with the local file at *file_path*."""
+    ctx = request_context().client
+    file = ctx.web.get_file_by_server_relative_url(_sp_path(f"{folder_name}/{file_name}"))
+    ctx.load(file, ["Exists"])
+    ctx.execute_query()
+
+    if not file.exists:
+        return {
+            "success": False,
+            "message": (
+                f"File '{file_name}' does not exist "
+                f"in '{folder_name}'"
+            ),
+        }
+
+    result = upload_from_path(folder_name, file_path, file_name)
+    result["message"] = f"File '{file_name}' updated successfully"
+    return result
+
+
 @sp_retry
 def delete_document(
     folder_name: str, file_name: str,
 ) -> dict[str, Any]:
     """Delete *file_name* from *folder_name*."""
-    ctx = get_sp_context()
+    ctx = request_context().client
     file_path = _sp_path(f"{folder_name}/{file_name}")
     file = ctx.web.get_file_by_server_relative_url(file_path)
     ctx.load(file, ["Exists"])
@@ -361,7 +370,7 @@ def download_document(
     local_path: str,
 ) -> dict[str, Any]:
     """Download a SharePoint file to *local_path* (fallback: system temp)."""
-    ctx = get_sp_context()
+    ctx = request_context().client
     logger.info(
         "Downloading '%s/%s' → '%s'",
         folder_name, file_name, local_path,
@@ -379,52 +388,16 @@ def download_document(
             "error": f"File '{file_name}' not found in '{folder_name}'",
         }
 
-    buf = io.BytesIO()
-    file.download(buf)
-    ctx.execute_query()
-    content_bytes = buf.getvalue()
+    # Stream content straight to disk; nothing is buffered in memory
+    settings = get_settings()
 
-    def _save(path: str) -> dict[str, Any]:
-        try:
-            directory = os.path.dirname(path)
-            if directory:
-                os.makedirs(directory, exist_ok=True)
-            with open(path, "wb") as fh:
-                fh.write(content_bytes)
-            if (
-                os.path.exists(path)
-                and os.path.getsize(path) == len(content_bytes)
-            ):
-                return {
-                    "success": True,
-                    "path": os.path.abspath(path),
-                    "size": len(content_bytes),
-                }
-            raise OSError("File verification failed after write")
-        except Exception as exc:
-            logger.error("Save failed for '%s': %s", path, exc)
-            return {"success": False, "error": str(exc)}
-
-    primary = _save(local_path)
-    if primary["success"]:
-        return {**primary, "method": "primary"}
-
-    logger.warning(
-        "Primary save failed (%s), trying fallback",
-        primary["error"],
-    )
-    fallback_dir = tempfile.gettempdir()
-    fallback = _save(os.path.join(fallback_dir, file_name))
-    if fallback["success"]:
-        return {
-            **fallback,
-            "method": "fallback",
-            "primary_error": primary["error"],
-        }
+    def _write(sink: Any) -> None:
+        file.download_session(sink, chunk_size=settings.shp_download_chunk_size)
+        ctx.execute_query()
 
-    return {
-        "success": False,
-        "error": "Both primary and fallback saves failed",
-        "primary_error": primary["error"],
-        "fallback_error": fallback["error"],
-    }
+    return save_download(
+        _write,
+        local_path,
+        file_name,
+        expected_size=file.length if settings.shp_download_verify != "none" else None,
+    )
@@ -1,31 +1,37 @@
-"""Unified folder service supporting both Office365 and Graph APIs."""
+"""Unified folder service supporting both Office365 and Graph APIs.
+
+The ``*_async`` variants are what tool handlers await (see document_service).
+"""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
-from ..core import get_sp_context
+from ..core.client_async import async_graph_enabled
+from ..core.request_context import request_context, request_scoped
+from ..utils.cache import cached, invalidates, join_path
 
 logger = logging.getLogger(__name__)
 
 
-def list_folders(parent_folder: str | None = None) -> list[dict[str, Any]]:
-    """List sub-folders in *parent_folder* (or library root if omitted)."""
-    client = get_sp_context()
-    
-    if client.api_type in ("graph", "graphql"):
+@request_scoped
+def list_folders(
+    parent_folder: str | None = None, limit: int | None = None, cursor: str | None = None,
+) -> list[dict[str, Any]] | dict[str, Any]:
+    """List sub-folders in *parent_folder* (one page of them with *limit*/*cursor*)."""
+    if request_context().is_graph:
         from . import folder_service_graph
-        return folder_service_graph.list_folders(parent_folder)
+        return folder_service_graph.list_folders(parent_folder, limit, cursor)
     else:
         from . import folder_service_office365
-        return folder_service_office365.list_folders(parent_folder)
+        return folder_service_office365.list_folders(parent_folder, limit, cursor)
 
 
+@request_scoped
 def create_folder(folder_name: str, parent_folder: str | None = None) -> dict[str, Any]:
     """Create *folder_name* inside *parent_folder* (or library root)."""
-    client = get_sp_context()
-    
-    if client.api_type in ("graph", "graphql"):
+    if request_context().is_graph:
         from . import folder_service_graph
         return folder_service_graph.create_folder(folder_name, parent_folder)
     else:
@@ -33,11 +39,10 @@ def create_folder(folder_name: str, parent_folder: str | None = None) -> dict[st
         return folder_service_office365.create_folder(folder_name, parent_folder)
 
 
+@request_scoped
 def delete_folder(folder_path: str) -> dict[str, Any]:
     """Delete the empty folder at *folder_path*."""
-    client = get_sp_context()
-    
-    if client.api_type in ("graph", "graphql"):
+    if request_context().is_graph:
         from . import folder_service_graph
         return folder_service_graph.delete_folder(folder_path)
     else:
@@ -45,13 +50,51 @@ def delete_folder(folder_path: str) -> dict[str, Any]:
         return folder_service_office365.delete_folder(folder_path)
 
 
+@cached("get_folder_tree", lambda parent_folder=None: parent_folder, recursive=True)
+@request_scoped
 def get_folder_tree(parent_folder: str | None = None) -> dict[str, Any]:
     """Return a recursive tree of folders and files starting at *parent_folder*."""
-    client = get_sp_context()
-    
-    if client.api_type in ("graph", "graphql"):
+    if request_context().is_graph:
         from . import folder_service_graph
         return folder_service_graph.get_folder_tree(parent_folder)
     else:
         from . import folder_service_office365
         return folder_service_office365.get_folder_tree(parent_folder)
+
+
+# ---------------------------------------------------------------------------
+# Async entry points
+# ---------------------------------------------------------------------------
+
+@cached("list_folders", lambda parent_folder=None, *_args, **_kwargs: parent_folder)
+@request_scoped
+async def list_folders_async(
+    parent_folder: str | None = None, limit: int | None = None, cursor: str | None = None,
+) -> list[dict[str, Any]] | dict[str, Any]:
+    """Async variant of :func:`list_folders`."""
+    if async_graph_enabled():
+        from . import folder_service_graph_async
+        return await folder_service_graph_async.list_folders(parent_folder, limit, cursor)
+    return await asyncio.to_thread(list_folders, parent_folder, limit, cursor)
+
+
+@invalidates(lambda folder_name, parent_folder=None: [join_path(parent_folder, folder_name)])
+@request_scoped
+async def create_folder_async(
+    folder_name: str, parent_folder: str | None = None,
+) -> dict[str, Any]:
+    """Async variant of :func:`create_folder`."""
+    if async_graph_enabled():
+        from . import folder_service_graph_async
+        return await folder_service_graph_async.create_folder(folder_name, parent_folder)
+    return await asyncio.to_thread(create_folder, folder_name, parent_folder)
+
+
+@invalidates(lambda folder_path: [folder_path])
+@request_scoped
+async def delete_folder_async(folder_path: str) -> dict[str, Any]:
+    """Async variant of :func:`delete_folder`."""
+    if async_graph_enabled():
+        from . import folder_service_graph_async
+        return await folder_service_graph_async.delete_folder(folder_path)
+    return await asyncio.to_thread(delete_folder, folder_path)
@@ -2,46 +2,39 @@
 from __future__ import annotations
 
 import logging
-import posixpath
-import time
+from collections.abc import Callable, Iterator
 from typing import Any
 from urllib.parse import quote
 
 from ..config import get_settings
-from ..core import get_sp_context
-from ..exceptions import SharePointConnectionError
-from ..utils.retry import sp_retry
+from ..core.batch import MAX_BATCH_SIZE, batch_get
+from ..core.drive_index import get_drive_index, record_removal, record_upsert
+from ..core.pagination import (
+    Entry,
+    check_limit,
+    collection_params,
+    cursor_link,
+    iter_entries,
+    iter_pages,
+    list_entries,
+    page_result,
+    relative_link,
+    take,
+    with_query,
+)
+from ..core.request_context import request_context
+from ..exceptions import SharePointCircuitOpenError, SharePointConnectionError
+from ..utils.crawler import AdaptiveRateLimiter, Listing, assemble_tree, crawl_tree
+from ..utils.retry import http_status, sp_retry
 
 logger = logging.getLogger(__name__)
 
-
-def _normalize_path(sub_path: str | None = None) -> str:
-    """Build drive-relative path from configured scope + sub_path.
-
-    Returns empty string when both scope and sub_path are empty (= drive root).
-    Graph API's drive/root already IS the document library, so NO library name
-    is prepended.
-    
-    This function now uses the GraphClient's normalize_path method to properly
-    handle SharePoint library names like "Shared Documents".
-    """
-    client = get_sp_context()
-    scope = get_settings().shp_doc_library
-    clean_path = posixpath.normpath(f"/{sub_path}").lstrip("/") if sub_path else ""
-    if clean_path.startswith(".."):
-        raise ValueError(f"Invalid path traversal attempt: {sub_path}")
-    
-    # Combine scope and path
-    parts = [p for p in [scope, clean_path] if p]
-    combined_path = "/".join(parts)
-    
-    # Use client's normalize_path if available (for Graph API)
-    if hasattr(client, 'normalize_path'):
-        normalized = client.normalize_path(combined_path)
-        logger.debug(f"Path normalization: '{combined_path}' → '{normalized}'")
-        return normalized
-    
-    return combined_path
+_DELTA_SELECT = (
+    "id,name,folder,file,size,webUrl,createdDateTime,lastModifiedDateTime,"
+    "parentReference,deleted,root"
+)
+_FOLDER_SELECT = "id,name,webUrl,createdDateTime,lastModifiedDateTime,folder"
+_TREE_SELECT = "id,name,webUrl,size,createdDateTime,lastModifiedDateTime,file,folder"
 
 
 def _drive_item_url(site_id: str, path: str, suffix: str = "") -> str:
@@ -58,41 +51,191 @@ def _drive_item_url(site_id: str, path: str, suffix: str = "") -> str:
     return f"sites/{site_id}/drive/root{suffix.lstrip(':')}"
 
 
-@sp_retry
-def list_folders(parent_folder: str | None = None) -> list[dict[str, Any]]:
-    """List sub-folders in *parent_folder* (or library root if omitted)."""
-    logger.info("Listing folders in %s", parent_folder or "root")
-    client = get_sp_context()
-    site_id = client._get_site_id()
-    
-    folder_path = _normalize_path(parent_folder)
-    
-    # Get folder children
-    endpoint = _drive_item_url(site_id, folder_path, ":/children")
-    response = client.get(endpoint)
-    
-    items = response.get("value", [])
-    
-    # Filter only folders
+def _folder_entry(item: dict[str, Any]) -> dict[str, Any]:
+    """Shape a drive item as a List_SharePoint_Folders entry."""
+    return {
+        "name": item.get("name"),
+        "url": item.get("webUrl"),
+        "created": item.get("createdDateTime"),
+        "modified": item.get("lastModifiedDateTime"),
+    }
+
+
+def _new_folder_body(folder_name: str) -> dict[str, Any]:
+    """Request body for creating *folder_name* (fails if it already exists)."""
+    return {
+        "name": folder_name,
+        "folder": {},
+        "@microsoft.graph.conflictBehavior": "fail"
+    }
+
+
+def _created_result(folder_name: str, new_folder: dict[str, Any]) -> dict[str, Any]:
+    """Build the success payload for a created folder."""
+    return {
+        "success": True,
+        "message": f"Folder '{folder_name}' created successfully",
+        "folder": {"name": new_folder.get("name"), "url": new_folder.get("webUrl")},
+    }
+
+
+def _tree_nodes(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Shape drive items as tree nodes, folders first."""
     folders = [item for item in items if "folder" in item]
-    
+    files = [item for item in items if "file" in item]
     return [
+        {"name": f.get("name"), "type": "folder", "children": []}
+        for f in folders
+    ] + [
         {
             "name": f.get("name"),
-            "url": f.get("webUrl"),
+            "path": f.get("webUrl"),
+            "type": "file",
+            "size": f.get("size"),
             "created": f.get("createdDateTime"),
             "modified": f.get("lastModifiedDateTime"),
         }
-        for f in folders
+        for f in files
     ]
 
 
+def _children_entries(
+    client: Any,
+    site_id: str,
+    folder_path: str,
+    select: str,
+    limit: int | None = None,
+    cursor: str | None = None,
+) -> Iterator[Entry]:
+    """Children of *folder_path*: from the drive index if possible, else paged from Graph."""
+    index = get_drive_index()
+    if index is not None and not cursor_link(cursor):
+        items = index.listing(client, site_id, folder_path)
+        if items is not None:
+            return list_entries(items, cursor)
+    return iter_entries(
+        client,
+        _drive_item_url(site_id, folder_path, ":/children"),
+        collection_params(get_settings().shp_page_size, limit, select),
+        cursor,
+    )
+
+
+def _children_listing(client: Any, folder_path: str, response: dict[str, Any]) -> Listing:
+    """Turn a ``children`` response and its further pages into tree nodes plus sub-folder paths."""
+    items = response.get("value", [])
+    if response.get("@odata.nextLink"):
+        items = list(items)
+        for page in iter_pages(client, relative_link(response["@odata.nextLink"])):
+            items.extend(page.get("value", []))
+    sub_folders = [
+        f"{folder_path}/{item.get('name')}".strip("/") for item in items if "folder" in item
+    ]
+    return _tree_nodes(items), sub_folders
+
+
+def _delta_tree(client: Any, site_id: str, root_id: str, max_depth: int) -> list[dict]:
+    """Build the tree below *root_id* from a single paged ``root/delta`` scan.
+
+    SharePoint only supports delta on the drive root, so the whole drive is
+    enumerated and the subtree is picked out locally. Delta responses carry
+    ``parentReference.id`` but no ``parentReference.path``, so items are
+    linked to their parents by id.
+    """
+    children_by_parent: dict[str, list[dict[str, Any]]] = {}
+    pages = iter_pages(
+        client,
+        f"sites/{site_id}/drive/root/delta",
+        params={"$select": _DELTA_SELECT},
+    )
+    for page in pages:
+        for item in page.get("value", []):
+            if "deleted" in item or "root" in item:
+                continue
+            parent_id = (item.get("parentReference") or {}).get("id")
+            children_by_parent.setdefault(parent_id, []).append(item)
+
+    def _children_of(folder_id: str) -> list[dict[str, Any]]:
+        return sorted(
+            children_by_parent.get(folder_id, []), key=lambda i: (i.get("name") or "").lower()
+        )
+
+    return _assemble_by_id(_children_of, root_id, max_depth)
+
+
+def _assemble_by_id(
+    children_of: Callable[[str], list[dict[str, Any]]], root_id: str, max_depth: int,
+) -> list[dict]:
+    """Build tree nodes below *root_id* from an id -> children lookup."""
+
+    def _build(folder_id: str, depth: int) -> list[dict]:
+        # Same depth semantics as the crawler: folders at max_depth stay unlisted
+        if depth >= max_depth:
+            return []
+        items = children_of(folder_id)
+        nodes = _tree_nodes(items)
+        folder_ids = [item["id"] for item in items if "folder" in item]
+        for node, folder_id in zip(nodes, folder_ids):
+            node["children"] = _build(folder_id, depth + 1)
+        return nodes
+
+    return _build(root_id, 0)
+
+
+def _tree_root(root: dict[str, Any], children: list[dict]) -> dict[str, Any]:
+    """Wrap the assembled *children* in the root folder node."""
+    return {
+        "name": root.get("name"),
+        "path": root.get("webUrl"),
+        "type": "folder",
+        "created": root.get("createdDateTime"),
+        "modified": root.get("lastModifiedDateTime"),
+        "children": children,
+    }
+
+
+def _not_empty_result(children: list[dict[str, Any]]) -> dict[str, Any] | None:
+    """Return the refusal payload if a folder to delete still has *children*."""
+    file_count = sum(1 for c in children if "file" in c)
+    folder_count = sum(1 for c in children if "folder" in c)
+    if file_count > 0:
+        return {"success": False, "message": f"Folder contains {file_count} file(s)"}
+    if folder_count > 0:
+        return {"success": False, "message": f"Folder contains {folder_count} sub-folder(s)"}
+    return None
+
+
 @sp_retry
+def list_folders(
+    parent_folder: str | None = None, limit: int | None = None, cursor: str | None = None,
+) -> list[dict[str, Any]] | dict[str, Any]:
+    """List sub-folders in *parent_folder* (or library root if omitted).
+
+    Every page is read unless *limit* or *cursor* is given; then one page of
+    results is returned with the ``next_cursor`` to continue from.
+    """
+    logger.info("Listing folders in %s", parent_folder or "root")
+    check_limit(limit)
+    ctx = request_context()
+    client, site_id = ctx.client, ctx.site_id
+    
+    folder_path = ctx.path(parent_folder)
+    entries = _children_entries(client, site_id, folder_path, _FOLDER_SELECT, limit, cursor)
+    
+    # Filter only folders
+    items, next_cursor = take(entries, limit, keep=lambda item: "folder" in item)
+    folders = [_folder_entry(item) for item in items]
+    if limit is None and cursor is None:
+        return folders
+    return page_result(folders, next_cursor)
+
+
+@sp_retry(idempotent=False)
 def create_folder(folder_name: str, parent_folder: str | None = None) -> dict[str, Any]:
     """Create *folder_name* inside *parent_folder* (or library root)."""
-    client = get_sp_context()
-    site_id = client._get_site_id()
-    parent_path = _normalize_path(parent_folder)
+    ctx = request_context()
+    client, site_id = ctx.client, ctx.site_id
+    parent_path = ctx.path(parent_folder)
     logger.info("Creating folder '%s' in '%s'", folder_name, parent_path)
 
     # Guard: folder already exists?
@@ -103,19 +246,10 @@ def create_folder(folder_name: str, parent_folder: str | None = None) -> dict[st
     # Create folder
     endpoint = _drive_item_url(site_id, parent_path, ":/children")
     
-    data = {
-        "name": folder_name,
-        "folder": {},
-        "@microsoft.graph.conflictBehavior": "fail"
-    }
-    
     try:
-        new_folder = client.post(endpoint, data)
-        return {
-            "success": True,
-            "message": f"Folder '{folder_name}' created successfully",
-            "folder": {"name": new_folder.get("name"), "url": new_folder.get("webUrl")},
-        }
+        new_folder = client.post(endpoint, _new_folder_body(folder_name))
+        record_upsert(new_folder)
+        return _created_result(folder_name, new_folder)
     except Exception as exc:
         logger.error(f"Failed to create folder: {exc}")
         return {"success": False, "message": f"Failed to create folder: {exc}"}
@@ -124,9 +258,9 @@ def create_folder(folder_name: str, parent_folder: str | None = None) -> dict[st
 @sp_retry
 def delete_folder(folder_path: str) -> dict[str, Any]:
     """Delete the empty folder at *folder_path*."""
-    client = get_sp_context()
-    site_id = client._get_site_id()
-    full_path = _normalize_path(folder_path)
+    ctx = request_context()
+    client, site_id = ctx.client, ctx.site_id
+    full_path = ctx.path(folder_path)
     logger.info("Deleting folder: %s", full_path)
     
     # Get folder to check if it exists and get its ID
@@ -135,29 +269,25 @@ def delete_folder(folder_path: str) -> dict[str, Any]:
         metadata = client.get(metadata_endpoint)
         folder_id = metadata.get("id")
     except SharePointConnectionError as exc:
+        if http_status(exc) != 404:
+            raise
         logger.error(
-            "Folder not found for deletion",
-            folder_path=folder_path,
-            error=str(exc)
+            "Folder not found for deletion (folder_path=%s, error=%s)",
+            folder_path, exc,
         )
         return {"success": False, "message": f"Folder '{folder_path}' does not exist"}
 
     # Check if folder has children
     children_endpoint = f"sites/{site_id}/drive/items/{folder_id}/children"
     children_response = client.get(children_endpoint)
-    children = children_response.get("value", [])
-    
-    if len(children) > 0:
-        file_count = sum(1 for c in children if "file" in c)
-        folder_count = sum(1 for c in children if "folder" in c)
-        if file_count > 0:
-            return {"success": False, "message": f"Folder contains {file_count} file(s)"}
-        if folder_count > 0:
-            return {"success": False, "message": f"Folder contains {folder_count} sub-folder(s)"}
+    not_empty = _not_empty_result(children_response.get("value", []))
+    if not_empty:
+        return not_empty
 
     # Delete folder
     delete_endpoint = f"sites/{site_id}/drive/items/{folder_id}"
     client.delete(delete_endpoint)
+    record_removal(folder_id)
     
     return {"success": True, "message": f"Folder '{folder_path}' deleted successfully"}
 
@@ -166,17 +296,30 @@ def delete_folder(folder_path: str) -> dict[str, Any]:
 def get_folder_tree(parent_folder: str | None = None) -> dict[str, Any]:
     """Return a recursive tree of folders and files starting at *parent_folder*."""
     cfg = get_settings()
-    client = get_sp_context()
-    site_id = client._get_site_id()
-    root_path = _normalize_path(parent_folder)
+    ctx = request_context()
+    client, site_id = ctx.client, ctx.site_id
+    root_path = ctx.path(parent_folder)
     logger.info("Building folder tree for '%s'", parent_folder or "root")
 
+    index = get_drive_index()
+    if index is not None:
+        index.ensure_fresh(client, site_id)
+        root = index.item_at(root_path)
+        if root is not None and "folder" in root:
+            index.hits += 1
+            children = _assemble_by_id(index.children, root["id"], cfg.shp_max_depth)
+            return _tree_root(root, children)
+        index.misses += 1
+
     try:
         root_endpoint = _drive_item_url(site_id, root_path)
         root = client.get(root_endpoint)
+    except SharePointCircuitOpenError:
+        raise  # lets the response cache serve its last answer
     except Exception as exc:
         logger.error("Cannot access root folder '%s': %s", root_path, exc)
         return {
+            "success": False,
             "name": root_path.split("/")[-1],
             "path": root_path,
             "type": "folder",
@@ -184,72 +327,33 @@ def get_folder_tree(parent_folder: str | None = None) -> dict[str, Any]:
             "children": [],
         }
 
-    tree_nodes: dict[str, list] = {}
-    pending = [parent_folder or ""]
-
-    for level in range(cfg.shp_max_depth):
-        if not pending:
-            break
-        logger.info("Tree level %d: %d folder(s)", level + 1, len(pending))
-        current, pending = pending.copy(), []
+    if cfg.shp_tree_engine == "delta":
+        children = _delta_tree(client, site_id, root.get("id"), cfg.shp_max_depth)
+        return _tree_root(root, children)
 
-        while current:
-            batch, current = (
-                current[: cfg.shp_max_folders_per_level],
-                current[cfg.shp_max_folders_per_level :],
+    def _list_children(group: list[str]) -> list[Listing | Exception]:
+        params = collection_params(cfg.shp_page_size, None, _TREE_SELECT)
+        endpoints = [
+            with_query(_drive_item_url(site_id, ctx.path(fp), ":/children"), params)
+            for fp in group
+        ]
+        return [
+            response if isinstance(response, Exception)
+            else _children_listing(client, fp, response)
+            # crawl_tree re-queues throttled folders itself
+            for fp, response in zip(
+                group, batch_get(client, endpoints, retry_throttled=False)
             )
-            for fp in batch:
-                try:
-                    folder_path = _normalize_path(fp)
-                    children_endpoint = _drive_item_url(site_id, folder_path, ":/children")
-                    response = client.get(children_endpoint)
-                    items = response.get("value", [])
-                    
-                    folders = [item for item in items if "folder" in item]
-                    files = [item for item in items if "file" in item]
-                    
-                    tree_nodes[fp] = [
-                        {"name": f.get("name"), "type": "folder", "children": []} 
-                        for f in folders
-                    ] + [
-                        {
-                            "name": f.get("name"),
-                            "path": f.get("webUrl"),
-                            "type": "file",
-                            "size": f.get("size"),
-                            "created": f.get("createdDateTime"),
-                            "modified": f.get("lastModifiedDateTime"),
-                        }
-                        for f in files
-                    ]
-                    pending.extend(
-                        f"{fp}/{f.get('name')}".strip("/") for f in folders
-                    )
-                except SharePointConnectionError as exc:
-                    logger.warning(
-                        "Failed to process folder in tree traversal",
-                        folder_path=fp,
-                        error=str(exc),
-                        error_type=type(exc).__name__
-                    )
-            if current:
-                time.sleep(0.1)
-
-        if level < cfg.shp_max_depth - 1:
-            time.sleep(cfg.shp_level_delay)
-
-    def _build(path: str) -> list[dict]:
-        children = tree_nodes.get(path, [])
-        for child in children:
-            if child["type"] == "folder":
-                child["children"] = _build(f"{path}/{child['name']}".strip("/"))
-        return children
+        ]
 
-    return {
-        "name": root.get("name"),
-        "path": root.get("webUrl"),
-        "type": "folder",
-        "created": root.get("createdDateTime"),
-        "modified": root.get("lastModifiedDateTime"),
-        "children": _build(parent_folder or ""),
-    }
+    tree_nodes = crawl_tree(
+        parent_folder or "",
+        _list_children,
+        max_depth=cfg.shp_max_depth,
+        max_folders_per_level=cfg.shp_max_folders_per_level,
+        workers=cfg.shp_tree_workers,
+        limiter=AdaptiveRateLimiter(cfg.shp_tree_rate_limit),
+        group_size=MAX_BATCH_SIZE,
+    )
+
+    return _tree_root(root, assemble_tree(tree_nodes, parent_folder or ""))
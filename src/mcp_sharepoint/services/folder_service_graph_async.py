@@ -0,0 +1,136 @@
+"""Folder operations using Microsoft Graph API on the asyncio transport.
+
+Async counterparts of ``folder_service_graph`` (tree building stays on the
+sync path).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+
+from ..config import get_settings
+from ..core.drive_index import get_drive_index, record_removal, record_upsert
+from ..core.pagination import (
+    Entry,
+    check_limit,
+    collection_params,
+    cursor_link,
+    iter_entries_async,
+    list_entries,
+    page_result,
+    take_async,
+)
+from ..core.request_context import async_request_context
+from ..exceptions import SharePointConnectionError
+from ..utils.retry import http_status, sp_retry
+from .folder_service_graph import (
+    _FOLDER_SELECT,
+    _created_result,
+    _drive_item_url,
+    _folder_entry,
+    _new_folder_body,
+    _not_empty_result,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _children_entries(
+    client: Any,
+    site_id: str,
+    folder_path: str,
+    select: str,
+    limit: int | None = None,
+    cursor: str | None = None,
+) -> AsyncIterator[Entry]:
+    """Children of *folder_path*: from the drive index if possible, else paged from Graph."""
+    index = get_drive_index()
+    if index is not None and not cursor_link(cursor):
+        items = await asyncio.to_thread(index.listing, client.sync_client, site_id, folder_path)
+        if items is not None:
+            for entry in list_entries(items, cursor):
+                yield entry
+            return
+    entries = iter_entries_async(
+        client,
+        _drive_item_url(site_id, folder_path, ":/children"),
+        collection_params(get_settings().shp_page_size, limit, select),
+        cursor,
+    )
+    async for entry in entries:
+        yield entry
+
+
+@sp_retry
+async def list_folders(
+    parent_folder: str | None = None, limit: int | None = None, cursor: str | None = None,
+) -> list[dict[str, Any]] | dict[str, Any]:
+    """List sub-folders in *parent_folder* (or library root if omitted)."""
+    logger.info("Listing folders in %s", parent_folder or "root")
+    check_limit(limit)
+    ctx = await async_request_context()
+    client, site_id = ctx.async_client, ctx.site_id
+
+    folder_path = ctx.path(parent_folder)
+    items, next_cursor = await take_async(
+        _children_entries(client, site_id, folder_path, _FOLDER_SELECT, limit, cursor),
+        limit,
+        keep=lambda item: "folder" in item,
+    )
+    folders = [_folder_entry(item) for item in items]
+    if limit is None and cursor is None:
+        return folders
+    return page_result(folders, next_cursor)
+
+
+@sp_retry(idempotent=False)
+async def create_folder(folder_name: str, parent_folder: str | None = None) -> dict[str, Any]:
+    """Create *folder_name* inside *parent_folder* (or library root)."""
+    ctx = await async_request_context()
+    client, site_id = ctx.async_client, ctx.site_id
+    parent_path = ctx.path(parent_folder)
+    logger.info("Creating folder '%s' in '%s'", folder_name, parent_path)
+
+    # Guard: folder already exists?
+    existing = await list_folders(parent_folder)
+    if any(f["name"] == folder_name for f in existing):
+        return {"success": False, "message": f"Folder '{folder_name}' already exists"}
+
+    endpoint = _drive_item_url(site_id, parent_path, ":/children")
+    try:
+        new_folder = await client.post(endpoint, _new_folder_body(folder_name))
+        await asyncio.to_thread(record_upsert, new_folder)
+        return _created_result(folder_name, new_folder)
+    except Exception as exc:
+        logger.error(f"Failed to create folder: {exc}")
+        return {"success": False, "message": f"Failed to create folder: {exc}"}
+
+
+@sp_retry
+async def delete_folder(folder_path: str) -> dict[str, Any]:
+    """Delete the empty folder at *folder_path*."""
+    ctx = await async_request_context()
+    client, site_id = ctx.async_client, ctx.site_id
+    full_path = ctx.path(folder_path)
+    logger.info("Deleting folder: %s", full_path)
+
+    try:
+        metadata = await client.get(_drive_item_url(site_id, full_path))
+        folder_id = metadata.get("id")
+    except SharePointConnectionError as exc:
+        if http_status(exc) != 404:
+            raise
+        logger.error("Folder not found for deletion (folder_path=%s, error=%s)",
+                     folder_path, exc)
+        return {"success": False, "message": f"Folder '{folder_path}' does not exist"}
+
+    children = await client.get(f"sites/{site_id}/drive/items/{folder_id}/children")
+    not_empty = _not_empty_result(children.get("value", []))
+    if not_empty:
+        return not_empty
+
+    await client.delete(f"sites/{site_id}/drive/items/{folder_id}")
+    await asyncio.to_thread(record_removal, folder_id)
+    return {"success": True, "message": f"Folder '{folder_path}' deleted successfully"}
@@ -3,11 +3,15 @@ from __future__ import annotations
 
 import logging
 import posixpath
-import time
+import threading
 from typing import Any
 
 from ..config import get_settings
-from ..core import get_sp_context
+from ..core.client import _create_office365_client
+from ..core.pagination import check_limit, collection_entries, page_result, page_top, take
+from ..core.request_context import request_context
+from ..exceptions import SharePointCircuitOpenError
+from ..utils.crawler import AdaptiveRateLimiter, Listing, assemble_tree, crawl_tree
 from ..utils.retry import sp_retry
 
 logger = logging.getLogger(__name__)
@@ -24,54 +28,121 @@ def _sp_path(sub_path: str | None = None) -> str:
     return "/".join(parts)
 
 
-@sp_retry
-def _load_items(path: str, item_type: str) -> list[dict[str, Any]]:
-    """Generic loader for folders or files from a SharePoint path."""
-    ctx = get_sp_context()
-    folder = ctx.web.get_folder_by_server_relative_url(path)
-    items = getattr(folder, item_type).top(500)
-    props = ["ServerRelativeUrl", "Name", "TimeCreated", "TimeLastModified"] + (
+def _item_entry(item: Any, item_type: str) -> dict[str, Any]:
+    """Shape a loaded SharePoint folder or file as a plain dict."""
+    entry: dict[str, Any] = {
+        "name": item.name,
+        "url": item.properties.get("ServerRelativeUrl"),
+        "created": (
+            item.properties["TimeCreated"].isoformat()
+            if item.properties.get("TimeCreated")
+            else None
+        ),
+        "modified": (
+            item.properties["TimeLastModified"].isoformat()
+            if item.properties.get("TimeLastModified")
+            else None
+        ),
+    }
+    if item_type == "files":
+        entry["size"] = item.properties.get("Length")
+    return entry
+
+
+def _item_props(item_type: str) -> list[str]:
+    return ["ServerRelativeUrl", "Name", "TimeCreated", "TimeLastModified"] + (
         ["Length"] if item_type == "files" else []
     )
-    ctx.load(items, props)
+
+
+@sp_retry
+def _load_items(
+    path: str, item_type: str, limit: int | None = None, cursor: str | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Generic loader for folders or files from a SharePoint path.
+
+    Returns up to *limit* entries from *cursor* on, plus the next cursor.
+    """
+    ctx = request_context().client
+    folder = ctx.web.get_folder_by_server_relative_url(path)
+    items = getattr(folder, item_type).paged(page_top(get_settings().shp_page_size, limit))
+    ctx.load(items, _item_props(item_type))
     ctx.execute_query()
+    loaded, next_cursor = take(collection_entries(items, cursor), limit)
+    return [_item_entry(item, item_type) for item in loaded], next_cursor
+
+
+_worker = threading.local()
+
+
+def _worker_context() -> Any:
+    """ClientContext private to the calling tree-crawler thread.
+
+    A ClientContext queues pending queries until ``execute_query``, so one
+    context cannot be shared by concurrent workers.
+    """
+    ctx = getattr(_worker, "ctx", None)
+    if ctx is None:
+        ctx = _worker.ctx = _create_office365_client(get_settings()).ctx
+    return ctx
 
-    result = []
-    for item in items:
-        entry: dict[str, Any] = {
-            "name": item.name,
-            "url": item.properties.get("ServerRelativeUrl"),
-            "created": (
-                item.properties["TimeCreated"].isoformat()
-                if item.properties.get("TimeCreated")
-                else None
-            ),
-            "modified": (
-                item.properties["TimeLastModified"].isoformat()
-                if item.properties.get("TimeLastModified")
-                else None
-            ),
+
+def _folder_listing(folder_path: str) -> Listing:
+    """List sub-folders and files of *folder_path* in a single round trip."""
+    ctx = _worker_context()
+    folder = ctx.web.get_folder_by_server_relative_url(_sp_path(folder_path))
+    page_size = get_settings().shp_page_size
+    sub_folders = folder.folders.paged(page_size)
+    files = folder.files.paged(page_size)
+    ctx.load(sub_folders, _item_props("folders"))
+    ctx.load(files, _item_props("files"))
+    ctx.execute_query()
+    # Iterating loads any further pages
+    sub_folders, files = list(sub_folders), list(files)
+
+    names = [f.name for f in sub_folders]
+    nodes = [{"name": n, "type": "folder", "children": []} for n in names] + [
+        {
+            "name": entry["name"],
+            "path": entry["url"],
+            "type": "file",
+            **{k: v for k, v in entry.items() if k not in ("name", "url")},
         }
-        if item_type == "files":
-            entry["size"] = item.properties.get("Length")
-        result.append(entry)
-    return result
+        for entry in (_item_entry(f, "files") for f in files)
+    ]
+    return nodes, [f"{folder_path}/{n}".strip("/") for n in names]
+
+
+def _list_group(group: list[str]) -> list[Listing | Exception]:
+    results: list[Listing | Exception] = []
+    for folder_path in group:
+        try:
+            results.append(_folder_listing(folder_path))
+        except Exception as exc:
+            results.append(exc)
+    return results
 
 
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
-def list_folders(parent_folder: str | None = None) -> list[dict[str, Any]]:
+def list_folders(
+    parent_folder: str | None = None, limit: int | None = None, cursor: str | None = None,
+) -> list[dict[str, Any]] | dict[str, Any]:
     """List sub-folders in *parent_folder* (or library root if omitted)."""
     logger.info("Listing folders in %s", parent_folder or "root")
-    return _load_items(_sp_path(parent_folder), "folders")
+    check_limit(limit)
+    folders, next_cursor = _load_items(_sp_path(parent_folder), "folders", limit, cursor)
+    if limit is None and cursor is None:
+        return folders
+    return page_result(folders, next_cursor)
 
 
-@sp_retry
+@sp_retry(idempotent=False)
 def create_folder(folder_name: str, parent_folder: str | None = None) -> dict[str, Any]:
     """Create *folder_name* inside *parent_folder* (or library root)."""
-    ctx = get_sp_context()
+    ctx = request_context().client
     parent_path = _sp_path(parent_folder)
     logger.info("Creating folder '%s' in '%s'", folder_name, parent_path)
 
@@ -92,7 +163,7 @@ def create_folder(folder_name: str, parent_folder: str | None = None) -> dict[st
 @sp_retry
 def delete_folder(folder_path: str) -> dict[str, Any]:
     """Delete the empty folder at *folder_path*."""
-    ctx = get_sp_context()
+    ctx = request_context().client
     full_path = _sp_path(folder_path)
     logger.info("Deleting folder: %s", full_path)
 
@@ -118,7 +189,7 @@ def delete_folder(folder_path: str) -> dict[str, Any]:
 def get_folder_tree(parent_folder: str | None = None) -> dict[str, Any]:
     """Return a recursive tree of folders and files starting at *parent_folder*."""
     cfg = get_settings()
-    ctx = get_sp_context()
+    ctx = request_context().client
     root_path = _sp_path(parent_folder)
     logger.info("Building folder tree for '%s'", parent_folder or "root")
 
@@ -126,9 +197,12 @@ def get_folder_tree(parent_folder: str | None = None) -> dict[str, Any]:
         root = ctx.web.get_folder_by_server_relative_url(root_path)
         ctx.load(root, ["Name", "ServerRelativeUrl", "TimeCreated", "TimeLastModified"])
         ctx.execute_query()
+    except SharePointCircuitOpenError:
+        raise  # lets the response cache serve its last answer
     except Exception as exc:
         logger.error("Cannot access root folder '%s': %s", root_path, exc)
         return {
+            "success": False,
             "name": root_path.split("/")[-1],
             "path": root_path,
             "type": "folder",
@@ -136,57 +210,14 @@ def get_folder_tree(parent_folder: str | None = None) -> dict[str, Any]:
             "children": [],
         }
 
-    tree_nodes: dict[str, list] = {}
-    pending = [parent_folder or ""]
-
-    for level in range(cfg.shp_max_depth):
-        if not pending:
-            break
-        logger.info("Tree level %d: %d folder(s)", level + 1, len(pending))
-        current, pending = pending.copy(), []
-
-        while current:
-            batch, current = (
-                current[: cfg.shp_max_folders_per_level],
-                current[cfg.shp_max_folders_per_level :],
-            )
-            for fp in batch:
-                try:
-                    sub_folders = [f["name"] for f in list_folders(fp)]
-                    files = _load_items(_sp_path(fp), "files")
-                    tree_nodes[fp] = [
-                        {"name": n, "type": "folder", "children": []} for n in sub_folders
-                    ] + [
-                        {
-                            "name": f["name"],
-                            "path": f["url"],
-                            "type": "file",
-                            **{k: v for k, v in f.items() if k not in ("name", "url")},
-                        }
-                        for f in files
-                    ]
-                    pending.extend(
-                        f"{fp}/{n}".strip("/") for n in sub_folders
-                    )
-                except Exception as exc:
-                    logger.warning(
-                        "Failed to process folder in tree traversal",
-                        folder_path=fp,
-                        error=str(exc),
-                        error_type=type(exc).__name__
-                    )
-            if current:
-                time.sleep(0.1)
-
-        if level < cfg.shp_max_depth - 1:
-            time.sleep(cfg.shp_level_delay)
-
-    def _build(path: str) -> list[dict]:
-        children = tree_nodes.get(path, [])
-        for child in children:
-            if child["type"] == "folder":
-                child["children"] = _build(f"{path}/{child['name']}".strip("/"))
-        return children
+    tree_nodes = crawl_tree(
+        parent_folder or "",
+        _list_group,
+        max_depth=cfg.shp_max_depth,
+        max_folders_per_level=cfg.shp_max_folders_per_level,
+        workers=cfg.shp_tree_workers,
+        limiter=AdaptiveRateLimiter(cfg.shp_tree_rate_limit),
+    )
 
     return {
         "name": root.name,
@@ -202,5 +233,5 @@ def get_folder_tree(parent_folder: str | None = None) -> dict[str, Any]:
             if root.properties.get("TimeLastModified")
             else None
         ),
-        "children": _build(parent_folder or ""),
+        "children": assemble_tree(tree_nodes, parent_folder or ""),
     }
@@ -1,19 +1,24 @@
-"""Unified metadata service supporting both Office365 and Graph APIs."""
+"""Unified metadata service supporting both Office365 and Graph APIs.
+
+The ``*_async`` variants are what tool handlers await (see document_service).
+"""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
-from ..core import get_sp_context
+from ..core.client_async import async_graph_enabled
+from ..core.request_context import request_context, request_scoped
+from ..utils.cache import cached, invalidates, join_path
 
 logger = logging.getLogger(__name__)
 
 
+@request_scoped
 def get_file_metadata(folder_name: str, file_name: str) -> dict[str, Any]:
     """Return all list-item properties for *file_name*."""
-    client = get_sp_context()
-    
-    if client.api_type in ("graph", "graphql"):
+    if request_context().is_graph:
         from . import metadata_service_graph
         return metadata_service_graph.get_file_metadata(folder_name, file_name)
     else:
@@ -21,17 +26,60 @@ def get_file_metadata(folder_name: str, file_name: str) -> dict[str, Any]:
         return metadata_service_office365.get_file_metadata(folder_name, file_name)
 
 
+@request_scoped
 def update_file_metadata(
     folder_name: str,
     file_name: str,
     metadata: dict[str, Any],
 ) -> dict[str, Any]:
     """Update list-item *metadata* fields for *file_name*."""
-    client = get_sp_context()
-    
-    if client.api_type in ("graph", "graphql"):
+    if request_context().is_graph:
         from . import metadata_service_graph
         return metadata_service_graph.update_file_metadata(folder_name, file_name, metadata)
     else:
         from . import metadata_service_office365
         return metadata_service_office365.update_file_metadata(folder_name, file_name, metadata)
+
+
+@request_scoped
+def file_etag(folder_name: str, file_name: str) -> str | None:
+    """Current eTag of *file_name* (Graph only; None when unavailable)."""
+    if request_context().is_graph:
+        from . import metadata_service_graph
+        return metadata_service_graph.current_etag(folder_name, file_name)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Async entry points
+# ---------------------------------------------------------------------------
+
+@cached(
+    "get_file_metadata",
+    join_path,
+    validator=lambda result: result.get("metadata", {}).get("eTag"),
+    revalidate=file_etag,
+)
+@request_scoped
+async def get_file_metadata_async(folder_name: str, file_name: str) -> dict[str, Any]:
+    """Async variant of :func:`get_file_metadata`."""
+    if async_graph_enabled():
+        from . import metadata_service_graph_async
+        return await metadata_service_graph_async.get_file_metadata(folder_name, file_name)
+    return await asyncio.to_thread(get_file_metadata, folder_name, file_name)
+
+
+@invalidates(lambda folder_name, file_name, *_args: [join_path(folder_name, file_name)])
+@request_scoped
+async def update_file_metadata_async(
+    folder_name: str,
+    file_name: str,
+    metadata: dict[str, Any],
+) -> dict[str, Any]:
+    """Async variant of :func:`update_file_metadata`."""
+    if async_graph_enabled():
+        from . import metadata_service_graph_async
+        return await metadata_service_graph_async.update_file_metadata(
+            folder_name, file_name, metadata,
+        )
+    return await asyncio.to_thread(update_file_metadata, folder_name, file_name, metadata)
@@ -2,32 +2,17 @@
 from __future__ import annotations
 
 import logging
-import posixpath
 from typing import Any
 from urllib.parse import quote
 
-from ..config import get_settings
-from ..core import get_sp_context
+from ..core.batch import batch_get
+from ..core.request_context import request_context
+from ..exceptions import SharePointCircuitOpenError
 from ..utils.retry import sp_retry
 
 logger = logging.getLogger(__name__)
 
 
-def _normalize_path(sub_path: str = "") -> str:
-    """Build drive-relative path from configured scope + sub_path.
-
-    Returns empty string when both scope and sub_path are empty (= drive root).
-    Graph API's drive/root already IS the document library, so NO library name
-    is prepended.
-    """
-    scope = get_settings().shp_doc_library
-    clean_path = posixpath.normpath(f"/{sub_path}").lstrip("/") if sub_path else ""
-    if clean_path.startswith(".."):
-        raise ValueError(f"Invalid path traversal attempt: {sub_path}")
-    parts = [p for p in [scope, clean_path] if p]
-    return "/".join(parts)
-
-
 def _drive_item_url(site_id: str, path: str, suffix: str = "") -> str:
     """Build a Graph API drive-item endpoint."""
     if path:
@@ -35,51 +20,74 @@ def _drive_item_url(site_id: str, path: str, suffix: str = "") -> str:
     return f"sites/{site_id}/drive/root{suffix.lstrip(':')}"
 
 
+def _metadata_result(
+    file_name: str,
+    file_path: str,
+    file_metadata: dict[str, Any],
+    list_item: dict[str, Any],
+) -> dict[str, Any]:
+    """Merge list-item fields and drive-item properties into one payload."""
+    # Get fields from list item
+    fields = list_item.get("fields", {})
+
+    metadata = {
+        k: str(v)
+        for k, v in fields.items()
+        if v is not None
+    }
+
+    # Add standard metadata from drive item
+    metadata.update({
+        "id": file_metadata.get("id"),
+        "name": file_metadata.get("name"),
+        "size": str(file_metadata.get("size", 0)),
+        "created": file_metadata.get("createdDateTime"),
+        "modified": file_metadata.get("lastModifiedDateTime"),
+        "webUrl": file_metadata.get("webUrl"),
+        "eTag": file_metadata.get("eTag"),
+    })
+
+    return {
+        "success": True,
+        "message": f"Metadata retrieved for '{file_name}'",
+        "metadata": metadata,
+        "file": {"name": file_name, "path": file_path},
+    }
+
+
+def _form_values(metadata: dict[str, Any]) -> dict[str, Any]:
+    """Convert tool *metadata* into Graph listItem field values (drops None)."""
+    form_values: dict[str, Any] = {}
+    for key, value in metadata.items():
+        if value is None:
+            continue
+        if isinstance(value, (bool, list)):
+            form_values[key] = value
+        else:
+            form_values[key] = str(value)
+    return form_values
+
+
 @sp_retry
 def get_file_metadata(folder_name: str, file_name: str) -> dict[str, Any]:
     """Return all list-item properties for *file_name*."""
-    client = get_sp_context()
-    site_id = client._get_site_id()
+    ctx = request_context()
+    client, site_id = ctx.client, ctx.site_id
     
-    folder_path = _normalize_path(folder_name)
-    file_path = f"{folder_path}/{file_name}" if folder_path else file_name
+    file_path = ctx.file_path(folder_name, file_name)
     
     logger.info("Getting metadata for '%s'", file_path)
 
-    # Get file metadata from Graph API
-    endpoint = _drive_item_url(site_id, file_path)
+    # Drive item and its list item (SharePoint-specific metadata) in one $batch
+    endpoints = [
+        _drive_item_url(site_id, file_path),
+        _drive_item_url(site_id, file_path, ":/listItem"),
+    ]
     try:
-        file_metadata = client.get(endpoint)
-        
-        # Get list item for SharePoint-specific metadata
-        list_item_endpoint = f"sites/{site_id}/drive/items/{file_metadata.get('id')}/listItem"
-        list_item = client.get(list_item_endpoint)
-        
-        # Get fields from list item
-        fields = list_item.get("fields", {})
-        
-        metadata = {
-            k: str(v)
-            for k, v in fields.items()
-            if v is not None
-        }
-        
-        # Add standard metadata from drive item
-        metadata.update({
-            "id": file_metadata.get("id"),
-            "name": file_metadata.get("name"),
-            "size": str(file_metadata.get("size", 0)),
-            "created": file_metadata.get("createdDateTime"),
-            "modified": file_metadata.get("lastModifiedDateTime"),
-            "webUrl": file_metadata.get("webUrl"),
-        })
-        
-        return {
-            "success": True,
-            "message": f"Metadata retrieved for '{file_name}'",
-            "metadata": metadata,
-            "file": {"name": file_name, "path": file_path},
-        }
+        file_metadata, list_item = batch_get(client, endpoints, raise_errors=True)
+        return _metadata_result(file_name, file_path, file_metadata, list_item)
+    except SharePointCircuitOpenError:
+        raise  # lets the response cache serve its last answer
     except Exception as exc:
         logger.error(f"Failed to get metadata: {exc}")
         return {
@@ -88,6 +96,15 @@ def get_file_metadata(folder_name: str, file_name: str) -> dict[str, Any]:
         }
 
 
+def current_etag(folder_name: str, file_name: str) -> str | None:
+    """Fetch only the eTag of *file_name* (cheap cache revalidation)."""
+    ctx = request_context()
+    client, site_id = ctx.client, ctx.site_id
+    file_path = ctx.file_path(folder_name, file_name)
+    item = client.get(_drive_item_url(site_id, file_path), params={"$select": "eTag"})
+    return item.get("eTag")
+
+
 @sp_retry
 def update_file_metadata(
     folder_name: str,
@@ -95,11 +112,10 @@ def update_file_metadata(
     metadata: dict[str, Any],
 ) -> dict[str, Any]:
     """Update list-item *metadata* fields for *file_name*."""
-    client = get_sp_context()
-    site_id = client._get_site_id()
+    ctx = request_context()
+    client, site_id = ctx.client, ctx.site_id
     
-    folder_path = _normalize_path(folder_name)
-    file_path = f"{folder_path}/{file_name}" if folder_path else file_name
+    file_path = ctx.file_path(folder_name, file_name)
     
     logger.info("Updating metadata for '%s'", file_path)
 
@@ -109,18 +125,7 @@ def update_file_metadata(
         file_metadata = client.get(file_endpoint)
         file_id = file_metadata.get("id")
         
-        # Prepare fields to update
-        form_values: dict[str, str] = {}
-        for key, value in metadata.items():
-            if value is None:
-                continue
-            if isinstance(value, bool):
-                form_values[key] = True if value else False
-            elif isinstance(value, list):
-                form_values[key] = value
-            else:
-                form_values[key] = str(value)
-
+        form_values = _form_values(metadata)
         if not form_values:
             return {"success": True, "message": "No fields to update"}
 
@@ -0,0 +1,82 @@
+"""File metadata operations using Microsoft Graph API on the asyncio transport."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from ..core.batch import batch_get_async
+from ..core.request_context import async_request_context
+from ..exceptions import SharePointCircuitOpenError
+from ..utils.retry import sp_retry
+from .metadata_service_graph import (
+    _drive_item_url,
+    _form_values,
+    _metadata_result,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@sp_retry
+async def get_file_metadata(folder_name: str, file_name: str) -> dict[str, Any]:
+    """Return all list-item properties for *file_name*."""
+    ctx = await async_request_context()
+    client, site_id = ctx.async_client, ctx.site_id
+
+    file_path = ctx.file_path(folder_name, file_name)
+    logger.info("Getting metadata for '%s'", file_path)
+
+    try:
+        file_metadata, list_item = await batch_get_async(
+            client,
+            [
+                _drive_item_url(site_id, file_path),
+                _drive_item_url(site_id, file_path, ":/listItem"),
+            ],
+            raise_errors=True,
+        )
+        return _metadata_result(file_name, file_path, file_metadata, list_item)
+    except SharePointCircuitOpenError:
+        raise  # lets the response cache serve its last answer
+    except Exception as exc:
+        logger.error(f"Failed to get metadata: {exc}")
+        return {
+            "success": False,
+            "message": f"Failed to retrieve metadata: {exc}",
+        }
+
+
+@sp_retry
+async def update_file_metadata(
+    folder_name: str,
+    file_name: str,
+    metadata: dict[str, Any],
+) -> dict[str, Any]:
+    """Update list-item *metadata* fields for *file_name*."""
+    ctx = await async_request_context()
+    client, site_id = ctx.async_client, ctx.site_id
+
+    file_path = ctx.file_path(folder_name, file_name)
+    logger.info("Updating metadata for '%s'", file_path)
+
+    try:
+        file_metadata = await client.get(_drive_item_url(site_id, file_path))
+
+        form_values = _form_values(metadata)
+        if not form_values:
+            return {"success": True, "message": "No fields to update"}
+
+        await client.put(
+            f"sites/{site_id}/drive/items/{file_metadata.get('id')}/listItem/fields",
+            form_values,
+        )
+        return {
+            "success": True,
+            "message": f"Updated {len(form_values)} field(s) for '{file_name}'",
+        }
+    except Exception as exc:
+        logger.error(f"Failed to update metadata: {exc}")
+        return {
+            "success": False,
+            "message": f"Failed to update metadata: {exc}",
+        }
@@ -6,7 +6,7 @@ import posixpath
 from typing import Any
 
 from ..config import get_settings
-from ..core import get_sp_context
+from ..core.request_context import request_context
 from ..utils.retry import sp_retry
 
 logger = logging.getLogger(__name__)
@@ -26,7 +26,7 @@ def _sp_path(sub_path: str = "") -> str:
 @sp_retry
 def get_file_metadata(folder_name: str, file_name: str) -> dict[str, Any]:
     """Return all list-item properties for *file_name*."""
-    ctx = get_sp_context()
+    ctx = request_context().client
     file_path = _sp_path(f"{folder_name}/{file_name}")
     logger.info("Getting metadata for '%s'", file_path)
 
@@ -55,7 +55,7 @@ def update_file_metadata(
     metadata: dict[str, Any],
 ) -> dict[str, Any]:
     """Update list-item *metadata* fields for *file_name*."""
-    ctx = get_sp_context()
+    ctx = request_context().client
     file_path = _sp_path(f"{folder_name}/{file_name}")
     logger.info("Updating metadata for '%s'", file_path)
 
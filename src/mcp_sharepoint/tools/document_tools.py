@@ -8,29 +8,35 @@ from typing import Any
 from ..config import get_settings
 from ..server import mcp
 from ..services.document_service import (
-    delete_document as _delete_document,
+    delete_document_async as _delete_document,
 )
 from ..services.document_service import (
     download_document as _download_document,
 )
 from ..services.document_service import (
-    get_document_content as _get_document_content,
+    get_document_content_async as _get_document_content,
 )
 from ..services.document_service import (
-    list_documents as _list_documents,
+    list_documents_async as _list_documents,
 )
 from ..services.document_service import (
-    search_documents as _search_documents,
+    search_documents_async as _search_documents,
 )
 from ..services.document_service import (
-    update_document as _update_document,
+    update_document_async as _update_document,
 )
 from ..services.document_service import (
-    upload_document as _upload_document,
+    update_from_path as _update_from_path,
+)
+from ..services.document_service import (
+    upload_document_async as _upload_document,
 )
 from ..services.document_service import (
     upload_from_path as _upload_from_path,
 )
+from ..utils.blobs import get_blob_store
+from ..utils.metrics import timed
+from ..utils.parsers import DEFAULT_EXCEL_ROWS, ContentOptions
 
 
 def _get_default_folder() -> str:
@@ -59,24 +65,32 @@ def _get_default_folder() -> str:
     description=(
         "List all documents (with metadata) inside a SharePoint folder. "
         "For Graph API, use empty string or 'root' for the document library root. "
-        "For nested folders, use paths like 'Reports' or 'Reports/2024'."
+        "For nested folders, use paths like 'Reports' or 'Reports/2024'. "
+        "For large folders, pass limit to get {items, count, next_cursor} "
+        "and call again with cursor=next_cursor for the next page."
     ),
 )
-async def list_documents_tool(folder_name: str = "") -> list[dict[str, Any]]:
+@timed("List_SharePoint_Documents")
+async def list_documents_tool(
+    folder_name: str = "", limit: int | None = None, cursor: str | None = None,
+) -> list[dict[str, Any]] | dict[str, Any]:
     """Lists enterprise documents within a specified SharePoint path.
 
     Args:
         folder_name: The target relative SharePoint directory string.
                      Defaults to empty string (root of document library).
+        limit: Maximum number of files to return (None = all).
+        cursor: ``next_cursor`` from a previous call.
 
     Returns:
-        A list of dictionaries containing file metadata and sizing.
+        A list of dictionaries containing file metadata and sizing, or a
+        page ``{items, count, next_cursor}`` when limit or cursor is given.
     """
     # Use configured default if folder_name is empty
     if not folder_name:
         folder_name = _get_default_folder()
     
-    return await asyncio.to_thread(_list_documents, folder_name)
+    return await _list_documents(folder_name, limit, cursor)
 
 
 @mcp.tool(
@@ -87,6 +101,7 @@ async def list_documents_tool(folder_name: str = "") -> list[dict[str, Any]]:
         "Returns up to row_limit results with metadata."
     ),
 )
+@timed("Search_SharePoint")
 async def search_documents_tool(query: str, row_limit: int = 20) -> list[dict[str, Any]]:
     """Searches SharePoint documents using Keyword Query Language (KQL).
 
@@ -97,7 +112,7 @@ async def search_documents_tool(query: str, row_limit: int = 20) -> list[dict[st
     Returns:
         A list of matching document attributes.
     """
-    return await asyncio.to_thread(_search_documents, query, row_limit)
+    return await _search_documents(query, row_limit)
 
 
 @mcp.tool(
@@ -105,39 +120,80 @@ async def search_documents_tool(query: str, row_limit: int = 20) -> list[dict[st
     description=(
         "Retrieve and decode the content of a SharePoint document. "
         "Supports PDF, Word, Excel, and plain-text files. "
-        "For files in the document library root, use empty string for folder_name."
+        "For files in the document library root, use empty string for folder_name. "
+        "For large PDFs, read a page range with start_page/end_page; "
+        "for workbooks, pick sheets with sheet_names and size the preview with "
+        "max_rows/max_columns. For text and other unparsed files, byte_offset/max_bytes "
+        "fetch only part of the file (e.g. the head of a large log). "
+        "max_chars caps the returned text for any parsed type."
     ),
 )
-async def get_document_content_tool(folder_name: str = "", file_name: str = "") -> dict[str, Any]:
+@timed("Get_Document_Content")
+async def get_document_content_tool(
+    folder_name: str = "",
+    file_name: str = "",
+    start_page: int = 1,
+    end_page: int | None = None,
+    max_chars: int | None = None,
+    sheet_names: list[str] | None = None,
+    max_rows: int = DEFAULT_EXCEL_ROWS,
+    max_columns: int | None = None,
+    byte_offset: int = 0,
+    max_bytes: int | None = None,
+) -> dict[str, Any]:
     """Retrieves and parses the substantive content of a target SharePoint file.
 
     Args:
         folder_name: Directory containing target file. Use empty string for root.
         file_name: Exact file name including extension.
+        start_page: First PDF page to extract (1-based).
+        end_page: Last PDF page to extract, inclusive. Defaults to the last page.
+        max_chars: Stop extracting once this many characters were read.
+        sheet_names: Excel worksheets to read. Defaults to all of them.
+        max_rows: Excel rows read per worksheet, header row included.
+        max_columns: Excel columns read per row. Defaults to all columns.
+        byte_offset: First byte to fetch of a text or other unparsed file.
+        max_bytes: Bytes to fetch of a text or other unparsed file. Defaults to the rest.
 
     Returns:
         Dictionary containing extracted text, page schemas, or binary payloads.
+        Limited PDF reads also report the ``pages`` read and ``truncated``;
+        byte-limited reads report the ``byte_range`` returned and ``truncated``.
     """
+    options = ContentOptions(
+        start_page=start_page,
+        end_page=end_page,
+        max_chars=max_chars,
+        sheets=tuple(sheet_names) if sheet_names is not None else None,
+        max_rows=max_rows,
+        max_columns=max_columns,
+        byte_offset=byte_offset,
+        max_bytes=max_bytes,
+    )
+
     # Use default folder if not specified
     if not folder_name:
         folder_name = _get_default_folder()
     
-    return await asyncio.to_thread(_get_document_content, folder_name, file_name)
+    return await _get_document_content(folder_name, file_name, options)
 
 
 @mcp.tool(
     name="Upload_Document",
     description=(
         "Upload a new document to a SharePoint folder. "
-        "Pass content as a UTF-8 string or Base64-encoded bytes. "
+        "Pass content as a UTF-8 string or Base64-encoded bytes, or (HTTP transports) "
+        "POST the raw bytes to /blobs and pass the returned handle as content_handle. "
         "Use empty string for folder_name to upload to document library root."
     ),
 )
+@timed("Upload_Document")
 async def upload_document_tool(
     file_name: str,
-    content: str,
+    content: str = "",
     folder_name: str = "",
     is_base64: bool = False,
+    content_handle: str = "",
 ) -> dict[str, Any]:
     """Uploads document payload material to SharePoint.
 
@@ -146,6 +202,7 @@ async def upload_document_tool(
         content: Raw document string or base64 blob.
         folder_name: Target remote repository path. Use empty string for root.
         is_base64: Boolean indicating payload decoding.
+        content_handle: Handle from ``POST /blobs``; replaces *content*.
 
     Returns:
         Dictionary containing the success status and remote file structure.
@@ -153,8 +210,21 @@ async def upload_document_tool(
     # Use default folder if not specified
     if not folder_name:
         folder_name = _get_default_folder()
+
+    if content_handle:
+        store = get_blob_store()
+        blob = store.claim(content_handle) if store is not None else None
+        if blob is None:
+            return {
+                "success": False,
+                "message": f"Unknown or expired content handle '{content_handle}'",
+            }
+        try:
+            return await asyncio.to_thread(_upload_from_path, folder_name, blob.path, file_name)
+        finally:
+            blob.discard()
     
-    return await asyncio.to_thread(_upload_document, folder_name, file_name, content, is_base64)
+    return await _upload_document(folder_name, file_name, content, is_base64)
 
 
 @mcp.tool(
@@ -164,6 +234,7 @@ async def upload_document_tool(
         "Use empty string for folder_name to upload to document library root."
     ),
 )
+@timed("Upload_Document_From_Path")
 async def upload_from_path_tool(
     folder_name: str = "",
     file_path: str = "",
@@ -241,14 +312,18 @@ async def upload_from_path_tool(
     name="Update_Document",
     description=(
         "Overwrite the content of an existing SharePoint document. "
+        "Pass content as a UTF-8 string or Base64-encoded bytes, or (HTTP transports) "
+        "POST the raw bytes to /blobs and pass the returned handle as content_handle. "
         "Use empty string for folder_name for files in document library root."
     ),
 )
+@timed("Update_Document")
 async def update_document_tool(
     folder_name: str = "",
     file_name: str = "",
     content: str = "",
     is_base64: bool = False,
+    content_handle: str = "",
 ) -> dict[str, Any]:
     """Mutates an existing document in place with overwrite semantics.
     
@@ -257,6 +332,7 @@ async def update_document_tool(
         file_name: Target filename to override.
         content: The new text or base64 binary block.
         is_base64: Setting if binary format.
+        content_handle: Handle from ``POST /blobs``; replaces *content*.
 
     Returns:
         Dictionary highlighting successful replacement or failure.
@@ -264,8 +340,21 @@ async def update_document_tool(
     # Use default folder if not specified
     if not folder_name:
         folder_name = _get_default_folder()
+
+    if content_handle:
+        store = get_blob_store()
+        blob = store.claim(content_handle) if store is not None else None
+        if blob is None:
+            return {
+                "success": False,
+                "message": f"Unknown or expired content handle '{content_handle}'",
+            }
+        try:
+            return await asyncio.to_thread(_update_from_path, folder_name, file_name, blob.path)
+        finally:
+            blob.discard()
     
-    return await asyncio.to_thread(_update_document, folder_name, file_name, content, is_base64)
+    return await _update_document(folder_name, file_name, content, is_base64)
 
 
 @mcp.tool(
@@ -275,6 +364,7 @@ async def update_document_tool(
         "Use empty string for folder_name for files in document library root."
     ),
 )
+@timed("Delete_Document")
 async def delete_document_tool(folder_name: str = "", file_name: str = "") -> dict[str, Any]:
     """Unlinks and physically deletes a document node from SharePoint.
 
@@ -289,7 +379,7 @@ async def delete_document_tool(folder_name: str = "", file_name: str = "") -> di
     if not folder_name:
         folder_name = _get_default_folder()
     
-    return await asyncio.to_thread(_delete_document, folder_name, file_name)
+    return await _delete_document(folder_name, file_name)
 
 
 @mcp.tool(
@@ -300,6 +390,7 @@ async def delete_document_tool(folder_name: str = "", file_name: str = "") -> di
         "Use empty string for folder_name for files in document library root."
     ),
 )
+@timed("Download_Document")
 async def download_document_tool(
     folder_name: str = "", file_name: str = "", local_path: str = "",
 ) -> dict[str, Any]:
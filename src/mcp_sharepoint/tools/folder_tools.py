@@ -6,17 +6,18 @@ import asyncio
 from ..config import get_settings
 from ..server import mcp
 from ..services.folder_service import (
-    create_folder as _create_folder,
+    create_folder_async as _create_folder,
 )
 from ..services.folder_service import (
-    delete_folder as _delete_folder,
+    delete_folder_async as _delete_folder,
 )
 from ..services.folder_service import (
     get_folder_tree as _get_folder_tree,
 )
 from ..services.folder_service import (
-    list_folders as _list_folders,
+    list_folders_async as _list_folders,
 )
+from ..utils.metrics import timed
 
 
 def _get_default_folder() -> str:
@@ -44,17 +45,25 @@ def _get_default_folder() -> str:
     description=(
         "List all sub-folders in a SharePoint directory. "
         "Use None/null or empty string for document library root. "
-        "For Graph API, the root represents the default document library."
+        "For Graph API, the root represents the default document library. "
+        "For large folders, pass limit to get {items, count, next_cursor} "
+        "and call again with cursor=next_cursor for the next page."
     ),
 )
-async def list_folders_tool(parent_folder: str | None = None):
+@timed("List_SharePoint_Folders")
+async def list_folders_tool(
+    parent_folder: str | None = None, limit: int | None = None, cursor: str | None = None,
+):
     """List all sub-folders in a SharePoint directory.
     
     Args:
         parent_folder: Parent folder path. None or empty string for root.
+        limit: Maximum number of folders to return (None = all).
+        cursor: ``next_cursor`` from a previous call.
         
     Returns:
-        List of folder information dictionaries.
+        List of folder information dictionaries, or a page
+        ``{items, count, next_cursor}`` when limit or cursor is given.
     """
     # Convert empty string to None for consistency
     if parent_folder == "":
@@ -65,7 +74,7 @@ async def list_folders_tool(parent_folder: str | None = None):
         default = _get_default_folder()
         parent_folder = default if default else None
     
-    return await asyncio.to_thread(_list_folders, parent_folder)
+    return await _list_folders(parent_folder, limit, cursor)
 
 
 @mcp.tool(
@@ -76,6 +85,7 @@ async def list_folders_tool(parent_folder: str | None = None):
         "Use None/null or empty string for document library root."
     ),
 )
+@timed("Get_SharePoint_Tree")
 async def get_sharepoint_tree_tool(parent_folder: str | None = None):
     """Get a recursive tree view of folders and files.
     
@@ -104,6 +114,7 @@ async def get_sharepoint_tree_tool(parent_folder: str | None = None):
         "Use None/null or empty string for parent_folder to create in document library root."
     ),
 )
+@timed("Create_Folder")
 async def create_folder_tool(folder_name: str = "", parent_folder: str | None = None):
     """Create a new folder in SharePoint.
     
@@ -123,7 +134,7 @@ async def create_folder_tool(folder_name: str = "", parent_folder: str | None =
         default = _get_default_folder()
         parent_folder = default if default else None
     
-    return await asyncio.to_thread(_create_folder, folder_name, parent_folder)
+    return await _create_folder(folder_name, parent_folder)
 
 
 @mcp.tool(
@@ -133,6 +144,7 @@ async def create_folder_tool(folder_name: str = "", parent_folder: str | None =
         "Provide the full path to the folder to delete."
     ),
 )
+@timed("Delete_Folder")
 async def delete_folder_tool(folder_path: str = ""):
     """Delete an empty folder from SharePoint.
     
@@ -142,4 +154,4 @@ async def delete_folder_tool(folder_path: str = ""):
     Returns:
         Dictionary with deletion status.
     """
-    return await asyncio.to_thread(_delete_folder, folder_path)
+    return await _delete_folder(folder_path)
@@ -1,28 +1,29 @@
 """MCP tool registrations for file metadata operations."""
 from __future__ import annotations
 
-import asyncio
-
 from ..server import mcp
 from ..services.metadata_service import (
-    get_file_metadata as _get_file_metadata,
+    get_file_metadata_async as _get_file_metadata,
 )
 from ..services.metadata_service import (
-    update_file_metadata as _update_file_metadata,
+    update_file_metadata_async as _update_file_metadata,
 )
+from ..utils.metrics import timed
 
 
 @mcp.tool(
     name="Get_File_Metadata",
     description="Retrieve all SharePoint list-item metadata fields for a document.",
 )
+@timed("Get_File_Metadata")
 async def get_file_metadata_tool(folder_name: str, file_name: str):
-    return await asyncio.to_thread(_get_file_metadata, folder_name, file_name)
+    return await _get_file_metadata(folder_name, file_name)
 
 
 @mcp.tool(
     name="Update_File_Metadata",
     description="Update one or more SharePoint list-item metadata fields for a document.",
 )
+@timed("Update_File_Metadata")
 async def update_file_metadata_tool(folder_name: str, file_name: str, metadata: dict):
-    return await asyncio.to_thread(_update_file_metadata, folder_name, file_name, metadata)
+    return await _update_file_metadata(folder_name, file_name, metadata)
@@ -1,3 +1,3 @@
-from .parsers import detect_file_type, parse_excel, parse_pdf, parse_word
+from .parsers import ContentOptions, detect_file_type, parse_excel, parse_pdf, parse_word
 
-__all__ = ["detect_file_type", "parse_pdf", "parse_excel", "parse_word"]
+__all__ = ["ContentOptions", "detect_file_type", "parse_pdf", "parse_excel", "parse_word"]
@@ -0,0 +1,279 @@
+"""Short-lived handles for moving raw bytes outside the JSON-RPC channel.
+
+Tool arguments and results are JSON, so binary content has to be base64
+encoded — a third larger on the wire, and held in memory as a str, the
+decoded bytes and the request body at once. On the HTTP transports (``sse``
+and ``http``) the server instead exposes a side channel next to ``/health``:
+
+- ``POST /blobs`` streams a raw request body to a temporary file and returns
+  a handle, which ``Upload_Document`` accepts as ``content_handle``;
+- ``Get_Document_Content`` returns binary files as a ``content_url``
+  (``GET /blobs/{handle}``) instead of ``content_base64``.
+
+Handles are unguessable, single-use and expire after ``SHP_BLOB_TTL``
+seconds; blobs are capped at ``SHP_BLOB_MAX_BYTES``, and all unclaimed
+blobs together at ``SHP_BLOB_MAX_PENDING`` files / ``SHP_BLOB_MAX_PENDING_BYTES``
+bytes so unclaimed uploads cannot fill the disk. Set
+``SHP_BLOB_TRANSFER=false`` to always use base64.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import secrets
+import tempfile
+import threading
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Request-body chunks are gathered up to this size per write in a worker thread
+_WRITE_SIZE = 1024 * 1024
+
+
+class BlobTooLargeError(ValueError):
+    """Raised when a blob exceeds the configured size limit."""
+
+
+class BlobStoreFullError(RuntimeError):
+    """Raised when pending blobs already use the store's file or byte budget."""
+
+
+class Blob:
+    """A temporary file reachable through an opaque handle."""
+
+    __slots__ = ("handle", "path", "name", "size", "expires_at")
+
+    def __init__(self, handle: str, path: str, name: str | None, expires_at: float):
+        self.handle = handle
+        self.path = path
+        self.name = name
+        self.size = 0
+        self.expires_at = expires_at
+
+    def discard(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            logger.warning("Could not remove blob file %s: %s", self.path, exc)
+
+
+class BlobStore:
+    """Thread-safe registry of pending blobs backed by temp files.
+
+    Blobs being written count against the pending budget as their bytes
+    arrive, so concurrent uploads cannot overshoot it.
+
+    Args:
+        directory: Folder for blob files
+        ttl: Seconds a handle stays valid
+        max_bytes: Largest accepted blob
+        max_pending: Most blobs written or waiting to be claimed at once
+        max_pending_bytes: Most bytes those blobs may hold together
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ttl: float = 300.0,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_pending: int = 32,
+        max_pending_bytes: int = 1024 * 1024 * 1024,
+    ):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_pending = max_pending
+        self.max_pending_bytes = max_pending_bytes
+        self.created = 0
+        self.claimed = 0
+        self.expired = 0
+        self.rejected = 0
+        self._blobs: dict[str, Blob] = {}
+        self._used = 0  # blobs written or pending
+        self._used_bytes = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _reserve(self, size: int, new: bool = False) -> None:
+        """Count *size* more bytes (and a new blob if *new*) against the budget."""
+        with self._lock:
+            if new and self._used >= self.max_pending:
+                self.rejected += 1
+                raise BlobStoreFullError(f"{self.max_pending} blobs already pending")
+            if self._used_bytes + size > self.max_pending_bytes:
+                self.rejected += 1
+                raise BlobStoreFullError(
+                    f"Pending blobs would exceed {self.max_pending_bytes} bytes"
+                )
+            self._used += new
+            self._used_bytes += size
+
+    def _release(self, blob: Blob) -> None:
+        with self._lock:
+            self._used -= 1
+            self._used_bytes -= blob.size
+
+    def _new(self, name: str | None) -> Blob:
+        self.reap()
+        self._reserve(0, new=True)
+        try:
+            fd, path = tempfile.mkstemp(dir=self.directory, prefix="blob-")
+        except BaseException:
+            with self._lock:
+                self._used -= 1
+            raise
+        os.close(fd)
+        return Blob(secrets.token_urlsafe(24), path, name, time.monotonic() + self.ttl)
+
+    def _abandon(self, blob: Blob) -> None:
+        self._release(blob)
+        blob.discard()
+
+    def _register(self, blob: Blob) -> Blob:
+        with self._lock:
+            self._blobs[blob.handle] = blob
+            self.created += 1
+        return blob
+
+    def publish(self, data: bytes, name: str | None = None) -> Blob:
+        """Store *data* for one download through its handle.
+
+        Raises:
+            BlobTooLargeError: If *data* exceeds the size limit
+            BlobStoreFullError: If the pending budget is used up
+        """
+        if len(data) > self.max_bytes:
+            raise BlobTooLargeError(f"Blob exceeds {self.max_bytes} bytes")
+        blob = self._new(name)
+        try:
+            self._reserve(len(data))
+            blob.size = len(data)
+            with open(blob.path, "wb") as fh:
+                fh.write(data)
+        except BaseException:
+            self._abandon(blob)
+            raise
+        return self._register(blob)
+
+    async def receive(self, chunks: Any, name: str | None = None) -> Blob:
+        """Stream an async iterable of byte *chunks* (a request body) into a blob.
+
+        File writes run in a worker thread so a slow disk never stalls the
+        event loop.
+
+        Raises:
+            BlobTooLargeError: If the body exceeds the size limit
+            BlobStoreFullError: If the pending budget is used up
+        """
+        blob = self._new(name)
+        try:
+            with open(blob.path, "wb") as fh:
+                buffer = bytearray()
+                async for chunk in chunks:
+                    if blob.size + len(chunk) > self.max_bytes:
+                        raise BlobTooLargeError(f"Blob exceeds {self.max_bytes} bytes")
+                    self._reserve(len(chunk))
+                    blob.size += len(chunk)
+                    buffer += chunk
+                    if len(buffer) >= _WRITE_SIZE:
+                        await asyncio.to_thread(fh.write, buffer)
+                        buffer = bytearray()
+                if buffer:
+                    await asyncio.to_thread(fh.write, buffer)
+        except BaseException:
+            self._abandon(blob)
+            raise
+        return self._register(blob)
+
+    def claim(self, handle: str) -> Blob | None:
+        """Take ownership of the blob behind *handle* (single use).
+
+        The caller must :meth:`Blob.discard` it when done.
+        """
+        with self._lock:
+            blob = self._blobs.pop(handle, None)
+        if blob is None:
+            return None
+        self._release(blob)
+        if blob.expires_at <= time.monotonic():
+            blob.discard()
+            with self._lock:
+                self.expired += 1
+            return None
+        with self._lock:
+            self.claimed += 1
+        return blob
+
+    def reap(self) -> None:
+        """Delete blobs whose handles have expired unused."""
+        now = time.monotonic()
+        with self._lock:
+            stale = [h for h, blob in self._blobs.items() if blob.expires_at <= now]
+            blobs = [self._blobs.pop(h) for h in stale]
+            self.expired += len(blobs)
+        for blob in blobs:
+            self._abandon(blob)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "pending": len(self._blobs),
+                "pending_bytes": sum(blob.size for blob in self._blobs.values()),
+                "created": self.created,
+                "claimed": self.claimed,
+                "expired": self.expired,
+                "rejected": self.rejected,
+            }
+
+
+_store: BlobStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore | None:
+    """Return the shared store, or None when the side channel is unavailable."""
+    global _store
+    from ..config import get_settings  # noqa: PLC0415
+
+    settings = get_settings()
+    if not settings.shp_blob_transfer or settings.transport not in ("sse", "http"):
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = BlobStore(
+                    os.path.join(tempfile.gettempdir(), "sharepoint-mcp-blobs"),
+                    ttl=settings.shp_blob_ttl,
+                    max_bytes=settings.shp_blob_max_bytes,
+                    max_pending=settings.shp_blob_max_pending,
+                    max_pending_bytes=settings.shp_blob_max_pending_bytes,
+                )
+    return _store
+
+
+def publish_blob(data: bytes, name: str | None = None) -> dict[str, Any] | None:
+    """Offer *data* for download through the side channel.
+
+    Returns:
+        ``content_url`` / ``expires_in`` fields for a tool result, or None
+        when the side channel is unavailable (callers fall back to base64)
+    """
+    store = get_blob_store()
+    if store is None:
+        return None
+    try:
+        blob = store.publish(data, name)
+    except (BlobTooLargeError, BlobStoreFullError, OSError) as exc:
+        logger.warning("Falling back to base64 for '%s': %s", name, exc)
+        return None
+    return {"content_url": f"/blobs/{blob.handle}", "expires_in": int(store.ttl)}
+
+
+def blob_stats() -> dict[str, Any] | None:
+    """Stats for /health, or None if no blob was exchanged yet."""
+    return _store.stats() if _store is not None else None
@@ -0,0 +1,411 @@
+"""In-process TTL + LRU cache for read-only service calls.
+
+``@cached`` wraps a service entry point (sync or async) so repeated calls
+with the same arguments are answered from memory for a per-tool TTL
+(``SHP_CACHE_TTLS``). The cache is bounded by an approximate byte size
+(``SHP_CACHE_MAX_BYTES``) and evicts least recently used entries first.
+
+Entries remember the folder/file path they describe. ``@invalidates`` on
+mutating entry points drops the entries for each changed item, its
+descendants, its parent folder's listing and any tree above it. Where a
+tool can cheaply re-check freshness (e.g. a file's eTag), an expired entry
+is revalidated instead of recomputed. While the circuit breaker for the
+backend is open (``core/breaker.py``), an expired entry is served as is.
+
+Cached values are shared between callers and must be treated as read-only.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import logging
+import posixpath
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import wraps
+from typing import Any, TypeVar
+
+from ..exceptions import SharePointCircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+_T = TypeVar("_T")
+
+DEFAULT_TTLS = {
+    "list_documents": 30.0,
+    "list_folders": 30.0,
+    "get_folder_tree": 120.0,
+    "get_file_metadata": 60.0,
+}
+
+
+def normalize_cache_path(path: str | None) -> str:
+    """Canonical, case-insensitive form of a folder/file path ("" = root)."""
+    if not path:
+        return ""
+    return posixpath.normpath(f"/{path}").strip("/").lower()
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "size", "path", "recursive", "validator")
+
+    def __init__(self, value, expires_at, size, path, recursive, validator):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.path = path
+        self.recursive = recursive
+        self.validator = validator
+
+
+class ResponseCache:
+    """Thread-safe, byte-bounded LRU map with per-entry expiry.
+
+    Args:
+        max_bytes: Approximate memory budget for cached values
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stale = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, key: tuple) -> _Entry | None:
+        """Return the entry for *key* (fresh or expired), marking it recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def store(
+        self,
+        key: tuple,
+        value: Any,
+        ttl: float,
+        path: str,
+        recursive: bool = False,
+        validator: str | None = None,
+    ) -> None:
+        try:
+            size = len(json.dumps(value, default=str))
+        except (TypeError, ValueError):
+            return
+        if size > self.max_bytes:
+            return
+        entry = _Entry(value, time.monotonic() + ttl, size, path, recursive, validator)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old.size
+            self._entries[key] = entry
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted.size
+                self.evictions += 1
+
+    def extend(self, entry: _Entry, ttl: float) -> None:
+        """Mark a revalidated *entry* fresh for another *ttl* seconds."""
+        entry.expires_at = time.monotonic() + ttl
+        with self._lock:
+            self.revalidated += 1
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def record_stale(self) -> None:
+        """Count an expired entry served because its backend was unavailable."""
+        with self._lock:
+            self.stale += 1
+
+    def invalidate(self, path: str) -> None:
+        """Drop entries affected by a change to the item at *path*.
+
+        That is the item itself, anything below it, its containing folder's
+        listing and recursive entries above it.
+        """
+        path = normalize_cache_path(path)
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items()
+                if _related(entry.path, path, entry.recursive)
+            ]
+            for key in stale:
+                self.bytes -= self._entries.pop(key).size
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "stale": self.stale,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            }
+
+
+def _related(entry_path: str, changed: str, recursive: bool) -> bool:
+    """Whether a change to the item at *changed* can affect an entry for *entry_path*."""
+    if not changed or entry_path == changed or entry_path.startswith(changed + "/"):
+        return True  # the item itself or anything below it
+    if entry_path == posixpath.dirname(changed):
+        return True  # listing of the containing folder
+    if recursive and (not entry_path or changed.startswith(entry_path + "/")):
+        return True  # tree entry spans the change
+    return False
+
+
+_cache: ResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Return the shared cache, or None when caching is disabled."""
+    global _cache
+    from ..config import get_settings  # noqa: PLC0415
+
+    settings = get_settings()
+    if not settings.shp_cache_enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(settings.shp_cache_max_bytes)
+    return _cache
+
+
+def cache_stats() -> dict[str, Any] | None:
+    """Stats for /health, or None if nothing was cached yet."""
+    return _cache.stats() if _cache is not None else None
+
+
+def _ttl(tool: str) -> float:
+    from ..config import get_settings  # noqa: PLC0415
+    return get_settings().shp_cache_ttls.get(tool, 0.0)
+
+
+def _backend_path(path: str | None) -> str:
+    """Cache form of *path* as the backend resolves it.
+
+    Goes through ``RequestContext.path`` (library scope plus the client's
+    library-name mapping), so "Shared Documents/X" and "X" share entries
+    wherever the backend treats them as the same item.
+    """
+    from ..core.request_context import request_context  # noqa: PLC0415
+
+    try:
+        return normalize_cache_path(request_context().path(path))
+    except Exception as exc:
+        logger.debug("Cache path resolution failed for %r: %s", path, exc)
+        return normalize_cache_path(path)
+
+
+async def _off_loop_until_ready(resolve: Callable[..., _T], *args: Any) -> _T:
+    """Run *resolve* inline, or on a worker thread while client creation would block."""
+    from ..core.client import shared_client_ready  # noqa: PLC0415
+
+    if shared_client_ready():
+        return resolve(*args)
+    return await asyncio.to_thread(resolve, *args)
+
+
+def _path_arity(path: Callable[..., Any]) -> int:
+    """Number of leading call arguments a *path* callable names."""
+    return sum(
+        p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+        for p in inspect.signature(path).parameters.values()
+    )
+
+
+def cached(
+    tool: str,
+    path: Callable[..., str | None],
+    *,
+    recursive: bool = False,
+    validator: Callable[[Any], str | None] | None = None,
+    revalidate: Callable[..., str | None] | None = None,
+) -> Callable[[_F], _F]:
+    """Cache a read-only service function for the *tool* TTL.
+
+    Entries are keyed by the backend-resolved path plus the remaining
+    arguments, so spellings the backend maps to one item share an entry.
+
+    Args:
+        tool: Key into ``SHP_CACHE_TTLS``; a TTL of 0 disables caching
+        path: Maps the call arguments to the path the result describes; its
+            named parameters are the function's leading (path) parameters
+        recursive: The result covers everything below *path* (trees)
+        validator: Extracts a version tag (eTag) from a result
+        revalidate: Fetches the current version tag for the call arguments;
+            an expired entry whose tag is unchanged is served again
+    """
+
+    def _store(cache: ResponseCache, key: tuple, item: str, value: Any) -> None:
+        if isinstance(value, dict) and (value.get("success") is False or "error" in value):
+            return  # never cache failures
+        cache.store(
+            key,
+            value,
+            _ttl(tool),
+            item,
+            recursive,
+            validator(value) if validator else None,
+        )
+
+    def decorator(func: _F) -> _F:
+        signature = inspect.signature(func)
+        path_params = set(list(signature.parameters)[: _path_arity(path)])
+
+        def _resolve(args: tuple, kwargs: dict) -> tuple[tuple, str]:
+            item = _backend_path(path(*args, **kwargs))
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            rest = tuple(
+                (name, value) for name, value in bound.arguments.items()
+                if name not in path_params
+            )
+            return (tool, item, rest), item
+
+        def _cache() -> ResponseCache | None:
+            cache = get_response_cache()
+            return cache if cache is not None and _ttl(tool) > 0 else None
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                cache = _cache()
+                if cache is None:
+                    return await func(*args, **kwargs)
+                key, item = await _off_loop_until_ready(_resolve, args, kwargs)
+                entry = cache.lookup(key)
+                if entry is not None:
+                    if entry.expires_at > time.monotonic():
+                        cache.record(hit=True)
+                        return entry.value
+                    if revalidate and entry.validator:
+                        current = await asyncio.to_thread(_safe, revalidate, args, kwargs)
+                        if current == entry.validator:
+                            cache.extend(entry, _ttl(tool))
+                            cache.record(hit=True)
+                            return entry.value
+                cache.record(hit=False)
+                try:
+                    value = await func(*args, **kwargs)
+                except SharePointCircuitOpenError:
+                    if entry is None:
+                        raise
+                    cache.record_stale()
+                    return entry.value
+                _store(cache, key, item, value)
+                return value
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            cache = _cache()
+            if cache is None:
+                return func(*args, **kwargs)
+            key, item = _resolve(args, kwargs)
+            entry = cache.lookup(key)
+            if entry is not None:
+                if entry.expires_at > time.monotonic():
+                    cache.record(hit=True)
+                    return entry.value
+                if revalidate and entry.validator:
+                    if _safe(revalidate, args, kwargs) == entry.validator:
+                        cache.extend(entry, _ttl(tool))
+                        cache.record(hit=True)
+                        return entry.value
+            cache.record(hit=False)
+            try:
+                value = func(*args, **kwargs)
+            except SharePointCircuitOpenError:
+                if entry is None:
+                    raise
+                cache.record_stale()
+                return entry.value
+            _store(cache, key, item, value)
+            return value
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _safe(revalidate: Callable[..., str | None], args: tuple, kwargs: dict) -> str | None:
+    try:
+        return revalidate(*args, **kwargs)
+    except Exception as exc:
+        logger.debug("Cache revalidation failed: %s", exc)
+        return None
+
+
+def invalidates(paths: Callable[..., list[str | None]]) -> Callable[[_F], _F]:
+    """Drop cached entries affected by the items a mutating call changes.
+
+    Paths are resolved the way the backend resolves them (see ``@cached``).
+    Invalidation runs after the call, whether it succeeded or failed, since
+    a failed mutation may still have partially applied.
+    """
+
+    def _resolve(args: tuple, kwargs: dict) -> list[str]:
+        return [_backend_path(changed) for changed in paths(*args, **kwargs)]
+
+    def decorator(func: _F) -> _F:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    if _cache is not None:
+                        for item in await _off_loop_until_ready(_resolve, args, kwargs):
+                            _cache.invalidate(item)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if _cache is not None:
+                    for item in _resolve(args, kwargs):
+                        _cache.invalidate(item)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def join_path(folder: str | None, name: str | None) -> str:
+    """``folder/name`` with empty parts skipped."""
+    return "/".join(p for p in (folder, name) if p)
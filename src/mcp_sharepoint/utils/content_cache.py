@@ -0,0 +1,209 @@
+"""Two-tier cache of extracted document text, keyed by drive item + cTag.
+
+Parsing a large PDF or workbook dominates ``Get_Document_Content``. The
+Graph ``cTag`` (content tag) only changes when a file's bytes change, so the
+parsed payload for an ``(item id, cTag)`` pair can be reused indefinitely:
+a repeat read of an unchanged file costs one metadata GET instead of a
+download and a parse.
+
+Entries live in a byte-bounded in-memory LRU (``SHP_CONTENT_CACHE_MAX_BYTES``)
+backed by JSON files under ``SHP_CACHE_DIR/content``
+(``SHP_CONTENT_CACHE_DISK_MAX_BYTES``, oldest files pruned first) so they
+survive restarts. Each item (per set of extraction limits) keeps only its
+latest version; a new cTag replaces the previous entry. Only text results are cached — base64
+fallbacks would cost more to store than to re-download.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from .parsers import detect_file_type
+
+logger = logging.getLogger(__name__)
+
+
+class ContentCache:
+    """Thread-safe memory + disk store of parsed content payloads.
+
+    Args:
+        directory: Folder for the on-disk tier (None = memory only)
+        max_bytes: Approximate memory budget
+        disk_max_bytes: Disk budget; 0 disables the disk tier
+    """
+
+    def __init__(self, directory: str | None, max_bytes: int, disk_max_bytes: int = 0):
+        self.directory = directory if disk_max_bytes > 0 else None
+        self.max_bytes = max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.bytes = 0
+        self.disk_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[str, dict[str, Any], int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            self.disk_bytes = sum(size for _, size, _ in self._disk_files())
+
+    @staticmethod
+    def _key(item_id: str, file_name: str, variant: str) -> str:
+        # The parser (and so the payload) depends on the extension and the
+        # extraction limits too
+        raw = f"{item_id}\0{detect_file_type(file_name)}\0{variant}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _disk_files(self) -> list[tuple[str, int, float]]:
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                files.append((entry.path, stat.st_size, stat.st_mtime))
+        return files
+
+    def lookup(
+        self, item_id: str, tag: str, file_name: str, variant: str = "",
+    ) -> dict[str, Any] | None:
+        """Return the cached payload for *item_id* at version *tag*, if any.
+
+        *variant* distinguishes extractions of the same file with different
+        limits (page range, character budget).
+        """
+        key = self._key(item_id, file_name, variant)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == tag:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return {**cached[1], "name": file_name}
+
+        result = self._read_disk(key, tag)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._remember(key, tag, result)
+        return {**result, "name": file_name}
+
+    def store(
+        self, item_id: str, tag: str, file_name: str, result: dict[str, Any], variant: str = "",
+    ) -> None:
+        """Cache a parsed *result* for *item_id* at version *tag*."""
+        if result.get("content_type") != "text":
+            return
+        key = self._key(item_id, file_name, variant)
+        self._remember(key, tag, result)
+        self._write_disk(key, tag, result)
+
+    def _remember(self, key: str, tag: str, result: dict[str, Any]) -> None:
+        size = len(result.get("content") or "")
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+            self._entries[key] = (tag, result, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+
+    def _read_disk(self, key: str, tag: str) -> dict[str, Any] | None:
+        if not self.directory:
+            return None
+        path = os.path.join(self.directory, f"{key}.json")
+        try:
+            with open(path, encoding="utf-8") as fh:
+                record = json.load(fh)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Discarding unreadable content cache file %s: %s", path, exc)
+            return None
+        if record.get("tag") != tag:
+            return None
+        return record.get("result")
+
+    def _write_disk(self, key: str, tag: str, result: dict[str, Any]) -> None:
+        if not self.directory:
+            return
+        data = json.dumps({"tag": tag, "result": result}).encode("utf-8")
+        if len(data) > self.disk_max_bytes:
+            return
+        path = os.path.join(self.directory, f"{key}.json")
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            with self._lock:
+                old_size = os.path.getsize(path) if os.path.exists(path) else 0
+                os.replace(tmp, path)
+                self.disk_bytes += len(data) - old_size
+                if self.disk_bytes > self.disk_max_bytes:
+                    self._prune_disk()
+        except OSError as exc:
+            logger.warning("Could not write content cache file %s: %s", path, exc)
+
+    def _prune_disk(self) -> None:
+        """Delete the oldest files until the disk tier fits (caller holds the lock)."""
+        for path, size, _ in sorted(self._disk_files(), key=lambda f: f[2]):
+            if self.disk_bytes <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.disk_bytes -= size
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "disk_bytes": self.disk_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (
+                    round((self.hits + self.disk_hits) / lookups, 3) if lookups else None
+                ),
+            }
+
+
+_content_cache: ContentCache | None = None
+_content_cache_lock = threading.Lock()
+
+
+def get_content_cache() -> ContentCache | None:
+    """Return the shared content cache, or None when disabled."""
+    global _content_cache
+    from ..config import get_settings  # noqa: PLC0415
+
+    settings = get_settings()
+    if not settings.shp_content_cache_enabled:
+        return None
+    if _content_cache is None:
+        with _content_cache_lock:
+            if _content_cache is None:
+                _content_cache = ContentCache(
+                    os.path.join(settings.shp_cache_dir, "content"),
+                    settings.shp_content_cache_max_bytes,
+                    settings.shp_content_cache_disk_max_bytes,
+                )
+    return _content_cache
+
+
+def content_cache_stats() -> dict[str, Any] | None:
+    """Stats for /health, or None if the cache was never used."""
+    return _content_cache.stats() if _content_cache is not None else None
@@ -0,0 +1,163 @@
+"""Concurrent breadth-first folder crawler shared by the tree builders.
+
+Each tree level is listed by a bounded thread pool. An adaptive rate limiter
+paces the requests instead of fixed sleeps: it starts at the configured rate,
+halves it (and pauses for ``Retry-After``) whenever SharePoint throttles, and
+creeps back up additively while calls succeed. Throttled folders are
+re-queued rather than dropped.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from ..exceptions import SharePointCircuitOpenError
+from .retry import is_throttle_error, retry_after_seconds
+
+logger = logging.getLogger(__name__)
+
+# (child nodes, sub-folder paths) for one listed folder
+Listing = tuple[list[dict[str, Any]], list[str]]
+
+
+class AdaptiveRateLimiter:
+    """Thread-safe AIMD request pacer.
+
+    Args:
+        rate: Starting and maximum request rate (requests per second)
+        min_rate: Floor the rate never drops below
+    """
+
+    def __init__(self, rate: float, min_rate: float = 0.5):
+        self.max_rate = max(rate, min_rate)
+        self.min_rate = min_rate
+        self.rate = self.max_rate
+        self.throttles = 0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until the caller may send its next request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.rate
+        if slot > now:
+            time.sleep(slot - now)
+
+    def on_success(self) -> None:
+        """Additive increase: regain a tenth of the headroom per success."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+    def on_throttle(self, retry_after: float | None = None) -> None:
+        """Multiplicative decrease, plus a pause of *retry_after* seconds."""
+        with self._lock:
+            self.throttles += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            pause = retry_after if retry_after is not None else 1.0 / self.rate
+            self._next_slot = max(self._next_slot, time.monotonic() + pause)
+        logger.warning("Throttled during crawl; rate now %.1f req/s", self.rate)
+
+
+def crawl_tree(
+    root: str,
+    fetch: Callable[[list[str]], Sequence[Listing | Exception]],
+    *,
+    max_depth: int,
+    max_folders_per_level: int,
+    workers: int,
+    limiter: AdaptiveRateLimiter,
+    group_size: int = 1,
+    max_throttle_retries: int = 5,
+) -> dict[str, list[dict[str, Any]]]:
+    """List every folder below *root*, level by level, in parallel.
+
+    Args:
+        root: Relative path of the starting folder ("" for the library root)
+        fetch: Lists a group of folders; returns one ``Listing`` or the
+            exception raised for it per path, in order
+        max_depth: Number of levels to descend (SHP_MAX_DEPTH)
+        max_folders_per_level: Folders dispatched per wave (SHP_MAX_FOLDERS_PER_LEVEL)
+        workers: Thread pool size
+        limiter: Shared rate limiter (one ``acquire`` per ``fetch`` call)
+        group_size: Folders handed to one ``fetch`` call (e.g. 20 for $batch)
+        max_throttle_retries: Re-queues allowed for a throttled folder
+
+    Returns:
+        Mapping of folder path to its child nodes, as consumed by ``assemble_tree``.
+
+    Raises:
+        SharePointCircuitOpenError: When a listing fails fast on an open
+            breaker; a tree with those folders missing is not returned
+    """
+    tree_nodes: dict[str, list[dict[str, Any]]] = {}
+
+    def _list_group(group: list[str]) -> list[Listing | Exception]:
+        results: dict[str, Listing | Exception] = {}
+        todo = list(group)
+        for attempt in range(max_throttle_retries + 1):
+            limiter.acquire()
+            try:
+                listings = list(fetch(todo))
+            except Exception as exc:  # one failure covers the whole group
+                listings = [exc] * len(todo)
+
+            throttled = []
+            retry_after = None
+            for path, listing in zip(todo, listings):
+                results[path] = listing
+                if isinstance(listing, Exception) and is_throttle_error(listing):
+                    throttled.append(path)
+                    delay = retry_after_seconds(listing)
+                    if delay is not None:
+                        retry_after = max(retry_after or 0.0, delay)
+            if not throttled:
+                limiter.on_success()
+                break
+            limiter.on_throttle(retry_after)
+            if attempt < max_throttle_retries:
+                todo = throttled
+        return [results[path] for path in group]
+
+    pending = [root]
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="tree") as pool:
+        for level in range(max_depth):
+            if not pending:
+                break
+            logger.info("Tree level %d: %d folder(s)", level + 1, len(pending))
+            current, pending = pending, []
+
+            for start in range(0, len(current), max_folders_per_level):
+                wave = current[start : start + max_folders_per_level]
+                groups = [wave[i : i + group_size] for i in range(0, len(wave), group_size)]
+                for group, listings in zip(groups, pool.map(_list_group, groups)):
+                    for path, listing in zip(group, listings):
+                        if isinstance(listing, SharePointCircuitOpenError):
+                            raise listing
+                        if isinstance(listing, Exception):
+                            logger.warning(
+                                "Failed to process folder '%s' in tree traversal: %s (%s)",
+                                path, listing, type(listing).__name__,
+                            )
+                            continue
+                        nodes, sub_folders = listing
+                        tree_nodes[path] = nodes
+                        pending.extend(sub_folders)
+
+    return tree_nodes
+
+
+def assemble_tree(tree_nodes: dict[str, list[dict[str, Any]]], root: str) -> list[dict]:
+    """Attach each folder's listed children to its node, starting at *root*."""
+    children = tree_nodes.get(root, [])
+    for child in children:
+        if child["type"] == "folder":
+            child["children"] = assemble_tree(
+                tree_nodes, f"{root}/{child['name']}".strip("/")
+            )
+    return children
@@ -0,0 +1,244 @@
+"""Prometheus metrics served by the ``/metrics`` route.
+
+Only what nothing else counts is recorded on the hot path -- tool calls,
+SharePoint HTTP requests and parse times -- and recording is a dict update
+under a lock; nothing is formatted until a scrape. Counters other
+components already keep (retries, throttling, token renewals, caches,
+pools) are read from their ``stats()`` when ``/metrics`` is scraped.
+``asyncio.to_thread`` work is counted by :class:`CountingThreadPool`,
+installed as the event loop's default executor.
+
+The text exposition format (version 0.0.4) is written directly, so no
+client library is needed.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import wraps
+from typing import Any, TypeVar
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Request latencies, from fast cache hits to slow downloads
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# (label values, sample value) pairs of one metric family
+Samples = Iterable[tuple[Mapping[str, Any], float | None]]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _labels(labels: Mapping[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def family(name: str, kind: str, help_text: str, samples: Samples) -> list[str]:
+    """Exposition lines for one metric family (samples with a None value are skipped)."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        if value is not None:
+            lines.append(f"{name}{_labels(labels)} {_number(value)}")
+    return lines
+
+
+class Counter:
+    """Monotonic counter keyed by label values.
+
+    Args:
+        name: Metric name (``_total`` suffix included)
+        help_text: ``# HELP`` description
+        labels: Label names, in the order values are passed to :meth:`inc`
+    """
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *values: Any, amount: float = 1) -> None:
+        with self._lock:
+            self._values[values] = self._values.get(values, 0) + amount
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items(), key=lambda item: str(item[0]))
+        return family(
+            self.name,
+            "counter",
+            self.help_text,
+            ((dict(zip(self.labels, key)), value) for key, value in values),
+        )
+
+
+class Histogram:
+    """Histogram keyed by label values, with fixed upper bucket bounds.
+
+    Args:
+        name: Metric name
+        help_text: ``# HELP`` description
+        labels: Label names, in the order values are passed to :meth:`observe`
+        buckets: Increasing upper bounds (``+Inf`` is implied)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [per-bucket counts (last = +Inf), sum]
+        self._series: dict[tuple, list[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *values: Any) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(values)
+            if series is None:
+                series = self._series[values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            series = sorted(
+                ((key, list(counts), total) for key, (counts, total) in self._series.items()),
+                key=lambda item: str(item[0]),
+            )
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, counts, total in series:
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{_labels({**labels, 'le': _number(bound)})} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{_labels(labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(labels)} {cumulative}")
+        return lines
+
+
+TOOL_CALLS = Counter(
+    "sharepoint_mcp_tool_calls_total",
+    "MCP tool calls by tool and outcome (error: raised or returned success=false).",
+    ("tool", "outcome"),
+)
+TOOL_SECONDS = Histogram(
+    "sharepoint_mcp_tool_duration_seconds", "MCP tool call latency.", ("tool",)
+)
+HTTP_REQUESTS = Counter(
+    "sharepoint_mcp_http_requests_total",
+    "SharePoint / Graph HTTP requests by endpoint class, method and status "
+    "(error: no response).",
+    ("endpoint", "method", "status"),
+)
+PARSE_SECONDS = Histogram(
+    "sharepoint_mcp_parse_duration_seconds",
+    "Document parse time by file type, including time queued for a parse worker.",
+    ("file_type",),
+)
+
+_INSTRUMENTS = (TOOL_CALLS, TOOL_SECONDS, HTTP_REQUESTS, PARSE_SECONDS)
+
+
+def timed(tool: str) -> Callable[[_F], _F]:
+    """Count and time calls to an async MCP tool function under *tool*."""
+
+    def decorator(func: _F) -> _F:
+        if not inspect.iscoroutinefunction(func):
+            raise TypeError(f"{tool}: only async tools can be timed")
+
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = await func(*args, **kwargs)
+                if not (isinstance(result, dict) and result.get("success") is False):
+                    outcome = "ok"
+                return result
+            finally:
+                TOOL_SECONDS.observe(time.perf_counter() - started, tool)
+                TOOL_CALLS.inc(tool, outcome)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+class CountingThreadPool(ThreadPoolExecutor):
+    """Thread pool that counts submitted work until it finishes.
+
+    ``in_flight`` covers work both queued for a thread and running.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.in_flight = 0
+        self._count_lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        with self._count_lock:
+            self.in_flight += 1
+        try:
+            future = super().submit(fn, *args, **kwargs)
+        except BaseException:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, _future: Future | None) -> None:
+        with self._count_lock:
+            self.in_flight -= 1
+
+
+_thread_pool: CountingThreadPool | None = None
+
+
+def count_thread_work(loop: asyncio.AbstractEventLoop) -> None:
+    """Give *loop* a default executor (used by ``asyncio.to_thread``) that counts its work."""
+    global _thread_pool
+    _thread_pool = CountingThreadPool(thread_name_prefix="asyncio")
+    loop.set_default_executor(_thread_pool)
+
+
+def thread_work_in_flight() -> int | None:
+    """``asyncio.to_thread`` work queued or running, or None if not counted."""
+    return _thread_pool.in_flight if _thread_pool is not None else None
+
+
+def render(*extra: Iterable[str]) -> str:
+    """The hot-path instruments plus *extra* families, in exposition format."""
+    lines: list[str] = []
+    for instrument in _INSTRUMENTS:
+        lines.extend(instrument.collect())
+    for block in extra:
+        lines.extend(block)
+    return "\n".join(lines) + "\n"
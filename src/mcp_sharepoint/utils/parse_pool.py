@@ -0,0 +1,248 @@
+"""Process pool that runs CPU-bound document parsers off the server process.
+
+``parse_pdf``/``parse_excel``/``parse_word`` hold the GIL for their whole
+run, so parsing on a worker thread stalls every other tool call. With
+``SHP_PARSE_WORKERS`` > 0 parsing is shipped to a ``ProcessPoolExecutor``
+instead: the calling thread just waits on a future (GIL released) and
+multi-core hosts parse several documents at once.
+
+Workers are started with ``forkserver`` where available (``spawn``
+otherwise) rather than forking the threaded server, and are bounded by:
+
+- ``SHP_PARSE_MAX_TASKS_PER_CHILD`` — recycle workers to shed leaked memory;
+- ``SHP_PARSE_MEMORY_LIMIT`` — address-space cap per worker (POSIX only);
+- ``SHP_PARSE_TIMEOUT`` — a parse running longer is abandoned and its
+  worker killed.
+
+Each worker is its own single-process executor and takes one parse at a
+time; parses wait in the pool for an idle worker. The timeout therefore
+counts from when a worker picks the parse up, and killing an overrunning
+or dead worker (memory cap, crash) never touches other parses, running or
+queued. A dead worker is replaced and its parse retried once. With
+``SHP_PARSE_WORKERS=0`` parsers run inline and the timeout does not apply.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import queue
+import sys
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# ProcessPoolExecutor only takes max_tasks_per_child from 3.11; older
+# interpreters get the equivalent by recycling the whole pool
+_NATIVE_RECYCLING = sys.version_info >= (3, 11)
+
+
+class ParseTimeoutError(TimeoutError):
+    """Raised when a parse exceeds ``SHP_PARSE_TIMEOUT``."""
+
+
+def _limit_memory(max_bytes: int) -> None:
+    """Worker initializer: cap the worker's address space."""
+    if max_bytes <= 0:
+        return
+    try:
+        import resource  # POSIX only
+    except ImportError:
+        return
+    resource.setrlimit(resource.RLIMIT_AS, (max_bytes, max_bytes))
+
+
+def _mp_context() -> Any:
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        # Import the parsers once in the fork server instead of per worker
+        ctx.set_forkserver_preload(["mcp_sharepoint.utils.parsers"])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+class _Worker:
+    """One worker process, wrapped in a single-process executor."""
+
+    __slots__ = ("executor", "tasks")
+
+    def __init__(self) -> None:
+        self.executor: ProcessPoolExecutor | None = None
+        self.tasks = 0
+
+
+class ParsePool:
+    """A pool of restartable worker processes with per-task timeouts.
+
+    Args:
+        workers: Number of worker processes
+        max_tasks_per_child: Parses per worker before it is replaced (0 = never)
+        memory_limit: Address-space cap per worker in bytes (0 = none)
+        timeout: Seconds a parse may run once a worker picks it up (None = no limit)
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_tasks_per_child: int = 0,
+        memory_limit: int = 0,
+        timeout: float | None = None,
+    ):
+        self.workers = workers
+        self.max_tasks_per_child = max_tasks_per_child
+        self.memory_limit = memory_limit
+        self.timeout = timeout
+        self.submitted = 0
+        self.completed = 0
+        self.timeouts = 0
+        self.restarts = 0
+        self.pending = 0
+        self._workers = [_Worker() for _ in range(max(1, workers))]
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        for worker in self._workers:
+            self._idle.put(worker)
+        self._lock = threading.Lock()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        kwargs: dict[str, Any] = {}
+        if self.max_tasks_per_child and _NATIVE_RECYCLING:
+            kwargs["max_tasks_per_child"] = self.max_tasks_per_child
+        return ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=_mp_context(),
+            initializer=_limit_memory,
+            initargs=(self.memory_limit,),
+            **kwargs,
+        )
+
+    def _submit(self, worker: _Worker, fn: Callable[..., T], args: tuple[Any, ...]) -> Future:
+        """Hand a parse to *worker*, which is idle and owned by the caller."""
+        if worker.executor is None:
+            worker.executor = self._new_executor()
+        elif (
+            self.max_tasks_per_child
+            and not _NATIVE_RECYCLING
+            and worker.tasks >= self.max_tasks_per_child
+        ):
+            # The worker is idle, so it just exits
+            worker.executor.shutdown(wait=False)
+            worker.executor = self._new_executor()
+            worker.tasks = 0
+        worker.tasks += 1
+        return worker.executor.submit(fn, *args)
+
+    def _replace(self, worker: _Worker, *, kill: bool) -> None:
+        """Drop *worker*'s process; a fresh one starts with its next parse."""
+        executor, worker.executor, worker.tasks = worker.executor, None, 0
+        with self._lock:
+            self.restarts += 1
+        if executor is None:
+            return
+        if kill:
+            terminate = getattr(executor, "terminate_workers", None)  # 3.14+
+            if terminate is not None:
+                terminate()
+            else:
+                for process in list((getattr(executor, "_processes", None) or {}).values()):
+                    process.terminate()
+        executor.shutdown(wait=False)
+
+    def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` in a worker and return its result.
+
+        *fn* and *args* must be picklable.
+
+        Raises:
+            ParseTimeoutError: If the parse exceeds the timeout
+        """
+        try:
+            return self._run_once(fn, args)
+        except BrokenProcessPool:
+            logger.warning("Parse worker died; retrying on a fresh worker")
+            return self._run_once(fn, args)
+
+    def _run_once(self, fn: Callable[..., T], args: tuple[Any, ...]) -> T:
+        with self._lock:
+            self.submitted += 1
+            self.pending += 1
+        worker = self._idle.get()
+        try:
+            future = self._submit(worker, fn, args)
+            try:
+                result = future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                with self._lock:
+                    self.timeouts += 1
+                logger.warning("Parse exceeded %ss; restarting its worker", self.timeout)
+                self._replace(worker, kill=True)
+                raise ParseTimeoutError(f"Parsing took longer than {self.timeout}s") from None
+            except BrokenProcessPool:
+                self._replace(worker, kill=False)
+                raise
+        finally:
+            self._idle.put(worker)
+            with self._lock:
+                self.pending -= 1
+        with self._lock:
+            self.completed += 1
+        return result
+
+    def shutdown(self) -> None:
+        for worker in self._workers:
+            executor, worker.executor = worker.executor, None
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self.pending,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "timeouts": self.timeouts,
+                "restarts": self.restarts,
+            }
+
+
+_pool: ParsePool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> ParsePool | None:
+    """Return the shared parse pool, or None when parsing runs inline."""
+    global _pool
+    from ..config import get_settings  # noqa: PLC0415
+
+    settings = get_settings()
+    if settings.shp_parse_workers <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ParsePool(
+                    settings.shp_parse_workers,
+                    max_tasks_per_child=settings.shp_parse_max_tasks_per_child,
+                    memory_limit=settings.shp_parse_memory_limit,
+                    timeout=settings.shp_parse_timeout or None,
+                )
+    return _pool
+
+
+def run_parse(fn: Callable[..., T], *args: Any) -> T:
+    """Run a parser in the process pool, or inline when it is disabled."""
+    pool = get_parse_pool()
+    if pool is None:
+        return fn(*args)
+    return pool.run(fn, *args)
+
+
+def parse_pool_stats() -> dict[str, Any] | None:
+    """Stats for /health, or None if nothing was parsed out of process yet."""
+    return _pool.stats() if _pool is not None else None
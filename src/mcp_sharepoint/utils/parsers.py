@@ -3,7 +3,9 @@ from __future__ import annotations
 
 import io
 import logging
-from typing import Literal
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any, Literal
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +22,9 @@ _FILE_TYPE_MAP: dict[str, list[str]] = {
 
 FileType = Literal["text", "pdf", "excel", "word", "binary"]
 
+# Rows shown per worksheet unless the caller asks for more or fewer
+DEFAULT_EXCEL_ROWS = 50
+
 
 def detect_file_type(file_name: str) -> FileType:
     """Return the logical file type for *file_name* based on its extension."""
@@ -30,6 +35,126 @@ def detect_file_type(file_name: str) -> FileType:
     return "binary"
 
 
+@dataclass(frozen=True)
+class ContentOptions:
+    """Limits applied while extracting a document's content.
+
+    Attributes:
+        start_page: First PDF page to extract (1-based)
+        end_page: Last PDF page to extract (inclusive; None = last page)
+        max_chars: Stop once this many characters were extracted
+        sheets: Excel worksheets to read by name (None = all)
+        max_rows: Excel rows read per worksheet, header row included
+        max_columns: Excel columns read per row (None = all)
+        byte_offset: First byte to fetch of a text or binary file
+        max_bytes: Bytes to fetch of a text or binary file (None = to EOF)
+    """
+
+    start_page: int = 1
+    end_page: int | None = None
+    max_chars: int | None = None
+    sheets: tuple[str, ...] | None = None
+    max_rows: int = DEFAULT_EXCEL_ROWS
+    max_columns: int | None = None
+    byte_offset: int = 0
+    max_bytes: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.start_page < 1:
+            raise ValueError("start_page must be 1 or greater")
+        if self.end_page is not None and self.end_page < self.start_page:
+            raise ValueError("end_page must not be before start_page")
+        if self.max_chars is not None and self.max_chars < 1:
+            raise ValueError("max_chars must be positive")
+        if self.max_rows < 1:
+            raise ValueError("max_rows must be positive")
+        if self.max_columns is not None and self.max_columns < 1:
+            raise ValueError("max_columns must be positive")
+        if self.byte_offset < 0:
+            raise ValueError("byte_offset must not be negative")
+        if self.max_bytes is not None and self.max_bytes < 1:
+            raise ValueError("max_bytes must be positive")
+
+    @property
+    def is_partial(self) -> bool:
+        """Whether these options may return less than the whole document."""
+        return self != ContentOptions()
+
+    @property
+    def byte_range(self) -> tuple[int, int | None] | None:
+        """Inclusive ``(start, end)`` bytes to fetch, or None for the whole file."""
+        if not self.byte_offset and self.max_bytes is None:
+            return None
+        end = None if self.max_bytes is None else self.byte_offset + self.max_bytes - 1
+        return self.byte_offset, end
+
+    @property
+    def key(self) -> str:
+        """Stable identifier of these limits ("" for the defaults)."""
+        return repr(self) if self.is_partial else ""
+
+
+def open_pdf(source: str | bytes) -> Any:
+    """Open the PDF at *source* (a file path, read from disk as needed, or bytes)."""
+    import fitz  # PyMuPDF — optional heavy dep, imported lazily
+
+    if isinstance(source, str):
+        return fitz.open(source)
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def iter_pdf_pages(
+    doc: Any, start_page: int = 1, end_page: int | None = None,
+) -> Iterator[tuple[int, str]]:
+    """Yield ``(page_number, text)`` for pages *start_page*..*end_page* of *doc*.
+
+    *doc* is a document from :func:`open_pdf`; the caller closes it.
+    """
+    last = len(doc) if end_page is None else min(end_page, len(doc))
+    for number in range(max(start_page, 1), last + 1):
+        yield number, doc[number - 1].get_text()
+
+
+def pdf_page_count(doc: Any) -> int:
+    """Number of pages in *doc* (from :func:`open_pdf`)."""
+    return len(doc)
+
+
+def extract_pdf(
+    source: str | bytes, options: ContentOptions | None = None,
+) -> tuple[str, int, int, bool]:
+    """Extract text page by page, stopping once the character budget is met.
+
+    Returns:
+        (text, page_count, last_page_read, truncated)
+
+    Raises:
+        Exception: propagates any fitz / PyMuPDF error.
+    """
+    options = options or ContentOptions()
+    parts: list[str] = []
+    chars = 0
+    last_page = 0
+    doc = open_pdf(source)
+    try:
+        page_count = pdf_page_count(doc)
+        for last_page, text in iter_pdf_pages(doc, options.start_page, options.end_page):
+            parts.append(text + "\n")
+            chars += len(text) + 1
+            if options.max_chars is not None and chars >= options.max_chars:
+                break
+    finally:
+        doc.close()
+    final_page = page_count if options.end_page is None else min(options.end_page, page_count)
+
+    text = "".join(parts).strip()
+    truncated = last_page < final_page
+    if options.max_chars is not None and len(text) > options.max_chars:
+        text = text[:options.max_chars]
+        truncated = True
+    return text, page_count, last_page, truncated
+
+
 def parse_pdf(content_bytes: bytes) -> tuple[str, int]:
     """Extract plain text from a PDF byte string.
 
@@ -39,33 +164,104 @@ def parse_pdf(content_bytes: bytes) -> tuple[str, int]:
     Raises:
         Exception: propagates any fitz / PyMuPDF error.
     """
-    import fitz  # PyMuPDF — optional heavy dep, imported lazily
+    text, page_count, _, _ = extract_pdf(content_bytes)
+    return text, page_count
 
-    doc = fitz.open(stream=content_bytes, filetype="pdf")
-    text = "".join(doc[i].get_text() + "\n" for i in range(len(doc)))
-    page_count = len(doc)
-    doc.close()
-    return text.strip(), page_count
 
+def _is_zip(source: str | bytes) -> bool:
+    if isinstance(source, bytes):
+        return source[:2] == b"PK"
+    with open(source, "rb") as fh:
+        return fh.read(2) == b"PK"
 
-def parse_excel(content_bytes: bytes) -> tuple[str, int]:
-    """Extract sheet data from an Excel file.
 
-    Returns:
-        (text, sheet_count)
-    """
-    import pandas as pd  # optional heavy dep, imported lazily
+def _format_row(values: tuple[object, ...]) -> str | None:
+    """Join a row's cells with `` | ``; None for a blank row."""
+    cells = ["" if value is None else str(value) for value in values]
+    while cells and not cells[-1]:
+        cells.pop()
+    return " | ".join(cells) if cells else None
+
 
-    sheets: dict = pd.read_excel(io.BytesIO(content_bytes), sheet_name=None)
+def _parse_legacy_excel(source: str | bytes, options: ContentOptions) -> tuple[str, int]:
+    """Read a binary (BIFF) ``.xls`` workbook, which openpyxl cannot open."""
+    try:
+        import pandas as pd  # optional, only needed for .xls
+    except ImportError as exc:
+        raise ImportError(
+            "Reading .xls workbooks requires pandas and xlrd "
+            "(pip install 'sharepoint-mcp[xls]')"
+        ) from exc
+
+    data = source if isinstance(source, str) else io.BytesIO(source)
+    sheets: dict = pd.read_excel(
+        data,
+        sheet_name=list(options.sheets) if options.sheets else None,
+        header=None,
+        nrows=options.max_rows,
+        usecols=range(options.max_columns) if options.max_columns else None,
+    )
     parts: list[str] = []
     for sheet_name, df in sheets.items():
         parts.append(f"=== {sheet_name} ===")
-        parts.extend(
-            df.head(50).fillna("").astype(str).apply(" | ".join, axis=1).tolist()
-        )
+        rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+        parts.extend(line for line in map(_format_row, rows) if line is not None)
     return "\n".join(parts), len(sheets)
 
 
+def parse_excel(
+    source: str | bytes, options: ContentOptions | None = None,
+) -> tuple[str, int]:
+    """Extract the first rows of each worksheet from an Excel file.
+
+    ``.xlsx`` workbooks are streamed with openpyxl's read-only mode, so only
+    the rows shown are ever loaded. Worksheets not found are skipped.
+
+    Args:
+        source: File path or bytes
+        options: Sheet selection, row/column limits and character budget
+
+    Returns:
+        (text, sheet_count)
+    """
+    options = options or ContentOptions()
+    if not _is_zip(source):
+        return _parse_legacy_excel(source, options)
+
+    from openpyxl import load_workbook  # imported lazily
+
+    workbook = load_workbook(
+        source if isinstance(source, str) else io.BytesIO(source),
+        read_only=True,
+        data_only=True,
+    )
+    try:
+        worksheets = workbook.worksheets
+        if options.sheets is not None:
+            worksheets = [ws for ws in worksheets if ws.title in options.sheets]
+        budget = options.max_chars
+        parts: list[str] = []
+        chars = 0
+        for ws in worksheets:
+            if budget is not None and chars > budget:
+                break  # over budget: stop reading, the caller cuts the text
+            parts.append(f"=== {ws.title} ===")
+            chars += len(parts[-1]) + 1
+            rows = ws.iter_rows(
+                max_row=options.max_rows, max_col=options.max_columns, values_only=True,
+            )
+            for line in map(_format_row, rows):
+                if line is None:
+                    continue
+                parts.append(line)
+                chars += len(line) + 1
+                if budget is not None and chars > budget:
+                    break
+        return "\n".join(parts), len(workbook.worksheets)
+    finally:
+        workbook.close()
+
+
 def parse_word(content_bytes: bytes) -> tuple[str, int]:
     """Extract text from a Word document.
 
@@ -1,50 +1,308 @@
-"""Retry decorator for SharePoint API calls.
+"""The retry policy for SharePoint API calls.
 
-Uses tenacity to handle Microsoft Graph / SharePoint throttling (HTTP 429)
-and transient failures (HTTP 503) with exponential backoff.
+``sp_retry`` is the only place a failed SharePoint call is retried; the HTTP
+sessions underneath never retry on their own. One policy covers a whole
+call:
+
+* At most ``SHP_RETRY_ATTEMPTS`` attempts, and no retry that would end past
+  ``SHP_RETRY_DEADLINE`` seconds after the call started.
+* Throttling (429 / 503) waits exactly as long as the server's
+  ``Retry-After`` asks, and that pause is shared with every other worker
+  through the throttle governor (``core/throttle.py``). Other transient
+  failures back off exponentially with jitter.
+* Calls marked ``idempotent=False`` (creating a folder) are only retried
+  when the server certainly did not act on the request: it was throttled,
+  or the connection was never made.
+* Nested ``sp_retry`` functions run inside the outermost call's policy
+  rather than multiplying its attempts.
 """
 from __future__ import annotations
 
+import asyncio
+import inspect
 import logging
-from collections.abc import Callable
+import random
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
 from functools import wraps
-from typing import Any, TypeVar
-
-from tenacity import (
-    before_sleep_log,
-    retry,
-    retry_if_exception_type,
-    stop_after_attempt,
-    wait_exponential,
-)
+from typing import Any, TypeVar, overload
+
+import aiohttp
+import requests
+
+from ..exceptions import SharePointThrottleError
 
 logger = logging.getLogger(__name__)
 
 _F = TypeVar("_F", bound=Callable[..., Any])
 
+THROTTLED_STATUSES = (429, 503)
+# Server errors worth another attempt (besides throttling)
+TRANSIENT_STATUSES = (500, 502, 504)
+
+# Failures where the request never reached SharePoint
+_NOT_SENT = (
+    requests.exceptions.ConnectTimeout,
+    aiohttp.ClientConnectorError,
+    ConnectionRefusedError,
+)
+# Transport failures that may have hit the server mid-request
+_TRANSIENT = (
+    ConnectionError,
+    TimeoutError,
+    asyncio.TimeoutError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    aiohttp.ClientConnectionError,
+)
+
+# Set while an sp_retry call runs, so nested ones defer to it
+_in_retry: ContextVar[bool] = ContextVar("sp_retry_active", default=False)
+
+
+def _causes(exc: BaseException) -> Iterator[BaseException]:
+    """*exc* and the chain of exceptions it was raised from."""
+    seen: BaseException | None = exc
+    while seen is not None:
+        yield seen
+        seen = seen.__cause__
+
+
+def _http_response(exc: BaseException) -> Any:
+    """Find the HTTP response attached to *exc* or the exception it wraps."""
+    for cause in _causes(exc):
+        response = getattr(cause, "response", None)
+        if response is not None:
+            return response
+    return None
+
+
+def http_status(exc: BaseException) -> int | None:
+    """HTTP status code behind *exc*, if it came from an HTTP response."""
+    status = getattr(exc, "status", None)
+    if isinstance(status, int):
+        return status
+    return getattr(_http_response(exc), "status_code", None)
+
+
+def is_throttle_error(exc: BaseException) -> bool:
+    """Whether *exc* signals SharePoint throttling (429 / 503)."""
+    if isinstance(exc, SharePointThrottleError):
+        return True
+    return http_status(exc) in THROTTLED_STATUSES
+
+
+def is_retryable(exc: BaseException, idempotent: bool = True) -> bool:
+    """Whether :func:`sp_retry` should try the call again after *exc*.
+
+    The clients wrap HTTP and transport failures in
+    ``SharePointConnectionError``, so errors are classified by the response
+    or exception behind them rather than by their type.
+    """
+    if is_throttle_error(exc) or any(isinstance(c, _NOT_SENT) for c in _causes(exc)):
+        return True
+    if not idempotent:
+        return False
+    if http_status(exc) in TRANSIENT_STATUSES:
+        return True
+    return any(isinstance(c, _TRANSIENT) for c in _causes(exc))
+
+
+def parse_retry_after(value: Any) -> float | None:
+    """Seconds to wait from a ``Retry-After`` value (delta-seconds or HTTP date)."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """The ``Retry-After`` delay carried by a throttling response, if any."""
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after is not None:
+        return retry_after
+    response = _http_response(exc)
+    headers = getattr(response, "headers", None) or {}
+    return parse_retry_after(headers.get("Retry-After"))
 
-class SharePointThrottleError(Exception):
-    """Raised when SharePoint returns a 429 / 503 response."""
 
+class RetryPolicy:
+    """Attempt limit, deadline and backoff applied to each ``sp_retry`` call.
 
-def sp_retry(func: _F) -> _F:
-    """Decorator: retry a SharePoint call up to 3 times with exponential backoff.
+    Args:
+        attempts: Maximum attempts per call (1 = never retry)
+        deadline: Seconds after the first attempt by which a retry must end
+        base: First backoff delay in seconds (doubles per attempt)
+        cap: Longest backoff delay in seconds
+    """
+
+    def __init__(
+        self, attempts: int = 3, deadline: float = 30.0, base: float = 1.0, cap: float = 15.0,
+    ):
+        self.attempts = max(attempts, 1)
+        self.deadline = deadline
+        self.base = base
+        self.cap = cap
+        self.calls = 0
+        self.retried_calls = 0
+        self.retries = 0
+        self.gave_up = 0
+        self._lock = threading.Lock()
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered exponential delay after failed attempt number *attempt*."""
+        delay = min(self.cap, self.base * 2 ** (attempt - 1))
+        return random.uniform(delay / 2, delay)
+
+    def next_delay(
+        self, name: str, exc: BaseException, attempt: int, started: float, idempotent: bool,
+    ) -> float | None:
+        """Seconds to wait before the next attempt, or None to give up."""
+        if not is_retryable(exc, idempotent):
+            return None
+        if attempt >= self.attempts:
+            self._gave_up(name, attempt, "no attempts left", exc)
+            return None
+
+        delay = retry_after_seconds(exc) if is_throttle_error(exc) else None
+        if delay is None:
+            delay = self.backoff(attempt)
+        else:
+            from ..core.throttle import get_throttle_governor  # noqa: PLC0415
+
+            delay = get_throttle_governor().pause(delay)
+        if time.monotonic() - started + delay > self.deadline:
+            self._gave_up(name, attempt, f"{self.deadline:g}s deadline", exc)
+            return None
+
+        with self._lock:
+            self.retries += 1
+        logger.warning(
+            "%s failed (attempt %d/%d): %s; retrying in %.1fs",
+            name, attempt, self.attempts, exc, delay,
+        )
+        return delay
+
+    def record(self, name: str, attempts: int) -> None:
+        """Count a call (successful or not) that took *attempts* attempts."""
+        with self._lock:
+            self.calls += 1
+            if attempts > 1:
+                self.retried_calls += 1
+        if attempts > 1:
+            logger.info("%s took %d attempts", name, attempts)
+
+    def _gave_up(self, name: str, attempt: int, reason: str, exc: BaseException) -> None:
+        with self._lock:
+            self.gave_up += 1
+        logger.warning("%s failed after %d attempt(s) (%s): %s", name, attempt, reason, exc)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retried_calls": self.retried_calls,
+                "retries": self.retries,
+                "gave_up": self.gave_up,
+            }
+
+
+_policy: RetryPolicy | None = None
+_policy_lock = threading.Lock()
 
-    Handles:
-    - ``SharePointThrottleError`` (429 Too Many Requests)
-    - Generic ``Exception`` from transient network issues
 
-    Waits: 2s → 8s → 30s (max) between attempts.
+def get_retry_policy() -> RetryPolicy:
+    """Return the process-wide policy, creating it from settings on first use."""
+    global _policy
+    if _policy is None:
+        from ..config import get_settings  # noqa: PLC0415
+
+        with _policy_lock:
+            if _policy is None:
+                settings = get_settings()
+                _policy = RetryPolicy(settings.shp_retry_attempts, settings.shp_retry_deadline)
+    return _policy
+
+
+def retry_stats() -> dict[str, Any] | None:
+    """Stats for /health, or None if no retried call ran yet."""
+    return _policy.stats() if _policy is not None else None
+
+
+@overload
+def sp_retry(func: _F, *, idempotent: bool = True) -> _F: ...
+@overload
+def sp_retry(func: None = None, *, idempotent: bool = True) -> Callable[[_F], _F]: ...
+
+
+def sp_retry(func: Any = None, *, idempotent: bool = True) -> Any:
+    """Decorator: run a SharePoint call under the retry policy.
+
+    Use as ``@sp_retry``, or ``@sp_retry(idempotent=False)`` for calls that
+    must not be repeated once SharePoint may have acted on them. Coroutine
+    functions wait with ``asyncio.sleep`` so the event loop is never blocked.
     """
-    @retry(
-        retry=retry_if_exception_type((SharePointThrottleError, ConnectionError, TimeoutError)),
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=2, min=2, max=30),
-        before_sleep=before_sleep_log(logger, logging.WARNING),
-        reraise=True,
-    )
+    if func is None:
+        return lambda f: sp_retry(f, idempotent=idempotent)
+
+    name = func.__qualname__
+
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _in_retry.get():
+                return await func(*args, **kwargs)
+            policy = get_retry_policy()
+            token = _in_retry.set(True)
+            started, attempt = time.monotonic(), 0
+            try:
+                while True:
+                    attempt += 1
+                    try:
+                        result = await func(*args, **kwargs)
+                    except Exception as exc:
+                        delay = policy.next_delay(name, exc, attempt, started, idempotent)
+                        if delay is None:
+                            raise
+                        await asyncio.sleep(delay)
+                    else:
+                        return result
+            finally:
+                _in_retry.reset(token)
+                policy.record(name, attempt)
+
+        return async_wrapper
+
     @wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
-        return func(*args, **kwargs)
+        if _in_retry.get():
+            return func(*args, **kwargs)
+        policy = get_retry_policy()
+        token = _in_retry.set(True)
+        started, attempt = time.monotonic(), 0
+        try:
+            while True:
+                attempt += 1
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as exc:
+                    delay = policy.next_delay(name, exc, attempt, started, idempotent)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+                else:
+                    return result
+        finally:
+            _in_retry.reset(token)
+            policy.record(name, attempt)
 
-    return wrapper  # type: ignore[return-value]
+    return wrapper
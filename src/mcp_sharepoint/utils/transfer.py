@@ -0,0 +1,209 @@
+"""Constant-memory file transfer helpers.
+
+Downloads are streamed chunk by chunk into a temporary file next to the
+destination and atomically renamed into place once complete, so a failed
+or interrupted transfer never leaves a truncated file behind and memory use
+does not grow with file size.
+
+Completed downloads are verified against the size Graph reports and,
+optionally (``SHP_DOWNLOAD_VERIFY=hash``), against the item's content hash.
+SharePoint document libraries only expose ``quickXorHash``, so a pure-Python
+implementation of that algorithm is included.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import logging
+import os
+import tempfile
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_WIDTH_BITS = 160
+_WIDTH_BYTES = _WIDTH_BITS // 8
+_SHIFT = 11
+_CYCLE = 160  # bytes until the bit offset repeats (160 / gcd(11, 160))
+_MASK = (1 << _WIDTH_BITS) - 1
+
+
+class QuickXorHash:
+    """Microsoft's ``quickXorHash`` (as reported in Graph ``file.hashes``).
+
+    Byte *n* of the input is XORed into a 160-bit circular register at bit
+    offset ``(n * 11) % 160``; the total length is XORed into the last 8
+    bytes. Bytes 160 apart land on the same offset, so each chunk is folded
+    into 160 bytes with big-integer XORs before being rotated into the
+    register, keeping the per-byte work in C.
+    """
+
+    def __init__(self) -> None:
+        self._state = 0
+        self._length = 0
+
+    def update(self, data: bytes | memoryview) -> None:
+        size = len(data)
+        if not size:
+            return
+        rows = -(-size // _CYCLE)
+        folded = int.from_bytes(bytes(data), "little")
+        row_bits = _CYCLE * 8
+        while rows > 1:
+            half = rows // 2
+            split = (rows - half) * row_bits
+            folded = (folded & ((1 << split) - 1)) ^ (folded >> split)
+            rows -= half
+
+        start = self._length
+        columns = folded.to_bytes(_CYCLE, "little")
+        for k, value in enumerate(columns):
+            if value:
+                offset = ((start + k) * _SHIFT) % _WIDTH_BITS
+                self._state ^= ((value << offset) | (value >> (_WIDTH_BITS - offset))) & _MASK
+        self._length += size
+
+    def digest(self) -> bytes:
+        out = bytearray(self._state.to_bytes(_WIDTH_BYTES, "little"))
+        for i, byte in enumerate(self._length.to_bytes(8, "little")):
+            out[_WIDTH_BYTES - 8 + i] ^= byte
+        return bytes(out)
+
+    def hexdigest(self) -> str:
+        return self.digest().hex()
+
+
+def _hasher(algorithm: str) -> Any:
+    if algorithm == "quickXorHash":
+        return QuickXorHash()
+    return hashlib.new({"sha1Hash": "sha1", "sha256Hash": "sha256"}[algorithm])
+
+
+def _matches(algorithm: str, hasher: Any, expected: str) -> bool:
+    if algorithm == "quickXorHash":
+        return base64.b64encode(hasher.digest()).decode() == expected
+    return hasher.hexdigest().lower() == expected.lower()
+
+
+def expected_hash(item: dict[str, Any]) -> tuple[str, str] | None:
+    """Pick the strongest hash Graph reported for a drive *item*, if any."""
+    hashes = (item.get("file") or {}).get("hashes") or {}
+    for algorithm in ("sha256Hash", "sha1Hash", "quickXorHash"):
+        if hashes.get(algorithm):
+            return algorithm, hashes[algorithm]
+    return None
+
+
+class DownloadSink:
+    """Writable file object that counts (and optionally hashes) what it writes."""
+
+    def __init__(self, fh: Any, algorithm: str | None = None):
+        self._fh = fh
+        self.size = 0
+        self.algorithm = algorithm
+        self.hasher = _hasher(algorithm) if algorithm else None
+
+    def write(self, chunk: bytes) -> int:
+        self._fh.write(chunk)
+        self.size += len(chunk)
+        if self.hasher is not None:
+            self.hasher.update(chunk)
+        return len(chunk)
+
+    def seekable(self) -> bool:
+        return False
+
+
+@contextmanager
+def atomic_download(
+    path: str,
+    *,
+    expected_size: int | None = None,
+    expected: tuple[str, str] | None = None,
+) -> Iterator[DownloadSink]:
+    """Stream into a temp file beside *path*, then rename it into place.
+
+    Args:
+        path: Final destination
+        expected_size: Byte count the finished file must have
+        expected: ``(algorithm, value)`` from :func:`expected_hash` to verify
+
+    Raises:
+        OSError: If the write fails or verification does not match; the
+            temporary file is removed and *path* is left untouched.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".download-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            sink = DownloadSink(fh, expected[0] if expected else None)
+            yield sink
+            fh.flush()
+            os.fsync(fh.fileno())
+        if expected_size is not None and sink.size != expected_size:
+            raise OSError(
+                f"Size mismatch after download: expected {expected_size}, got {sink.size}"
+            )
+        if expected and not _matches(expected[0], sink.hasher, expected[1]):
+            raise OSError(f"{expected[0]} mismatch after download")
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def save_download(
+    write: Callable[[DownloadSink], Any],
+    local_path: str,
+    file_name: str,
+    *,
+    expected_size: int | None = None,
+    expected: tuple[str, str] | None = None,
+) -> dict[str, Any]:
+    """Stream a download to *local_path*, falling back to the system temp dir.
+
+    Args:
+        write: Streams the file content into the sink it is given; called
+            again for the fallback location if the first attempt fails
+        local_path: Preferred destination
+        file_name: Name used inside the fallback directory
+        expected_size: See :func:`atomic_download`
+        expected: See :func:`atomic_download`
+
+    Returns:
+        ``Download_Document`` payload (``success``, ``path``, ``size``,
+        ``method`` and any ``*_error`` details)
+    """
+
+    def _save(path: str) -> dict[str, Any]:
+        try:
+            with atomic_download(
+                path, expected_size=expected_size, expected=expected,
+            ) as sink:
+                write(sink)
+            return {"success": True, "path": os.path.abspath(path), "size": sink.size}
+        except Exception as exc:
+            logger.error("Save failed for '%s': %s", path, exc)
+            return {"success": False, "error": str(exc)}
+
+    primary = _save(local_path)
+    if primary["success"]:
+        return {**primary, "method": "primary"}
+
+    logger.warning("Primary save failed (%s), trying fallback", primary["error"])
+    fallback = _save(os.path.join(tempfile.gettempdir(), file_name))
+    if fallback["success"]:
+        return {**fallback, "method": "fallback", "primary_error": primary["error"]}
+
+    return {
+        "success": False,
+        "error": "Both primary and fallback saves failed",
+        "primary_error": primary["error"],
+        "fallback_error": fallback["error"],
+    }
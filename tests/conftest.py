@@ -6,7 +6,12 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 import mcp_sharepoint.config.settings
+import mcp_sharepoint.core.breaker
 import mcp_sharepoint.core.client
+import mcp_sharepoint.core.readiness
+import mcp_sharepoint.core.site_resolver
+import mcp_sharepoint.core.throttle
+import mcp_sharepoint.utils.retry
 
 
 @pytest.fixture
@@ -17,13 +22,62 @@ def mock_settings(monkeypatch):
     dummy.shp_library_name = "Shared Documents"
     dummy.shp_max_depth = 3
     dummy.shp_max_folders_per_level = 10
-    dummy.shp_level_delay = 0.0
+    dummy.shp_tree_workers = 2
+    dummy.shp_tree_rate_limit = 1000.0
+    dummy.shp_index_enabled = False
+    dummy.shp_cache_enabled = False
+    dummy.shp_content_cache_enabled = False
+    dummy.shp_blob_transfer = False
+    dummy.shp_parse_workers = 0
+    dummy.shp_page_size = 999
 
     with patch("mcp_sharepoint.config.settings.get_settings", return_value=dummy):
         with patch("mcp_sharepoint.config.get_settings", return_value=dummy):
             yield dummy
 
 
+@pytest.fixture(autouse=True)
+def site_resolver(monkeypatch):
+    """Give every test an empty, memory-only site/drive ID resolver."""
+    resolver = mcp_sharepoint.core.site_resolver.SiteResolver(ttl=3600.0)
+    monkeypatch.setattr(mcp_sharepoint.core.site_resolver, "_resolver", resolver)
+    return resolver
+
+
+@pytest.fixture(autouse=True)
+def throttle_governor(monkeypatch):
+    """Give every test its own throttle governor with no pause in effect."""
+    governor = mcp_sharepoint.core.throttle.ThrottleGovernor()
+    monkeypatch.setattr(mcp_sharepoint.core.throttle, "_governor", governor)
+    return governor
+
+
+@pytest.fixture(autouse=True)
+def circuit_breakers(monkeypatch):
+    """Give every test closed circuit breakers with default thresholds."""
+    breakers = mcp_sharepoint.core.breaker.CircuitBreakers()
+    monkeypatch.setattr(mcp_sharepoint.core.breaker, "_breakers", breakers)
+    return breakers
+
+
+@pytest.fixture(autouse=True)
+def readiness_probe(monkeypatch):
+    """Give every test a readiness probe that has not checked SharePoint yet."""
+    probe = mcp_sharepoint.core.readiness.ReadinessProbe(
+        mcp_sharepoint.core.readiness.check_sharepoint
+    )
+    monkeypatch.setattr(mcp_sharepoint.core.readiness, "_probe", probe)
+    return probe
+
+
+@pytest.fixture(autouse=True)
+def retry_policy(monkeypatch):
+    """Give every test a default retry policy with fresh counters."""
+    policy = mcp_sharepoint.utils.retry.RetryPolicy()
+    monkeypatch.setattr(mcp_sharepoint.utils.retry, "_policy", policy)
+    return policy
+
+
 @pytest.fixture
 def mock_sp_context():
     """Provide a mock SharePoint ClientContext so no network calls are made."""
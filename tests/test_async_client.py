@@ -0,0 +1,117 @@
+"""Unit tests for the aiohttp-based AsyncGraphClient in core/client_async.py."""
+from __future__ import annotations
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mcp_sharepoint.core.client_async import AsyncGraphClient
+from mcp_sharepoint.exceptions import SharePointConnectionError
+
+
+def _make_app() -> web.Application:
+    async def children(request: web.Request) -> web.Response:
+        assert request.headers["Authorization"] == "Bearer token"
+        return web.json_response({"value": [{"name": "a.txt", "file": {}}]})
+
+    async def content(request: web.Request) -> web.Response:
+        return web.Response(body=b"binarydata")
+
+    async def upload(request: web.Request) -> web.Response:
+        return web.json_response({"id": "fileid", "size": len(await request.read())})
+
+    async def missing(request: web.Request) -> web.Response:
+        return web.json_response({"error": "nope"}, status=404)
+
+    async def remove(request: web.Request) -> web.Response:
+        return web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_get("/v1.0/children", children)
+    app.router.add_get("/v1.0/content", content)
+    app.router.add_put("/v1.0/upload", upload)
+    app.router.add_get("/v1.0/missing", missing)
+    app.router.add_delete("/v1.0/item", remove)
+    return app
+
+
+def test_async_client_round_trip(site_resolver):
+    sync_client = SimpleNamespace(
+        api_type="graph",
+        access_token="token",
+        site_url="https://example.com/sites/test",
+    )
+    site_resolver.prime(sync_client.site_url, "SITE123")
+
+    async def scenario() -> None:
+        server = TestServer(_make_app())
+        await server.start_server()
+        client = AsyncGraphClient(sync_client)
+        client.base_url = str(server.make_url("/v1.0"))
+        try:
+            assert await client.get_site_id() == "SITE123"
+            assert (await client.get("children"))["value"][0]["name"] == "a.txt"
+            assert await client.download("content") == b"binarydata"
+
+            class Sink:
+                chunks: list[bytes] = []
+                threads: set[int] = set()
+
+                def write(self, chunk: bytes) -> None:
+                    self.chunks.append(chunk)
+                    self.threads.add(threading.get_ident())
+
+            sink = Sink()
+            assert await client.download_to("content", sink, chunk_size=4) == 10
+            assert b"".join(sink.chunks) == b"binarydata"
+            assert threading.get_ident() not in sink.threads  # written off the loop
+            assert await client.upload("upload", b"abc") == {"id": "fileid", "size": 3}
+            assert await client.delete("item") is True
+            with pytest.raises(SharePointConnectionError):
+                await client.get("missing")
+        finally:
+            await client.close()
+            await server.close()
+
+    asyncio.run(scenario())
+
+
+def test_sessions_are_closed_when_replaced(monkeypatch):
+    from mcp_sharepoint.core import client_async
+
+    sync_client = SimpleNamespace(api_type="graph", access_token="token", site_url="x")
+    client = AsyncGraphClient(sync_client)
+
+    # A session left behind by a finished event loop is closed on the next loop
+    first = asyncio.run(client._get_session())
+    second_loop_session = asyncio.run(client._get_session())
+    assert first.closed
+    assert second_loop_session is not first
+
+    # Replacing the shared client closes the previous one's session
+    monkeypatch.setattr(client_async, "_async_client", client)
+    monkeypatch.setattr(client_async._client_mod, "_shared_client", SimpleNamespace(
+        api_type="graph", access_token="token", site_url="x",
+    ))
+    monkeypatch.setattr(
+        client_async, "get_token_manager", lambda: SimpleNamespace(needs_refresh=lambda: False)
+    )
+    monkeypatch.setattr(
+        client_async, "get_settings", lambda: SimpleNamespace(shp_async_pool_size=10)
+    )
+
+    async def scenario():
+        session = await client._get_session()
+        replacement = await client_async.get_async_sp_context()
+        assert replacement is not client
+        assert session.closed
+        await replacement._get_session()
+        await client_async.close_async_sp_context()
+        assert replacement._session is None
+
+    asyncio.run(scenario())
+    assert second_loop_session.closed
@@ -0,0 +1,93 @@
+"""Unit tests for the $batch coalescing helpers in core/batch.py."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from mcp_sharepoint.core import batch, throttle
+from mcp_sharepoint.exceptions import SharePointConnectionError, SharePointThrottleError
+
+
+class FakeBatchClient:
+    """Answers $batch posts; endpoints listed in *throttle_once* get one 429."""
+
+    def __init__(self, throttle_once=(), missing=()):
+        self.posts: list[list[str]] = []
+        self.throttle_once = set(throttle_once)
+        self.missing = set(missing)
+
+    def get(self, endpoint):
+        return {"endpoint": endpoint}
+
+    def post(self, endpoint, data):
+        assert endpoint == "$batch"
+        assert len(data["requests"]) <= batch.MAX_BATCH_SIZE
+        self.posts.append([r["url"] for r in data["requests"]])
+        responses = []
+        for request in reversed(data["requests"]):  # Graph may answer out of order
+            url = request["url"]
+            if url in self.throttle_once:
+                self.throttle_once.discard(url)
+                responses.append(
+                    {"id": request["id"], "status": 429, "headers": {"Retry-After": "0"}}
+                )
+            elif url in self.missing:
+                responses.append(
+                    {"id": request["id"], "status": 404,
+                     "body": {"error": {"message": "itemNotFound"}}}
+                )
+            else:
+                responses.append({"id": request["id"], "status": 200, "body": {"url": url}})
+        return {"responses": responses}
+
+
+def test_batch_get_chunks_and_demultiplexes_in_order():
+    client = FakeBatchClient()
+    endpoints = [f"items/{i}" for i in range(25)]
+
+    results = batch.batch_get(client, endpoints)
+
+    assert [len(p) for p in client.posts] == [20, 5]
+    assert results == [{"url": f"/items/{i}"} for i in range(25)]
+
+
+def test_batch_get_retries_throttled_sub_requests(monkeypatch):
+    monkeypatch.setattr(throttle.time, "sleep", lambda _s: None)
+    client = FakeBatchClient(throttle_once={"/items/1"}, missing={"/items/2"})
+
+    results = batch.batch_get(client, ["items/0", "items/1", "items/2"])
+
+    assert client.posts[1] == ["/items/1"]
+    assert results[0] == {"url": "/items/0"}
+    assert results[1] == {"url": "/items/1"}
+    assert isinstance(results[2], SharePointConnectionError)
+    with pytest.raises(SharePointConnectionError, match="itemNotFound"):
+        batch.batch_get(client, ["items/0", "items/2"], raise_errors=True)
+
+
+def test_batch_get_can_return_throttled_sub_requests_unretried():
+    client = FakeBatchClient(throttle_once={"/items/1"})
+
+    results = batch.batch_get(client, ["items/0", "items/1"], retry_throttled=False)
+
+    assert len(client.posts) == 1
+    assert results[0] == {"url": "/items/0"}
+    assert isinstance(results[1], SharePointThrottleError)
+
+
+def test_batch_get_async_matches_sync():
+    sync = FakeBatchClient()
+
+    class AsyncClient:
+        async def get(self, endpoint):
+            return sync.get(endpoint)
+
+        async def post(self, endpoint, data):
+            return sync.post(endpoint, data)
+
+    results = asyncio.run(batch.batch_get_async(AsyncClient(), ["a", "b"]))
+    single = asyncio.run(batch.batch_get_async(AsyncClient(), ["a"]))
+
+    assert results == [{"url": "/a"}, {"url": "/b"}]
+    assert single == [{"endpoint": "a"}]
@@ -0,0 +1,133 @@
+"""Tests for the /blobs raw-byte side channel (utils/blobs.py and its routes)."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from mcp_sharepoint.server import create_blob, read_blob
+from mcp_sharepoint.utils import blobs as blobs_mod
+from mcp_sharepoint.utils.blobs import (
+    BlobStore,
+    BlobStoreFullError,
+    BlobTooLargeError,
+    publish_blob,
+)
+
+
+@pytest.fixture
+def blob_settings(mock_settings, monkeypatch, tmp_path):
+    mock_settings.shp_blob_transfer = True
+    mock_settings.transport = "http"
+    mock_settings.shp_blob_ttl = 60.0
+    mock_settings.shp_blob_max_bytes = 1000
+    mock_settings.shp_blob_max_pending = 2
+    mock_settings.shp_blob_max_pending_bytes = 1500
+    monkeypatch.setattr(blobs_mod, "_store", None)
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    return mock_settings
+
+
+@pytest.fixture
+def http(blob_settings):
+    app = Starlette(routes=[
+        Route("/blobs", create_blob, methods=["POST"]),
+        Route("/blobs/{handle}", read_blob, methods=["GET"]),
+    ])
+    with TestClient(app) as client:
+        yield client
+
+
+def test_upload_handle_round_trip(http):
+    response = http.post("/blobs", content=b"\x00\x01raw bytes")
+    assert response.status_code == 201
+    handle = response.json()["handle"]
+
+    blob = blobs_mod.get_blob_store().claim(handle)
+    with open(blob.path, "rb") as fh:
+        assert fh.read() == b"\x00\x01raw bytes"
+    blob.discard()
+
+    assert blobs_mod.get_blob_store().claim(handle) is None  # single use
+
+
+def test_oversized_upload_is_rejected(http):
+    assert http.post("/blobs", content=b"x" * 1001).status_code == 413
+    assert blobs_mod.blob_stats()["pending"] == 0
+
+
+def test_pending_budget_rejects_with_507(http):
+    first = http.post("/blobs", content=b"x" * 800)
+    assert first.status_code == 201
+    assert http.post("/blobs", content=b"x" * 800).status_code == 507  # bytes
+    assert http.post("/blobs", content=b"x" * 10).status_code == 201
+    assert http.post("/blobs", content=b"x" * 10).status_code == 507  # count
+    assert blobs_mod.blob_stats()["rejected"] == 2
+
+    # Claiming a blob frees its share of the budget
+    blobs_mod.get_blob_store().claim(first.json()["handle"]).discard()
+    assert http.post("/blobs", content=b"x" * 800).status_code == 201
+    with pytest.raises(BlobStoreFullError):
+        blobs_mod.get_blob_store().publish(b"x" * 10)
+    assert publish_blob(b"x" * 10) is None  # falls back to base64
+
+
+def test_update_document_consumes_handle(http, monkeypatch):
+    from mcp_sharepoint.tools import document_tools
+
+    updates = []
+
+    def update_from_path(folder_name, file_name, file_path):
+        with open(file_path, "rb") as fh:
+            updates.append((folder_name, file_name, fh.read()))
+        return {"success": True}
+
+    monkeypatch.setattr(document_tools, "_update_from_path", update_from_path)
+    handle = http.post("/blobs", content=b"\x00new bytes").json()["handle"]
+
+    result = asyncio.run(document_tools.update_document_tool(
+        folder_name="docs", file_name="a.bin", content_handle=handle,
+    ))
+    assert result == {"success": True}
+    assert updates == [("docs", "a.bin", b"\x00new bytes")]
+    assert blobs_mod.blob_stats()["pending"] == 0
+    again = asyncio.run(document_tools.update_document_tool(
+        folder_name="docs", file_name="a.bin", content_handle=handle,
+    ))
+    assert again["success"] is False
+
+
+def test_published_content_is_served_once(http):
+    result = publish_blob(b"%PDF binary", "a.bin")
+
+    assert "content_base64" not in result
+    first = http.get(result["content_url"])
+    assert first.status_code == 200
+    assert first.content == b"%PDF binary"
+    assert http.get(result["content_url"]).status_code == 404
+
+
+def test_stdio_transport_falls_back_to_base64(blob_settings):
+    blob_settings.transport = "stdio"
+    assert publish_blob(b"data") is None
+
+
+def test_expired_handles_are_reaped(tmp_path):
+    store = BlobStore(str(tmp_path), ttl=0, max_bytes=10)
+    blob = store.publish(b"abc")
+
+    assert store.claim(blob.handle) is None
+    assert list(tmp_path.iterdir()) == []
+    with pytest.raises(BlobTooLargeError):
+        store.publish(b"x" * 11)
+
+    async def body():
+        yield b"x" * 6
+        yield b"x" * 6
+
+    with pytest.raises(BlobTooLargeError):
+        asyncio.run(store.receive(body()))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,211 @@
+"""Tests for the per-endpoint circuit breakers in core/breaker.py."""
+from __future__ import annotations
+
+import time
+
+import pytest
+import requests
+
+from mcp_sharepoint.core import breaker as breaker_mod
+from mcp_sharepoint.core.breaker import CLOSED, HALF_OPEN, OPEN, endpoint_class
+from mcp_sharepoint.core.client_unified import TokenCache
+from mcp_sharepoint.core.http import create_session
+from mcp_sharepoint.core.token_manager import TokenManager
+from mcp_sharepoint.exceptions import SharePointCircuitOpenError, SharePointConnectionError
+from mcp_sharepoint.utils import cache as cache_mod
+from mcp_sharepoint.utils.cache import cached
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    state = {"now": 1000.0}
+    monkeypatch.setattr(breaker_mod.time, "monotonic", lambda: state["now"])
+    return state
+
+
+def _response(status):
+    response = requests.Response()
+    response.status_code = status
+    response._content = b"{}"
+    return response
+
+
+def test_requests_are_classified_by_endpoint():
+    graph = "https://graph.microsoft.com/v1.0"
+    assert endpoint_class("https://login.microsoftonline.com/t/oauth2/v2.0/token") == "token"
+    assert endpoint_class(f"{graph}/sites/contoso.sharepoint.com:/sites/team") == "site"
+    assert endpoint_class(f"{graph}/sites/abc/drives?$select=id,name") == "site"
+    assert endpoint_class(f"{graph}/sites/abc/drive/root/search(q='x')") == "search"
+    assert endpoint_class(f"{graph}/sites/abc/drive/root:/Reports:/children") == "items"
+    assert endpoint_class(f"{graph}/$batch") == "items"
+    assert endpoint_class("https://contoso.sharepoint.com/sites/team/_api/web") == "site"
+    assert endpoint_class("https://contoso.sharepoint.com/_api/search/postquery") == "search"
+
+
+def test_open_breaker_fails_fast_then_probes(clock, circuit_breakers, monkeypatch):
+    sent = []
+
+    def send(self, request, **kwargs):
+        sent.append(request.url)
+        return _response(502 if len(sent) <= 5 else 200)
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", send)
+    session = create_session()
+    items = "https://graph.microsoft.com/v1.0/sites/abc/drive/items/1"
+
+    for _ in range(5):
+        assert session.get(items).status_code == 502
+    assert circuit_breakers.breakers["items"].state == OPEN
+
+    # Nothing is sent while open, and other endpoint classes are unaffected
+    with pytest.raises(SharePointCircuitOpenError) as excinfo:
+        session.get(items)
+    assert excinfo.value.endpoint == "items"
+    assert session.get("https://graph.microsoft.com/v1.0/sites/abc").status_code == 200
+    assert len(sent) == 6
+
+    # After the reset timeout one probe goes through and closes the breaker
+    clock["now"] += 30
+    assert session.get(items).status_code == 200
+    assert circuit_breakers.breakers["items"].state == CLOSED
+    stats = breaker_mod.breaker_stats()["items"]
+    assert stats["opened"] == 1
+    assert stats["rejected"] == 1
+
+
+def test_failed_probe_reopens_and_blocks_concurrent_calls(clock, circuit_breakers):
+    breaker = circuit_breakers.breakers["search"]
+    for _ in range(5):
+        breaker.failure()
+    clock["now"] += 30
+
+    breaker.allow()  # the probe
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(SharePointCircuitOpenError):
+        breaker.allow()
+    breaker.failure()
+    assert breaker.state == OPEN
+    with pytest.raises(SharePointCircuitOpenError):
+        breaker.allow()
+
+
+def test_throttled_probe_frees_the_probe_slot(clock, circuit_breakers):
+    breaker = circuit_breakers.breakers["items"]
+    for _ in range(5):
+        breaker.failure()
+    clock["now"] += 30
+
+    breaker.allow()  # the probe, answered with a throttle
+    breaker.observe(429)
+    assert breaker.state == HALF_OPEN
+    breaker.allow()  # next request probes without waiting out the reset
+    breaker.observe(200)
+    assert breaker.state == CLOSED
+
+
+def test_open_token_breaker_keeps_unexpired_token(circuit_breakers):
+    cache = TokenCache()
+    cache.set_token("old", 120)  # inside the 5 minute refresh buffer
+
+    def acquire():
+        raise SharePointConnectionError("AAD unavailable")
+
+    manager = TokenManager(acquire=acquire, cache=cache)
+    for _ in range(5):
+        with pytest.raises(SharePointConnectionError):
+            manager.refresh()
+    assert circuit_breakers.breakers["token"].state == OPEN
+
+    assert manager.ensure_fresh() == "old"
+    cache.expires_at = time.time() - 1
+    with pytest.raises(SharePointCircuitOpenError):
+        manager.ensure_fresh()
+
+
+def test_response_cache_serves_expired_entry_while_open(mock_settings, monkeypatch):
+    mock_settings.shp_cache_enabled = True
+    mock_settings.shp_cache_max_bytes = 10_000
+    mock_settings.shp_cache_ttls = {"listing": 0.0001}
+    monkeypatch.setattr(cache_mod, "_cache", None)
+    state = {"open": False}
+
+    @cached("listing", lambda folder: folder)
+    def listing(folder):
+        if state["open"]:
+            raise SharePointCircuitOpenError("items", 30)
+        return [{"name": "a.txt"}]
+
+    assert listing("Reports") == [{"name": "a.txt"}]
+    time.sleep(0.001)
+    state["open"] = True
+    assert listing("Reports") == [{"name": "a.txt"}]
+    assert cache_mod.cache_stats()["stale"] == 1
+    # Nothing cached for this folder: the error surfaces
+    with pytest.raises(SharePointCircuitOpenError):
+        listing("Other")
+
+
+def test_metadata_is_served_stale_through_the_service_stack(
+    mock_settings, monkeypatch, site_resolver, circuit_breakers,
+):
+    import asyncio
+    import json
+
+    from mcp_sharepoint.core import client as client_mod
+    from mcp_sharepoint.core import client_async
+    from mcp_sharepoint.core.client import GraphClient
+    from mcp_sharepoint.services.metadata_service import get_file_metadata_async
+
+    mock_settings.shp_cache_enabled = True
+    mock_settings.shp_cache_max_bytes = 10_000
+    mock_settings.shp_cache_ttls = {"get_file_metadata": 0.0001}
+    mock_settings.shp_async_http = False
+    mock_settings.shp_api_type = "graph"
+    monkeypatch.setattr(cache_mod, "_cache", None)
+    monkeypatch.setattr(client_async, "get_settings", lambda: mock_settings)
+    client = GraphClient("token", "https://contoso.sharepoint.com/sites/team", create_session())
+    monkeypatch.setattr(client_mod, "get_sp_context", lambda: client)
+    site_resolver.prime(client.site_url, "S")
+
+    etag = {"value": "v1"}
+    sent = []
+
+    def send(self, request, **kwargs):
+        sent.append(request.url)
+        response = _response(200)
+        response._content = json.dumps({"responses": [
+            {"id": "0", "status": 200, "body": {"id": "F", "name": "a.txt", "eTag": etag["value"]}},
+            {"id": "1", "status": 200, "body": {"fields": {"Title": "Report"}}},
+        ]}).encode()
+        return response
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", send)
+
+    first = asyncio.run(get_file_metadata_async("docs", "a.txt"))
+    assert first["success"] is True
+    for _ in range(5):
+        circuit_breakers.breakers["items"].failure()
+    time.sleep(0.001)
+
+    # Revalidation and the refetch both fail fast; the expired entry is served
+    assert asyncio.run(get_file_metadata_async("docs", "a.txt")) == first
+    assert len(sent) == 1
+    assert cache_mod.cache_stats()["stale"] == 1
+
+
+@pytest.mark.parametrize("status, outcome", [(404, "missing"), (403, "raises")])
+def test_only_404_reports_a_missing_file(mock_sp_context, mock_settings, status, outcome):
+    from mcp_sharepoint.services import document_service_graph
+
+    mock_sp_context.api_type = "graph"
+    mock_sp_context._get_site_id.return_value = "S"
+    mock_sp_context.normalize_path = lambda path: path
+    mock_sp_context.get.side_effect = SharePointConnectionError("GET failed", status)
+
+    if outcome == "missing":
+        result = document_service_graph.delete_document("docs", "a.txt")
+        assert result["success"] is False
+        assert "does not exist" in result["message"]
+    else:
+        with pytest.raises(SharePointConnectionError):
+            document_service_graph.delete_document("docs", "a.txt")
@@ -0,0 +1,138 @@
+"""Unit tests for the read-only tool response cache in utils/cache.py."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from mcp_sharepoint.core import client as client_mod
+from mcp_sharepoint.core.client_graphql import GraphQLClient
+from mcp_sharepoint.utils import cache as cache_mod
+from mcp_sharepoint.utils.cache import ResponseCache, cached, invalidates, join_path
+
+
+@pytest.fixture
+def cache_settings(mock_settings, monkeypatch):
+    mock_settings.shp_cache_enabled = True
+    mock_settings.shp_cache_max_bytes = 10_000
+    mock_settings.shp_cache_ttls = {"listing": 60.0, "tree": 60.0, "meta": 60.0}
+    monkeypatch.setattr(cache_mod, "_cache", None)
+    monkeypatch.setattr(client_mod, "get_sp_context", lambda: FakeClient())
+    return mock_settings
+
+
+class FakeClient:
+    """Sync client stand-in with the GraphQL client's library-name mapping."""
+
+    api_type = "graphql"
+    normalize_path = GraphQLClient.normalize_path
+
+
+def test_cached_listing_is_invalidated_by_mutation_in_folder(cache_settings):
+    calls = []
+
+    @cached("listing", lambda folder: folder)
+    def listing(folder):
+        calls.append(folder)
+        return [{"name": f"{folder}-{len(calls)}"}]
+
+    @cached("tree", lambda folder: folder, recursive=True)
+    def tree(folder):
+        calls.append(f"tree:{folder}")
+        return {"children": []}
+
+    @invalidates(lambda folder, name: [join_path(folder, name)])
+    def upload(folder, name):
+        return {"success": True}
+
+    assert listing("Reports") == listing("Reports")
+    listing("Other")
+    tree("")
+    assert calls == ["Reports", "Other", "tree:"]
+
+    upload("reports", "q1.pdf")  # case-insensitive path match
+
+    listing("Reports")
+    listing("Other")
+    tree("")
+    assert calls == ["Reports", "Other", "tree:", "Reports", "tree:"]
+    stats = cache_mod.cache_stats()
+    assert stats["hits"] == 2
+    assert stats["invalidations"] == 2
+
+
+def test_library_prefixed_paths_share_entries(cache_settings):
+    cache_settings.shp_doc_library = ""
+    calls = []
+
+    @cached("listing", lambda folder, *_args, **_kwargs: folder)
+    async def listing(folder, limit=None):
+        calls.append(folder)
+        return [{"name": f"{folder}-{len(calls)}"}]
+
+    @invalidates(lambda folder, name: [join_path(folder, name)])
+    async def upload(folder, name):
+        return {"success": True}
+
+    async def scenario():
+        first = await listing("Reports")
+        assert await listing("Shared Documents/Reports") is first
+        await listing("Reports", limit=5)  # other arguments still split entries
+        await upload("Shared Documents/reports", "q1.pdf")
+        await listing("Reports")
+
+    asyncio.run(scenario())
+    assert calls == ["Reports", "Reports", "Reports"]
+
+
+def test_expired_entry_is_revalidated_by_etag(cache_settings):
+    cache_settings.shp_cache_ttls = {"meta": 0.0001}
+    etag = {"value": "v1"}
+    fetches = []
+
+    @cached(
+        "meta",
+        join_path,
+        validator=lambda result: result["metadata"]["eTag"],
+        revalidate=lambda folder, name: etag["value"],
+    )
+    async def metadata(folder, name):
+        fetches.append(name)
+        return {"success": True, "metadata": {"eTag": etag["value"]}}
+
+    async def scenario():
+        await metadata("docs", "a.txt")
+        await asyncio.sleep(0.01)
+        await metadata("docs", "a.txt")  # expired, eTag unchanged -> served
+        etag["value"] = "v2"
+        await asyncio.sleep(0.01)
+        await metadata("docs", "a.txt")  # expired, eTag changed -> refetched
+
+    asyncio.run(scenario())
+    assert fetches == ["a.txt", "a.txt"]
+    assert cache_mod.cache_stats()["revalidated"] == 1
+
+
+def test_failures_are_not_cached(cache_settings):
+    calls = []
+
+    @cached("meta", join_path)
+    def metadata(folder, name):
+        calls.append(name)
+        return {"success": False, "message": "boom"}
+
+    metadata("docs", "a.txt")
+    metadata("docs", "a.txt")
+    assert len(calls) == 2
+
+
+def test_lru_eviction_respects_byte_budget():
+    cache = ResponseCache(max_bytes=100)
+    for i in range(5):
+        cache.store(("k", i), "x" * 30, ttl=60, path=str(i))
+        cache.lookup(("k", 0))  # keep the first entry hot
+
+    assert cache.bytes <= 100
+    assert cache.lookup(("k", 0)) is not None
+    assert cache.lookup(("k", 1)) is None
+    assert cache.evictions == 2
@@ -0,0 +1,40 @@
+"""Unit tests for the parsed-content cache in utils/content_cache.py."""
+from __future__ import annotations
+
+from mcp_sharepoint.utils.content_cache import ContentCache
+
+
+def _text(content):
+    return {"name": "a.txt", "content_type": "text", "content": content, "size": len(content)}
+
+
+def test_hit_requires_matching_tag_and_survives_restart(tmp_path):
+    cache = ContentCache(str(tmp_path), max_bytes=1000, disk_max_bytes=10_000)
+    cache.store("ID1", "c1", "a.txt", _text("hello"))
+
+    assert cache.lookup("ID1", "c1", "renamed.txt")["name"] == "renamed.txt"
+    assert cache.lookup("ID1", "c2", "a.txt") is None
+
+    # A fresh instance (new process) is served from disk
+    reopened = ContentCache(str(tmp_path), max_bytes=1000, disk_max_bytes=10_000)
+    assert reopened.lookup("ID1", "c1", "a.txt")["content"] == "hello"
+    assert reopened.stats()["disk_hits"] == 1
+
+    # A new version replaces the old one
+    reopened.store("ID1", "c2", "a.txt", _text("bye"))
+    assert reopened.lookup("ID1", "c1", "a.txt") is None
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+def test_binary_results_are_not_cached_and_budgets_hold(tmp_path):
+    cache = ContentCache(str(tmp_path), max_bytes=10, disk_max_bytes=200)
+    cache.store("B", "c1", "a.bin", {"content_type": "binary", "content_base64": "AA=="})
+    assert cache.lookup("B", "c1", "a.bin") is None
+
+    for i in range(5):
+        cache.store(f"ID{i}", "c1", "a.txt", _text("x" * 6))
+
+    assert cache.bytes <= 10
+    assert cache.disk_bytes <= 200
+    assert cache.lookup("ID4", "c1", "a.txt") is not None
+
@@ -0,0 +1,106 @@
+"""Unit tests for the breadth-first tree crawler in utils/crawler.py."""
+from __future__ import annotations
+
+import threading
+import time
+
+from mcp_sharepoint.utils.crawler import AdaptiveRateLimiter, assemble_tree, crawl_tree
+from mcp_sharepoint.utils.retry import SharePointThrottleError
+
+# folder path -> sub-folder names
+LIBRARY = {
+    "": ["a", "b"],
+    "a": ["a1", "a2"],
+    "b": [],
+    "a/a1": ["deep"],
+    "a/a2": [],
+    "a/a1/deep": [],
+}
+
+
+def _listing(path):
+    names = LIBRARY[path]
+    nodes = [{"name": n, "type": "folder", "children": []} for n in names]
+    nodes.append({"name": f"{path or 'root'}.txt", "type": "file"})
+    return nodes, [f"{path}/{n}".strip("/") for n in names]
+
+
+def test_crawl_builds_same_tree_in_parallel_and_retries_throttles():
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0, "throttled": False}
+
+    def fetch(group):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.02)
+        with lock:
+            state["active"] -= 1
+        results = []
+        for path in group:
+            if path == "a/a1" and not state["throttled"]:
+                state["throttled"] = True
+                results.append(SharePointThrottleError("429"))
+            else:
+                results.append(_listing(path))
+        return results
+
+    limiter = AdaptiveRateLimiter(rate=1000)
+    tree_nodes = crawl_tree(
+        "", fetch, max_depth=5, max_folders_per_level=10, workers=4, limiter=limiter,
+    )
+    tree = assemble_tree(tree_nodes, "")
+
+    assert set(tree_nodes) == set(LIBRARY)
+    assert [c["name"] for c in tree] == ["a", "b", "root.txt"]
+    a1 = tree[0]["children"][0]
+    assert a1["name"] == "a1"
+    assert a1["children"][0]["name"] == "deep"
+    assert state["peak"] > 1
+    assert limiter.throttles == 1
+
+
+def test_crawl_waits_for_largest_retry_after_in_group():
+    throttled = {"a": 5.0, "b": 1.0}
+    waits = []
+
+    class Limiter(AdaptiveRateLimiter):
+        def on_throttle(self, retry_after=None):
+            waits.append(retry_after)
+
+    def fetch(group):
+        return [
+            SharePointThrottleError("429", throttled.pop(p)) if p in throttled
+            else _listing(p)
+            for p in group
+        ]
+
+    tree_nodes = crawl_tree(
+        "", fetch, max_depth=2, max_folders_per_level=10, workers=1,
+        limiter=Limiter(rate=1000), group_size=2,
+    )
+
+    assert waits == [5.0]
+    assert set(tree_nodes) == {"", "a", "b"}
+
+
+def test_crawl_respects_max_depth():
+    tree_nodes = crawl_tree(
+        "",
+        lambda group: [_listing(p) for p in group],
+        max_depth=2,
+        max_folders_per_level=1,
+        workers=2,
+        limiter=AdaptiveRateLimiter(rate=1000),
+    )
+    assert set(tree_nodes) == {"", "a", "b"}
+
+
+def test_rate_limiter_backs_off_and_recovers():
+    limiter = AdaptiveRateLimiter(rate=10, min_rate=1)
+    limiter.on_throttle(retry_after=0)
+    limiter.on_throttle(retry_after=0)
+    assert limiter.rate == 2.5
+    for _ in range(20):
+        limiter.on_success()
+    assert limiter.rate == 10
@@ -0,0 +1,119 @@
+"""Unit tests for the SQLite drive-item index in core/drive_index.py."""
+from __future__ import annotations
+
+import pytest
+import requests
+
+from mcp_sharepoint.core.drive_index import DriveIndex
+from mcp_sharepoint.exceptions import SharePointConnectionError
+
+ROOT = "https://graph.microsoft.com/v1.0/"
+
+
+def _item(item_id, name, parent, folder=False, **extra):
+    item = {"id": item_id, "name": name, "parentReference": {"id": parent}, **extra}
+    item["folder" if folder else "file"] = {}
+    return item
+
+
+class FakeDeltaClient:
+    """Serves delta pages by endpoint and records the requests made."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls: list[str] = []
+
+    def get(self, endpoint, params=None):
+        self.calls.append(endpoint)
+        page = self.pages[endpoint]
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+
+def _full_scan():
+    return {
+        "sites/S/drive/root/delta": {
+            "value": [
+                {"id": "R", "name": "root", "root": {}, "folder": {}},
+                _item("REP", "Reports", "R", folder=True),
+                _item("Y24", "2024", "REP", folder=True),
+            ],
+            "@odata.nextLink": f"{ROOT}delta-page-2",
+        },
+        "delta-page-2": {
+            "value": [
+                _item("F1", "q1.pdf", "Y24", size=10, cTag="c1"),
+                _item("F2", "readme.txt", "R"),
+            ],
+            "@odata.deltaLink": f"{ROOT}delta-token-1",
+        },
+    }
+
+
+def test_full_sync_then_listing_and_paths():
+    index = DriveIndex(":memory:", max_staleness=60)
+    client = FakeDeltaClient(_full_scan())
+
+    listing = index.listing(client, "S", "reports/2024")
+
+    assert [i["name"] for i in listing] == ["q1.pdf"]
+    assert listing[0]["cTag"] == "c1"
+    assert [i["name"] for i in index.listing(client, "S", "")] == ["readme.txt", "Reports"]
+    assert index.listing(client, "S", "Missing") is None
+    assert index.item_at("Reports/2024/q1.pdf")["id"] == "F1"
+    # Fresh index: the second and third listings made no requests
+    assert client.calls == ["sites/S/drive/root/delta", "delta-page-2"]
+    assert index.stats()["items"] == 5
+
+
+def test_incremental_sync_write_through_and_expired_token():
+    index = DriveIndex(":memory:", max_staleness=60)
+    pages = _full_scan()
+    client = FakeDeltaClient(pages)
+    index.sync(client, "S")
+
+    # Deleting a folder removes its descendants
+    pages["delta-token-1"] = {
+        "value": [{"id": "REP", "deleted": {}}],
+        "@odata.deltaLink": f"{ROOT}delta-token-2",
+    }
+    index.sync(client, "S")
+    assert index.item_at("Reports") is None
+    assert index.item_at("Reports/2024/q1.pdf") is None
+    assert index.stats()["items"] == 2
+
+    # Write-through from an upload and a delete
+    index.upsert(_item("F3", "new.docx", "R"))
+    assert index.item_at("new.docx")["id"] == "F3"
+    index.remove("F3")
+    assert index.item_at("new.docx") is None
+
+    # 410 Gone on the stored delta link triggers a full rebuild
+    response = requests.Response()
+    response.status_code = 410
+    gone = SharePointConnectionError("gone")
+    gone.__cause__ = requests.exceptions.HTTPError(response=response)
+    pages["delta-token-2"] = gone
+    index.sync(client, "S")
+    assert index.item_at("Reports/2024/q1.pdf")["id"] == "F1"
+
+
+def test_stale_index_resyncs_on_read():
+    index = DriveIndex(":memory:", max_staleness=0)
+    pages = _full_scan()
+    pages["delta-token-1"] = {"value": [], "@odata.deltaLink": f"{ROOT}delta-token-1"}
+    client = FakeDeltaClient(pages)
+
+    index.listing(client, "S", "")
+    index.listing(client, "S", "")
+
+    assert client.calls[-1] == "delta-token-1"
+    assert index.stats()["syncs"] == 2
+
+
+def test_sync_errors_propagate():
+    index = DriveIndex(":memory:")
+    client = FakeDeltaClient({"sites/S/drive/root/delta": SharePointConnectionError("boom")})
+    with pytest.raises(SharePointConnectionError):
+        index.sync(client, "S")
@@ -26,7 +26,7 @@ def _make_folder(name: str, url: str) -> MagicMock:
 class TestListFolders:
     def test_returns_empty_list_when_no_subfolders(self, mock_sp_context):
         folder_mock = MagicMock()
-        folder_mock.folders.top = MagicMock(return_value=[])
+        folder_mock.folders.paged = MagicMock(return_value=[])
         mock_sp_context.web.get_folder_by_server_relative_url.return_value = folder_mock
 
         from mcp_sharepoint.services.folder_service import list_folders
@@ -68,3 +68,73 @@ class TestCreateFolder:
 
         assert result["success"] is False
         assert "already exists" in result["message"]
+
+
+class TestGraphDeltaTree:
+    def test_builds_tree_from_delta_pages(self, mock_settings, mock_sp_context, monkeypatch):
+        from mcp_sharepoint.services import folder_service_graph as svc
+
+        mock_settings.shp_tree_engine = "delta"
+        mock_settings.shp_max_depth = 2
+        mock_settings.shp_doc_library = ""
+        pages = {
+            "sites/S/drive/root/delta": {
+                "value": [
+                    {"id": "R", "name": "root", "root": {}, "folder": {}},
+                    {"id": "B", "name": "beta", "folder": {}, "parentReference": {"id": "R"}},
+                    {"id": "A", "name": "Alpha", "folder": {}, "parentReference": {"id": "R"}},
+                ],
+                "@odata.nextLink": "https://graph.microsoft.com/v1.0/next-page",
+            },
+            "next-page": {
+                "value": [
+                    {"id": "F", "name": "a.txt", "file": {}, "size": 3,
+                     "parentReference": {"id": "A"}},
+                    {"id": "D", "name": "deep", "folder": {}, "parentReference": {"id": "A"}},
+                    {"id": "X", "name": "x.txt", "file": {}, "parentReference": {"id": "D"}},
+                    {"id": "G", "name": "gone", "deleted": {}, "parentReference": {"id": "R"}},
+                ],
+            },
+        }
+        client = mock_sp_context
+        client._get_site_id.return_value = "S"
+        client.normalize_path = lambda path: path
+        client.get.side_effect = lambda endpoint, params=None: (
+            pages[endpoint] if endpoint in pages else {"id": "R", "name": "root"}
+        )
+        monkeypatch.setattr(svc, "get_settings", lambda: mock_settings)
+
+        tree = svc.get_folder_tree()
+
+        assert [c["name"] for c in tree["children"]] == ["Alpha", "beta"]
+        alpha = tree["children"][0]
+        assert [c["name"] for c in alpha["children"]] == ["deep", "a.txt"]
+        assert alpha["children"][1]["size"] == 3
+        # max_depth=2: "deep" sits at depth 2 and is not expanded
+        assert alpha["children"][0]["children"] == []
+
+
+class TestFolderTreeErrors:
+    def test_unreadable_root_is_reported_and_not_cached(
+        self, mock_settings, mock_sp_context, monkeypatch,
+    ):
+        from mcp_sharepoint.services import folder_service_office365 as svc
+        from mcp_sharepoint.services.folder_service import get_folder_tree
+        from mcp_sharepoint.utils import cache as cache_mod
+
+        mock_settings.shp_cache_enabled = True
+        mock_settings.shp_cache_max_bytes = 10_000
+        mock_settings.shp_cache_ttls = {"get_folder_tree": 120.0}
+        monkeypatch.setattr(cache_mod, "_cache", None)
+        monkeypatch.setattr(svc, "get_settings", lambda: mock_settings)
+        mock_sp_context.api_type = "office365"
+        mock_sp_context.execute_query.side_effect = RuntimeError("403 Forbidden")
+
+        first = get_folder_tree("secret")
+        second = get_folder_tree("secret")
+
+        assert first["success"] is False
+        assert first["error"] == "Could not access folder"
+        assert second == first
+        assert mock_sp_context.execute_query.call_count == 2
+        assert cache_mod.cache_stats()["hits"] == 0
@@ -57,11 +57,11 @@ def make_client():
 def test_get_post_put_delete_and_download_upload(monkeypatch):
     client = make_client()
 
-    # _get_site_id should call requests.get and cache the result
+    # _get_site_id should call session.get and cache the result
     def fake_get_site(url, headers=None, params=None, timeout=None):
         return DummyResponse(json_data={"id": "SITE123"})
 
-    monkeypatch.setattr("requests.get", fake_get_site)
+    monkeypatch.setattr(client.session, "get", fake_get_site)
     site_id = client._get_site_id()
     assert site_id == "SITE123"
 
@@ -69,42 +69,81 @@ def test_get_post_put_delete_and_download_upload(monkeypatch):
     def fake_get(url, headers=None, params=None, timeout=None):
         return DummyResponse(json_data={"value": 1})
 
-    monkeypatch.setattr("requests.get", fake_get)
+    monkeypatch.setattr(client.session, "get", fake_get)
     assert client.get("some/endpoint") == {"value": 1}
 
     # Test post() returns parsed json
     def fake_post(url, headers=None, json=None, timeout=None):
         return DummyResponse(json_data={"ok": True})
 
-    monkeypatch.setattr("requests.post", fake_post)
+    monkeypatch.setattr(client.session, "post", fake_post)
     assert client.post("some/endpoint", {"a": 1}) == {"ok": True}
 
     # Test put() with empty content returns {}
     def fake_put(url, headers=None, json=None, timeout=None):
         return DummyResponse(status_code=200, json_data=None, content=b"")
 
-    monkeypatch.setattr("requests.put", fake_put)
+    monkeypatch.setattr(client.session, "put", fake_put)
     assert client.put("some/endpoint", {"a": 1}) == {}
 
     # Test delete() returns True on success
     def fake_delete(url, headers=None, timeout=None):
         return DummyResponse(status_code=204)
 
-    monkeypatch.setattr("requests.delete", fake_delete)
+    monkeypatch.setattr(client.session, "delete", fake_delete)
     assert client.delete("some/endpoint") is True
 
     # Test download() returns bytes
     def fake_download(url, headers=None, timeout=None):
         return DummyResponse(status_code=200, content=b"binarydata")
 
-    monkeypatch.setattr("requests.get", fake_download)
+    monkeypatch.setattr(client.session, "get", fake_download)
     assert client.download("some/content") == b"binarydata"
 
+    # Test download_to() streams chunks into a file object
+    class StreamResponse(DummyResponse):
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def iter_content(self, chunk_size=1):
+            for i in range(0, len(self.content), chunk_size):
+                yield self.content[i:i + chunk_size]
+
+    def fake_stream(url, headers=None, timeout=None, stream=False):
+        assert stream is True
+        return StreamResponse(status_code=200, content=b"binarydata")
+
+    monkeypatch.setattr(client.session, "get", fake_stream)
+    chunks = []
+
+    class Sink:
+        def write(self, chunk):
+            chunks.append(chunk)
+
+    assert client.download_to("some/content", Sink(), chunk_size=4) == 10
+    assert chunks == [b"bina", b"ryda", b"ta"]
+
+    # Test download() with a byte range sends Range and copes with a
+    # server that ignores it (200 with the whole body)
+    sent = []
+
+    def fake_range(url, headers=None, timeout=None, stream=False):
+        sent.append(headers["Range"])
+        return StreamResponse(status_code=200, content=b"binarydata")
+
+    monkeypatch.setattr(client.session, "get", fake_range)
+    assert client.download("some/content", byte_range=(2, 5)) == b"nary"
+    assert client.download("some/content", byte_range=(6, None)) == b"data"
+    assert sent == ["bytes=2-5", "bytes=6-"]
+
     # Test upload() returns json
     def fake_upload(url, headers=None, data=None, timeout=None):
         return DummyResponse(status_code=200, json_data={"id": "fileid"})
 
-    monkeypatch.setattr("requests.put", fake_upload)
+    monkeypatch.setattr(client.session, "put", fake_upload)
     assert client.upload("some/endpoint", b"abc") == {"id": "fileid"}
 
 
@@ -114,7 +153,155 @@ def test_graph_client_error_wrapping(monkeypatch):
     def raising_get(url, headers=None, params=None, timeout=None):
         raise requests.exceptions.RequestException("fail")
 
-    monkeypatch.setattr("requests.get", raising_get)
+    monkeypatch.setattr(client.session, "get", raising_get)
 
     with pytest.raises(SharePointConnectionError):
         client.get("endpoint")
+
+
+def _fresh_token_manager(monkeypatch, tokens):
+    """Install a TokenManager whose acquisitions return *tokens* in order."""
+    from mcp_sharepoint.core import token_manager as tm
+    from mcp_sharepoint.core.client_unified import TokenCache
+
+    cache = TokenCache()
+    tokens = iter(tokens)
+
+    def acquire():
+        token = next(tokens)
+        cache.set_token(token, 3600)
+        return token
+
+    manager = tm.TokenManager(acquire=acquire, cache=cache)
+    monkeypatch.setattr(tm, "_manager", manager)
+    return manager, cache
+
+
+def test_shared_client_refreshes_token_in_place(monkeypatch, site_resolver):
+    from unittest.mock import MagicMock
+
+    from mcp_sharepoint.core import client as client_mod
+    from mcp_sharepoint.core import http
+
+    settings = MagicMock(
+        shp_api_type="graph",
+        shp_site_url="https://example.com/sites/test",
+        shp_http_pool_connections=2,
+        shp_http_pool_maxsize=4,
+        shp_http_connect_timeout=5.0,
+        shp_http_read_timeout=30.0,
+        shp_http_transfer_timeout=60.0,
+    )
+    monkeypatch.setattr(client_mod, "get_settings", lambda: settings)
+    monkeypatch.setattr(http, "_session", None)
+    manager, cache = _fresh_token_manager(monkeypatch, ["tok-1", "tok-2"])
+    client_mod.reset_sp_context()
+
+    try:
+        first = client_mod.get_sp_context()
+        site_resolver.prime(first.site_url, "SITE123")
+        assert client_mod.get_sp_context() is first
+        assert first.headers["Authorization"] == "Bearer tok-1"
+        assert first.session is http.get_session(settings)
+        assert first.timeout == (5.0, 30.0)
+
+        # Force the token into its refresh window
+        cache.expires_at = 0
+        assert client_mod.get_sp_context() is first
+        assert first.headers["Authorization"] == "Bearer tok-2"
+        assert first._get_site_id() == "SITE123"
+        assert manager.stats()["renewals"] == 2
+    finally:
+        client_mod.reset_sp_context()
+
+
+def test_token_refresh_is_single_flight(monkeypatch):
+    import threading
+
+    from mcp_sharepoint.core.client_unified import TokenCache
+    from mcp_sharepoint.core.token_manager import TokenManager
+
+    cache = TokenCache()
+    release = threading.Event()
+    calls = {"n": 0}
+
+    def slow_acquire():
+        calls["n"] += 1
+        release.wait(timeout=5)
+        cache.set_token("tok", 3600)
+        return "tok"
+
+    manager = TokenManager(acquire=slow_acquire, cache=cache)
+    results: list[str] = []
+    workers = [
+        threading.Thread(target=lambda: results.append(manager.ensure_fresh()))
+        for _ in range(5)
+    ]
+    for worker in workers:
+        worker.start()
+    while manager.coalesced < 4:
+        threading.Event().wait(0.01)
+    release.set()
+    for worker in workers:
+        worker.join()
+
+    assert calls["n"] == 1
+    assert results == ["tok"] * 5
+    assert manager.stats()["renewals"] == 1
+
+
+def test_failed_token_acquisition_is_not_retried_inline(monkeypatch):
+    from types import SimpleNamespace
+
+    from mcp_sharepoint.core import client_unified
+
+    calls = []
+
+    class App:
+        def acquire_token_for_client(self, scopes):
+            calls.append(scopes)
+            return {"error": "invalid_client"}
+
+    monkeypatch.setattr(client_unified, "_get_msal_app", lambda *_args: App())
+    settings = SimpleNamespace(shp_tenant_id="t", shp_id_app="a", shp_id_app_secret="s")
+
+    with pytest.raises(SharePointConnectionError, match="invalid_client"):
+        client_unified._acquire_graph_token(settings)
+    assert len(calls) == 1
+
+
+def test_pool_stats_count_keep_alive_reuse():
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from mcp_sharepoint.core.http import create_session, pool_stats
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = b'{"ok": true}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    session = create_session(pool_connections=1, pool_maxsize=2)
+    try:
+        for _ in range(3):
+            url = f"http://127.0.0.1:{server.server_port}/"
+            assert session.get(url, timeout=5).json() == {"ok": True}
+        stats = pool_stats(session)
+        assert stats["requests"] == 3
+        assert stats["misses"] == 1
+        assert stats["hits"] == 2
+    finally:
+        session.close()
+        server.shutdown()
+        server.server_close()
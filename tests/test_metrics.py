@@ -0,0 +1,103 @@
+"""Tests for the Prometheus metrics in utils/metrics.py and the /metrics route."""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+
+import pytest
+import requests
+
+from mcp_sharepoint.core.http import create_session
+from mcp_sharepoint.server import metrics
+from mcp_sharepoint.utils import metrics as metrics_mod
+from mcp_sharepoint.utils.metrics import (
+    TOOL_CALLS,
+    Counter,
+    Histogram,
+    count_thread_work,
+    thread_work_in_flight,
+    timed,
+)
+
+
+def test_histogram_and_counter_exposition():
+    histogram = Histogram("op_seconds", "Op latency.", ("op",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 7.0):
+        histogram.observe(value, "read")
+    counter = Counter("op_total", "Ops.", ("path",))
+    counter.inc('a"b')
+    counter.inc('a"b', amount=2)
+
+    assert histogram.collect() == [
+        "# HELP op_seconds Op latency.",
+        "# TYPE op_seconds histogram",
+        'op_seconds_bucket{op="read",le="0.1"} 1',
+        'op_seconds_bucket{op="read",le="1.0"} 3',
+        'op_seconds_bucket{op="read",le="+Inf"} 4',
+        'op_seconds_sum{op="read"} 8.05',
+        'op_seconds_count{op="read"} 4',
+    ]
+    assert counter.collect()[-1] == 'op_total{path="a\\"b"} 3'
+
+
+def test_timed_tool_counts_outcomes_and_keeps_signature():
+    @timed("Test_Tool")
+    async def tool(folder_name: str = "", fail: bool = False):
+        if fail:
+            raise RuntimeError("boom")
+        return {"success": folder_name != "missing"}
+
+    assert list(inspect.signature(tool).parameters) == ["folder_name", "fail"]
+    asyncio.run(tool("docs"))
+    asyncio.run(tool("missing"))
+    with pytest.raises(RuntimeError):
+        asyncio.run(tool(fail=True))
+
+    lines = TOOL_CALLS.collect()
+    assert 'sharepoint_mcp_tool_calls_total{tool="Test_Tool",outcome="ok"} 1' in lines
+    assert 'sharepoint_mcp_tool_calls_total{tool="Test_Tool",outcome="error"} 2' in lines
+
+
+def test_thread_work_is_counted_until_it_finishes(monkeypatch):
+    monkeypatch.setattr(metrics_mod, "_thread_pool", None)
+    assert thread_work_in_flight() is None
+    release = threading.Event()
+
+    async def scenario():
+        count_thread_work(asyncio.get_running_loop())
+        work = [asyncio.create_task(asyncio.to_thread(release.wait, 5)) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert thread_work_in_flight() == 3
+        release.set()
+        await asyncio.gather(*work)
+
+    asyncio.run(scenario())
+    assert thread_work_in_flight() == 0
+
+
+def test_metrics_route_exports_requests_and_component_stats(monkeypatch):
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 404
+        response._content = b"{}"
+        return response
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", send)
+    create_session().get("https://graph.microsoft.com/v1.0/sites/abc/drive/items/1")
+
+    monkeypatch.setattr(metrics_mod, "_thread_pool", None)
+
+    async def scrape():
+        count_thread_work(asyncio.get_running_loop())
+        return await metrics(None)
+
+    response = asyncio.run(scrape())
+    body = response.body.decode()
+
+    assert response.media_type.startswith("text/plain; version=0.0.4")
+    assert 'endpoint="items",method="GET",status="404"}' in body
+    assert "# TYPE sharepoint_mcp_tool_duration_seconds histogram" in body
+    assert 'sharepoint_mcp_circuit_open{endpoint="items"} 0' in body
+    assert "sharepoint_mcp_ready 0" in body
+    assert 'sharepoint_mcp_pool_queue_depth{pool="threads"} 0' in body
@@ -0,0 +1,121 @@
+"""Tests for @odata.nextLink paging and limit/cursor listings."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from mcp_sharepoint.core import pagination
+from mcp_sharepoint.core.request_context import request_scope
+
+CHILDREN = "sites/S/drive/root:/mcp_server/Reports:/children"
+NEXT = "sites/S/drive/items/R/children?$skiptoken=p2"
+
+
+class PagedClient:
+    """Graph client stand-in serving a folder's children in two pages."""
+
+    api_type = "graph"
+
+    def __init__(self):
+        self.requests: list[tuple[str, dict | None]] = []
+        self.pages = {
+            CHILDREN: {
+                "value": [
+                    {"name": "a.txt", "file": {}},
+                    {"name": "Sub1", "folder": {}},
+                    {"name": "b.txt", "file": {}},
+                ],
+                "@odata.nextLink": pagination.GRAPH_ROOT + NEXT,
+            },
+            NEXT: {"value": [{"name": "Sub2", "folder": {}}, {"name": "c.txt", "file": {}}]},
+        }
+
+    def _get_site_id(self):
+        return "S"
+
+    def normalize_path(self, path):
+        return path.removeprefix("Shared Documents/")
+
+    def get(self, endpoint, params=None):
+        self.requests.append((endpoint, params))
+        return self.pages[endpoint]
+
+
+@pytest.fixture
+def paged(mock_settings, monkeypatch):
+    from mcp_sharepoint.core import client as client_mod
+    from mcp_sharepoint.services import folder_service_graph
+
+    client = PagedClient()
+    mock_settings.shp_api_type = "graph"
+    mock_settings.shp_page_size = 999
+    monkeypatch.setattr(client_mod, "get_sp_context", lambda: client)
+    monkeypatch.setattr(folder_service_graph, "get_settings", lambda: mock_settings)
+    return client
+
+
+def _names(items):
+    return [item["name"] for item in items]
+
+
+def test_full_listing_follows_next_link(paged):
+    from mcp_sharepoint.services.document_service import list_documents
+    from mcp_sharepoint.services.folder_service import list_folders
+
+    # Previously only the first page came back
+    assert _names(list_documents("Reports")) == ["a.txt", "b.txt", "c.txt"]
+    assert _names(list_folders("Reports")) == ["Sub1", "Sub2"]
+
+    endpoint, params = paged.requests[0]
+    assert endpoint == CHILDREN
+    assert params["$top"] == 999
+    assert "size" in params["$select"]
+    # Next links already carry the query
+    assert paged.requests[1] == (NEXT, None)
+
+
+def test_limit_and_cursor_resume_across_pages(paged):
+    from mcp_sharepoint.services.document_service import list_documents
+
+    first = list_documents("Reports", limit=2)
+    assert _names(first["items"]) == ["a.txt", "b.txt"]
+    assert first["count"] == 2
+    assert paged.requests[0][1]["$top"] == 2
+    # The second file ended the first page; nothing was fetched ahead
+    assert len(paged.requests) == 1
+
+    paged.requests.clear()
+    second = list_documents("Reports", limit=2, cursor=first["next_cursor"])
+    assert _names(second["items"]) == ["c.txt"]
+    assert second["next_cursor"] is None
+    # Resumed straight from the next link
+    assert [endpoint for endpoint, _ in paged.requests] == [NEXT]
+
+
+def test_async_listing_pages_with_the_same_cursors(paged):
+    class AsyncClient:
+        async def get(self, endpoint, params=None):
+            return paged.get(endpoint, params)
+
+    entries = pagination.iter_entries_async(AsyncClient(), CHILDREN)
+    items, cursor = asyncio.run(pagination.take_async(entries, 4))
+    assert _names(items) == ["a.txt", "Sub1", "b.txt", "Sub2"]
+
+    # Cursors from the async client resume on the sync one
+    rest, end = pagination.take(pagination.iter_entries(paged, CHILDREN, cursor=cursor))
+    assert _names(rest) == ["c.txt"]
+    assert end is None
+
+
+def test_invalid_cursor_and_limit_are_rejected(paged):
+    from mcp_sharepoint.services.folder_service import list_folders
+
+    with request_scope():
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            list_folders("Reports", cursor="not-a-cursor")
+        # Cursors never point outside Graph
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            list_folders("Reports", cursor=pagination.encode_cursor("https://evil.example/x", 0))
+        with pytest.raises(ValueError, match="limit"):
+            list_folders("Reports", limit=0)
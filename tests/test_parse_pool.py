@@ -0,0 +1,87 @@
+"""Tests for the document parsing process pool (utils/parse_pool.py)."""
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from mcp_sharepoint.utils.parse_pool import ParsePool, ParseTimeoutError, run_parse
+
+
+@pytest.fixture
+def pool():
+    pool = ParsePool(1, memory_limit=512 * 1024 * 1024, timeout=5)
+    yield pool
+    pool.shutdown()
+
+
+def test_runs_in_a_worker_process(pool):
+    assert pool.run(pow, 2, 10) == 1024
+    assert pool.run(os.getpid) != os.getpid()
+    assert pool.stats()["completed"] == 2
+
+
+def test_timeout_kills_the_worker_and_pool_recovers(pool):
+    pool.timeout = 0.5
+    with pytest.raises(ParseTimeoutError):
+        pool.run(time.sleep, 30)
+
+    pool.timeout = 5
+    assert pool.run(pow, 3, 2) == 9
+    assert pool.stats()["timeouts"] == 1
+    assert pool.stats()["restarts"] == 1
+
+
+def test_timeout_counts_from_when_the_parse_starts(pool):
+    pool.timeout = 1
+    pool.run(pow, 2, 2)  # start the worker
+
+    with ThreadPoolExecutor(2) as threads:
+        parses = [threads.submit(pool.run, time.sleep, 0.7) for _ in range(2)]
+        assert [p.result() for p in parses] == [None, None]  # second queued ~0.7s
+    assert pool.stats()["timeouts"] == 0
+
+
+def test_timeout_kills_only_the_overrunning_worker():
+    pool = ParsePool(2, timeout=1.5)
+    try:
+        with ThreadPoolExecutor(3) as threads:
+            warm = [threads.submit(pool.run, time.sleep, 0.2) for _ in range(2)]
+            [p.result() for p in warm]
+
+            stuck = threads.submit(pool.run, time.sleep, 30)
+            time.sleep(0.75)
+            slow = threads.submit(pool.run, time.sleep, 1)  # still running at the kill
+            time.sleep(0.1)
+            queued = threads.submit(pool.run, pow, 2, 3)
+
+            with pytest.raises(ParseTimeoutError):
+                stuck.result()
+            assert slow.result() is None
+            assert queued.result() == 8
+        stats = pool.stats()
+        assert stats["submitted"] == 5  # neither neighbour was retried
+        assert stats["timeouts"] == 1
+        assert stats["restarts"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_crashed_worker_is_replaced(pool):
+    with pytest.raises(BrokenProcessPool):
+        pool.run(os._exit, 1)  # dies again on the retry
+
+    assert pool.run(pow, 2, 2) == 4
+    assert pool.stats()["restarts"] == 2
+
+
+def test_memory_limit_applies_to_workers(pool):
+    with pytest.raises(MemoryError):
+        pool.run(bytes, 1024 * 1024 * 1024)
+
+
+def test_parses_inline_when_disabled(mock_settings):
+    assert run_parse(os.getpid) == os.getpid()
@@ -3,7 +3,13 @@ from __future__ import annotations
 
 import pytest
 
-from mcp_sharepoint.utils.parsers import detect_file_type
+from mcp_sharepoint.utils.parsers import (
+    DEFAULT_EXCEL_ROWS,
+    ContentOptions,
+    detect_file_type,
+    extract_pdf,
+    parse_excel,
+)
 
 
 class TestDetectFileType:
@@ -26,3 +32,101 @@ class TestDetectFileType:
     )
     def test_detect(self, filename: str, expected: str) -> None:
         assert detect_file_type(filename) == expected
+
+
+def _pdf(pages: int) -> bytes:
+    import fitz
+
+    doc = fitz.open()
+    for number in range(1, pages + 1):
+        doc.new_page().insert_text((72, 72), f"Page {number} text")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+class TestExtractPdf:
+    def test_page_range(self, tmp_path) -> None:
+        path = tmp_path / "doc.pdf"
+        path.write_bytes(_pdf(5))
+
+        text, pages, last, truncated = extract_pdf(str(path), ContentOptions(2, 3))
+
+        assert pages == 5 and last == 3 and truncated is False
+        assert "Page 2" in text and "Page 3" in text and "Page 4" not in text
+
+    def test_stops_at_char_budget(self) -> None:
+        text, _, last, truncated = extract_pdf(_pdf(10), ContentOptions(max_chars=20))
+
+        assert len(text) == 20 and last == 2 and truncated is True
+
+    def test_whole_range_read_is_not_truncated(self) -> None:
+        _, _, last, truncated = extract_pdf(_pdf(1), ContentOptions(end_page=1))
+        assert last == 1 and truncated is False
+
+    def test_rejects_invalid_range(self) -> None:
+        with pytest.raises(ValueError):
+            ContentOptions(start_page=3, end_page=2)
+
+
+def test_content_result_reports_partial_pdf_read(mock_settings) -> None:
+    from mcp_sharepoint.services.content import content_result
+
+    result = content_result("a.pdf", _pdf(4), options=ContentOptions(end_page=2))
+
+    assert result["pages"] == "1-2" and result["page_count"] == 4
+    assert content_result("a.txt", b"abcdef", options=ContentOptions(max_chars=3)) == {
+        "name": "a.txt", "content_type": "text", "content": "abc", "truncated": True, "size": 6,
+    }
+
+
+def _xlsx() -> bytes:
+    import io
+
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    wb.active.title = "Data"
+    wb.active.append(["id", "name", "amount"])
+    for i in range(1, 1000):
+        wb.active.append([i, f"row {i}", i * 1.5])
+    wb.create_sheet("Notes").append(["hello", None, None])
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+class TestParseExcel:
+    def test_default_preview_reads_first_rows_of_every_sheet(self) -> None:
+        text, sheets = parse_excel(_xlsx())
+
+        lines = text.splitlines()
+        assert sheets == 2
+        assert lines[:2] == ["=== Data ===", "id | name | amount"]
+        assert lines[DEFAULT_EXCEL_ROWS] == "49 | row 49 | 73.5"
+        assert lines[-2:] == ["=== Notes ===", "hello"]
+
+    def test_sheet_row_and_column_selection(self) -> None:
+        options = ContentOptions(sheets=("Data",), max_rows=3, max_columns=2)
+
+        text, _ = parse_excel(_xlsx(), options)
+
+        assert text == "=== Data ===\nid | name\n1 | row 1\n2 | row 2"
+
+    def test_stops_once_over_char_budget(self) -> None:
+        text, _ = parse_excel(_xlsx(), ContentOptions(max_rows=1000, max_chars=40))
+        assert 40 < len(text) < 80
+
+
+def test_content_result_for_a_byte_range_drops_cut_characters(mock_settings) -> None:
+    from mcp_sharepoint.services.content import content_result
+
+    # "héllo wörld" fetched from byte 2: the range starts inside "é"
+    part = "héllo wörld".encode()[2:9]
+    options = ContentOptions(byte_offset=2, max_bytes=7)
+
+    result = content_result("log.txt", part, options=options, size=13)
+
+    assert result["content"] == "llo w"
+    assert result["byte_range"] == "2-8" and result["truncated"] is True
+    assert result["size"] == 13
@@ -0,0 +1,89 @@
+"""Tests for the per-tool-call context in core/request_context.py."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from mcp_sharepoint.core import client as client_mod
+from mcp_sharepoint.core import client_async
+from mcp_sharepoint.core.request_context import request_context, request_scope
+
+
+class CountingClient:
+    """Graph client stand-in counting the lookups a tool call makes."""
+
+    api_type = "graph"
+
+    def __init__(self):
+        self.site_lookups = 0
+        self.normalized = 0
+        self.gets: list[str] = []
+
+    def _get_site_id(self):
+        self.site_lookups += 1
+        return "S"
+
+    def normalize_path(self, path):
+        self.normalized += 1
+        return path.removeprefix("Shared Documents/")
+
+    def get(self, endpoint, params=None):
+        self.gets.append(endpoint)
+        return {"id": "F1", "name": "a.txt", "size": 3}
+
+    def download(self, endpoint, byte_range=None):
+        return b"abc"
+
+
+@pytest.fixture
+def counted(mock_settings, monkeypatch):
+    from mcp_sharepoint.services import document_service_graph
+
+    client = CountingClient()
+    lookups = []
+
+    def get_sp_context():
+        lookups.append(client)
+        return client
+
+    mock_settings.shp_api_type = "graph"
+    mock_settings.shp_async_http = False
+    monkeypatch.setattr(client_mod, "get_sp_context", get_sp_context)
+    for module in (client_async, document_service_graph):
+        monkeypatch.setattr(module, "get_settings", lambda: mock_settings)
+    return client, lookups
+
+
+def test_tool_call_resolves_client_site_and_path_once(counted):
+    from mcp_sharepoint.services import document_service
+
+    client, lookups = counted
+
+    result = document_service.get_document_content("Reports", "a.txt")
+    assert result["content"] == "abc"
+    # Previously: dispatcher + backend + path normalization each fetched the client
+    assert len(lookups) == 1
+    assert client.site_lookups == 1
+    assert client.gets == ["sites/S/drive/root:/mcp_server/Reports/a.txt"]
+
+    # The async entry point falls back to the sync dispatcher on a worker
+    # thread, which joins the outer call's context
+    asyncio.run(document_service.get_document_content_async("Reports", "a.txt"))
+    assert len(lookups) == 2
+    assert client.site_lookups == 2
+
+
+def test_paths_are_normalized_once_per_scope(counted):
+    client, lookups = counted
+
+    with request_scope() as ctx:
+        assert ctx.path("Reports") == "mcp_server/Reports"
+        assert request_context().file_path("Reports", "a.txt") == "mcp_server/Reports/a.txt"
+        assert client.normalized == 1
+        # Traversal stays inside the configured scope
+        assert ctx.path("../../etc") == "mcp_server/etc"
+
+    # Outside a scope every caller gets its own context
+    assert request_context() is not request_context()
+    assert len(lookups) == 1
@@ -1,8 +1,12 @@
 """Tests for the retry decorator in utils/retry.py."""
 from __future__ import annotations
 
+import asyncio
+
 import pytest
+import requests
 
+from mcp_sharepoint.exceptions import SharePointConnectionError
 from mcp_sharepoint.utils.retry import SharePointThrottleError, sp_retry
 
 
@@ -34,3 +38,119 @@ def test_sp_retry_raises_after_max_attempts(monkeypatch):
 
     with pytest.raises(ConnectionError):
         always_fail()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake monotonic clock advanced by (recorded) sleeps."""
+    state = {"now": 100.0, "slept": []}
+
+    def sleep(seconds):
+        state["slept"].append(seconds)
+        state["now"] += seconds
+
+    monkeypatch.setattr("time.monotonic", lambda: state["now"])
+    monkeypatch.setattr("time.sleep", sleep)
+    return state
+
+
+def _wrapped(cause: BaseException) -> SharePointConnectionError:
+    """A client error wrapping *cause*, as the Graph clients raise them."""
+    error = SharePointConnectionError(f"Graph API call failed: {cause}")
+    error.__cause__ = cause
+    return error
+
+
+def _http_error(status: int, headers: dict | None = None) -> SharePointConnectionError:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return _wrapped(requests.exceptions.HTTPError(response=response))
+
+
+def test_retries_stop_at_the_call_deadline(clock, retry_policy):
+    calls = {"n": 0}
+
+    @sp_retry
+    def throttled() -> None:
+        calls["n"] += 1
+        raise _http_error(429, {"Retry-After": "20"})
+
+    with pytest.raises(SharePointConnectionError):
+        throttled()
+    # A second 20s wait would end past the 30s deadline
+    assert calls["n"] == 2
+    assert clock["slept"] == [20.0]
+    assert retry_policy.stats() == {"calls": 1, "retried_calls": 1, "retries": 1, "gave_up": 1}
+
+
+def test_non_idempotent_calls_retry_only_unsent_requests(clock):
+    failures = [
+        _wrapped(requests.exceptions.ConnectTimeout("connect timed out")),
+        _wrapped(requests.exceptions.ReadTimeout("read timed out")),
+    ]
+    calls = {"n": 0}
+
+    @sp_retry(idempotent=False)
+    def create() -> None:
+        calls["n"] += 1
+        raise failures.pop(0)
+
+    # The connect timeout is retried; the read timeout may have created the folder
+    with pytest.raises(SharePointConnectionError, match="read timed out"):
+        create()
+    assert calls["n"] == 2
+
+    @sp_retry
+    def read() -> str:
+        calls["n"] += 1
+        if calls["n"] < 4:
+            raise _http_error(502)
+        return "ok"
+
+    assert read() == "ok"
+
+
+def test_nested_calls_share_the_outer_attempts(clock):
+    inner_calls = {"n": 0}
+
+    @sp_retry
+    def inner() -> None:
+        inner_calls["n"] += 1
+        raise ConnectionError("reset")
+
+    @sp_retry
+    def outer() -> None:
+        inner()
+
+    with pytest.raises(ConnectionError):
+        outer()
+    # Previously 3 inner attempts per outer attempt, 9 in all
+    assert inner_calls["n"] == 3
+
+
+def test_backoff_is_jittered_and_capped(retry_policy):
+    delays = {retry_policy.backoff(1) for _ in range(50)}
+    assert all(0.5 <= d <= 1.0 for d in delays)
+    assert len(delays) > 1
+    assert all(7.5 <= retry_policy.backoff(10) <= 15.0 for _ in range(50))
+
+
+def test_async_calls_retry_throttles_with_retry_after(monkeypatch):
+    slept = []
+
+    async def sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    calls = {"n": 0}
+
+    @sp_retry
+    async def throttled() -> str:
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise SharePointThrottleError("429", retry_after=2.0, status=429)
+        return "ok"
+
+    assert asyncio.run(throttled()) == "ok"
+    assert slept == [2.0]
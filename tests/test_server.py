@@ -2,11 +2,12 @@
 import asyncio
 import json
 
-from mcp_sharepoint.server import health_check
+from mcp_sharepoint.server import health_check, liveness, readiness
 
 
-def test_health_check_success(mock_sp_context):
+def test_health_check_success(mock_sp_context, readiness_probe):
     """Test the /health endpoint when SharePoint connectivity succeeds."""
+    asyncio.run(readiness_probe.refresh())
     response = asyncio.run(health_check(None))
 
     assert response.status_code == 200
@@ -18,13 +19,14 @@ def test_health_check_success(mock_sp_context):
     assert "sharepoint_error" not in data
 
 
-def test_health_check_failure(mock_sp_context):
+def test_health_check_failure(mock_sp_context, readiness_probe):
     """Test the /health endpoint when SharePoint connectivity fails."""
     # Force the mock to raise on execute_query
-    # Health check calls `client.ctx.execute_query()` for Office365 clients
+    # The readiness check calls `client.ctx.execute_query()` for Office365 clients
     # so set the side effect on that attribute.
     mock_sp_context.ctx.execute_query.side_effect = Exception("Simulated connection timeout")
 
+    asyncio.run(readiness_probe.refresh())
     response = asyncio.run(health_check(None))
 
     assert response.status_code == 503
@@ -33,3 +35,26 @@ def test_health_check_failure(mock_sp_context):
     assert data["status"] == "degraded"
     assert data["sharepoint"] == "disconnected"
     assert "Simulated connection timeout" in data["sharepoint_error"]
+
+
+def test_probes_answer_from_the_last_background_check(mock_sp_context, readiness_probe):
+    """/readyz and /health report the cached result without calling SharePoint."""
+    assert asyncio.run(liveness(None)).status_code == 200
+
+    # Not checked yet: not ready
+    response = asyncio.run(readiness(None))
+    assert response.status_code == 503
+    assert json.loads(response.body)["sharepoint"] == "unknown"
+
+    asyncio.run(readiness_probe.refresh())
+    assert mock_sp_context.ctx.execute_query.call_count == 1
+    for _ in range(3):
+        assert asyncio.run(readiness(None)).status_code == 200
+        assert asyncio.run(health_check(None)).status_code == 200
+    assert mock_sp_context.ctx.execute_query.call_count == 1
+
+    # A result older than three intervals is no longer trusted
+    readiness_probe._checked_at -= readiness_probe.interval * 4
+    response = asyncio.run(readiness(None))
+    assert response.status_code == 503
+    assert json.loads(response.body)["sharepoint"] == "unknown"
@@ -0,0 +1,85 @@
+"""Tests for memoized site/drive resolution in core/site_resolver.py."""
+from __future__ import annotations
+
+import pytest
+
+from mcp_sharepoint.core import site_resolver as resolver_mod
+from mcp_sharepoint.core.site_resolver import SiteResolver
+from mcp_sharepoint.exceptions import SharePointConnectionError
+
+SITE_URL = "https://contoso.sharepoint.com/sites/Team"
+
+DRIVES = {
+    "value": [
+        {
+            "id": "DRIVE-DOCS",
+            "name": "Documents",
+            "webUrl": "https://contoso.sharepoint.com/sites/Team/Shared%20Documents",
+        },
+        {
+            "id": "DRIVE-ARCHIVE",
+            "name": "Archive",
+            "webUrl": "https://contoso.sharepoint.com/sites/Team/Archive",
+        },
+    ]
+}
+
+
+class FakeGraph:
+    def __init__(self):
+        self.calls: list[str] = []
+        self.fail = False
+
+    def __call__(self, endpoint):
+        self.calls.append(endpoint)
+        if self.fail:
+            raise SharePointConnectionError("boom")
+        if endpoint == "sites/contoso.sharepoint.com:/sites/Team":
+            return {"id": "SITE-1"}
+        if endpoint.startswith("sites/SITE-1/drives"):
+            return DRIVES
+        if endpoint.startswith("sites/SITE-1/drive"):
+            return {"id": "DRIVE-DOCS"}
+        raise AssertionError(endpoint)
+
+
+def test_resolutions_are_shared_and_libraries_mapped():
+    resolver = SiteResolver(ttl=60)
+    fetch = FakeGraph()
+
+    assert resolver.site_id(SITE_URL, fetch) == "SITE-1"
+    assert resolver.site_id(SITE_URL.lower() + "/", fetch) == "SITE-1"
+    assert resolver.drive_id(SITE_URL, fetch) == "DRIVE-DOCS"
+    assert resolver.drive_id(SITE_URL, fetch, "Shared Documents") == "DRIVE-DOCS"
+    assert resolver.drive_id(SITE_URL, fetch, "archive") == "DRIVE-ARCHIVE"
+
+    # One site lookup, then one drives listing plus the default drive
+    assert len(fetch.calls) == 3
+    with pytest.raises(SharePointConnectionError):
+        resolver.drive_id(SITE_URL, fetch, "Nope")
+
+
+def test_expired_entry_falls_back_to_stale_value_on_error(monkeypatch):
+    resolver = SiteResolver(ttl=60)
+    fetch = FakeGraph()
+    now = [1000.0]
+    monkeypatch.setattr(resolver_mod.time, "time", lambda: now[0])
+
+    resolver.site_id(SITE_URL, fetch)
+    now[0] += 61
+    fetch.fail = True
+
+    assert resolver.site_id(SITE_URL, fetch) == "SITE-1"
+    assert resolver.stats()["stale"] == 1
+
+
+def test_snapshot_warms_a_new_process(tmp_path):
+    snapshot = str(tmp_path / "sites.json")
+    SiteResolver(ttl=60, snapshot_path=snapshot).drive_id(SITE_URL, FakeGraph())
+
+    fetch = FakeGraph()
+    warm = SiteResolver(ttl=60, snapshot_path=snapshot)
+
+    assert warm.site_id(SITE_URL, fetch) == "SITE-1"
+    assert warm.drive_id(SITE_URL, fetch, "Archive") == "DRIVE-ARCHIVE"
+    assert fetch.calls == []
@@ -0,0 +1,106 @@
+"""Tests for the tenant-wide throttle governor in core/throttle.py."""
+from __future__ import annotations
+
+import pytest
+import requests
+
+from mcp_sharepoint.core import throttle
+from mcp_sharepoint.core.http import create_session
+from mcp_sharepoint.exceptions import SharePointConnectionError
+from mcp_sharepoint.utils.retry import sp_retry
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Frozen monotonic clock; sleeping advances it and is recorded."""
+    state = {"now": 1000.0, "slept": []}
+
+    def sleep(seconds):
+        state["slept"].append(seconds)
+        state["now"] += seconds
+
+    monkeypatch.setattr(throttle.time, "monotonic", lambda: state["now"])
+    monkeypatch.setattr(throttle.time, "sleep", sleep)
+    return state
+
+
+def _response(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = b"{}"
+    return response
+
+
+def test_throttle_on_one_session_pauses_every_request(clock, monkeypatch):
+    replies = [_response(429, {"Retry-After": "7"}), _response(200), _response(200)]
+    monkeypatch.setattr(
+        requests.adapters.HTTPAdapter, "send", lambda self, request, **kw: replies.pop(0)
+    )
+    session, other = create_session(), create_session()
+
+    assert session.get("https://graph.microsoft.com/v1.0/a").status_code == 429
+    # A different session (another worker) waits out the same Retry-After
+    assert other.get("https://graph.microsoft.com/v1.0/b").status_code == 200
+    assert clock["slept"] == [7.0]
+    # ...once: the pause is over for everyone afterwards
+    session.get("https://graph.microsoft.com/v1.0/c")
+    assert clock["slept"] == [7.0]
+    assert throttle.throttle_stats()["throttles"] == 1
+
+
+def test_low_ratelimit_budget_spreads_requests(clock, throttle_governor):
+    throttle_governor.observe(
+        200, {"RateLimit-Limit": "100", "RateLimit-Remaining": "5", "RateLimit-Reset": "10"}
+    )
+    # 5 requests left for 10s: one every 2s
+    assert [throttle_governor.delay() for _ in range(3)] == [0.0, 2.0, 4.0]
+
+    throttle_governor.observe(
+        200, {"RateLimit-Limit": "100", "RateLimit-Remaining": "0", "RateLimit-Reset": "30"}
+    )
+    assert throttle_governor.delay() == 30.0
+
+    # Back above the reserve: no pacing
+    clock["now"] += 30
+    throttle_governor.observe(
+        200, {"RateLimit-Limit": "100", "RateLimit-Remaining": "90", "RateLimit-Reset": "10"}
+    )
+    assert throttle_governor.delay() == 0.0
+
+
+def test_missing_retry_after_backs_off_and_pauses_are_capped(clock, throttle_governor):
+    assert throttle_governor.observe(503, {}) == 2.0
+    assert throttle_governor.observe(503, {}) == 4.0
+    assert throttle_governor.observe(429, {"Retry-After": "86400"}) == throttle_governor.max_wait
+    throttle_governor.observe(200, {})
+    assert throttle_governor.observe(503, {}) == 2.0
+
+
+def test_sp_retry_fires_on_wrapped_throttle_errors(clock):
+    slept = clock["slept"]
+    calls = {"throttled": 0, "missing": 0}
+
+    def http_error(status, headers=None):
+        # How the Graph clients surface HTTP failures
+        wrapped = SharePointConnectionError(f"Graph API GET failed: {status}")
+        wrapped.__cause__ = requests.exceptions.HTTPError(response=_response(status, headers))
+        return wrapped
+
+    @sp_retry
+    def throttled():
+        calls["throttled"] += 1
+        if calls["throttled"] == 1:
+            raise http_error(429, {"Retry-After": "3"})
+        return "ok"
+
+    @sp_retry
+    def missing():
+        calls["missing"] += 1
+        raise http_error(404)
+
+    assert throttled() == "ok"
+    assert slept == [3.0]
+    with pytest.raises(SharePointConnectionError):
+        missing()
+    assert calls["missing"] == 1
@@ -0,0 +1,86 @@
+"""Unit tests for the streaming download helpers in utils/transfer.py."""
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+
+import pytest
+
+from mcp_sharepoint.utils.transfer import (
+    QuickXorHash,
+    atomic_download,
+    expected_hash,
+    save_download,
+)
+
+
+def _reference_quick_xor(data: bytes) -> bytes:
+    """Byte-at-a-time quickXorHash, straight from the published algorithm."""
+    state = 0
+    for n, byte in enumerate(data):
+        offset = (n * 11) % 160
+        state ^= ((byte << offset) | (byte >> (160 - offset))) & ((1 << 160) - 1)
+    out = bytearray(state.to_bytes(20, "little"))
+    for i, byte in enumerate(len(data).to_bytes(8, "little")):
+        out[12 + i] ^= byte
+    return bytes(out)
+
+
+@pytest.mark.parametrize("size", [0, 1, 159, 160, 161, 5000])
+def test_quick_xor_matches_reference_across_chunk_boundaries(size):
+    data = os.urandom(size)
+    hasher = QuickXorHash()
+    for start in range(0, size, 37):
+        hasher.update(data[start:start + 37])
+    assert hasher.digest() == _reference_quick_xor(data)
+
+
+def test_verified_download_is_renamed_into_place(tmp_path):
+    data = b"x" * 3000
+    item = {"size": len(data), "file": {"hashes": {
+        "quickXorHash": base64.b64encode(_reference_quick_xor(data)).decode(),
+    }}}
+    target = tmp_path / "out" / "file.bin"
+
+    with atomic_download(
+        str(target), expected_size=item["size"], expected=expected_hash(item),
+    ) as sink:
+        for start in range(0, len(data), 1024):
+            sink.write(data[start:start + 1024])
+
+    assert target.read_bytes() == data
+    assert os.listdir(target.parent) == ["file.bin"]
+
+
+def test_mismatch_leaves_destination_untouched(tmp_path):
+    target = tmp_path / "file.bin"
+    target.write_bytes(b"old")
+    expected = ("sha1Hash", hashlib.sha1(b"other").hexdigest().upper())
+
+    with pytest.raises(OSError, match="sha1Hash mismatch"):
+        with atomic_download(str(target), expected=expected) as sink:
+            sink.write(b"new")
+
+    assert target.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["file.bin"]
+
+
+def test_save_download_falls_back_after_failed_stream(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path / "fallback"))
+    (tmp_path / "fallback").mkdir()
+    attempts = []
+
+    def write(sink):
+        attempts.append(sink)
+        sink.write(b"abc")
+        if len(attempts) == 1:
+            raise ConnectionError("reset mid-stream")
+
+    result = save_download(write, str(tmp_path / "primary.txt"), "file.txt", expected_size=3)
+
+    assert result["success"] is True
+    assert result["method"] == "fallback"
+    assert "reset mid-stream" in result["primary_error"]
+    assert not (tmp_path / "primary.txt").exists()
+    assert (tmp_path / "fallback" / "file.txt").read_bytes() == b"abc"
@@ -0,0 +1,123 @@
+"""Unit tests for resumable Graph upload sessions in core/upload_session.py."""
+from __future__ import annotations
+
+import pytest
+import requests
+
+from mcp_sharepoint.core import upload_session
+from mcp_sharepoint.core.upload_session import (
+    CHUNK_ALIGNMENT,
+    aligned_chunk_size,
+    bytes_reader,
+    file_reader,
+    upload_in_session,
+)
+from mcp_sharepoint.exceptions import SharePointConnectionError
+
+UPLOAD_URL = "https://tenant.sharepoint.com/upload/abc"
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self._body = body or {}
+        self.headers = {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} error", response=self)
+
+    def json(self):
+        return self._body
+
+
+class FakeSession:
+    """Upload URL endpoint that stores fragments and can fail on demand."""
+
+    def __init__(self, size, fail_at=None, fail_status=503):
+        self.size = size
+        self.received = bytearray()
+        self.fail_at = set(fail_at or ())
+        self.fail_status = fail_status
+        self.ranges: list[str] = []
+        self.deleted = False
+
+    def put(self, url, data=None, headers=None, timeout=None):
+        assert url == UPLOAD_URL and "Authorization" not in headers
+        self.ranges.append(headers["Content-Range"])
+        start = int(headers["Content-Range"].split()[1].split("-")[0])
+        if start in self.fail_at:
+            self.fail_at.discard(start)
+            # The fragment landed server-side but the response was lost
+            self.received[start:] = data
+            return FakeResponse(self.fail_status)
+        assert start == len(self.received)
+        self.received.extend(data)
+        if len(self.received) == self.size:
+            return FakeResponse(201, {"id": "NEW", "name": "big.bin"})
+        return FakeResponse(202, {"nextExpectedRanges": [f"{len(self.received)}-"]})
+
+    def get(self, url, timeout=None):
+        return FakeResponse(200, {"nextExpectedRanges": [f"{len(self.received)}-{self.size - 1}"]})
+
+    def delete(self, url, timeout=None):
+        self.deleted = True
+        return FakeResponse(204)
+
+
+class FakeClient:
+    timeout = transfer_timeout = (1, 1)
+
+    def __init__(self, session):
+        self.session = session
+        self.posts: list[str] = []
+
+    def post(self, endpoint, data=None):
+        self.posts.append(endpoint)
+        return {"uploadUrl": UPLOAD_URL, "nextExpectedRanges": ["0-"]}
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch):
+    monkeypatch.setattr(upload_session.time, "sleep", lambda _s: None)
+
+
+def test_chunk_size_is_aligned_to_320_kib():
+    assert aligned_chunk_size(1) == CHUNK_ALIGNMENT
+    assert aligned_chunk_size(3 * CHUNK_ALIGNMENT + 5) == 3 * CHUNK_ALIGNMENT
+
+
+def test_resumes_from_next_expected_range_after_transient_failure():
+    data = bytes(range(256)) * 5000  # ~1.2 MiB -> 4 fragments
+    session = FakeSession(len(data), fail_at={CHUNK_ALIGNMENT})
+    client = FakeClient(session)
+
+    item = upload_in_session(
+        client, "items/X/createUploadSession", bytes_reader(data), len(data), CHUNK_ALIGNMENT,
+    )
+
+    assert item["id"] == "NEW"
+    assert bytes(session.received) == data
+    # The failed fragment was acknowledged server-side, so it is not re-sent
+    starts = [int(r.split()[1].split("-")[0]) for r in session.ranges]
+    assert starts == [0, CHUNK_ALIGNMENT, 2 * CHUNK_ALIGNMENT, 3 * CHUNK_ALIGNMENT]
+    assert session.ranges[-1].endswith(f"-{len(data) - 1}/{len(data)}")
+
+
+def test_permanent_failure_cancels_the_session():
+    data = b"x" * (2 * CHUNK_ALIGNMENT)
+    session = FakeSession(len(data), fail_at={0}, fail_status=400)
+
+    with pytest.raises(SharePointConnectionError):
+        upload_in_session(FakeClient(session), "s", bytes_reader(data), len(data), CHUNK_ALIGNMENT)
+
+    assert session.deleted is True
+
+
+def test_file_reader_maps_local_file(tmp_path):
+    path = tmp_path / "big.bin"
+    path.write_bytes(b"abcdef")
+
+    with file_reader(str(path)) as (read_range, size):
+        assert size == 6
+        assert read_range(2, 5) == b"cde"